@@ -148,14 +148,13 @@ class RequestApp:
             self.path = reservation.path
 
         reservation_protocol = self.node.network_manager.protocol_stack[1]
-        for card in reservation_protocol.timecards:
-            if reservation in card.reservations:
-                process = Process(self, "add_memo_reservation_map", [card.memory_index, reservation])
-                event = Event(reservation.start_time, process)
-                self.node.timeline.schedule(event)
-                process = Process(self, "remove_memo_reservation_map", [card.memory_index])
-                event = Event(reservation.end_time, process)
-                self.node.timeline.schedule(event)
+        for memory_index in reservation_protocol.calendar.get_memory_indices(reservation):
+            process = Process(self, "add_memo_reservation_map", [memory_index, reservation])
+            event = Event(reservation.start_time, process)
+            self.node.timeline.schedule(event)
+            process = Process(self, "remove_memo_reservation_map", [memory_index])
+            event = Event(reservation.end_time, process)
+            self.node.timeline.schedule(event)
 
     def set_name(self, name: str):
         self.name = name
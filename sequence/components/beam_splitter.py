@@ -10,7 +10,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ..kernel.timeline import Timeline
     from ..topology.node import Node
+    from .photon_train import PhotonTrain
 
+import numpy as np
 from numpy import trace
 
 from .photon import Photon
@@ -69,7 +71,7 @@ class BeamSplitter(Entity):
 
         assert photon.encoding_type["name"] == "polarization", "Beamsplitter should only be used with polarization."
 
-        if self.get_generator().random() < self.fidelity:
+        if self.get_stream().uniform() < self.fidelity:
             index = int((self.timeline.now() - self.start_time) * self.frequency * 1e-12)
 
             if 0 > index or index >= len(self.basis_list):
@@ -79,6 +81,34 @@ class BeamSplitter(Entity):
                                  photon, self.get_generator())
             self._receivers[res].get(photon)
 
+    def get_train(self, train: "PhotonTrain", **kwargs) -> None:
+        """Method to receive a train of photons for measurement.
+
+        The measurement basis of each photon is given by its arrival time (as in `get`),
+        and all photons are measured at once.
+
+        Args:
+            train (PhotonTrain): photons to measure (must have polarization encoding)
+
+        Side Effects:
+            May call get_train method of the receivers with the photons measured in each output.
+        """
+
+        assert train.encoding_type["name"] == "polarization", "Beamsplitter should only be used with polarization."
+
+        rng = self.get_generator()
+        train = train.select(rng.random(len(train)) < self.fidelity)
+        index = ((train.times - self.start_time) * self.frequency * 1e-12).astype(np.int64)
+        valid = (index >= 0) & (index < len(self.basis_list))
+        train = train.select(valid)
+
+        bases = np.array(polarization["bases"], dtype=complex)[np.asarray(self.basis_list)[index[valid]]]
+        results = train.measure(bases, rng)
+        for res, receiver in enumerate(self._receivers):
+            train_out = train.select(results == res)
+            if len(train_out) > 0:
+                receiver.get_train(train_out)
+
     def set_basis_list(self, basis_list: list[int], start_time: int, frequency: float) -> None:
         """Sets the basis_list, start_time, and frequency attributes."""
 
@@ -238,13 +268,13 @@ class PolarizingBeamSplitter(Entity):
         assert photon.encoding_type["name"] == "polarization", \
             "PolarizingBeamSplitter requires polarization encoding."
 
-        if self.get_generator().random() < self.fidelity:
+        if self.get_stream().uniform() < self.fidelity:
             # Measure in fixed basis
             basis = polarization["bases"][self.basis_index]
             result = Photon.measure(basis, photon, self.get_generator())
 
             # Apply measurement error (bit flip)
-            if self.get_generator().random() < self.mismeasure_prob:
+            if self.get_stream().uniform() < self.mismeasure_prob:
                 result = 1 - result
             
             self._receivers[result].get(photon)
\ No newline at end of file
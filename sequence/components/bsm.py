@@ -105,6 +105,8 @@ class BSM(Entity):
         phase_error (float): phase error applied to measurement.
         detectors (list[Detector]): list of attached photon detection devices.
         resolution (int): maximum time resolution achievable with attached detectors.
+        photons (list[Photon]): photons measured for the current arrival time (one per location).
+        photon_arrival_time (int): arrival time of the current photons.
     """
 
     _phi_plus = [complex(sqrt(1 / 2)), complex(0), complex(0), complex(sqrt(1 / 2))]
@@ -127,6 +129,7 @@ class BSM(Entity):
         self.encoding = "None"
         self.phase_error = phase_error
         self.photons = []
+        self._received = []  # all photons received at the current arrival time, released at the next one
         self.photon_arrival_time = -1
         self.resolution = None
 
@@ -155,7 +158,10 @@ class BSM(Entity):
         if not self.encoding == "shell":
             self.resolution = max(d.time_resolution for d in self.detectors)
 
+        for photon in self._received:
+            photon.release()
         self.photons = []
+        self._received = []
         self.photon_arrival_time = -1
 
     @abstractmethod
@@ -172,11 +178,16 @@ class BSM(Entity):
 
         # check if photon arrived later than current photon
         if self.photon_arrival_time < self.timeline.now():
-            # clear photons
+            # clear (and release) photons, including the photons that were not measured
+            for reference in self._received:
+                reference.release()
             self.photons = [photon]
+            self._received = [photon]
             # set arrival time
             self.photon_arrival_time = self.timeline.now()
+            return
 
+        self._received.append(photon)
         # check if we have a photon from a new location
         if not any([reference.location == photon.location for reference in self.photons]):
             self.photons.append(photon)
@@ -497,7 +508,7 @@ class SingleAtomBSM(BSM):
                     raise NotImplementedError("Unknown state")
 
                 photon = p0 if meas0 else p1
-                if self.get_generator().random() > photon.loss:
+                if self.get_stream().uniform() > photon.loss:
                     log.logger.info(f"Triggering detector {detector_num}")
                     # middle BSM node notify two end nodes via EntanglementGenerationB.bsm_update()
                     self.detectors[detector_num].get()
@@ -505,13 +516,13 @@ class SingleAtomBSM(BSM):
                     log.logger.info(f'{self.name} lost photon p{meas1}')
 
             else:  # meas0, meas1 = 1, 1 or 0, 0
-                if meas0 and self.get_generator().random() > p0.loss:
+                if meas0 and self.get_stream().uniform() > p0.loss:
                     detector_num = self.get_generator().choice([0, 1])
                     self.detectors[detector_num].get()
                 else:
                     log.logger.info(f'{self.name} lost photon p0')
 
-                if meas1 and self.get_generator().random() > p1.loss:
+                if meas1 and self.get_stream().uniform() > p1.loss:
                     detector_num = self.get_generator().choice([0, 1])
                     self.detectors[detector_num].get()
                 else:
@@ -1,71 +1,217 @@
 """Models for simulation of quantum circuit.
 
-This module introduces the QuantumCircuit class. The qutip library is used to calculate the unitary matrix of a circuit.
+This module introduces the QuantumCircuit class.
+The unitary matrix of a circuit is compiled with NumPy, and shared by all circuits with the same gates (see `compile_unitary`).
+The qutip library is only needed to convert a circuit with `Circuit.to_qutip`, and by the gate functions (e.g. `x_gate`)
+returning qutip operators; the `*_matrix` functions (e.g. `x_matrix`) return the gates as NumPy arrays.
+qutip and qutip-qip are optional dependencies, installed with `pip install sequence[qutip]`.
 """
 
+from functools import lru_cache
+from importlib import import_module
+from types import ModuleType
 from math import e, pi, sqrt
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
-from qutip_qip.circuit import QubitCircuit
-from qutip_qip.operations import gate_sequence_product
-from qutip import Qobj
+
+if TYPE_CHECKING:
+    from qutip import Qobj
+    from qutip_qip.circuit import QubitCircuit
 
 GATE_INFO_TYPE = list[str | list[int] | float]
 
 
+def x_matrix():
+    return np.array([[0, 1],
+                     [1, 0]], dtype=complex)
+
+
+def y_matrix():
+    return np.array([[0, -1.j],
+                     [1.j, 0]], dtype=complex)
+
+
+def z_matrix():
+    return np.array([[1, 0],
+                     [0, -1]], dtype=complex)
+
+
+def h_matrix():
+    return 1/sqrt(2)*np.array([[1, 1],
+                               [1, -1]], dtype=complex)
+
+
+def s_matrix():
+    return np.array([[1.,   0],
+                     [0., 1.j]], dtype=complex)
+
+def sdg_matrix():
+    return np.array([[1.,   0],
+                     [0., -1.j]], dtype=complex)
+
+def t_matrix():
+    return np.array([[1.,   0],
+                     [0., e ** (1.j * (pi / 4))]], dtype=complex)
+
+def root_iZ_matrix():
+    return 1/sqrt(2)*np.array([[1.+1.j,   0],
+                               [0, 1.-1.j]], dtype=complex)
+
+def minus_root_iZ_matrix():
+    return 1/sqrt(2)*np.array([[1.-1.j,   0],
+                               [0, 1.+1.j]], dtype=complex)
+
+def root_iY_matrix():
+    return 1/sqrt(2)*np.array([[1.,   1.],
+                               [-1., 1.]], dtype=complex)
+
+def minus_root_iY_matrix():
+    return 1/sqrt(2)*np.array([[1.,   -1.],
+                               [1., 1.]], dtype=complex)
+
+def phase_matrix(theta: float):
+    return np.array([[1., 0],
+                     [0, e ** (1.j * theta)]], dtype=complex)
+
+
+def controlled_matrix(matrix: np.ndarray, num_controls: int = 1):
+    """Function to build the matrix of a gate controlled by the first qubits.
+
+    Args:
+        matrix (np.ndarray): matrix of the target qubit(s).
+        num_controls (int): number of control qubits (default 1).
+
+    Returns:
+        np.ndarray: matrix of the controlled gate, acting on the control qubits followed by the target qubit(s).
+    """
+    dim = len(matrix) * 2 ** num_controls
+    mat = np.identity(dim, dtype=complex)
+    mat[dim - len(matrix):, dim - len(matrix):] = matrix
+    return mat
+
+
+def swap_matrix():
+    return np.array([[1, 0, 0, 0],
+                     [0, 0, 1, 0],
+                     [0, 1, 0, 0],
+                     [0, 0, 0, 1]], dtype=complex)
+
+
+def import_qutip(name: str = "qutip") -> ModuleType:
+    """Function to import a module of the optional qutip dependencies.
+
+    Args:
+        name (str): name of the module (e.g. `qutip` or `qutip_qip.circuit`).
+
+    Returns:
+        ModuleType: the imported module.
+
+    Raises:
+        ImportError: if qutip or qutip-qip is not installed.
+    """
+
+    try:
+        return import_module(name)
+    except ImportError as err:
+        raise ImportError(f"Cannot import '{name}'; the qutip dependencies are optional, "
+                          f"install them with `pip install sequence[qutip]`.") from err
+
+
+# single-qubit gates as qutip operators (requires the `qutip` package), also the user gates of `Circuit.to_qutip`
+def _qobj(matrix: np.ndarray) -> "Qobj":
+    return import_qutip().Qobj(matrix, dims=[[2], [2]])
+
+
 def x_gate():
-    mat = np.array([[0, 1],
-                    [1, 0]])
-    return Qobj(mat, dims=[[2], [2]])
+    return _qobj(x_matrix())
 
 
 def y_gate():
-    mat = np.array([[0, -1.j],
-                    [1.j, 0]])
-    return Qobj(mat, dims=[[2], [2]])
+    return _qobj(y_matrix())
 
 
 def z_gate():
-    mat = np.array([[1, 0],
-                    [0, -1]])
-    return Qobj(mat, dims=[[2], [2]])
+    return _qobj(z_matrix())
 
 
 def s_gate():
-    mat = np.array([[1.,   0],
-                    [0., 1.j]])
-    return Qobj(mat, dims=[[2], [2]])
+    return _qobj(s_matrix())
 
 def sdg_gate():
-    mat = np.array([[1.,   0],
-                    [0., -1.j]])
-    return Qobj(mat, dims=[[2], [2]])
+    return _qobj(sdg_matrix())
 
 def t_gate():
-    mat = np.array([[1.,   0],
-                    [0., e ** (1.j * (pi / 4))]])
-    return Qobj(mat, dims=[[2], [2]])
+    return _qobj(t_matrix())
 
 def root_iZ_gate():
-    mat = 1/sqrt(2)*np.array([[1.+1.j,   0],
-                              [0, 1.-1.j]])
-    return Qobj(mat, dims=[[2], [2]])
+    return _qobj(root_iZ_matrix())
 
 def minus_root_iZ_gate():
-    mat = 1/sqrt(2)*np.array([[1.-1.j,   0],
-                              [0, 1.+1.j]])
-    return Qobj(mat, dims=[[2], [2]])
+    return _qobj(minus_root_iZ_matrix())
 
 def root_iY_gate():
-    mat = 1/sqrt(2)*np.array([[1.,   1.],
-                              [-1., 1.]])
-    return Qobj(mat, dims=[[2], [2]])
+    return _qobj(root_iY_matrix())
 
 def minus_root_iY_gate():
-    mat = 1/sqrt(2)*np.array([[1.,   -1.],
-                              [1., 1.]])
-    return Qobj(mat, dims=[[2], [2]])
+    return _qobj(minus_root_iY_matrix())
+
+
+# matrices of the gates of `Circuit` (without argument), acting on the gate indices in order
+GATE_MATRICES = {
+    'h': h_matrix(),
+    'x': x_matrix(),
+    'y': y_matrix(),
+    'z': z_matrix(),
+    'cx': controlled_matrix(x_matrix()),
+    'cz': controlled_matrix(z_matrix()),
+    'ccx': controlled_matrix(x_matrix(), 2),
+    'swap': swap_matrix(),
+    't': t_matrix(),
+    's': s_matrix(),
+    'sdg': sdg_matrix(),
+    'root_iZ': root_iZ_matrix(),
+    'minus_root_iZ': minus_root_iZ_matrix(),
+    'root_iY': root_iY_matrix(),
+    'minus_root_iY': minus_root_iY_matrix(),
+}
+for _mat in GATE_MATRICES.values():
+    _mat.flags.writeable = False
+
+
+@lru_cache(maxsize=1000)
+def compile_unitary(size: int, gates: tuple[tuple[str, tuple[int, ...], float | None], ...]) -> np.ndarray:
+    """Function to compute the unitary matrix of a sequence of gates.
+
+    Each gate is contracted with the axes of its qubits of the unitary (reshaped as a tensor),
+    so that no gate is padded to the size of the circuit.
+    Results are cached for the whole process; the returned matrix is read-only.
+
+    Args:
+        size (int): number of qubits of the circuit.
+        gates (tuple): gates `(name, indices, arg)` of the circuit, in order.
+
+    Returns:
+        np.ndarray: the unitary matrix of the circuit.
+    """
+    dim = 2 ** size
+    # axes 0 to size - 1 are the output qubits, the last axis indexes the input state
+    unitary = np.identity(dim, dtype=complex).reshape((2,) * size + (dim,))
+    for name, indices, arg in gates:
+        if name == 'phase':
+            matrix = phase_matrix(arg)
+        elif name in GATE_MATRICES:
+            matrix = GATE_MATRICES[name]
+        else:
+            raise NotImplementedError
+        num_qubits = len(indices)
+        tensor = matrix.reshape((2,) * (2 * num_qubits))
+        unitary = np.tensordot(tensor, unitary, axes=(list(range(num_qubits, 2 * num_qubits)), list(indices)))
+        unitary = np.moveaxis(unitary, list(range(num_qubits)), list(indices))
+
+    unitary = np.ascontiguousarray(unitary.reshape((dim, dim)))
+    unitary.flags.writeable = False
+    return unitary
 
 
 def validator(func):
@@ -105,66 +251,76 @@ class Circuit:
     def get_unitary_matrix(self) -> np.ndarray:
         """Method to get unitary matrix of circuit without measurement.
 
+        Circuits with the same size and gates share the same (read-only) matrix.
+
         Returns:
             np.ndarray: the matrix for the circuit operations.
         """
 
         if self._cache is None:
-            if len(self.gates) == 0:
-                self._cache = np.identity(2 ** self.size)
-                return self._cache
-
-            qc = QubitCircuit(self.size)
-            qc.user_gates = {"X": x_gate,
-                             "Y": y_gate,
-                             "Z": z_gate,
-                             "S": s_gate,
-                             "Sdg": sdg_gate,
-                             "T": t_gate,
-                             "ROOTiZ": root_iZ_gate,
-                             "MINUSROOTiZ": minus_root_iZ_gate,
-                             "ROOTiY": root_iY_gate,
-                             "MINUSROOTiY": minus_root_iY_gate}
-            for gate in self.gates:
-                name, indices, arg = gate
-                if name == 'h':
-                    qc.add_gate('SNOT', indices[0])
-                elif name == 'x':
-                    qc.add_gate('X', indices[0])
-                elif name == 'y':
-                    qc.add_gate('Y', indices[0])
-                elif name == 'z':
-                    qc.add_gate('Z', indices[0])
-                elif name == 'cx':
-                    qc.add_gate('CNOT', controls=indices[0], targets=indices[1])
-                elif name == 'cz':
-                    qc.add_gate('CZ', controls=indices[0], targets=indices[1])
-                elif name == 'ccx':
-                    qc.add_gate('TOFFOLI', controls=indices[:2], targets=indices[2])
-                elif name == 'swap':
-                    qc.add_gate('SWAP', indices)
-                elif name == 't':
-                    qc.add_gate('T', indices[0])
-                elif name == 's':
-                    qc.add_gate('S', indices[0])
-                elif name == 'sdg':
-                    qc.add_gate('Sdg', indices[0])
-                elif name == 'root_iZ':
-                    qc.add_gate('ROOTiZ', indices[0])
-                elif name == 'minus_root_iZ':
-                    qc.add_gate('MINUSROOTiZ', indices[0])
-                elif name == 'root_iY':
-                    qc.add_gate('ROOTiY', indices[0])
-                elif name == 'minus_root_iY':
-                    qc.add_gate('MINUSROOTiY', indices[0])
-                elif name == 'phase':
-                    qc.add_gate('PHASEGATE', indices[0], arg_value=arg)
-                else:
-                    raise NotImplementedError
-            self._cache = gate_sequence_product(qc.propagators()).full()
+            gates = tuple((name, tuple(indices), arg) for name, indices, arg in self.gates)
+            self._cache = compile_unitary(self.size, gates)
 
         return self._cache
 
+    def to_qutip(self) -> "QubitCircuit":
+        """Method to convert the circuit (without measurement) to a qutip circuit.
+
+        Requires the `qutip` and `qutip-qip` packages.
+
+        Returns:
+            QubitCircuit: the equivalent qutip circuit.
+        """
+
+        qc = import_qutip("qutip_qip.circuit").QubitCircuit(self.size)
+        qc.user_gates = {"X": x_gate,
+                         "Y": y_gate,
+                         "Z": z_gate,
+                         "S": s_gate,
+                         "Sdg": sdg_gate,
+                         "T": t_gate,
+                         "ROOTiZ": root_iZ_gate,
+                         "MINUSROOTiZ": minus_root_iZ_gate,
+                         "ROOTiY": root_iY_gate,
+                         "MINUSROOTiY": minus_root_iY_gate}
+        for gate in self.gates:
+            name, indices, arg = gate
+            if name == 'h':
+                qc.add_gate('SNOT', indices[0])
+            elif name == 'x':
+                qc.add_gate('X', indices[0])
+            elif name == 'y':
+                qc.add_gate('Y', indices[0])
+            elif name == 'z':
+                qc.add_gate('Z', indices[0])
+            elif name == 'cx':
+                qc.add_gate('CNOT', controls=indices[0], targets=indices[1])
+            elif name == 'cz':
+                qc.add_gate('CZ', controls=indices[0], targets=indices[1])
+            elif name == 'ccx':
+                qc.add_gate('TOFFOLI', controls=indices[:2], targets=indices[2])
+            elif name == 'swap':
+                qc.add_gate('SWAP', indices)
+            elif name == 't':
+                qc.add_gate('T', indices[0])
+            elif name == 's':
+                qc.add_gate('S', indices[0])
+            elif name == 'sdg':
+                qc.add_gate('Sdg', indices[0])
+            elif name == 'root_iZ':
+                qc.add_gate('ROOTiZ', indices[0])
+            elif name == 'minus_root_iZ':
+                qc.add_gate('MINUSROOTiZ', indices[0])
+            elif name == 'root_iY':
+                qc.add_gate('ROOTiY', indices[0])
+            elif name == 'minus_root_iY':
+                qc.add_gate('MINUSROOTiY', indices[0])
+            elif name == 'phase':
+                qc.add_gate('PHASEGATE', indices[0], arg_value=arg)
+            else:
+                raise NotImplementedError
+        return qc
+
     def serialize(self) -> dict:
         gates = [{"name": g_name, "indices": indices, "arg": arg}
                  for g_name, indices, arg in self.gates]
@@ -11,24 +11,23 @@ from typing import TYPE_CHECKING, Any
 from numpy import eye, kron, exp, sqrt
 from scipy.linalg import fractional_matrix_power
 from math import factorial
-import gmpy2
 
 if TYPE_CHECKING:
     from ..kernel.timeline import Timeline
+    from .photon_train import PhotonTrain
 
 from .photon import Photon
 from .beam_splitter import BeamSplitter, PolarizingBeamSplitter
 from .switch import Switch
 from .interferometer import Interferometer
 from .circuit import Circuit
+from .noise_process import PoissonProcess
 from ..kernel.entity import Entity
 from ..kernel.event import Event
 from ..kernel.process import Process
 from ..utils.encoding import time_bin, fock
 from ..utils import log
-
-gmpy2.get_context().precision = 80  # 80 bits ~ 24 decimal digits ~ sufficient for 10,000 years of ps timing 
-from gmpy2 import mpfr, rint, ceil
+from ..utils.exact_time import round_to_resolution, period_ceil
 
 
 class Detector(Entity):
@@ -46,6 +45,7 @@ class Detector(Entity):
         time_resolution (int): minimum resolving power of photon arrival time (in ps).
         next_detection_time (int): time of next possible detection event.
         photon_counter (int): counts number of detection events.
+        dark_count_process (PoissonProcess): process of dark count arrivals.
     """
 
     _meas_circuit = Circuit(1)
@@ -59,6 +59,7 @@ class Detector(Entity):
         self.time_resolution = time_resolution  # measured in ps
         self.next_detection_time = -1
         self.photon_counter = 0
+        self.dark_count_process = PoissonProcess(self, "record_detection", dark_count)
 
     def init(self):
         """Implementation of Entity interface (see base class)."""
@@ -66,6 +67,8 @@ class Detector(Entity):
         self.photon_counter = 0
         if self.dark_count > 0:
             self.add_dark_count()
+        else:
+            self.dark_count_process.stop()
 
     def get(self, photon=None, **kwargs) -> None:
         """Method to receive a photon for measurement.
@@ -86,33 +89,43 @@ class Detector(Entity):
             # if we measure |0>, return (do not record detection)
             if not res[key]:
                 return
+        elif photon is not None:
+            photon.release()
 
-        if self.get_generator().random() < self.efficiency:
+        if self.get_stream().uniform() < self.efficiency:
             self.record_detection()
         else:
             log.logger.debug(f'Photon loss in detector {self.name}')
 
+    def get_train(self, train: "PhotonTrain", **kwargs) -> None:
+        """Method to receive a train of photons for measurement.
+
+        Efficiency is applied to all photons at once,
+        and a `record_detection` event is scheduled at the arrival time of each detected photon.
+
+        Args:
+            train (PhotonTrain): photons to detect.
+        """
+
+        self.photon_counter += len(train)
+        detected = train.times[self.get_generator().random(len(train)) < self.efficiency]
+        for time in detected.tolist():
+            process = Process(self, "record_detection", [])
+            self.timeline.schedule(Event(time, process))
+
     def add_dark_count(self) -> None:
-        """Method to schedule false positive detection events.
+        """Method to (re)start false positive detection events at the `dark_count` rate.
 
-        Events are scheduled as a Poisson process.
+        Events are scheduled as a Poisson process (see `PoissonProcess`),
+        with one `record_detection` event scheduled at a time.
 
         Side Effects:
-            May schedule future `get` method calls.
-            May schedule future calls to self.
+            May schedule future `record_detection` method calls.
         """
 
         assert self.dark_count > 0, "Detector().add_dark_count called with 0 dark count rate"
-        time_to_next = int(self.get_generator().exponential(
-                1 / self.dark_count) * 1e12)  # time to next dark count
-        time = time_to_next + self.timeline.now()  # time of next dark count
-
-        process1 = Process(self, "add_dark_count", [])  # schedule photon detection and dark count add in future
-        process2 = Process(self, "record_detection", [])
-        event1 = Event(time, process1)
-        event2 = Event(time, process2)
-        self.timeline.schedule(event1)
-        self.timeline.schedule(event2)
+        self.dark_count_process.rate = self.dark_count
+        self.dark_count_process.start()
 
     def record_detection(self):
         """Method to record a detection event.
@@ -124,10 +137,10 @@ class Detector(Entity):
         now = self.timeline.now()
 
         if now > self.next_detection_time:
-            index = rint(mpfr(now) / mpfr(self.time_resolution))
-            time = int(index) * self.time_resolution
+            index = round_to_resolution(now, self.time_resolution)
+            time = index * self.time_resolution
             self.notify({'time': time})
-            period = int(ceil(mpfr("1e12") / mpfr(self.count_rate))) # period in ps
+            period = period_ceil(self.count_rate)  # period in ps
             self.next_detection_time = now + period
 
     def notify(self, info: dict[str, Any]):
@@ -245,6 +258,11 @@ class QSDetectorPolarization(QSDetector):
 
         self.splitter.get(photon)
 
+    def get_train(self, train: "PhotonTrain", **kwargs) -> None:
+        """Method to receive a train of photons for measurement (see `BeamSplitter.get_train`)."""
+
+        self.splitter.get_train(train)
+
     def get_photon_times(self):
         times = self.trigger_times
         self.trigger_times = [[], []]
@@ -392,6 +410,7 @@ class QSDetectorFockDirect(QSDetector):
             result = self.timeline.quantum_manager.measure([key], self.povms[2:4], samp)
         else:
             raise Exception(f"too many input ports for QSDFockDirect {self.name}")
+        photon.release()
 
         assert result in list(range(len(self.povms))), "The measurement outcome is not valid."
         if result == 1:
@@ -537,6 +556,8 @@ class QSDetectorFockInterference(QSDetector):
             # determine the outcome
             samp = self.get_generator().random()  # random measurement sample
             result = self.timeline.quantum_manager.measure([key0, key1], self.povms, samp)
+            photon0.release()
+            photon1.release()
 
             assert result in list(range(len(self.povms))), "The measurement outcome is not valid."
             if result == 0:
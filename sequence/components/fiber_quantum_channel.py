@@ -9,7 +9,8 @@ This code is written from the paper's equations/sections (Jones matrices, birefr
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, astuple, replace
+from functools import lru_cache
 from typing import TYPE_CHECKING, Optional, Tuple
 import numpy as np
 
@@ -19,10 +20,12 @@ from ..constants import SPEED_OF_LIGHT_M_PER_S, SPEED_OF_LIGHT, PLANCK_CONSTANT
 from sequence.kernel.process import Process
 from sequence.kernel.event import Event
 from ..components.photon import Photon
+from ..components.noise_process import PoissonProcess
 
 if TYPE_CHECKING:
     from ..topology.node import Node
     from ..kernel.timeline import Timeline
+    from ..components.photon_train import PhotonTrain
 
 PI = np.pi
 
@@ -468,6 +471,38 @@ def delta_beta_twist(spec: FiberSpec, nco: float, const: MaterialConstants) -> f
 
 
 
+@lru_cache(maxsize=4096)
+def _fiber_optics(spec_values: tuple, const: MaterialConstants) -> tuple[float, float, float, float]:
+    spec = FiberSpec(*spec_values)
+    wavelength_m = spec.wavelength_m
+    nco = GlassMixture(spec.core_m_germania).n(wavelength_m, spec.temperature_C)
+    ncl = GlassMixture(spec.clad_m_germania).n(wavelength_m, spec.temperature_C)
+
+    d_beta_lin = (
+        delta_beta_core_ellipticity(spec, nco, ncl)
+        + delta_beta_asym_thermal(spec, nco, ncl, const)
+        + delta_beta_bending(spec, nco, const)
+    )
+    d_beta_circ = delta_beta_twist(spec, nco, const)
+    beta = beta_fundamental_approx(spec.core_radius_m, wavelength_m, nco, ncl)
+    neff = beta / (2.0 * PI / wavelength_m)
+    return beta, neff, d_beta_lin, d_beta_circ
+
+
+def fiber_optics(spec: FiberSpec, wavelength_m: float, const: MaterialConstants = DEFAULT_CONST) \
+        -> tuple[float, float, float, float]:
+    """
+    Propagation constants of a fiber at a wavelength (Eqs. 2, 6, 8-11).
+
+    Results are cached by the values of the spec fields, so that specs that are changed
+    (or sections sharing the same spec) are evaluated once per wavelength.
+
+    Returns:
+        (beta, n_eff, delta_beta_linear, delta_beta_circular) of the fundamental mode
+    """
+    return _fiber_optics(astuple(replace(spec, wavelength_m=wavelength_m)), const)
+
+
 # -----------------------------
 # Channel implementation
 # -----------------------------
@@ -528,15 +563,33 @@ class fiberQuantumChannel(QuantumChannel):
         self.raman_noise_rate_Hz: float = 0.0
         self.noise_enabled: bool = False
         self.raman_const: RamanScatteringConstants = DEFAULT_RAMAN
+        self.noise_process = PoissonProcess(self, "_receive_noise_photon", 0.0)
 
 
         self.cd_delays_ps = []  # Track all CD delays
         self.wavelengths_nm = []  # Track all wavelengths
         self.track_delays = False  # Enable/disable tracking
 
+        # link model is only recomputed when the sections change (see init)
+        self._link_key: Optional[tuple] = None
+        self._jones_ops: dict = {}
+        self._base_delay_ps: int = 0
+        self._cd_ps_per_nm: float = 0.0
+        self._lambda_ref_nm: float = 0.0
+
     def init(self) -> None:
         super().init()
-        self._compute_link_model()
+        link_key = (tuple((section.length_m, astuple(section.spec)) for section in self.sections), self.const)
+        if link_key != self._link_key:
+            self._compute_link_model()
+            self._link_key = link_key
+
+        # per-photon constants
+        J = self.J_total
+        self._jones_ops = {2: J, "signal": np.kron(J, np.eye(2)), "idler": np.kron(np.eye(2), J)}
+        self._base_delay_ps = int(round(self.base_group_delay_s * 1e12))
+        self._cd_ps_per_nm = self.DCD_ps_per_nm_km * (self.distance / 1000.0)
+        self._lambda_ref_nm = self.sections[0].spec.wavelength_m * 1e9
 
         if self._is_classical_coexist_enabled():
             self.raman_noise_rate_FS_Hz, self.raman_noise_rate_BS_Hz = self._compute_raman_noise_rate()
@@ -600,17 +653,8 @@ class fiberQuantumChannel(QuantumChannel):
             s = section.spec
             L = section.length_m
             
-            # Calculate refractive indices
-            nco = GlassMixture(s.core_m_germania).n(s.wavelength_m, s.temperature_C)
-            ncl = GlassMixture(s.clad_m_germania).n(s.wavelength_m, s.temperature_C)
-            
             # Birefringence for this section
-            d_beta_lin = (
-                delta_beta_core_ellipticity(s, nco, ncl)
-                + delta_beta_asym_thermal(s, nco, ncl, self.const)
-                + delta_beta_bending(s, nco, self.const)
-            )
-            d_beta_circ = delta_beta_twist(s, nco, self.const)
+            _, _, d_beta_lin, d_beta_circ = fiber_optics(s, s.wavelength_m, self.const)
             
             # Build Jones matrix for this section
             J_section = self._build_link_jones(
@@ -669,16 +713,10 @@ class fiberQuantumChannel(QuantumChannel):
             lam = s.wavelength_m
             dlam = s.d_lambda_m
             
-            # Calculate n_eff at three wavelengths for this section
-            def calc_neff(wavelength):
-                nco = GlassMixture(s.core_m_germania).n(wavelength, s.temperature_C)
-                ncl = GlassMixture(s.clad_m_germania).n(wavelength, s.temperature_C)
-                beta = beta_fundamental_approx(s.core_radius_m, wavelength, nco, ncl)
-                return beta / (2.0 * PI / wavelength)
-            
-            neff_minus = calc_neff(lam - dlam)
-            neff_center = calc_neff(lam)
-            neff_plus = calc_neff(lam + dlam)
+            # n_eff at three wavelengths for this section
+            neff_minus = fiber_optics(s, lam - dlam, self.const)[1]
+            neff_center = fiber_optics(s, lam, self.const)[1]
+            neff_plus = fiber_optics(s, lam + dlam, self.const)[1]
             
             # Group index for this section
             dn_dlam = (neff_plus - neff_minus) / (2.0 * dlam)
@@ -704,12 +742,10 @@ class fiberQuantumChannel(QuantumChannel):
         if self.DCD_ps_per_nm_km == 0.0 or not hasattr(qubit, "wavelength"):
             return 0.0
         lambda_q_nm = float(qubit.wavelength)
-        lambda_ref_nm = self.sections[0].spec.wavelength_m * 1e9
-        dlam_nm = lambda_q_nm - lambda_ref_nm
-        L_km = self.distance / 1000.0
-        
-        # This now correctly uses the effective DCD from all sections
-        delay_ps = self.DCD_ps_per_nm_km * L_km * dlam_nm
+        dlam_nm = lambda_q_nm - self._lambda_ref_nm
+
+        # This now correctly uses the effective DCD from all sections (DCD x L, computed in init)
+        delay_ps = self._cd_ps_per_nm * dlam_nm
 
         if self.track_delays:
             self.cd_delays_ps.append(delay_ps)
@@ -722,15 +758,9 @@ class fiberQuantumChannel(QuantumChannel):
         lam_center = s.wavelength_m
         dlam = s.d_lambda_m
         
-        def calc_neff(wavelength):
-            nco = GlassMixture(s.core_m_germania).n(wavelength, s.temperature_C)
-            ncl = GlassMixture(s.clad_m_germania).n(wavelength, s.temperature_C)
-            beta = beta_fundamental_approx(s.core_radius_m, wavelength, nco, ncl)
-            return beta / (2.0 * PI / wavelength)
-        
-        neff_A = calc_neff(lam_center - dlam)
-        neff_B = calc_neff(lam_center)
-        neff_C = calc_neff(lam_center + dlam)
+        neff_A = fiber_optics(s, lam_center - dlam, self.const)[1]
+        neff_B = fiber_optics(s, lam_center, self.const)[1]
+        neff_C = fiber_optics(s, lam_center + dlam, self.const)[1]
         
         d2neff_dlam2 = (neff_C - 2.0 * neff_B + neff_A) / (dlam ** 2)
         
@@ -760,9 +790,7 @@ class fiberQuantumChannel(QuantumChannel):
         length_thermal = length_m * (1.0 + alpha_core * (s.temperature_C - s.reference_temp_C))
         
         # Calculate average propagation constant beta at center wavelength
-        nco = GlassMixture(s.core_m_germania).n(s.wavelength_m, s.temperature_C)
-        ncl = GlassMixture(s.clad_m_germania).n(s.wavelength_m, s.temperature_C)
-        beta_avg = beta_fundamental_approx(s.core_radius_m, s.wavelength_m, nco, ncl)
+        beta_avg = fiber_optics(s, s.wavelength_m, self.const)[0]
 
         # Build Jones matrices with THERMAL length 
         J_lin = jones_linear(delta_beta_linear, length_thermal, beta_avg)
@@ -820,30 +848,9 @@ class fiberQuantumChannel(QuantumChannel):
             s = section.spec
             L = section.length_m
             
-            # Create temporary spec with different wavelength
-            spec_temp = FiberSpec(
-                core_radius_m=s.core_radius_m,
-                cladding_radius_m=s.cladding_radius_m,
-                core_m_germania=s.core_m_germania,
-                clad_m_germania=s.clad_m_germania,
-                wavelength_m=wavelength_m,
-                temperature_C=s.temperature_C,
-                reference_temp_C=s.reference_temp_C,
-                core_ellipticity=s.core_ellipticity,
-                bend_radius_m=s.bend_radius_m,
-                axial_tension_N=s.axial_tension_N,
-                twist_rate_rad_per_m=s.twist_rate_rad_per_m,
-            )
-            
-            nco = GlassMixture(spec_temp.core_m_germania).n(wavelength_m, spec_temp.temperature_C)
-            ncl = GlassMixture(spec_temp.clad_m_germania).n(wavelength_m, spec_temp.temperature_C)
-            
-            d_beta_lin = (
-                delta_beta_core_ellipticity(spec_temp, nco, ncl)
-                + delta_beta_asym_thermal(spec_temp, nco, ncl, self.const)
-                + delta_beta_bending(spec_temp, nco, self.const)
-            )
-            d_beta_circ = delta_beta_twist(spec_temp, nco, self.const)
+            # Spec with different wavelength
+            spec_temp = replace(s, wavelength_m=wavelength_m)
+            _, _, d_beta_lin, d_beta_circ = fiber_optics(spec_temp, wavelength_m, self.const)
             
             J_section = self._build_link_jones(L, d_beta_lin, d_beta_circ, spec_temp)
             J_composite = J_section @ J_composite
@@ -860,26 +867,16 @@ class fiberQuantumChannel(QuantumChannel):
             and self.sender.get_generator().random() > self.loss
             and self.J_total is not None
         ):
-            self._apply_jones(qubit, self.J_total)
+            state = self._apply_jones(qubit, np.asarray(qubit.quantum_state.state, dtype=complex))
 
             extra_delay = 0.0
-            pmd_delay = self._sample_pmd_delay_picoseconds(qubit)
+            pmd_delay = self._sample_pmd_delay_picoseconds(qubit, state)
             cd_delay = self._chromatic_delay_picoseconds(qubit)
 
             extra_delay += pmd_delay
             extra_delay += cd_delay
-            
-            """if hasattr(qubit, 'wavelength') and self.timeline.now() < 1e8:  # Only first ~100 photons
-                print(f"[{self.name}] Photon: λ={qubit.wavelength:.3f} nm, "
-                    f"PMD={pmd_delay*1e12:.1f} ps, "
-                    f"CD={cd_delay*1e12:.1f} ps, "
-                    f"Total extra={extra_s*1e12:.1f} ps")"""
-
-            if not extra_delay:
-                print("extra delay is : ", extra_delay)
-            
-            base_ps = int(round(self.base_group_delay_s * 1e12))
-            future_time = self.timeline.now() + base_ps + extra_delay
+
+            future_time = self.timeline.now() + self._base_delay_ps + extra_delay
             future_time = max(self.timeline.now(), future_time)
 
             process = Process(self.receiver, "receive_qubit", [source.name, qubit])
@@ -887,30 +884,53 @@ class fiberQuantumChannel(QuantumChannel):
             
             return
 
-    def _apply_jones(self, qubit: "Photon", J: np.ndarray) -> None:
-        """Apply Jones matrix to qubit state """
-        state = np.array(qubit.quantum_state.state, dtype=complex)
+    def transmit_train(self, train: "PhotonTrain", source: "Node") -> None:
+        """
+        Apply loss, Jones transform, PMD + CD delays to a whole photon train (vectorized `transmit`).
+        Arrival times are rounded to the nearest ps.
+        """
+        if train.encoding_type["name"] != "polarization" or self.J_total is None:
+            return
+
+        rng = self.sender.get_generator()
+        train = train.apply_loss(self.loss, rng)
+        train.apply_jones(self._jones_ops[2])
+
+        extra_delay = np.zeros(len(train))
+        if self.tau_dgd_s > 0.0:
+            p_h = np.abs(train.states[:, 0]) ** 2
+            extra_delay += np.where(rng.random(len(train)) < p_h, -0.5, 0.5) * self.tau_dgd_s * 1e12
+        if self.DCD_ps_per_nm_km != 0.0:
+            cd_delay = self._cd_ps_per_nm * (train.wavelengths - self._lambda_ref_nm)
+            extra_delay += cd_delay
+            if self.track_delays:
+                self.cd_delays_ps.extend(cd_delay.tolist())
+                self.wavelengths_nm.extend(train.wavelengths.tolist())
+
+        train.add_delay(np.maximum(np.rint(self._base_delay_ps + extra_delay), 0).astype(np.int64))
+        self._schedule_train(train, source)
 
+    def _apply_jones(self, qubit: "Photon", state: np.ndarray) -> np.ndarray:
+        """Apply Jones matrix (2x2, or 4x4 for the signal/idler photon of a pair) to qubit state.
+        Returns the new state."""
         if state.size == 2:
-            qubit.set_state(tuple(J @ state))
-            return
+            op = self._jones_ops[2]
+        elif state.size == 4:
+            op = self._jones_ops.get(qubit.name)
+            if op is None:
+                return state
+        else:
+            return state
 
-        if state.size == 4:
-            if qubit.name == "signal":
-                op = np.kron(J, np.eye(2))
-            elif qubit.name == "idler":
-                op = np.kron(np.eye(2), J)
-            else:
-                return
-            qubit.set_state(tuple(op @ state))
-    
+        state = op @ state
+        qubit.set_state(tuple(state))
+        return state
 
-    def _sample_pmd_delay_picoseconds(self, qubit: "Photon") -> float:
+    def _sample_pmd_delay_picoseconds(self, qubit: "Photon", state: np.ndarray) -> float:
         """Sample PMD delay: ±tau _DGD/2 based on H-polarization probability """
         if self.tau_dgd_s <= 0.0:
             return 0.0
 
-        state = np.array(qubit.quantum_state.state, dtype=complex)
         if state.size == 2:
             pH = float(abs(state[0])**2)
         elif state.size == 4:
@@ -1002,10 +1022,11 @@ class fiberQuantumChannel(QuantumChannel):
 
     def _schedule_next_noise_photon(self) -> None:
         """
-        Schedule the next Raman noise photon arrival.
+        Start the Raman noise photon arrivals.
 
-        Uses Poisson process: inter-arrival times follow exponential distribution.
-        Creates an actual noise photon and transmits it through the channel.
+        Uses Poisson process: inter-arrival times follow exponential distribution,
+        sampled in blocks with the generator of the sender (see `PoissonProcess`).
+        At each arrival, the `receive_noise_photon` method of the receiver is scheduled (see `_receive_noise_photon`).
         """
         if (
             not self.noise_enabled
@@ -1013,27 +1034,19 @@ class fiberQuantumChannel(QuantumChannel):
             or self.sender is None 
         ):
             return
-        # Sample inter-arrival time from exponential distribution
-        rate = self.raman_noise_rate_Hz  # [photons/s]
-        u = self.sender.get_generator().random()
-        wait_time_s = -np.log(max(u, 1e-10)) / rate
-        wait_time_ps = int(round(wait_time_s * 1e12))
+        self.noise_process.rate = self.raman_noise_rate_Hz  # [photons/s]
+        self.noise_process.source = self.sender
+        self.noise_process.start()
 
-        # Schedule creation and transmission of noise photon
-        generation_time = self.timeline.now() + wait_time_ps
-
-        # Create process to generate and send noise photon
-        process = Process(self, "_generate_and_transmit_noise_photon", [])
-        event = Event(generation_time, process)
-        self.timeline.schedule(event)
-
-    def _generate_and_transmit_noise_photon(self) -> None:
+    def _receive_noise_photon(self) -> None:
         """
-        Generate and record a Raman noise photon detection.
+        Record a Raman noise photon detection.
         
         Instead of creating and transmitting a full photon object, this method
-        directly triggers a detection event at the receiver. This is computationally
+        schedules a detection event at the receiver. This is computationally
         efficient and physically accurate for unpolarized Raman noise.
+        The event is scheduled after the propagation delay of the channel, as for transmitted photons,
+        so that receivers on other (parallel) timelines are reached within the lookahead.
         
         Physical model:
         - Raman scattering produces unpolarized light
@@ -1041,16 +1054,9 @@ class fiberQuantumChannel(QuantumChannel):
         - Photons still experience fiber loss (accounted for in noise rate calculation)
         """
         
-        # Schedule noise detection at receiver
-        arrival_time = self.timeline.now()
-        
-        # Call receiver's noise handling method
+        # Schedule receiver's noise handling method
         process = Process(self.receiver, "receive_noise_photon", [])
-        self.timeline.schedule(Event(arrival_time, process))
-        
-        # Schedule next noise photon (maintain Poisson process)
-        self._schedule_next_noise_photon()
-        
+        self.timeline.schedule(Event(self.timeline.now() + self._base_delay_ps, process))
 
     def get_noise_info(self) -> dict:
         """
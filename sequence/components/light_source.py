@@ -4,15 +4,16 @@ This module defines the LightSource class to supply individual photons and the S
 These classes should be connected to one or two entities, respectively, that are capable of receiving photons.
 """
 
+import numpy as np
 from numpy import multiply, sqrt, zeros, kron, outer
 
 from .photon import Photon
+from .photon_train import PhotonTrain
 from ..kernel.entity import Entity
 from ..kernel.event import Event
 from ..kernel.process import Process
 from ..utils.encoding import polarization, fock
 from ..utils import log
-import numpy as np
 
 
 class LightSource(Entity):
@@ -30,10 +31,11 @@ class LightSource(Entity):
         encoding_type (dict[str, Any]): encoding scheme of emitted photons (as defined in the encoding module).
         phase_error (float): phase error applied to qubits.
         photon_counter (int): counter for number of photons emitted.
+        photon_train (bool): if True, `emit` sends the photons as one `PhotonTrain` (see `emit_train`).
     """
 
     def __init__(self, name, timeline, frequency=8e7, wavelength=1550, bandwidth=0, mean_photon_num=0.1,
-                 encoding_type=polarization, phase_error=0):
+                 encoding_type=polarization, phase_error=0, photon_train=False):
         """Constructor for the LightSource class.
 
         Arguments:
@@ -45,6 +47,7 @@ class LightSource(Entity):
             mean_photon_num (float): mean number of photons emitted each period (default 0.1).
             encoding_type (dict): encoding scheme of emitted photons (as defined in the encoding module) (default polarization).
             phase_error (float): phase error applied to qubits (default 0).
+            photon_train (bool): if True, `emit` sends the photons as one `PhotonTrain` (default False).
         """
 
         Entity.__init__(self, name, timeline)
@@ -55,6 +58,7 @@ class LightSource(Entity):
         self.encoding_type = encoding_type
         self.phase_error = phase_error
         self.photon_counter = 0
+        self.photon_train = photon_train
 
     def init(self):
         """Implementation of Entity interface (see base class)."""
@@ -72,6 +76,10 @@ class LightSource(Entity):
             state_list (list[list[complex]]): list of complex coefficient arrays to send as photon-encoded qubits.
         """
 
+        if self.photon_train:
+            self.emit_train(state_list)
+            return
+
         log.logger.info(f"{self.name} emitting {len(state_list)} photons")
 
         time = self.timeline.now()
@@ -97,6 +105,42 @@ class LightSource(Entity):
 
             time += period
 
+    def emit_train(self, state_list) -> None:
+        """Method to emit photons as one photon train.
+
+        The numbers of photons, phase errors and wavelengths of all periods are sampled at once,
+        and the resulting `PhotonTrain` is passed to the `get_train` method of the receiver.
+        If the receiver has no `get_train` method, the photons are materialized and received one by one (as in `emit`).
+
+        Arguments:
+            state_list (list[list[complex]]): list of complex coefficient arrays to send as photon-encoded qubits.
+        """
+
+        log.logger.info(f"{self.name} emitting {len(state_list)} photons as a train")
+
+        rng = self.get_generator()
+        period = int(round(1e12 / self.frequency))
+        num_photons = rng.poisson(self.mean_photon_num, len(state_list))
+        states = np.array(state_list, dtype=complex).reshape(-1, 2)
+        if self.phase_error > 0:
+            states[rng.random(len(state_list)) < self.phase_error, 1] *= -1
+
+        pulses = np.repeat(np.arange(len(state_list)), num_photons)
+        wavelengths = self.linewidth * rng.standard_normal(len(pulses)) + self.wavelength
+        times = self.timeline.now() + pulses * period
+        train = PhotonTrain(self.timeline, states[pulses], wavelengths, times, pulses,
+                            encoding_type=self.encoding_type, location=self.owner)
+        self.photon_counter += len(train)
+
+        receiver = self._receivers[0]
+        if hasattr(receiver, "get_train"):
+            process = Process(receiver, "get_train", [train])
+            self.timeline.schedule(Event(self.timeline.now(), process))
+        else:
+            for photon, time in zip(train.to_photons(), train.times.tolist()):
+                process = Process(receiver, "get", [photon])
+                self.timeline.schedule(Event(time, process))
+
 
 class SPDCBellSource(LightSource):
     """
@@ -234,14 +278,14 @@ class SPDCBellSource(LightSource):
                     continue
                 lambda_idler = 1.0 / inv_idler
                 
-                new_photon0 = Photon("signal", self.timeline,
-                                     wavelength=lambda_signal,
-                                     location=self,
-                                     encoding_type=self.encoding_type)
-                new_photon1 = Photon("idler", self.timeline,
-                                     wavelength=lambda_idler,
-                                     location=self,
-                                     encoding_type=self.encoding_type)
+                new_photon0 = Photon.unchecked("signal", self.timeline,
+                                               wavelength=lambda_signal,
+                                               location=self,
+                                               encoding_type=self.encoding_type)
+                new_photon1 = Photon.unchecked("idler", self.timeline,
+                                               wavelength=lambda_idler,
+                                               location=self,
+                                               encoding_type=self.encoding_type)
 
                 new_photon0.combine_state(new_photon1)
                 new_photon0.set_state(self.bell_state)
@@ -347,16 +391,16 @@ class SPDCSource(LightSource):
             # The two generated photons should be entangled and should have keys pointing to same Fock state.
             for _ in state_list:
                 # generate two new photons
-                new_photon0 = Photon("", self.timeline,
-                                     wavelength=self.wavelengths[0],
-                                     location=self,
-                                     encoding_type=self.encoding_type,
-                                     use_qm=True)
-                new_photon1 = Photon("", self.timeline,
-                                     wavelength=self.wavelengths[1],
-                                     location=self,
-                                     encoding_type=self.encoding_type,
-                                     use_qm=True)
+                new_photon0 = Photon.unchecked("", self.timeline,
+                                               wavelength=self.wavelengths[0],
+                                               location=self,
+                                               encoding_type=self.encoding_type,
+                                               use_qm=True)
+                new_photon1 = Photon.unchecked("", self.timeline,
+                                               wavelength=self.wavelengths[1],
+                                               location=self,
+                                               encoding_type=self.encoding_type,
+                                               use_qm=True)
 
                 # set shared state to squeezed state
                 state = self._generate_tmsv_state()
@@ -372,16 +416,16 @@ class SPDCSource(LightSource):
                 num_photon_pairs = self.get_generator().poisson(self.mean_photon_num)
 
                 for _ in range(num_photon_pairs):
-                    new_photon0 = Photon("", self.timeline,
-                                         wavelength=self.wavelengths[0],
-                                         location=self,
-                                         encoding_type=self.encoding_type,
-                                         use_qm=True)
-                    new_photon1 = Photon("", self.timeline,
-                                         wavelength=self.wavelengths[1],
-                                         location=self,
-                                         encoding_type=self.encoding_type,
-                                         use_qm=True)
+                    new_photon0 = Photon.unchecked("", self.timeline,
+                                                   wavelength=self.wavelengths[0],
+                                                   location=self,
+                                                   encoding_type=self.encoding_type,
+                                                   use_qm=True)
+                    new_photon1 = Photon.unchecked("", self.timeline,
+                                                   wavelength=self.wavelengths[1],
+                                                   location=self,
+                                                   encoding_type=self.encoding_type,
+                                                   use_qm=True)
 
                     new_photon0.combine_state(new_photon1)
                     new_photon0.set_state((complex(0), complex(0), complex(0), complex(1)))
@@ -390,16 +434,16 @@ class SPDCSource(LightSource):
 
                 if num_photon_pairs == 0:
                     # send two null photons for purposes of entanglement
-                    new_photon0 = Photon("", self.timeline,
-                                         wavelength=self.wavelengths[0],
-                                         location=self,
-                                         encoding_type=self.encoding_type,
-                                         use_qm=True)
-                    new_photon1 = Photon("", self.timeline,
-                                         wavelength=self.wavelengths[1],
-                                         location=self,
-                                         encoding_type=self.encoding_type,
-                                         use_qm=True)
+                    new_photon0 = Photon.unchecked("", self.timeline,
+                                                   wavelength=self.wavelengths[0],
+                                                   location=self,
+                                                   encoding_type=self.encoding_type,
+                                                   use_qm=True)
+                    new_photon1 = Photon.unchecked("", self.timeline,
+                                                   wavelength=self.wavelengths[1],
+                                                   location=self,
+                                                   encoding_type=self.encoding_type,
+                                                   use_qm=True)
 
                     new_photon0.is_null = True
                     new_photon1.is_null = True
@@ -418,14 +462,14 @@ class SPDCSource(LightSource):
                     state = multiply([1, -1], state)
 
                 for _ in range(num_photon_pairs):
-                    new_photon0 = Photon("", self.timeline,
-                                         wavelength=self.wavelengths[0],
-                                         location=self,
-                                         encoding_type=self.encoding_type)
-                    new_photon1 = Photon("", self.timeline,
-                                         wavelength=self.wavelengths[1],
-                                         location=self,
-                                         encoding_type=self.encoding_type)
+                    new_photon0 = Photon.unchecked("", self.timeline,
+                                                   wavelength=self.wavelengths[0],
+                                                   location=self,
+                                                   encoding_type=self.encoding_type)
+                    new_photon1 = Photon.unchecked("", self.timeline,
+                                                   wavelength=self.wavelengths[1],
+                                                   location=self,
+                                                   encoding_type=self.encoding_type)
 
                     new_photon0.combine_state(new_photon1)
                     new_photon0.set_state((state[0], complex(0), complex(0), state[1]))
@@ -9,10 +9,9 @@ from copy import copy
 from math import inf
 from typing import Any, TYPE_CHECKING
 from collections.abc import Callable
-from numpy import exp, array
 from scipy import stats
 
-from ..kernel.quantum_manager import QuantumManager
+from ..kernel.quantum_manager import QuantumManager, QuantumManagerBellDiagonal
 
 if TYPE_CHECKING:
     from ..entanglement_management.entanglement_protocol import EntanglementProtocol
@@ -135,27 +134,6 @@ class MemoryArray(Entity):
         return self.memories[index]
 
 
-# define helper functions for analytical BDS decoherence implementation, reference see recurrence protocol paper
-def _p_id(x_rate, y_rate, z_rate, t):
-    val = (1 + exp(-2*(x_rate+y_rate)*t) + exp(-2*(x_rate+z_rate)*t) + exp(-2*(z_rate+y_rate)*t)) / 4
-    return val
-
-
-def _p_xerr(x_rate, y_rate, z_rate, t):
-    val = (1 - exp(-2*(x_rate+y_rate)*t) - exp(-2*(x_rate+z_rate)*t) + exp(-2*(z_rate+y_rate)*t)) / 4
-    return val
-
-
-def _p_yerr(x_rate, y_rate, z_rate, t):
-    val = (1 - exp(-2*(x_rate+y_rate)*t) + exp(-2*(x_rate+z_rate)*t) - exp(-2*(z_rate+y_rate)*t)) / 4
-    return val
-
-
-def _p_zerr(x_rate, y_rate, z_rate, t):
-    val = (1 + exp(-2*(x_rate+y_rate)*t) - exp(-2*(x_rate+z_rate)*t) - exp(-2*(z_rate+y_rate)*t)) / 4
-    return val
-
-
 class Memory(Entity):
     """Individual single-atom memory.
 
@@ -182,7 +160,8 @@ class Memory(Entity):
         generation_time (float): time when the EPR is first generated (float or int depends on timeing unit)
             (default -1 before generation or not used). Used only for logging
         last_update_time (float): last time when the EPR pair is updated (usually when decoherence channel applied),
-            used to determine decoherence channel (default -1 before generation or not used)
+            used to determine decoherence channel (default -1 before generation or not used).
+            Stored by the quantum manager with the Bell diagonal formalism.
         is_in_application (bool): whether the quantum memory is involved in application after successful distribution of EPR pair
     """
 
@@ -214,18 +193,21 @@ class Memory(Entity):
         self.frequency = frequency
         self.efficiency = efficiency
         self.coherence_time = coherence_time  # coherence time in seconds
-        self.decoherence_rate = 1 / self.coherence_time if self.coherence_time > 0 else 0 # rate of decoherence to implement time dependent decoherence
+        self._decoherence_rate = 1 / self.coherence_time if self.coherence_time > 0 else 0 # rate of decoherence to implement time dependent decoherence
+        self._decoherence_errors = None
         self.wavelength = wavelength
         self.qstate_key = timeline.quantum_manager.new()
         self.memory_array = None
 
-        self.decoherence_errors = decoherence_errors
-        if self.decoherence_errors is not None:
-                assert len(self.decoherence_errors) == 3 and abs(sum(self.decoherence_errors) - 1) < EPSILON, \
+        if decoherence_errors is not None:
+                assert len(decoherence_errors) == 3 and abs(sum(decoherence_errors) - 1) < EPSILON, \
                 "Decoherence errors refer to probabilities for each Pauli error to happen if an error happens, thus should be normalized."
+        # with the Bell diagonal formalism, decoherence rates and update times are kept by the quantum manager
+        self.decoherence_errors = decoherence_errors
         self.cutoff_ratio = cutoff_ratio
         assert 0 < self.cutoff_ratio <= 1, "Ratio of cutoff time and coherence time should be between 0 and 1"
         self.generation_time = -1
+        self._last_update_time = -1  # used without the Bell diagonal formalism
         self.last_update_time = -1
         self.is_in_application = False
 
@@ -275,11 +257,11 @@ class Memory(Entity):
 
         # create photon
         if protocol == "bk":
-            photon = Photon("", self.timeline, wavelength=self.wavelength, location=self.name, encoding_type=self.encoding,
-                            quantum_state=self.qstate_key, use_qm=True)
+            photon = Photon.unchecked("", self.timeline, wavelength=self.wavelength, location=self.name, encoding_type=self.encoding,
+                                      quantum_state=self.qstate_key, use_qm=True)
         elif protocol == "sh":
-            photon = Photon("", self.timeline, wavelength=self.wavelength, location=self.name, encoding_type=self.encoding_sh, 
-                            quantum_state=self.qstate_key, use_qm=True)
+            photon = Photon.unchecked("", self.timeline, wavelength=self.wavelength, location=self.name, encoding_type=self.encoding_sh, 
+                                      quantum_state=self.qstate_key, use_qm=True)
             # keep track of memory initialization time
             self.generation_time = self.timeline.now()
             self.last_update_time = self.timeline.now()
@@ -372,39 +354,59 @@ class Memory(Entity):
             Will modify BDS diagonal elements and last_update_time.
         """
 
-        if self.decoherence_errors is None:
-            # if not considering time-dependent decoherence then do nothing
-            pass
+        if self.decoherence_errors is None or self._bds_manager is None:
+            # if not considering time-dependent decoherence (or not using the Bell diagonal formalism) then do nothing
+            return
 
+        # the time-dependent Pauli channel is applied (and last_update_time updated) by the quantum manager
+        # note that the last_update_time of entangled memory is not updated,
+        # because decoherence has not been applied there
+        self._bds_manager.decohere([self.qstate_key], self.timeline.now())
+
+    @property
+    def _bds_manager(self) -> QuantumManagerBellDiagonal | None:
+        quantum_manager = self.timeline.quantum_manager
+        if isinstance(quantum_manager, QuantumManagerBellDiagonal):
+            return quantum_manager
+        return None
+
+    @property
+    def decoherence_rate(self) -> float:
+        return self._decoherence_rate
+
+    @decoherence_rate.setter
+    def decoherence_rate(self, rate: float) -> None:
+        self._decoherence_rate = rate
+        self._update_decoherence_rates()
+
+    @property
+    def decoherence_errors(self) -> list[float] | None:
+        return self._decoherence_errors
+
+    @decoherence_errors.setter
+    def decoherence_errors(self, errors: list[float] | None) -> None:
+        self._decoherence_errors = errors
+        self._update_decoherence_rates()
+
+    def _update_decoherence_rates(self) -> None:
+        # keep the Pauli decoherence rates stored by the Bell diagonal quantum manager up to date
+        bds_manager = self._bds_manager
+        if bds_manager is not None and self._decoherence_errors is not None:
+            rates = [self._decoherence_rate * error for error in self._decoherence_errors]
+            bds_manager.set_decoherence_rates(self.qstate_key, rates)
+
+    @property
+    def last_update_time(self) -> int:
+        if self._bds_manager is not None:
+            return self._bds_manager.get_last_update(self.qstate_key)
+        return self._last_update_time
+
+    @last_update_time.setter
+    def last_update_time(self, time: int) -> None:
+        if self._bds_manager is not None:
+            self._bds_manager.set_last_update(self.qstate_key, time)
         else:
-            time = (self.timeline.now() - self.last_update_time) * 1e-12  # duration of memory idling (in s)
-            if time > 0 and self.last_update_time > 0:  # time > 0 means time has progressed, self.last_update_time > 0 means the memory has not been reset
-
-                x_rate, y_rate, z_rate = self.decoherence_rate * self.decoherence_errors[0], \
-                                        self.decoherence_rate * self.decoherence_errors[1], \
-                                        self.decoherence_rate * self.decoherence_errors[2]
-                p_I, p_X, p_Y, p_Z = _p_id(x_rate, y_rate, z_rate, time), \
-                                    _p_xerr(x_rate, y_rate, z_rate, time), \
-                                    _p_yerr(x_rate, y_rate, z_rate, time), \
-                                    _p_zerr(x_rate, y_rate, z_rate, time)
-
-                state_now = self.timeline.quantum_manager.states[self.qstate_key].state  # current diagonal elements
-                transform_mtx = array([[p_I, p_Z, p_X, p_Y],
-                                       [p_Z, p_I, p_Y, p_X],
-                                       [p_X, p_Y, p_I, p_Z],
-                                       [p_Y, p_X, p_Z, p_I]])  # transform matrix for diagonal elements
-                state_new = transform_mtx @ state_now  # new diagonal elements after decoherence transformation
-            
-                log.logger.debug(f'{self.name}: before f={state_now[0]:.6f}, after f={state_new[0]:.6f}')
-                
-                # update the quantum state stored in quantum manager for self and entangled memory
-                keys = self.timeline.quantum_manager.states[self.qstate_key].keys
-                self.timeline.quantum_manager.set(keys, state_new)
-
-                # update the last_update_time of self
-                # note that the attr of entangled memory should not be updated right now,
-                # because decoherence has not been applied there
-                self.last_update_time = self.timeline.now()
+            self._last_update_time = time
 
     def _schedule_expiration(self) -> None:
         if self.expiration_event is not None:
@@ -453,9 +455,7 @@ class Memory(Entity):
         Will automatically call the `bds_decohere` method.
         """
         self.bds_decohere()
-        state_obj = self.timeline.quantum_manager.get(self.qstate_key)
-        state = state_obj.state
-        return state
+        return self.timeline.quantum_manager.get(self.qstate_key).state
 
     def get_bds_fidelity(self) -> float:
         """Will get the fidelity from the BDS state
@@ -463,9 +463,7 @@ class Memory(Entity):
         Return:
             (float): the fidelity of the BDS state
         """
-        state_obj = self.timeline.quantum_manager.get(self.qstate_key)
-        state = state_obj.state
-        return state[0]
+        return float(self.timeline.quantum_manager.diagonal(self.qstate_key)[0])
 
 
 class AbsorptiveMemory(Entity):
@@ -637,6 +635,7 @@ class AbsorptiveMemory(Entity):
         absorb_time = now - self.absorb_start_time
         index = int(absorb_time / self.mode_bin)
         if index < 0 or index >= self.mode_number:
+            photon.release()
             return
 
         # require resonant absorption of photons
@@ -668,6 +667,11 @@ class AbsorptiveMemory(Entity):
             else:
                 self.stored_photons[index]["number"] += 1
                 self.stored_photons[index]["overlap"] = True
+                photon.release()
+
+        # photons that are not absorbed are lost
+        else:
+            photon.release()
 
         # determine absorb_start_time
         if self.photon_counter == 1:
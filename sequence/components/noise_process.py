@@ -0,0 +1,97 @@
+"""Model for noise processes.
+
+This module defines the PoissonProcess class, generating the arrival times of noise events
+(such as detector dark counts or Raman noise photons) as a Poisson process.
+Arrival times are sampled in vectorized blocks, and only the next arrival is scheduled on the timeline.
+"""
+
+from typing import Any, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..kernel.entity import Entity
+
+from ..kernel.event import Event
+from ..kernel.process import Process
+from ..constants import SECOND
+
+
+class PoissonProcess:
+    """Class for a Poisson process of noise events.
+
+    Exponential inter-arrival times (truncated to ps) are sampled `block_size` at a time
+    with the generator of `source` (by default the owner), so that results are reproducible with the seed of the node.
+    A single event is scheduled at a time: at each arrival, the next arrival is scheduled
+    and the `activation` method of the owner is called.
+
+    Attributes:
+        owner (Entity): entity called at each arrival.
+        activation (str): name of the method of the owner called at each arrival (without arguments).
+        rate (float): average number of arrivals per second.
+        source (Any): object providing the random generator (with a `get_generator` method).
+        block_size (int): number of inter-arrival times sampled at once.
+        next_event (Event): event of the next arrival (None if the process is stopped).
+    """
+
+    BLOCK_SIZE = 1024
+
+    def __init__(self, owner: "Entity", activation: str, rate: float, source: Any = None, block_size: int = BLOCK_SIZE):
+        """Constructor for the Poisson process class.
+
+        Args:
+            owner (Entity): entity called at each arrival.
+            activation (str): name of the method of the owner called at each arrival.
+            rate (float): average number of arrivals per second.
+            source (Any): object providing the random generator (default None, i.e. the owner).
+            block_size (int): number of inter-arrival times sampled at once (default 1024).
+        """
+
+        assert block_size > 0
+        self.owner = owner
+        self.activation = activation
+        self.rate = rate
+        self.source = owner if source is None else source
+        self.block_size = block_size
+        self.next_event: Event | None = None
+        self._times: list[int] = []
+        self._index = 0
+
+    def start(self) -> None:
+        """Method to (re)start the process from the current time.
+
+        Samples already drawn are discarded, and the pending arrival (if any) is removed from the timeline.
+        Nothing is scheduled if `rate` is not positive.
+        """
+
+        self.stop()
+        self._times = [self.owner.timeline.now()]
+        self._index = 1
+        if self.rate > 0:
+            self._schedule_next()
+
+    def stop(self) -> None:
+        """Method to remove the pending arrival from the timeline."""
+
+        if self.next_event is not None:
+            self.owner.timeline.remove_event(self.next_event)
+            self.next_event = None
+
+    def _next_time(self) -> int:
+        if self._index == len(self._times):
+            gaps = self.source.get_generator().exponential(SECOND / self.rate, self.block_size).astype(np.int64)
+            times = np.cumsum(gaps)
+            times += self._times[-1]
+            self._times = times.tolist()
+            self._index = 0
+        time = self._times[self._index]
+        self._index += 1
+        return time
+
+    def _schedule_next(self) -> None:
+        self.next_event = Event(self._next_time(), Process(self, "_arrive", []))
+        self.owner.timeline.schedule(self.next_event)
+
+    def _arrive(self) -> None:
+        self._schedule_next()
+        getattr(self.owner, self.activation)()
@@ -6,24 +6,21 @@ OpticalChannels must be attached to nodes on both ends.
 """
 
 import heapq as hq
-import gmpy2
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..kernel.timeline import Timeline
     from ..topology.node import Node
     from ..components.photon import Photon
+    from ..components.photon_train import PhotonTrain
     from ..message import Message
 
 from ..kernel.entity import Entity
 from ..kernel.event import Event
 from ..kernel.process import Process
-from ..utils import log
-from ..constants import SPEED_OF_LIGHT, MICROSECOND, SECOND, EPSILON
-
-gmpy2.get_context().precision = 80 # 80 bits ~ 24 decimal digits ~ sufficient for 10,000 years of ps timing 
-EPSILON_MPFR = gmpy2.mpfr(EPSILON)
-PS_PER_SECOND = gmpy2.mpz(SECOND)
+from ..utils import log, trace
+from ..utils.exact_time import time_to_timebin, timebin_to_time
+from ..constants import SPEED_OF_LIGHT, MICROSECOND
 
 
 class OpticalChannel(Entity):
@@ -106,7 +103,8 @@ class QuantumChannel(OpticalChannel):
         self.delay: int = -1
         self.loss: float = 1
         self.frequency: float = frequency  # maximum frequency for sending qubits (measured in Hz)
-        self.send_bins: list = []
+        self.send_bins: list = []  # heap of reserved time bins
+        self._send_bin_set: set[int] = set()
 
     def init(self) -> None:
         """Implementation of Entity interface (see base class)."""
@@ -140,8 +138,11 @@ class QuantumChannel(OpticalChannel):
             Receiver node may receive the qubit (via the `receive_qubit` method).
         """
 
-        log.logger.info("{} send qubit with state {} to {} by Channel {}".format(
-                        self.sender.name, qubit.quantum_state, self.receiver, self.name))
+        if log.is_tracked("optical_channel"):
+            log.logger.info("{} send qubit with state {} to {} by Channel {}".format(
+                            self.sender.name, qubit.quantum_state, self.receiver, self.name))
+        if trace.is_traced("optical_channel"):
+            trace.recorder.record(self.name, "transmit_qubit", self.receiver, 1)
 
         assert self.delay >= 0 and self.loss <= 1, f"QuantumChannel init() function has not been run for {self.name}"
         assert source == self.sender
@@ -151,7 +152,8 @@ class QuantumChannel(OpticalChannel):
             time = -1
             while time < self.timeline.now():
                 time_bin = hq.heappop(self.send_bins)
-                time = self.timebin_to_time(time_bin, self.frequency)
+                self._send_bin_set.discard(time_bin)
+                time = timebin_to_time(time_bin, self.frequency)
             assert time == self.timeline.now(), f"qc {self.name} transmit method called at invalid time"
 
         # check if photon state using Fock representation
@@ -167,15 +169,16 @@ class QuantumChannel(OpticalChannel):
             self.timeline.schedule(event)
 
         # if not using Fock representation, check if photon kept
-        elif (self.sender.get_generator().random() > self.loss) or qubit.is_null:
-            if self._receiver_on_other_tl():
+        elif (self.sender.get_stream().uniform() > self.loss) or qubit.is_null:
+            is_sent = qubit.use_qm and self._receiver_on_other_tl()
+            if is_sent:
                 self.timeline.quantum_manager.move_manage_to_server(qubit.quantum_state)
 
             if qubit.is_null:
                 qubit.add_loss(self.loss)
 
             # check if polarization encoding and apply necessary noise
-            if qubit.encoding_type["name"] == "polarization" and self.sender.get_generator().random() > self.polarization_fidelity:
+            if qubit.encoding_type["name"] == "polarization" and self.sender.get_stream().uniform() > self.polarization_fidelity:
                 qubit.random_noise(self.get_generator())
 
             # schedule receiving node to receive photon at future time determined by light speed
@@ -184,15 +187,53 @@ class QuantumChannel(OpticalChannel):
             event = Event(future_time, process)
             self.timeline.schedule(event)
 
+            if is_sent:
+                # the receiving partition owns the state from now on:
+                # detach the local photon so that its deletion does not remove the shared state
+                qubit.timeline = None
+
         # if not using Fock representation, if photon lost, exit
         else:
-            pass
+            qubit.release()
+
+    def transmit_train(self, train: "PhotonTrain", source: "Node") -> None:
+        """Method to transmit a train of photon-encoded qubits.
+
+        Loss and polarization noise are applied to all photons at once, as in `transmit`.
+        The times of the train are its emission times; photons do not use the time bins of `schedule_transmit`.
+
+        Args:
+            train (PhotonTrain): photons to be transmitted.
+            source (Node): source node sending the photons.
+
+        Side Effects:
+            Receiver node may receive the kept photons (via the `receive_train` method),
+            at the arrival time of the first kept photon.
+        """
+
+        if log.is_tracked("optical_channel"):
+            log.logger.info(f"{self.sender.name} send {len(train)} photons to {self.receiver} by Channel {self.name}")
+        if trace.is_traced("optical_channel"):
+            trace.recorder.record(self.name, "transmit_qubit", self.receiver, len(train))
+
+        assert self.delay >= 0 and self.loss <= 1, f"QuantumChannel init() function has not been run for {self.name}"
+        assert source == self.sender
+
+        rng = self.sender.get_generator()
+        train = train.apply_loss(self.loss, rng)
+        if train.encoding_type["name"] == "polarization":
+            train.random_noise(rng.random(len(train)) > self.polarization_fidelity, self.get_generator())
+        train.add_delay(self.delay)
+        self._schedule_train(train, source)
+
+    def _schedule_train(self, train: "PhotonTrain", source: "Node") -> None:
+        if len(train) > 0:
+            process = Process(self.receiver, "receive_train", [source.name, train])
+            self.timeline.schedule(Event(int(train.times.min()), process))
 
     def time_to_timebin(self, time: int, frequency: float) -> int:
         """Convert simulation time to time bin.
-           Use the gmpy2.mpfr for high precision floating points.
-           The precision is set to 200 bits, equivalent to around 54 significant decimal digits.
-           The float in Python is 64 bits,   equivalent to around 16 significant decimal digits.
+           The period of the channel is the exact rational 10^12 / frequency ps (see `utils.exact_time`).
 
         Args:
             time (int): simulation time (picoseconds) to convert.
@@ -200,19 +241,11 @@ class QuantumChannel(OpticalChannel):
         Returns:
             int: time bin corresponding to the given simulation time.
         """
-        time = gmpy2.mpfr(time)
-        frequency = gmpy2.mpfr(frequency)
-        time_bin = time * frequency / PS_PER_SECOND
-        if time_bin - gmpy2.floor(time_bin) > EPSILON_MPFR:
-            time_bin = int(time_bin) + 1       # round to the next time bin
-        else:
-            time_bin = int(time_bin)
-        return time_bin
+        return time_to_timebin(time, frequency)
 
     def timebin_to_time(self, time_bin: int, frequency: float) -> int:
         """Convert time bin to simulation time (picoseconds).
-           Use the gmpy2.mpz  for high precision integers.
-           Use the gmpy2.mpfr for high precision floating points.
+           The period of the channel is the exact rational 10^12 / frequency ps (see `utils.exact_time`).
 
         Args:
             time_bin (int): time bin to convert.
@@ -221,10 +254,7 @@ class QuantumChannel(OpticalChannel):
         Returns:
             int: simulation time (picoseconds) corresponding to the given time bin.
         """
-        time_bin = gmpy2.mpz(time_bin)
-        frequency = gmpy2.mpfr(frequency)
-        time = gmpy2.mpfr(time_bin * PS_PER_SECOND) / frequency
-        return int(time)
+        return timebin_to_time(time_bin, frequency)
 
     def schedule_transmit(self, min_time: int) -> int:
         """Method to schedule a time for photon transmission.
@@ -239,14 +269,15 @@ class QuantumChannel(OpticalChannel):
             int: simulation time for next available transmission window.
         """
         min_time = max(min_time, self.timeline.now())
-        time_bin = self.time_to_timebin(min_time, self.frequency)
+        time_bin = time_to_timebin(min_time, self.frequency)
 
         # find earliest available time bin
-        while time_bin in self.send_bins:
+        while time_bin in self._send_bin_set:
             time_bin += 1
         hq.heappush(self.send_bins, time_bin)
+        self._send_bin_set.add(time_bin)
 
-        time = self.timebin_to_time(time_bin, self.frequency)
+        time = timebin_to_time(time_bin, self.frequency)
         return time
 
     def _receiver_on_other_tl(self) -> bool:
@@ -310,7 +341,10 @@ class ClassicalChannel(OpticalChannel):
             Receiver node may receive the qubit (via the `receive_qubit` method).
         """
 
-        log.logger.info(f"{self.sender.name} send message {message} to {self.receiver} by Channel {self.name}")
+        if log.is_tracked("optical_channel"):
+            log.logger.info(f"{self.sender.name} send message {message} to {self.receiver} by Channel {self.name}")
+        if trace.is_traced("optical_channel"):
+            trace.recorder.record(self.name, "transmit_message", self.receiver, self.delay)
         assert source == self.sender
 
         future_time = round(self.timeline.now() + int(self.delay))
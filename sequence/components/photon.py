@@ -4,7 +4,6 @@ This module defines the Photon class for tracking individual photons.
 Photons may be encoded directly with polarization or time bin schemes, or may herald the encoded state of single atom memories.
 """
 from typing import Any, TYPE_CHECKING
-from numpy import log2
 
 if TYPE_CHECKING:
     from numpy.random._generator import Generator
@@ -28,7 +27,7 @@ class Photon:
         encoding_type (dict[str, Any]): encoding type of photon (as defined in encoding module).
         quantum_state (int | tuple[complex]): quantum state of photon.
             If `use_qm` is false, this will be a QuantumState object.
-            Otherwise, it will be an integer key for the quantum manager.
+            Otherwise, it will be an integer key for the quantum manager (None after `release`).
         is_null (bool): defines whether photon is real or a "ghost" photon (not detectable but used in memory encoding).
                         if True, then it is a "ghost" photon
         loss (float): similarly defined for memory encoding, used to track loss and improve performance.
@@ -38,8 +37,14 @@ class Photon:
     Note: the `loss` attribute is currently specifically used for the `"single_atom"` encoding scheme.
     This encoding scheme also removes the local timeline reference and sets the quantum state to the local key.
     This is to both facilitate parallel execution and improve the performance of overall simulation.
+
+    Photons using the quantum manager keep their state until `release` is called (when they are detected or lost);
+    photons without a timeline reference (e.g. sharing the key of a memory) never remove their state.
     """
 
+    __slots__ = ("name", "timeline", "wavelength", "location", "encoding_type", "is_null", "loss", "use_qm",
+                 "quantum_state")
+
     _entangle_circuit = Circuit(2)
     _measure_circuit = Circuit(1)
     _measure_circuit.measure(0)
@@ -84,16 +89,58 @@ class Photon:
                 quantum_state = (complex(1), complex(0))
             else:
                 assert type(quantum_state) is tuple
-                assert all([abs(a) < 1 + EPSILON for a in quantum_state]), "Illegal value with abs > 1 in photon state"
-                assert abs(sum([abs(a) ** 2 for a in quantum_state]) - 1) < EPSILON, "Squared amplitudes do not sum to 1"
-                num_qubits = log2(len(quantum_state))
-                assert num_qubits == 1, "Length of amplitudes for single photon should be 2"
+                magnitudes = [abs(a) for a in quantum_state]
+                assert all(m < 1 + EPSILON for m in magnitudes), "Illegal value with abs > 1 in photon state"
+                assert abs(sum(m * m for m in magnitudes) - 1) < EPSILON, "Squared amplitudes do not sum to 1"
+                assert len(quantum_state) == 2, "Length of amplitudes for single photon should be 2"
             self.quantum_state = FreeQuantumState()
             self.quantum_state.state = quantum_state
 
-    def __del__(self):
+    @classmethod
+    def unchecked(cls, name: str, timeline: "Timeline", wavelength=0, location=None, encoding_type=polarization,
+                  quantum_state=None, use_qm=False) -> "Photon":
+        """Fast constructor for internal callers, skipping the validation of the arguments.
+
+        Arguments are the same as for the constructor;
+        a local `quantum_state` should be a valid tuple of 2 complex amplitudes.
+
+        Returns:
+            Photon: the new photon.
+        """
+
+        photon = cls.__new__(cls)
+        photon.name = name
+        photon.timeline = timeline
+        photon.wavelength = wavelength
+        photon.location = location
+        photon.encoding_type = encoding_type
+        photon.is_null = False
+        photon.loss = 0
+        photon.use_qm = use_qm
+        if use_qm:
+            photon.quantum_state = timeline.quantum_manager.new() if quantum_state is None else quantum_state
+        else:
+            state = FreeQuantumState()
+            state.state = (complex(1), complex(0)) if quantum_state is None else quantum_state
+            photon.quantum_state = state
+        return photon
+
+    def release(self) -> None:
+        """Method to remove the state of the photon from the quantum manager.
+
+        Called when the photon is detected or lost; the photon should not be used afterwards.
+        Does nothing for photons storing their state locally or without a timeline reference.
+        As removed keys are reused by the quantum manager, the key of the photon is cleared,
+        so that using a released photon fails instead of accessing an unrelated state.
+
+        Side Effects:
+            Will remove the `timeline` reference and the `quantum_state` key of the photon.
+        """
+
         if self.use_qm and self.timeline is not None:
             self.timeline.quantum_manager.remove(self.quantum_state)
+            self.timeline = None
+            self.quantum_state = None
 
     def combine_state(self, photon):
         """Method to combine quantum states of photons (see `QuantumState` module).
@@ -156,6 +203,25 @@ class Photon:
         else:
             return photon.quantum_state.measure(basis, rng)
 
+    @staticmethod
+    def measure_batch(bases, photons: list["Photon"], rng: "Generator"):
+        """Method to measure multiple unentangled photons at once (see `FreeQuantumState.measure_batch`).
+
+        Args:
+            bases (list[list[complex]] | list[list[list[complex]]]): basis with which to measure all photons,
+                or list with the basis of each photon.
+            photons (list[Photon]): list of photons to measure.
+            rng (Generator): PRNG to use for measurement results.
+
+        Returns:
+            np.ndarray: 0/1 value giving result of measurement of each photon.
+        """
+
+        if any(photon.use_qm for photon in photons):
+            raise NotImplementedError("Photon.measure_batch() not implemented for quantum manager.")
+
+        return FreeQuantumState.measure_batch(bases, [photon.quantum_state for photon in photons], rng)
+
     @staticmethod
     def measure_multiple(basis, photons: list["Photon"], rng: "Generator"):
         """Method to measure 2 entangled photons (see `FreeQuantumState` module).
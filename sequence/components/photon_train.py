@@ -0,0 +1,148 @@
+"""Model for trains of photons.
+
+This module defines the PhotonTrain class, storing a batch of unentangled photons as arrays
+(states, wavelengths and times) instead of one Photon object per photon.
+Light sources, quantum channels and detectors with a `*_train` method process a train with vectorized NumPy operations,
+and photons are materialized as Photon objects only when a receiver has no such method.
+"""
+
+from typing import Any, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.random import Generator
+    from ..kernel.entity import Entity
+    from ..kernel.timeline import Timeline
+
+from .photon import Photon
+from ..kernel.quantum_utils import measure_probabilities
+from ..utils.encoding import polarization
+
+
+class PhotonTrain:
+    """Class for a train of single photons, stored as a struct of arrays.
+
+    Photons of a train are not entangled and store their states locally (as Photon with `use_qm=False`).
+
+    Attributes:
+        timeline (Timeline): simulation timeline.
+        encoding_type (dict[str, Any]): encoding type of the photons (as defined in encoding module).
+        states (np.ndarray): states of the photons (complex array of shape (n, 2)).
+        wavelengths (np.ndarray): wavelengths of the photons (in nm).
+        times (np.ndarray): times (in ps) at which the photons reach their current location.
+        indices (np.ndarray): pulse index of each photon, used as the name of materialized photons.
+        location (Entity): current location of the photons.
+    """
+
+    def __init__(self, timeline: "Timeline", states, wavelengths, times, indices=None,
+                 encoding_type=polarization, location=None):
+        """Constructor for the photon train class.
+
+        Args:
+            timeline (Timeline): simulation timeline.
+            states (array_like): states of the photons, of shape (n, 2).
+            wavelengths (array_like): wavelengths of the photons (in nm).
+            times (array_like): times (in ps) of the photons.
+            indices (array_like): pulse index of each photon (default 0, 1, ..., n - 1).
+            encoding_type (dict[str, Any]): encoding type of the photons (default polarization).
+            location (Entity): location of the photons (default None).
+        """
+
+        self.timeline = timeline
+        self.encoding_type: dict[str, Any] = encoding_type
+        self.states: np.ndarray = np.asarray(states, dtype=complex).reshape(-1, 2)
+        self.wavelengths: np.ndarray = np.asarray(wavelengths, dtype=float)
+        self.times: np.ndarray = np.asarray(times, dtype=np.int64)
+        if indices is None:
+            indices = np.arange(len(self.states))
+        self.indices: np.ndarray = np.asarray(indices, dtype=np.int64)
+        self.location = location
+        assert len(self.wavelengths) == len(self.times) == len(self.indices) == len(self.states)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def select(self, mask) -> "PhotonTrain":
+        """Method to get the photons of the train selected by a boolean mask or an array of positions.
+
+        Returns:
+            PhotonTrain: new train with the selected photons (in the same order).
+        """
+
+        return PhotonTrain(self.timeline, self.states[mask], self.wavelengths[mask], self.times[mask],
+                           self.indices[mask], self.encoding_type, self.location)
+
+    def add_delay(self, delay) -> None:
+        """Method to delay the photons.
+
+        Args:
+            delay (int | np.ndarray): delay (in ps) of all photons, or of each photon.
+        """
+
+        self.times = self.times + delay
+
+    def apply_loss(self, loss: float, rng: "Generator") -> "PhotonTrain":
+        """Method to apply a loss channel to the photons.
+
+        Args:
+            loss (float): probability of losing each photon.
+            rng (Generator): PRNG to sample the lost photons.
+
+        Returns:
+            PhotonTrain: new train with the photons kept.
+        """
+
+        return self.select(rng.random(len(self)) > loss)
+
+    def random_noise(self, mask, rng: "Generator") -> None:
+        """Method to add random noise to the states of some photons (see `FreeQuantumState.random_noise`).
+
+        Args:
+            mask (np.ndarray): boolean mask of the photons with noise.
+            rng (Generator): PRNG to sample the random angles.
+        """
+
+        angles = rng.random(np.count_nonzero(mask)) * 2 * np.pi
+        self.states[mask] = np.stack((np.cos(angles), np.sin(angles)), axis=-1)
+
+    def apply_jones(self, jones: np.ndarray) -> None:
+        """Method to apply Jones matrices to the polarization states of the photons.
+
+        Args:
+            jones (np.ndarray): Jones matrix of all photons (shape (2, 2)), or of each photon (shape (n, 2, 2)).
+        """
+
+        if jones.ndim == 2:
+            self.states = self.states @ jones.T
+        else:
+            self.states = np.einsum("nij,nj->ni", jones, self.states)
+
+    def measure(self, bases: np.ndarray, rng: "Generator") -> np.ndarray:
+        """Method to measure the photons (see `FreeQuantumState.measure`).
+
+        The states of the photons are set to the measured basis vectors.
+
+        Args:
+            bases (np.ndarray): basis of each photon (complex array of shape (n, 2, 2), one basis vector per row).
+            rng (Generator): PRNG to sample the measurement results.
+
+        Returns:
+            np.ndarray: 0/1 measurement results.
+        """
+
+        prob_0 = measure_probabilities(self.states, bases[:, 0])
+        results = (rng.random(len(self)) >= prob_0).astype(np.int64)
+        self.states = bases[np.arange(len(self)), results]
+        return results
+
+    def to_photons(self) -> list[Photon]:
+        """Method to materialize the photons of the train.
+
+        Returns:
+            list[Photon]: one photon per element of the train (named by its pulse index).
+        """
+
+        return [Photon.unchecked(str(index), self.timeline, wavelength=wavelength, location=self.location,
+                                 encoding_type=self.encoding_type, quantum_state=(complex(state[0]), complex(state[1])))
+                for index, wavelength, state in zip(self.indices.tolist(), self.wavelengths.tolist(), self.states)]
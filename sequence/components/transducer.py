@@ -6,13 +6,17 @@ See https://arxiv.org/abs/2411.11377, Simulation of Quantum Transduction Strateg
 import random
 import math
 import numpy as np
-from qutip import Qobj
+from typing import TYPE_CHECKING
 from ..kernel.entity import Entity
 from ..kernel.timeline import Timeline
 from ..topology.node import Node
 from ..components.photon import Photon
+from ..components.circuit import import_qutip
 from ..protocol import Protocol
 
+if TYPE_CHECKING:
+    from qutip import Qobj
+
 MICROWAVE_WAVELENGTH = 999308 # nm
 OPTICAL_WAVELENGTH   = 1550   # nm
 
@@ -69,8 +73,10 @@ class Transducer(Entity):
 
 
 
-def get_conversion_matrix(efficiency: float) -> Qobj:
+def get_conversion_matrix(efficiency: float) -> "Qobj":
     """
+    Requires the `qutip` package.
+
     Args:
         efficiency (float): transducer efficiency
     """
@@ -80,7 +86,7 @@ def get_conversion_matrix(efficiency: float) -> Qobj:
         [0, math.sqrt(efficiency), math.sqrt(1 - efficiency), 0],
         [0, 0, 0, 1]
     ])
-    return Qobj(custom_gate_matrix, dims=[[4], [4]])
+    return import_qutip().Qobj(custom_gate_matrix, dims=[[4], [4]])
 
 
 
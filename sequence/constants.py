@@ -34,6 +34,15 @@ KET_STATE_FORMALISM: Final = "ket_vector"
 DENSITY_MATRIX_FORMALISM: Final = "density_matrix"
 FOCK_DENSITY_MATRIX_FORMALISM: Final = "fock_density"
 BELL_DIAGONAL_STATE_FORMALISM: Final = "bell_diagonal"
+STABILIZER_FORMALISM: Final = "stabilizer"
+
+# size of the range of quantum state keys allocated by each partition of a parallel simulation
+PARTITION_KEY_SPACE: Final = 2 ** 40
+
+# Built-In Event Queues
+HEAP_EVENT_QUEUE: Final = "heap"
+KEYED_HEAP_EVENT_QUEUE: Final = "keyed_heap"
+CALENDAR_EVENT_QUEUE: Final = "calendar"
 
 # Built-In Generation Protocols
 BARRET_KOK: Final = 'barret_kok'
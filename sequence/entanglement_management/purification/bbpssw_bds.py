@@ -73,13 +73,10 @@ class BBPSSW_BDS(BBPSSWProtocol):
 
         # first invoke single-memory decoherence channels on each involved quantum memory (in total 4)
         # purification will use the updated BDS as input, and also update the BDS with purification_res
-        # the bds_decohere() method will also update the last_update_time of quantum memories
+        # the decoherence update will also update the last_update_time of quantum memories
         # in this case it will be the time when purification is initiated, thus allowing correct accounting of idling decoherence
-
-        self.meas_memo.bds_decohere()
-        remote_meas_memo.bds_decohere()
-        self.kept_memo.bds_decohere()
-        remote_kept_memo.bds_decohere()
+        # the channels of the 4 memories are applied with a single (vectorized) update of the quantum manager
+        self._decohere([self.meas_memo, remote_meas_memo, self.kept_memo, remote_kept_memo])
 
         # use following trick to determine if the measurement results on both sides equal:
         # We consider that both sides do a biased coin flip,
@@ -136,8 +133,7 @@ class BBPSSW_BDS(BBPSSWProtocol):
                 log.logger.info(f'Purification success, measurement results: {self.meas_res}, {msg.meas_res}')
                 remote_kept_memory_name = self.remote_memories[0]
                 remote_kept_memory: Memory = self.owner.timeline.get_entity_by_name(remote_kept_memory_name)
-                remote_kept_memory.bds_decohere()
-                self.kept_memo.bds_decohere()
+                self._decohere([remote_kept_memory, self.kept_memo])
                 self.kept_memo.fidelity = self.kept_memo.get_bds_fidelity()
                 self.update_resource_manager(self.kept_memo, state="PURIFIED")
             else:
@@ -147,6 +143,12 @@ class BBPSSW_BDS(BBPSSWProtocol):
         else:
             raise Exception(f'{msg.msg_type} unknown')
 
+    def _decohere(self, memories: list[Memory]) -> None:
+        """Method to apply the idling decoherence of memories (see `Memory.bds_decohere`) in a single update."""
+
+        keys = [memo.qstate_key for memo in memories if memo.decoherence_errors is not None]
+        self.owner.timeline.quantum_manager.decohere(keys, self.owner.timeline.now())
+
     def purification_res(self) -> tuple[float, npt.NDArray]:
         """Method to calculate the correct success probability of a purification trial with BDS input.
 
@@ -159,8 +161,8 @@ class BBPSSW_BDS(BBPSSWProtocol):
         assert self.owner.timeline.quantum_manager.get_active_formalism() == BELL_DIAGONAL_STATE_FORMALISM, \
             "Input states should be Bell diagonal states."
 
-        kept_input_state = self.owner.timeline.quantum_manager.get(self.kept_memo.qstate_key)
-        meas_input_state = self.owner.timeline.quantum_manager.get(self.meas_memo.qstate_key)
+        kept_input_state = self.owner.timeline.quantum_manager.diagonal(self.kept_memo.qstate_key)
+        meas_input_state = self.owner.timeline.quantum_manager.diagonal(self.meas_memo.qstate_key)
 
         own_node, remote_node = self.owner, self.owner.timeline.get_entity_by_name(self.remote_node_name)
 
@@ -170,15 +172,15 @@ class BBPSSW_BDS(BBPSSWProtocol):
         remote_node_gate_fid, remote_node_meas_fid = remote_node.gate_fid, remote_node.meas_fid
 
         if self.is_twirled:
-            kept_elem_1, kept_elem_2, kept_elem_3, kept_elem_4 = kept_input_state.state[0], (1 - kept_input_state.state[
-                0]) / 3, (1 - kept_input_state.state[0]) / 3, (1 - kept_input_state.state[
+            kept_elem_1, kept_elem_2, kept_elem_3, kept_elem_4 = kept_input_state[0], (1 - kept_input_state[
+                0]) / 3, (1 - kept_input_state[0]) / 3, (1 - kept_input_state[
                 0]) / 3  # Diagonal elements of kept pair (twirled)
-            meas_elem_1, meas_elem_2, meas_elem_3, meas_elem_4 = meas_input_state.state[0], (1 - meas_input_state.state[
-                0]) / 3, (1 - meas_input_state.state[0]) / 3, (1 - meas_input_state.state[
+            meas_elem_1, meas_elem_2, meas_elem_3, meas_elem_4 = meas_input_state[0], (1 - meas_input_state[
+                0]) / 3, (1 - meas_input_state[0]) / 3, (1 - meas_input_state[
                 0]) / 3  # Diagonal elements of measured pair (twirled)
         else:
-            kept_elem_1, kept_elem_2, kept_elem_3, kept_elem_4 = kept_input_state.state  # Diagonal elements of kept pair
-            meas_elem_1, meas_elem_2, meas_elem_3, meas_elem_4 = meas_input_state.state  # Diagonal elements of measured pair
+            kept_elem_1, kept_elem_2, kept_elem_3, kept_elem_4 = kept_input_state  # Diagonal elements of kept pair
+            meas_elem_1, meas_elem_2, meas_elem_3, meas_elem_4 = meas_input_state  # Diagonal elements of measured pair
 
         # assert 1. >= kept_elem_1 >= 0.5 and 1. >= meas_elem_1 >= 0.5, "Input states should have fidelity above 1/2."
         a, b = (kept_elem_1 + kept_elem_2), (meas_elem_1 + meas_elem_2)
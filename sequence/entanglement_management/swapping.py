@@ -166,6 +166,9 @@ class EntanglementSwappingA(EntanglementProtocol):
 
             expire_time = min(self.left_memo.get_expire_time(), self.right_memo.get_expire_time())
 
+            # idling decoherence of Bell diagonal states (does nothing for other formalisms)
+            self.left_memo.bds_decohere()
+            self.right_memo.bds_decohere()
             meas_samp = self.owner.get_generator().random()
             meas_res = self.owner.timeline.quantum_manager.run_circuit(
                         self.circuit, [self.left_memo.qstate_key, self.right_memo.qstate_key], meas_samp)
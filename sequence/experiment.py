@@ -0,0 +1,268 @@
+"""Parameter sweeps and multi-seed ensembles of simulations.
+
+This module defines the `run_sweep` function, running a simulation for every point of a parameter grid and every seed
+of a seed list in a process pool, and the `aggregate` function, giving the mean and confidence interval of the results
+of each point over the seeds.
+
+The base of the simulations (e.g. a topology) is built once by the parent process and pickled.
+Worker processes unpickle a fresh copy of the base for every run; with the "fork" start method (where available),
+workers inherit the pickled base without copying it.
+Each run (replica) reseeds the random generators of its copy with its seed (see `reseed`).
+Results are written to a newline-delimited JSON file as soon as they are received, and a failing run only records its
+error.
+"""
+
+from collections.abc import Callable, Iterable
+import itertools
+import json
+from math import isnan, nan, sqrt
+from multiprocessing import get_all_start_methods, get_context
+import os
+import pickle
+import random
+import time
+import traceback
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from .app.random_request import RandomRequestApp
+from .app.request_app import RequestApp
+from .constants import SECOND
+from .kernel.quantum_manager import QuantumManager
+from .kernel.timeline import Timeline
+
+
+# state of the worker processes, set by `_init_worker`
+_base: bytes | None = None
+_run: Callable[[Any, dict, int], dict] | None = None
+
+
+def parameter_grid(grid: dict[str, Iterable] | Iterable[dict]) -> list[dict]:
+    """Function to list the points of a parameter grid.
+
+    Args:
+        grid (dict[str, Iterable] | Iterable[dict]): values of each parameter (all combinations are listed),
+            or list of points.
+
+    Returns:
+        list[dict]: points of the grid, as dictionaries of parameter values.
+    """
+
+    if isinstance(grid, dict):
+        names = list(grid)
+        return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    return [dict(point) for point in grid]
+
+
+def reseed(timeline: Timeline, seed: int) -> None:
+    """Function to reseed the random generators of a simulation for a replica.
+
+    The root seed of the random service of the timeline is set to `seed`, and all nodes get the generator of their name.
+    Random request applications of the nodes get the generator of the name `{node name}.app`,
+    and the global `random` and `numpy.random` generators are seeded with `seed`.
+    Random numbers already drawn in blocks (e.g. by noise processes) are kept.
+
+    Args:
+        timeline (Timeline): timeline of the simulation.
+        seed (int): seed of the replica.
+    """
+
+    timeline.random_service.seed(seed)
+    for entity in timeline.entities.values():
+        if hasattr(entity, "set_seed"):
+            entity.set_seed(timeline.random_service.seed_sequence(entity.name))
+            app = getattr(entity, "app", None)
+            if isinstance(app, RandomRequestApp):
+                app.rg = timeline.random_service.generator(f"{entity.name}.app")
+        else:
+            entity._generator = None
+            entity._stream = None
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def app_metrics(timeline: Timeline) -> dict[str, float]:
+    """Function to collect the metrics of the request applications of the nodes of a timeline.
+
+    Returns:
+        dict[str, float]: with keys
+            - "reservations": number of approved reservations of the random request applications;
+            - "throughput": mean throughput (entangled pairs/s) of the completed reservations of the random request
+              applications and of the current reservations of the other request applications;
+            - "wait_time": mean time (s) between the request and the start of the approved reservations;
+            - "memories": number of entangled memories delivered to the applications in their current reservations.
+    """
+
+    reservations = 0
+    throughputs = []
+    wait_times = []
+    memories = 0
+    for entity in timeline.entities.values():
+        app = getattr(entity, "app", None)
+        if isinstance(app, RandomRequestApp):
+            reservations += len(app.reserves)
+            throughputs.extend(app.get_all_throughput())
+            wait_times.extend(app.get_wait_time())
+        elif isinstance(app, RequestApp) and app.reservation_result:
+            throughputs.append(app.get_throughput())
+        if isinstance(app, RequestApp):
+            memories += app.memory_counter
+    return {"reservations": reservations,
+            "throughput": float(np.mean(throughputs)) if throughputs else nan,
+            "wait_time": float(np.mean(wait_times)) / SECOND if wait_times else nan,
+            "memories": memories}
+
+
+def _get_timeline(base: Any) -> Timeline | None:
+    if isinstance(base, Timeline):
+        return base
+    if hasattr(base, "get_timeline"):
+        return base.get_timeline()
+    return None
+
+
+def _init_worker(base: bytes, run: Callable[[Any, dict, int], dict], formalism: str) -> None:
+    global _base, _run
+    _base = base
+    _run = run
+    # the global formalism is not inherited by spawned workers, and is used by some components while running
+    QuantumManager.set_global_manager_formalism(formalism)
+
+
+def _run_point(task: tuple[int, dict, int]) -> dict:
+    """Function running one replica of a point in a worker process."""
+
+    index, params, seed = task
+    row = {"point": index, **params, "seed": seed}
+    tick = time.perf_counter()
+    try:
+        base = pickle.loads(_base)
+        timeline = _get_timeline(base)
+        if timeline is not None:
+            reseed(timeline, seed)
+        row.update(_run(base, params, seed))
+        row["error"] = None
+    except Exception as e:
+        row["error"] = "".join(traceback.format_exception_only(e)).strip()
+    row["wall_time"] = time.perf_counter() - tick
+    return row
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def run_sweep(build: Callable[[], Any], run: Callable[[Any, dict, int], dict],
+              grid: dict[str, Iterable] | Iterable[dict], seeds: Iterable[int], path: str = None,
+              processes: int = None, start_method: str = None) -> pd.DataFrame:
+    """Function to run a simulation for every point of a parameter grid and every seed.
+
+    The base is built once, then every replica calls `run(base, params, seed)` on its own copy of the base,
+    and returns its metrics (e.g. `app_metrics(timeline)`).
+    If the base is a timeline or has a `get_timeline` method (e.g. a topology), its timeline is reseeded
+    with the seed of the replica before `run` is called (see `reseed`).
+
+    Args:
+        build (Callable[[], Any]): function building the base of the simulations (the base must be picklable).
+        run (Callable[[Any, dict, int], dict]): function applying the parameters of a point to a copy of the base,
+            running the simulation and returning its metrics (must be picklable unless started by fork).
+        grid (dict[str, Iterable] | Iterable[dict]): parameter grid (see `parameter_grid`).
+        seeds (Iterable[int]): seeds of the replicas of every point.
+        path (str): path of the newline-delimited JSON file of the results, overwritten (default None).
+        processes (int): number of worker processes (default None, i.e. the number of CPUs).
+            With 1 process, replicas are run in the calling process.
+        start_method (str): start method of the worker processes (default None, i.e. "fork" where available).
+
+    Returns:
+        pd.DataFrame: one row per replica, with columns point (index of the point), the parameters, seed,
+            the metrics, error (None, or the exception of a failed replica) and wall_time (s).
+            Rows are sorted by point and seed.
+    """
+
+    points = parameter_grid(grid)
+    seeds = list(seeds)
+    tasks = [(index, params, seed) for index, params in enumerate(points) for seed in seeds]
+    base = pickle.dumps(build(), pickle.HIGHEST_PROTOCOL)
+    formalism = QuantumManager.get_active_formalism()
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(tasks)) or 1
+    if start_method is None and "fork" in get_all_start_methods():
+        start_method = "fork"
+
+    if processes == 1:
+        pool = None
+        _init_worker(base, run, formalism)
+        results = map(_run_point, tasks)
+    else:
+        pool = get_context(start_method).Pool(processes, _init_worker, (base, run, formalism))
+        results = pool.imap_unordered(_run_point, tasks)
+
+    rows = []
+    output = open(path, "w") if path is not None else None
+    try:
+        for row in results:
+            rows.append(row)
+            if output is not None:
+                # NaN is not valid JSON
+                record = {key: None if isinstance(value, float) and isnan(value) else value
+                          for key, value in row.items()}
+                output.write(json.dumps(record, default=_to_json) + "\n")
+                output.flush()
+    finally:
+        if pool is not None:
+            pool.terminate()
+        else:
+            _init_worker(None, None, formalism)
+        if output is not None:
+            output.close()
+
+    df = pd.DataFrame(rows)
+    return df.sort_values(["point", "seed"], ignore_index=True) if len(df) else df
+
+
+def read_results(path: str) -> pd.DataFrame:
+    """Function to load the results written by `run_sweep` (including those of an interrupted sweep)."""
+
+    return pd.read_json(path, lines=True)
+
+
+def aggregate(results: pd.DataFrame, confidence: float = 0.95) -> pd.DataFrame:
+    """Function to aggregate the replicas of every point of a sweep.
+
+    Args:
+        results (pd.DataFrame): results of `run_sweep`.
+        confidence (float): confidence level of the intervals (default 0.95).
+
+    Returns:
+        pd.DataFrame: one row per point, with its parameters, the number of successful replicas (replicas)
+            and failed replicas (failures), and for every numeric metric `m`, its mean `m_mean`
+            and the half-width `m_ci` of its Student's t confidence interval (NaN with less than 2 replicas).
+    """
+
+    # parameters are the columns between point and seed
+    columns = list(results.columns)
+    params = columns[columns.index("point") + 1:columns.index("seed")]
+    reserved = {"point", "seed", "error", "wall_time", *params}
+    metrics = [column for column in results.select_dtypes("number").columns if column not in reserved]
+
+    rows = []
+    for point, group in results.groupby("point", sort=True):
+        success = group[group["error"].isna()]
+        row = {"point": point, **group.iloc[0][params].to_dict(),
+               "replicas": len(success), "failures": len(group) - len(success)}
+        for metric in metrics:
+            values = success[metric].dropna()
+            row[f"{metric}_mean"] = values.mean() if len(values) else nan
+            if len(values) > 1:
+                t = stats.t.ppf((1 + confidence) / 2, len(values) - 1)
+                row[f"{metric}_ci"] = t * values.std(ddof=1) / sqrt(len(values))
+            else:
+                row[f"{metric}_ci"] = nan
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -1,4 +1,5 @@
-__all__ = ['entity', 'event', 'eventlist', 'process', 'quantum_manager', 'quantum_state', 'quantum_utils', 'timeline']
+__all__ = ['checkpoint', 'entity', 'event', 'eventlist', 'process', 'profiler', 'quantum_manager', 'quantum_state',
+           'quantum_utils', 'random_service', 'timeline']
 
 def __dir__():
     return sorted(__all__)
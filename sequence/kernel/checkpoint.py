@@ -0,0 +1,119 @@
+"""Checkpoint and restore of a simulation.
+
+This module defines the functions saving a timeline to a checkpoint file and restoring it,
+so that a simulation can be continued several times from the same point (e.g. after a common warm-up phase).
+A checkpoint holds the event list of the timeline, its entities and everything reachable from them
+(nodes, protocols, applications, quantum manager and random generators), as well as the global random states
+(`random` and `numpy.random`) and the global quantum manager formalism (used by some components while running).
+A restored simulation executes the same events with the same results as the original one.
+
+Checkpoint files are uncompressed zip archives with:
+    - `checkpoint.pkl`: pickle (protocol 5) of the version, timeline, user data and global states;
+    - `buffer_{index:06d}.bin`: raw data of the NumPy arrays of at least `OUT_OF_BAND_BYTES`,
+      stored out of band instead of being copied into the pickle.
+
+The progress callback of the timeline is not saved (it is None after restoring).
+
+Attributes:
+    CHECKPOINT_VERSION (int): version of the checkpoint format.
+    OUT_OF_BAND_BYTES (int): minimum size (bytes) of the arrays stored out of band.
+"""
+
+import pickle
+import random
+import zipfile
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .timeline import Timeline
+
+from .quantum_manager import QuantumManager
+
+
+CHECKPOINT_VERSION = 1
+OUT_OF_BAND_BYTES = 4096
+
+
+class _CheckpointPickler(pickle.Pickler):
+    """Pickler for checkpoints, storing large buffers out of band and skipping the progress callback."""
+
+    def __init__(self, file, timeline: "Timeline"):
+        self.buffers: list[pickle.PickleBuffer] = []
+        super().__init__(file, 5, buffer_callback=self._buffer_callback)
+        self.timeline = timeline
+
+    def _buffer_callback(self, buffer: pickle.PickleBuffer) -> bool:
+        # returning True serializes the buffer in band
+        if buffer.raw().nbytes < OUT_OF_BAND_BYTES:
+            return True
+        self.buffers.append(buffer)
+        return False
+
+    def persistent_id(self, obj):
+        if obj is self.timeline.progress_callback and obj is not None:
+            return ("progress_callback",)
+        return None
+
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    """Unpickler for checkpoints (see `_CheckpointPickler`)."""
+
+    def persistent_load(self, pid):
+        if pid[0] == "progress_callback":
+            return None
+        raise pickle.UnpicklingError(f"unsupported persistent object {pid}")
+
+
+def save_checkpoint(timeline: "Timeline", path: str, data: Any = None) -> None:
+    """Function to save a timeline and everything reachable from it to a checkpoint file.
+
+    Args:
+        timeline (Timeline): timeline to save (must not be running).
+        path (str): path of the checkpoint file (overwritten).
+        data (Any): other objects to save with the timeline, e.g. a topology or applications (default None).
+    """
+
+    assert not timeline.is_running, "cannot checkpoint a running timeline"
+    global_states = {"random": random.getstate(),
+                     "numpy_random": np.random.get_state(),
+                     "formalism": QuantumManager.get_active_formalism()}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+        with zf.open("checkpoint.pkl", "w", force_zip64=True) as fh:
+            pickler = _CheckpointPickler(fh, timeline)
+            pickler.dump((CHECKPOINT_VERSION, timeline, data, global_states))
+        for index, buffer in enumerate(pickler.buffers):
+            with zf.open(f"buffer_{index:06d}.bin", "w", force_zip64=True) as fh:
+                fh.write(buffer.raw())
+
+
+def load_checkpoint(path: str) -> tuple["Timeline", Any]:
+    """Function to restore a timeline from a checkpoint file.
+
+    The global random states and quantum manager formalism are set to their values at the checkpoint.
+
+    Args:
+        path (str): path of the checkpoint file (written by `save_checkpoint`).
+
+    Returns:
+        tuple[Timeline, Any]: restored timeline, and restored data saved with it.
+    """
+
+    with zipfile.ZipFile(path, "r") as zf:
+        names = sorted(name for name in zf.namelist() if name.startswith("buffer_"))
+        buffers = []
+        for name in names:
+            buffer = bytearray(zf.getinfo(name).file_size)
+            with zf.open(name) as fh:
+                fh.readinto(buffer)
+            buffers.append(buffer)
+        with zf.open("checkpoint.pkl") as fh:
+            version, timeline, data, global_states = _CheckpointUnpickler(fh, buffers=buffers).load()
+
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"unsupported checkpoint version {version} (expected {CHECKPOINT_VERSION})")
+    random.setstate(global_states["random"])
+    np.random.set_state(global_states["numpy_random"])
+    QuantumManager.set_global_manager_formalism(global_states["formalism"])
+    return timeline, data
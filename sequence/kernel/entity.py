@@ -5,9 +5,10 @@ This module defines the Entity class, inherited by all physical simulation eleme
 
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any
-from numpy.random import default_rng
 from numpy.random._generator import Generator
 
+from .random_service import RandomStream
+
 if TYPE_CHECKING:
     from .timeline import Timeline
     from ..components.photon import Photon
@@ -25,6 +26,8 @@ class Entity(ABC):
         owner (Entity | None): another entity that owns or aggregates the current entity.
         _observers (list[Any]): a list of observers for the entity.
         _receivers (list[Entity]): a list of entities that receive photons from current component.
+        _generator (Generator | None): random generator of the entity if not attached to a node.
+        _stream (RandomStream | None): random stream of the entity if not attached to a node.
     """
     def __init__(self, name: str, timeline: "Timeline") -> None:
         """Constructor for entity class.
@@ -33,11 +36,13 @@ class Entity(ABC):
             name (str): name of entity.
             timeline (Timeline): timeline for simulation.
         """
-        self.name: str                  = name
-        self.timeline: Timeline         = timeline
-        self.owner: "Entity" | None     = None
-        self._observers: list[Any]      = []
-        self._receivers: list["Entity"] = []
+        self.name: str                    = name
+        self.timeline: Timeline           = timeline
+        self.owner: "Entity" | None       = None
+        self._observers: list[Any]        = []
+        self._receivers: list["Entity"]   = []
+        self._generator: Generator | None = None
+        self._stream: RandomStream | None = None
         timeline.add_entity(self)
 
     def __str__(self) -> str:
@@ -92,17 +97,34 @@ class Entity(ABC):
     def get_generator(self) -> Generator:
         """Method to get random generator of parent node.
 
-        If entity is not attached to a node, return default generator.
+        If entity is not attached to a node, return the generator of the entity given by the random service of the timeline
+        (created at the first call).
         """
         if hasattr(self.owner, "get_generator"):
             return self.owner.get_generator()
-        else:
-            return default_rng()
+        if self._generator is None:
+            self._generator = self.timeline.random_service.generator(self.name)
+        return self._generator
+
+    def get_stream(self) -> RandomStream:
+        """Method to get buffered random stream of parent node.
+
+        The stream serves random numbers of hot paths (e.g. loss of each photon) from pre-generated blocks.
+        If entity is not attached to a node, return the stream of the entity given by the random service of the timeline
+        (created at the first call).
+        """
+        if hasattr(self.owner, "get_stream"):
+            return self.owner.get_stream()
+        if self._stream is None:
+            self._stream = self.timeline.random_service.stream(self.name)
+        return self._stream
 
     def change_timeline(self, timeline: "Timeline"):
         self.remove_from_timeline()
         self.timeline = timeline
         self.timeline.add_entity(self)
+        self._generator = None
+        self._stream = None
 
 
 class ClassicalEntity(Entity):
@@ -117,6 +139,8 @@ class ClassicalEntity(Entity):
         name (str): name of the entity.
         timeline (Timeline): the simulation timeline for the entity.
         owner (Entity): another entity that owns or aggregates the current entity.
+        _generator (Generator | None): random generator of the entity if not attached to a node.
+        _stream (RandomStream | None): random stream of the entity if not attached to a node.
     """
 
     def __init__(self, name: str, timeline: "Timeline") -> None:
@@ -129,6 +153,8 @@ class ClassicalEntity(Entity):
         self.name: str                       = name
         self.timeline: Timeline              = timeline
         self.owner: "ClassicalEntity" | None = None
+        self._generator: Generator | None    = None
+        self._stream: RandomStream | None    = None
         timeline.add_entity(self)
 
     def __str__(self) -> str:
@@ -153,17 +179,34 @@ class ClassicalEntity(Entity):
     def get_generator(self) -> Generator:
         """Method to get random generator of parent node.
 
-        If entity is not attached to a node, return default generator.
+        If entity is not attached to a node, return the generator of the entity given by the random service of the timeline
+        (created at the first call).
         """
         if hasattr(self.owner, "get_generator"):
             return self.owner.get_generator()
-        else:
-            return default_rng()
+        if self._generator is None:
+            self._generator = self.timeline.random_service.generator(self.name)
+        return self._generator
+
+    def get_stream(self) -> RandomStream:
+        """Method to get buffered random stream of parent node.
+
+        The stream serves random numbers of hot paths (e.g. loss of each photon) from pre-generated blocks.
+        If entity is not attached to a node, return the stream of the entity given by the random service of the timeline
+        (created at the first call).
+        """
+        if hasattr(self.owner, "get_stream"):
+            return self.owner.get_stream()
+        if self._stream is None:
+            self._stream = self.timeline.random_service.stream(self.name)
+        return self._stream
 
     def change_timeline(self, timeline: "Timeline"):
         self.remove_from_timeline()
         self.timeline = timeline
         self.timeline.add_entity(self)
+        self._generator = None
+        self._stream = None
 
     @property
     def _receivers(self):
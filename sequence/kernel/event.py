@@ -22,8 +22,11 @@ class Event:
         process (Process): the process encapsulated in the event.
         priority (int): the priority of the event, lower value denotes a higher priority.
         _is_removed (bool): the flag to denotes if it's a valid event
+        _entry (list): the heap entry holding the event (only used by keyed event lists).
     """
 
+    __slots__ = ('time', 'priority', 'process', '_is_removed', '_entry')
+
     def __init__(self, time: int, process: "Process", priority=inf):
         """Constructor for event class.
         
@@ -37,6 +40,7 @@ class Event:
         self.priority = priority
         self.process = process
         self._is_removed = False
+        self._entry = None
 
     def __eq__(self, another):
         return (self.time == another.time) and (self.priority == another.priority)
@@ -2,6 +2,8 @@
 
 This module defines the EventList class, used by the timeline to order and execute events.
 EventList is implemented as a min heap ordered by simulation time.
+Alternative event queue implementations may be registered with `EventList.register` and selected by name
+through the `event_queue` argument of the Timeline constructor.
 """
 
 from typing import TYPE_CHECKING
@@ -9,7 +11,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .event import Event
 
-from heapq import heappop, heappush
+from heapq import heapify, heappop, heappush, nsmallest
+
+from ..constants import CALENDAR_EVENT_QUEUE, HEAP_EVENT_QUEUE, KEYED_HEAP_EVENT_QUEUE
 
 
 class EventList:
@@ -17,13 +21,47 @@ class EventList:
 
     This class is implemented as a min-heap. The event with the lowest time and priority is placed at the top of heap.
 
+    Class Attributes:
+        _registry (dict[str, type]): mapping of event queue names to event list classes.
+
     Attributes:
         data (list[Event]): heap storing events.
     """
+    _registry: dict[str, type] = {}
 
     def __init__(self):
         self.data: list["Event"] = []
 
+    @classmethod
+    def register(cls, name: str, event_list_class=None):
+        """Register an event list class.
+
+        Args:
+            name (str): the name of the event queue.
+            event_list_class (type, optional): the event list class to register.
+        """
+        if event_list_class is not None:
+            cls._registry[name] = event_list_class
+            return None
+
+        def decorator(event_list_cls):
+            cls._registry[name] = event_list_cls
+            return event_list_cls
+
+        return decorator
+
+    @classmethod
+    def create(cls, name: str = HEAP_EVENT_QUEUE, *args, **kwargs) -> "EventList":
+        """Create a new instance of a registered event list.
+
+        Args:
+            name (str): the name of the event queue (default "heap").
+        """
+        if name not in cls._registry:
+            raise ValueError(f"Event queue '{name}' is not registered.")
+
+        return cls._registry[name](*args, **kwargs)
+
     def __len__(self):
         return len(self.data)
 
@@ -77,3 +115,298 @@ class EventList:
                     self.push(event)
 
                 break
+
+
+EventList.register(HEAP_EVENT_QUEUE, EventList)
+
+
+@EventList.register(KEYED_HEAP_EVENT_QUEUE)
+class KeyedEventList(EventList):
+    """Class of event list ordered by precomputed keys.
+
+    Each event is stored in the heap as an entry `[time, priority, seq, event]`,
+    so that ordering is resolved by tuple comparison instead of `Event.__lt__`.
+    The sequence number `seq` is unique and increasing, thus events with equal time and priority are executed in FIFO order.
+    Every queued event keeps a reference to its entry, so that `remove` and `update_event_time` do not search the heap.
+    Removed entries are left in the heap as tombstones, which are compacted once they exceed a fraction of the heap.
+
+    Attributes:
+        data (list[list]): heap storing event entries.
+        compaction_ratio (float): fraction of tombstones in the heap that triggers a compaction.
+        compaction_min_size (int): minimum heap size before compaction is considered.
+        tombstones (int): number of removed entries still stored in the heap.
+    """
+
+    def __init__(self, compaction_ratio: float = 0.5, compaction_min_size: int = 1024):
+        """Constructor for the keyed event list.
+
+        Args:
+            compaction_ratio (float): fraction of tombstones in the heap that triggers a compaction (default 0.5).
+            compaction_min_size (int): minimum heap size before compaction is considered (default 1024).
+        """
+        super().__init__()
+        self.compaction_ratio = compaction_ratio
+        self.compaction_min_size = compaction_min_size
+        self.tombstones = 0
+        self._size = 0
+        self._counter = 0  # a plain int (not itertools.count) so that event lists can be pickled
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for entry in self.data:
+            if entry[3] is not None:
+                yield entry[3]
+
+    def push(self, event: "Event") -> None:
+        entry = [event.time, event.priority, self._counter, event]
+        self._counter += 1
+        event._entry = entry
+        heappush(self.data, entry)
+        self._size += 1
+
+    def pop(self) -> "Event":
+        data = self.data
+        entry = heappop(data)
+        while entry[3] is None:
+            self.tombstones -= 1
+            entry = heappop(data)
+
+        event = entry[3]
+        event._entry = None
+        self._size -= 1
+        return event
+
+    def top(self) -> "Event":
+        data = self.data
+        while data[0][3] is None:
+            heappop(data)
+            self.tombstones -= 1
+        return data[0][3]
+
+    def isempty(self) -> bool:
+        return self._size == 0
+
+    def remove(self, event: "Event") -> None:
+        """Method to remove events from heap.
+
+        The event is marked invalid and its heap entry becomes a tombstone.
+        """
+
+        event.set_invalid()
+        self._discard(event)
+
+    def update_event_time(self, event: "Event", time: int):
+        """Method to update the timestamp of event in O(log n).
+
+        The current entry of the event is turned into a tombstone and a new entry is pushed.
+        Events no longer in the list (popped or removed) are left unchanged.
+        """
+        if time == event.time or event._entry is None:
+            return
+
+        self._discard(event)
+        event.time = time
+        self.push(event)
+
+    def compact(self) -> None:
+        """Method to drop all tombstones from the heap."""
+
+        self.data = [entry for entry in self.data if entry[3] is not None]
+        heapify(self.data)
+        self.tombstones = 0
+
+    def _discard(self, event: "Event") -> None:
+        entry = event._entry
+        if entry is None:
+            return
+
+        entry[3] = None
+        event._entry = None
+        self._size -= 1
+        self.tombstones += 1
+
+        stored = self._size + self.tombstones
+        if stored >= self.compaction_min_size and self.tombstones > self.compaction_ratio * stored:
+            self.compact()
+
+
+@EventList.register(CALENDAR_EVENT_QUEUE)
+class CalendarEventList(KeyedEventList):
+    """Class of event list implemented as a calendar queue.
+
+    Events are hashed by time into `num_buckets` buckets ("days") of width `bucket_width`,
+    where a full cycle of buckets forms a "year".
+    Each bucket is a small min-heap of `[time, priority, seq, event]` entries (see `KeyedEventList`),
+    so events with equal time and priority are still executed in FIFO order.
+    Dequeue scans buckets from the current day onward, which makes enqueue and dequeue amortized O(1)
+    when events are spread evenly in time (e.g. periodic photon emission).
+    The number of buckets is doubled (halved) when the number of events grows above (falls below) a threshold,
+    and the bucket width is re-estimated from the separation of the earliest events.
+
+    Attributes:
+        buckets (list[list[list]]): buckets of the calendar, each being a min-heap of event entries.
+        bucket_width (int): width of each bucket (ps).
+        tombstones (int): number of removed entries still stored in the buckets.
+    """
+
+    MIN_BUCKETS = 2
+    WIDTH_SAMPLES = 25
+
+    def __init__(self, bucket_width: int = None, num_buckets: int = 2,
+                 compaction_ratio: float = 0.5, compaction_min_size: int = 1024):
+        """Constructor for the calendar event list.
+
+        Args:
+            bucket_width (int): initial width of buckets (default None, estimated from the first events).
+            num_buckets (int): initial number of buckets (default 2).
+            compaction_ratio (float): fraction of tombstones that triggers a compaction (default 0.5).
+            compaction_min_size (int): minimum number of stored entries before compaction is considered (default 1024).
+        """
+        super().__init__(compaction_ratio, compaction_min_size)
+        self.bucket_width = bucket_width if bucket_width else 1
+        self._fixed_width = bucket_width is not None
+        num_buckets = max(num_buckets, self.MIN_BUCKETS)
+        self.buckets: list[list[list]] = [[] for _ in range(num_buckets)]
+        self._bucket_index = 0                 # index of current bucket
+        self._bucket_top = self.bucket_width   # upper time bound of current bucket
+        self._grow_threshold = 2 * num_buckets
+        self._shrink_threshold = num_buckets // 2 - 2
+
+    def __iter__(self):
+        for bucket in self.buckets:
+            for entry in bucket:
+                if entry[3] is not None:
+                    yield entry[3]
+
+    def push(self, event: "Event") -> None:
+        entry = [event.time, event.priority, self._counter, event]
+        self._counter += 1
+        event._entry = entry
+        self._insert(entry)
+        self._size += 1
+        if self._size > self._grow_threshold:
+            self._resize(2 * len(self.buckets))
+
+    def pop(self) -> "Event":
+        bucket = self.buckets[self._bucket_index]
+        if not (bucket and bucket[0][3] is not None and bucket[0][0] < self._bucket_top):
+            bucket = self._find_min_bucket()
+        event = heappop(bucket)[3]
+        event._entry = None
+        self._size -= 1
+        if self._size < self._shrink_threshold:
+            self._resize(len(self.buckets) // 2)
+        return event
+
+    def top(self) -> "Event":
+        return self._find_min_bucket()[0][3]
+
+    def compact(self) -> None:
+        """Method to drop all tombstones from the buckets."""
+
+        for bucket in self.buckets:
+            if len(bucket) > 0:
+                bucket[:] = [entry for entry in bucket if entry[3] is not None]
+                heapify(bucket)
+        self.tombstones = 0
+
+    def _insert(self, entry: list) -> None:
+        time = entry[0]
+        width = self.bucket_width
+        day = int(time // width)
+        heappush(self.buckets[day % len(self.buckets)], entry)
+        if time < self._bucket_top - width:
+            # event is earlier than the current bucket (e.g. timeline rewound or not yet started)
+            self._bucket_index = day % len(self.buckets)
+            self._bucket_top = (day + 1) * width
+
+    def _find_min_bucket(self) -> list:
+        """Method to locate the bucket holding the next event and move the calendar to it.
+
+        Returns:
+            list: the bucket with the next event at its top.
+        """
+        if self._size == 0:
+            raise IndexError("pop from empty event list")
+
+        buckets = self.buckets
+        num_buckets = len(buckets)
+        width = self.bucket_width
+        i = self._bucket_index
+        top = self._bucket_top
+
+        # scan one year starting from the current bucket
+        for _ in range(num_buckets):
+            bucket = buckets[i]
+            while bucket and bucket[0][3] is None:
+                heappop(bucket)
+                self.tombstones -= 1
+            if bucket and bucket[0][0] < top:
+                self._bucket_index = i
+                self._bucket_top = top
+                return bucket
+            i += 1
+            top += width
+            if i == num_buckets:
+                i = 0
+
+        # no event within one year: jump directly to the earliest event
+        earliest = None
+        for bucket in buckets:
+            while bucket and bucket[0][3] is None:
+                heappop(bucket)
+                self.tombstones -= 1
+            if bucket and (earliest is None or bucket[0] < earliest[0]):
+                earliest = bucket
+
+        day = int(earliest[0][0] // width)
+        self._bucket_index = day % num_buckets
+        self._bucket_top = (day + 1) * width
+        return earliest
+
+    def _resize(self, num_buckets: int) -> None:
+        """Method to rebuild the calendar with a new number of buckets.
+
+        Tombstones are dropped and the bucket width is re-estimated during the rebuild.
+        """
+        num_buckets = max(num_buckets, self.MIN_BUCKETS)
+        entries = [entry for bucket in self.buckets for entry in bucket if entry[3] is not None]
+        if not self._fixed_width:
+            self.bucket_width = self._estimate_width(entries)
+
+        self.buckets = [[] for _ in range(num_buckets)]
+        self.tombstones = 0
+        self._grow_threshold = 2 * num_buckets
+        self._shrink_threshold = num_buckets // 2 - 2
+
+        width = self.bucket_width
+        if len(entries) > 0:
+            start_day = int(min(entries)[0] // width)
+        else:
+            start_day = 0
+        self._bucket_index = start_day % num_buckets
+        self._bucket_top = (start_day + 1) * width
+
+        buckets = self.buckets
+        for entry in entries:
+            buckets[int(entry[0] // width) % num_buckets].append(entry)
+        for bucket in buckets:
+            heapify(bucket)
+
+    def _estimate_width(self, entries: list) -> int:
+        """Method to estimate the bucket width from the separation of the earliest events.
+
+        Following Brown (1988), the width is three times the average separation,
+        where separations larger than twice the average are discarded.
+        """
+        times = sorted(set(entry[0] for entry in nsmallest(self.WIDTH_SAMPLES, entries)))
+        if len(times) < 2:
+            return self.bucket_width
+
+        gaps = [t2 - t1 for t1, t2 in zip(times[:-1], times[1:])]
+        average = sum(gaps) / len(gaps)
+        gaps = [gap for gap in gaps if gap <= 2 * average]
+        width = int(3 * sum(gaps) / len(gaps))
+        return max(width, 1)
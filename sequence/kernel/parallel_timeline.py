@@ -0,0 +1,404 @@
+"""Definition of the ParallelTimeline class.
+
+This module defines the ParallelTimeline class, which simulates one partition of a network in its own process.
+Entities of the other partitions are recorded as foreign entities; events scheduled on them are buffered
+and exchanged with the other partitions through pipes.
+
+Partitions are synchronized conservatively in windows: all partitions agree on the earliest pending event time `t`,
+then execute their local events in `[t, t + lookahead)`.
+The lookahead is the minimum delay of the channels crossing partitions,
+so no event created inside a window can be received by another partition inside the same window.
+
+Quantum states sent to other partitions are shared through a `QuantumManagerServer` (see `connect_quantum_manager`).
+Requests of different partitions on a shared state within the same window are not ordered by simulation time.
+"""
+
+import pickle
+import traceback
+from io import BytesIO
+from math import inf
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from .event import Event
+
+from .entity import Entity
+from .quantum_manager_client import QuantumManagerClient
+from .timeline import Timeline
+from ..constants import HEAP_EVENT_QUEUE, PARTITION_KEY_SPACE
+from ..utils import log
+
+
+class _EventPickler(pickle.Pickler):
+    """Pickler for events sent to other partitions.
+
+    Entities and the timeline are not copied but referenced by name,
+    and are resolved to the local objects of the receiving partition by `_EventUnpickler`.
+    """
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Timeline):
+            return ("timeline",)
+        if isinstance(obj, Entity):
+            return ("entity", obj.name)
+        return None
+
+
+class _EventUnpickler(pickle.Unpickler):
+    """Unpickler for events received from other partitions (see `_EventPickler`)."""
+
+    def __init__(self, file, timeline: "ParallelTimeline"):
+        super().__init__(file)
+        self.timeline = timeline
+
+    def persistent_load(self, pid):
+        if pid[0] == "timeline":
+            return self.timeline
+        if pid[0] == "entity":
+            return self.timeline.get_entity_by_name(pid[1])
+        raise pickle.UnpicklingError(f"unsupported persistent object {pid}")
+
+
+class ParallelTimeline(Timeline):
+    """Timeline for one partition of a parallel simulation.
+
+    Events whose process owner is a foreign entity (given by name) are not pushed to the local event list,
+    but buffered and sent to the partition owning the entity at the end of the current window.
+
+    Attributes:
+        partition_id (int): index of the partition simulated by this timeline.
+        num_partitions (int): total number of partitions.
+        foreign_entities (dict[str, int]): mapping of names of entities on other partitions to their partition index.
+        lookahead (int): synchronization window (ps); if None, derived from channels crossing partitions when run.
+        connections (dict[int, Connection]): pipes to the other partitions, keyed by partition index.
+        event_buffer (dict[int, list[tuple[int, bytes]]]): serialized events (with their time) waiting to be sent,
+            keyed by partition index.
+        sync_counter (int): number of synchronization windows executed.
+        exchange_counter (int): number of events sent to other partitions.
+    """
+
+    def __init__(self, partition_id: int, num_partitions: int, lookahead: int | None = None,
+                 stop_time: int = 10 ** 23, formalism: str = None, truncation: int = 1,
+                 event_queue: str = HEAP_EVENT_QUEUE, seed: int = None):
+        """Constructor for the parallel timeline.
+
+        Args:
+            partition_id (int): index of the partition simulated by this timeline.
+            num_partitions (int): total number of partitions.
+            lookahead (int): synchronization window (ps) (default None, derived from the channels crossing partitions).
+            stop_time (int): stop time (in ps) of simulation (default 10 ** 23).
+            formalism (str): formalism of quantum state representation.
+            truncation (int): truncation of Hilbert space (currently only for Fock representation).
+            event_queue (str): name of the registered event queue implementation (default "heap").
+            seed (int): root seed of the random service (default None).
+                Entities have the same generators in all partitions, whatever the partitioning.
+        """
+        super().__init__(stop_time, formalism, truncation, event_queue, seed)
+        assert 0 <= partition_id < num_partitions, f"invalid partition {partition_id} of {num_partitions}"
+        self.partition_id: int = partition_id
+        self.num_partitions: int = num_partitions
+        self.foreign_entities: dict[str, int] = {}
+        self.lookahead: int | None = lookahead
+        self.connections: dict[int, Connection] = {}
+        self.event_buffer: dict[int, list[tuple[int, bytes]]] = {i: [] for i in range(num_partitions) if i != partition_id}
+        self.sync_counter: int = 0
+        self.exchange_counter: int = 0
+        self._window_end: int | float = -inf
+        # quantum state keys of different partitions must not collide
+        self.quantum_manager._least_available = partition_id * PARTITION_KEY_SPACE
+
+    def set_connections(self, connections: dict[int, Connection]) -> None:
+        """Method to set the pipes to the other partitions.
+
+        Args:
+            connections (dict[int, Connection]): pipes to the other partitions, keyed by partition index.
+        """
+        assert set(connections) == set(self.event_buffer), "must provide a connection to every other partition"
+        self.connections = connections
+
+    def connect_quantum_manager(self, address: Any, **kwargs) -> None:
+        """Method to replace the local quantum manager with a client of a quantum manager server.
+
+        States already created are kept by the client.
+        Should be called by all partitions after the network is built and before `init`.
+
+        Args:
+            address (Any): address of the quantum manager server (`QuantumManagerServer.address`).
+            kwargs: other arguments of the client constructor (e.g. `max_batch_size`).
+        """
+        local = self.quantum_manager
+        client = QuantumManagerClient.create(address, self.partition_id, truncation=local.truncation, **kwargs)
+        client.set_states(local.states)
+        client._least_available = local._least_available
+        self.quantum_manager = client
+
+    def init(self) -> None:
+        """Method to initialize all simulated entities.
+
+        Raises:
+            ValueError: if quantum channels send photons to other partitions, and the quantum manager cannot share
+                their states (see `connect_quantum_manager`).
+        """
+        if not self.quantum_manager.SHARES_STATES:
+            from ..components.optical_channel import QuantumChannel
+
+            channels = sorted(entity.name for entity in self.entities.values()
+                              if isinstance(entity, QuantumChannel) and entity.receiver in self.foreign_entities)
+            if channels:
+                raise ValueError(f"quantum channels {channels} of partition {self.partition_id} cross partitions, "
+                                 f"but {type(self.quantum_manager).__name__} cannot share states with other "
+                                 f"partitions; call connect_quantum_manager first")
+        super().init()
+
+    def add_foreign_entity(self, name: str, partition_id: int) -> None:
+        """Method to record an entity simulated by another partition.
+
+        Args:
+            name (str): name of the foreign entity.
+            partition_id (int): index of the partition owning the entity.
+        """
+        assert partition_id != self.partition_id and partition_id in self.event_buffer, \
+            f"invalid partition {partition_id} for foreign entity {name}"
+        self.foreign_entities[name] = partition_id
+
+    def schedule(self, event: "Event") -> None:
+        """Method to schedule an event.
+
+        Events on foreign entities are serialized immediately, as the objects they reference are owned by the receiving partition from now on,
+        and sent to the owning partition at the end of the window.
+        """
+        owner = event.process.owner
+        if type(owner) is str and owner in self.foreign_entities:
+            if event.time < self._window_end:
+                raise ValueError(f"event for foreign entity {owner} at time {event.time} violates the "
+                                 f"lookahead (window ends at {self._window_end})")
+            self.schedule_counter += 1
+            event.process.number = self.schedule_counter
+            stream = BytesIO()
+            _EventPickler(stream, pickle.HIGHEST_PROTOCOL).dump(event)
+            self.event_buffer[self.foreign_entities[owner]].append((event.time, stream.getvalue()))
+        else:
+            super().schedule(event)
+
+    def run(self, fast: bool = False) -> None:
+        """Main simulation method for a partition.
+
+        All partitions must call `run` at the same point of their execution.
+        The simulation stops for all partitions at the earliest stop time of any partition.
+
+        Args:
+            fast (bool): unused, the window loop always uses a fast execution path.
+                The profiler of the partition is supported, the progress callback is not.
+        """
+        log.logger.info(f"Timeline partition {self.partition_id} start simulation")
+        self.is_running = True
+
+        self.lookahead = self._exchange_lookahead()
+        if self.lookahead <= 0:
+            raise ValueError(f"lookahead must be positive, got {self.lookahead}")
+
+        events = self.events
+        profiler = self.profiler
+        while True:
+            window_start, stop_time = self._exchange_events()
+            self.stop_time = stop_time
+            if window_start >= stop_time:
+                break
+
+            self._window_end = window_end = min(window_start + self.lookahead, stop_time)
+            self.sync_counter += 1
+            while len(events) > 0:
+                event_time = events.top().time
+                # stop_time is re-read since `stop` may be called during the window
+                if event_time >= window_end or event_time >= self.stop_time:
+                    break
+                event = events.pop()
+                if event.is_invalid():
+                    continue
+                self.time = event_time
+                if profiler is None:
+                    event.process.run()
+                else:
+                    tick = perf_counter_ns()
+                    event.process.run()
+                    profiler.record(event.process, perf_counter_ns() - tick)
+                self.run_counter += 1
+                if profiler is not None and self.run_counter % profiler.sample_interval == 0:
+                    profiler.sample_queue(self)
+
+        self._window_end = -inf
+        self.is_running = False
+        log.logger.info(f"Timeline partition {self.partition_id} end simulation. Windows: {self.sync_counter}; "
+                        f"Scheduled Event: {self.schedule_counter}; Executed Event: {self.run_counter}; "
+                        f"Exchanged Event: {self.exchange_counter}")
+
+    def checkpoint(self, path: str, data: Any = None) -> None:
+        """Checkpoints are not supported for partitions, as they hold pipes to other processes."""
+        raise NotImplementedError("checkpoints of parallel timelines are not supported")
+
+    def _local_lookahead(self) -> float:
+        """Method to compute the minimum delay of local channels to foreign entities."""
+
+        lookahead = inf
+        for entity in self.entities.values():
+            # channels are the entities with a receiver (given by name) and a delay
+            receiver = getattr(entity, "receiver", None)
+            delay = getattr(entity, "delay", None)
+            if type(receiver) is str and receiver in self.foreign_entities and delay is not None:
+                lookahead = min(lookahead, delay)
+        return lookahead
+
+    def _exchange_lookahead(self) -> int | float:
+        """Method to agree on the lookahead of all partitions.
+
+        Returns:
+            int | float: minimum of the local lookahead (or configured lookahead) of all partitions.
+        """
+        lookahead = self._local_lookahead()
+        if self.lookahead is not None:
+            lookahead = min(lookahead, self.lookahead)
+
+        received = self._all_to_all({i: pickle.dumps(lookahead) for i in self.connections})
+        return min([lookahead] + [pickle.loads(data) for data in received.values()])
+
+    def _exchange_events(self) -> tuple[int | float, int | float]:
+        """Method to exchange buffered events with all partitions.
+
+        Received events are scheduled on the local event list.
+
+        Returns:
+            tuple[int | float, int | float]: earliest event time and earliest stop time over all partitions.
+        """
+        self.quantum_manager.flush()
+
+        next_time = inf
+        while len(self.events) > 0 and self.events.top().is_invalid():
+            self.events.pop()
+        if len(self.events) > 0:
+            next_time = self.events.top().time
+
+        for buffer in self.event_buffer.values():
+            for event_time, _ in buffer:
+                next_time = min(next_time, event_time)
+
+        messages = {}
+        for i, buffer in self.event_buffer.items():
+            self.exchange_counter += len(buffer)
+            messages[i] = pickle.dumps((next_time, self.stop_time, [data for _, data in buffer]), pickle.HIGHEST_PROTOCOL)
+            self.event_buffer[i] = []
+
+        global_next_time, global_stop_time = next_time, self.stop_time
+        for i, message in sorted(self._all_to_all(messages).items()):
+            other_next_time, other_stop_time, events = pickle.loads(message)
+            global_next_time = min(global_next_time, other_next_time)
+            global_stop_time = min(global_stop_time, other_stop_time)
+            for data in events:
+                super().schedule(_EventUnpickler(BytesIO(data), self).load())
+
+        return global_next_time, global_stop_time
+
+    def _all_to_all(self, messages: dict[int, bytes]) -> dict[int, bytes]:
+        """Method to send one message to and receive one message from every other partition.
+
+        Each pair of partitions `(i, j)` with `i < j` is served in increasing order of the peer index,
+        where partition `i` sends first and partition `j` receives first, which avoids deadlocks on full pipes.
+
+        Args:
+            messages (dict[int, bytes]): message to send to each partition.
+
+        Returns:
+            dict[int, bytes]: message received from each partition.
+        """
+        received = {}
+        for i in sorted(self.connections):
+            conn = self.connections[i]
+            if self.partition_id < i:
+                conn.send_bytes(messages[i])
+                received[i] = conn.recv_bytes()
+            else:
+                received[i] = conn.recv_bytes()
+                conn.send_bytes(messages[i])
+        return received
+
+
+def _worker_main(worker: Callable, partition_id: int, all_connections: list[dict[int, Connection]],
+                 result_conn: Connection, args: tuple) -> None:
+    # pipe ends of the other partitions are inherited when forking and must be closed,
+    # otherwise a failing partition would not release the partitions waiting on it
+    for i, conns in enumerate(all_connections):
+        if i != partition_id:
+            for conn in conns.values():
+                conn.close()
+    connections = all_connections[partition_id]
+    try:
+        result = worker(partition_id, connections, *args)
+        result_conn.send((True, result))
+    except BaseException:
+        result_conn.send((False, traceback.format_exc()))
+    finally:
+        # closing the pipes releases the partitions waiting on this one
+        for conn in connections.values():
+            conn.close()
+        result_conn.close()
+
+
+def run_parallel(worker: Callable[..., Any], num_partitions: int, args: tuple = (), start_method: str = None) -> list[Any]:
+    """Function to run a simulation partitioned over several processes.
+
+    The worker function is called in each process as `worker(partition_id, connections, *args)`.
+    It should build the partition (e.g. `RouterNetTopo(config, partition_id=partition_id)`),
+    pass `connections` to `ParallelTimeline.set_connections`, run the timeline and return a picklable result.
+
+    Args:
+        worker (Callable): function simulating one partition.
+        num_partitions (int): number of partitions (processes).
+        args (tuple): extra arguments passed to the worker.
+        start_method (str): multiprocessing start method (default None, platform default).
+
+    Returns:
+        list[Any]: results returned by the workers, ordered by partition index.
+    """
+    ctx = get_context(start_method)
+    connections = [dict() for _ in range(num_partitions)]
+    for i in range(num_partitions):
+        for j in range(i + 1, num_partitions):
+            conn_i, conn_j = ctx.Pipe()
+            connections[i][j] = conn_i
+            connections[j][i] = conn_j
+
+    processes = []
+    result_conns = []
+    for i in range(num_partitions):
+        recv_conn, send_conn = ctx.Pipe(duplex=False)
+        p = ctx.Process(target=_worker_main, args=(worker, i, connections, send_conn, args))
+        p.start()
+        send_conn.close()
+        processes.append(p)
+        result_conns.append(recv_conn)
+
+    for conns in connections:
+        for conn in conns.values():
+            conn.close()
+
+    results = []
+    errors = []
+    for i, conn in enumerate(result_conns):
+        try:
+            success, result = conn.recv()
+        except EOFError:
+            success, result = False, f"partition {i} exited without a result"
+        if success:
+            results.append(result)
+        else:
+            results.append(None)
+            errors.append(f"partition {i}:\n{result}")
+
+    for p in processes:
+        p.join()
+
+    if len(errors) > 0:
+        raise RuntimeError("parallel simulation failed\n" + "\n".join(errors))
+    return results
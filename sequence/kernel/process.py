@@ -2,13 +2,14 @@
 
 This module defines a process, which is performed when an event is executed.
 """
-from typing import Any
+from typing import Any, Callable
 
 
 class Process:
     """Class of process.
 
     The process claims the object of process, the function of object, and the arguments for the function.
+    The function of object is looked up when the process is first run, and kept until `owner` or `activation` is reassigned.
 
     Attributes:
         owner (Any): the object of process.
@@ -16,15 +17,51 @@ class Process:
         activation (str): the function name of object.
         activation_args  (list[Any]): the (non-keyword) arguments of object's function.
         activation_kwargs (dict[Any, Any]): the keyword arguments of object's function.
+        _method (Callable): the bound function `owner.activation` (None if not looked up yet).
     """
 
     def __init__(self, owner: Any, activation_method: str, activation_args: list[Any], activation_kwargs: dict[Any, Any] = {}):
+        self._method: Callable | None = None
         self.owner = owner
         self.number = None
         self.activation = activation_method
         self.activation_args = activation_args
         self.activation_kwargs = activation_kwargs
 
+    @property
+    def owner(self) -> Any:
+        return self._owner
+
+    @owner.setter
+    def owner(self, owner: Any) -> None:
+        self._owner = owner
+        self._method = None
+
+    @property
+    def activation(self) -> str:
+        return self._activation
+
+    @activation.setter
+    def activation(self, activation: str) -> None:
+        self._activation = activation
+        self._method = None
+
+    def __getstate__(self) -> dict:
+        # the bound function is looked up again after unpickling
+        state = self.__dict__.copy()
+        state["_method"] = None
+        return state
+
+    def bind(self) -> Callable:
+        """Method to look up and keep the function of object.
+
+        Returns:
+            Callable: the bound function `owner.activation`.
+        """
+
+        method = self._method = getattr(self._owner, self._activation)
+        return method
+
     def run(self) -> None:
         """Method to execute process.
 
@@ -32,4 +69,7 @@ class Process:
         `activation_args` passed as args, and 'activation_kwargs' passed as kwargs.
         """
 
-        return getattr(self.owner, self.activation)(*self.activation_args, **self.activation_kwargs)
+        method = self._method
+        if method is None:
+            method = self.bind()
+        return method(*self.activation_args, **self.activation_kwargs)
@@ -0,0 +1,214 @@
+"""Definition of the event profiler and progress reports of a timeline.
+
+This module defines the EventProfiler class, recording the executed events of a timeline
+by process owner class and activation, by entity, and the size of the event queue over time,
+and the RunStats class, giving the progress of a running simulation to the progress callback of a timeline.
+Both are opt-in: a timeline without profiler or progress callback runs its usual execution loop.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+import json
+from typing import TYPE_CHECKING
+from sys import stdout
+
+if TYPE_CHECKING:
+    from .eventlist import EventList
+    from .process import Process
+    from .timeline import Timeline
+
+from ..constants import SECOND
+
+
+@dataclass(frozen=True)
+class RunStats:
+    """Class for the progress of a running simulation.
+
+    Attributes:
+        sim_time (int): current simulation time (ps).
+        stop_time (int): stop time of the simulation (ps).
+        wall_time (float): wall time (s) since the start of the run.
+        run_counter (int): number of executed events since the creation of the timeline.
+        events_per_second (float): executed events per second of wall time since the previous report.
+        sim_wall_ratio (float): simulation time per wall time (s/s) since the previous report.
+        queue_size (int): number of events in the event queue.
+    """
+
+    sim_time: int
+    stop_time: int
+    wall_time: float
+    run_counter: int
+    events_per_second: float
+    sim_wall_ratio: float
+    queue_size: int
+
+
+def print_progress(stats: RunStats) -> None:
+    """Progress callback printing the progress of a simulation on a single line (used by `Timeline.show_progress`).
+
+    Args:
+        stats (RunStats): progress of the simulation.
+    """
+
+    execution_time = timedelta(seconds=stats.wall_time)
+    simulation_time = timedelta(seconds=stats.sim_time / SECOND)
+    stop_time = timedelta(seconds=stats.stop_time / SECOND)
+    print(f'\rexecution time: {execution_time};     simulation time: {simulation_time} / {stop_time};     '
+          f'{stats.events_per_second:.0f} events/s;     sim/wall ratio: {stats.sim_wall_ratio:.3g}', end='\r')
+    stdout.flush()
+
+
+def count_tombstones(events: "EventList") -> int:
+    """Function to get the number of removed events still stored in an event queue.
+
+    Keyed event lists count their tombstones; for other event lists, the stored events are scanned.
+    """
+
+    tombstones = getattr(events, "tombstones", None)
+    if tombstones is None:
+        tombstones = sum(event.is_invalid() for event in events)
+    return tombstones
+
+
+class EventProfiler:
+    """Class recording the events executed by a timeline.
+
+    Enabled with `Timeline.enable_profiler()`, then filled by the execution loop of the timeline.
+    The wall time of an event is the time spent in its process (including the scheduling of new events).
+
+    Attributes:
+        activations (dict[tuple[str, str], list[int]]): executed events and cumulative wall time (ns),
+            keyed by (class name of the process owner, activation).
+        entities (dict[str, int]): executed events, keyed by name of the process owner.
+        queue_samples (list[tuple[int, int, int, float]]): simulation time, executed events, queue size
+            and tombstone ratio of the event queue, sampled every `sample_interval` events.
+        sample_interval (int): number of executed events between two samples of the event queue.
+    """
+
+    def __init__(self, sample_interval: int = 10000):
+        """Constructor for the event profiler class.
+
+        Args:
+            sample_interval (int): number of executed events between two samples of the event queue (default 10000).
+        """
+
+        assert sample_interval > 0
+        self.activations: dict[tuple[str, str], list[int]] = {}
+        self.entities: dict[str, int] = {}
+        self.queue_samples: list[tuple[int, int, int, float]] = []
+        self.sample_interval: int = sample_interval
+
+    def record(self, process: "Process", elapsed: int) -> None:
+        """Method to record an executed event.
+
+        Args:
+            process (Process): process of the event.
+            elapsed (int): wall time (ns) of the process.
+        """
+
+        owner = process.owner
+        key = (type(owner).__name__, process.activation)
+        stats = self.activations.get(key)
+        if stats is None:
+            stats = self.activations[key] = [0, 0]
+        stats[0] += 1
+        stats[1] += elapsed
+        name = getattr(owner, "name", key[0])
+        self.entities[name] = self.entities.get(name, 0) + 1
+
+    def sample_queue(self, timeline: "Timeline") -> None:
+        """Method to record the size and tombstone ratio of the event queue of a timeline."""
+
+        events = timeline.events
+        size = len(events)
+        tombstones = count_tombstones(events)
+        stored = size + tombstones if hasattr(events, "tombstones") else size
+        ratio = tombstones / stored if stored else 0.0
+        self.queue_samples.append((timeline.time, timeline.run_counter, size, ratio))
+
+    def reset(self) -> None:
+        """Method to clear the recorded events."""
+
+        self.activations.clear()
+        self.entities.clear()
+        self.queue_samples.clear()
+
+    def to_dict(self) -> dict:
+        """Method to export the recorded events as a JSON serializable dictionary.
+
+        Returns:
+            dict: with keys "activations" (list of records with class, activation, count and wall_time in ns),
+                "entities" (executed events per entity) and "queue" (list of records with time, run_counter, size
+                and tombstone_ratio).
+        """
+
+        return {
+            "activations": [{"class": owner_class, "activation": activation, "count": count, "wall_time": wall_time}
+                            for (owner_class, activation), (count, wall_time) in self.activations.items()],
+            "entities": dict(self.entities),
+            "queue": [{"time": time, "run_counter": run_counter, "size": size, "tombstone_ratio": ratio}
+                      for time, run_counter, size, ratio in self.queue_samples],
+        }
+
+    def to_json(self, indent: int = None) -> str:
+        """Method to export the recorded events as JSON (see `to_dict`)."""
+
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_dataframe(self):
+        """Method to export the executed events per (class, activation) as a pandas DataFrame.
+
+        Returns:
+            pandas.DataFrame: with columns class, activation, count, wall_time (ns) and wall_time_per_event (ns),
+                sorted by decreasing wall time.
+        """
+
+        import pandas as pd
+
+        df = pd.DataFrame(self.to_dict()["activations"], columns=["class", "activation", "count", "wall_time"])
+        df["wall_time_per_event"] = df["wall_time"] / df["count"]
+        return df.sort_values("wall_time", ascending=False, ignore_index=True)
+
+    def to_collapsed(self, weight: str = "wall_time") -> str:
+        """Method to export the executed events as collapsed stacks (as read by flame graph tools).
+
+        Each line is the stack `Timeline.run;<class>;<activation>` followed by its weight.
+
+        Args:
+            weight (str): "wall_time" (in µs) or "count" (default "wall_time").
+
+        Returns:
+            str: one line per (class, activation).
+        """
+
+        assert weight in ("wall_time", "count"), f"invalid weight {weight}"
+        lines = []
+        for (owner_class, activation), (count, wall_time) in self.activations.items():
+            value = count if weight == "count" else wall_time // 1000
+            lines.append(f"Timeline.run;{owner_class};{activation} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def run_stats(timeline: "Timeline", wall_time: float, last_wall_time: float, last_run_counter: int,
+              last_sim_time: int) -> RunStats:
+    """Function to get the progress of a running timeline since a previous report.
+
+    Args:
+        timeline (Timeline): running timeline.
+        wall_time (float): wall time (s) since the start of the run.
+        last_wall_time (float): wall time (s) of the previous report.
+        last_run_counter (int): executed events at the previous report.
+        last_sim_time (int): simulation time (ps) at the previous report.
+
+    Returns:
+        RunStats: progress of the timeline.
+    """
+
+    interval = wall_time - last_wall_time
+    if interval > 0:
+        events_per_second = (timeline.run_counter - last_run_counter) / interval
+        sim_wall_ratio = (timeline.time - last_sim_time) / SECOND / interval
+    else:
+        events_per_second = sim_wall_ratio = 0.0
+    return RunStats(timeline.time, timeline.stop_time, wall_time, timeline.run_counter, events_per_second,
+                    sim_wall_ratio, len(timeline.events))
@@ -1,14 +1,16 @@
 """This module defines the quantum manager class, to track quantum states.
 
-The states may currently be defined in two possible ways:
+The states may currently be defined in the following ways:
     - KetState
     - DensityMatrix
     - FockDensityMatrix
     - Bell Diagonal
+    - Stabilizer
 
 The manager defines an API for interacting with quantum states.
 """
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from numpy.typing import NDArray
 from threading import Lock
 from typing import TYPE_CHECKING, Any
@@ -17,15 +19,16 @@ if TYPE_CHECKING:
     from ..components.circuit import Circuit
     from .quantum_state import State
 
-from qutip_qip.circuit import QubitCircuit
-from qutip_qip.operations import gate_sequence_product, Gate
-from numpy import cumsum, base_repr
+from numpy import cumsum, base_repr, arange, asarray, concatenate, full, int64, ones, unique, zeros
+from numpy.random import default_rng
 from scipy.sparse import csr_matrix
 from scipy.special import binom
 
-from .quantum_state import KetState, DensityState, BellDiagonalState
+from .quantum_state import KetState, DensityState, BellDiagonalState, StabilizerState
+from .stabilizer_tableau import StabilizerTableau
 from .quantum_utils import *
-from ..constants import KET_STATE_FORMALISM, DENSITY_MATRIX_FORMALISM, FOCK_DENSITY_MATRIX_FORMALISM, BELL_DIAGONAL_STATE_FORMALISM
+from ..constants import KET_STATE_FORMALISM, DENSITY_MATRIX_FORMALISM, FOCK_DENSITY_MATRIX_FORMALISM, BELL_DIAGONAL_STATE_FORMALISM, \
+    STABILIZER_FORMALISM
 
 
 class QuantumManager(ABC):
@@ -34,6 +37,7 @@ class QuantumManager(ABC):
     All states stored are of a single formalism (by default as a ket vector).
 
     Class Attributes:
+        SHARES_STATES (bool): whether states can be sent to other (parallel) timelines with `move_manage_to_server`.
         _registry (dict): mapping of formalism names to manager classes.
         _global_formalism_lock (Lock): lock for managing global formalism.
         _global_formalism (str): global formalism.
@@ -41,9 +45,11 @@ class QuantumManager(ABC):
     Attributes:
         states (dict[int, State]): mapping of state keys to quantum state objects.
         _least_available (int): tracking the total number of quantum states in the quantum network
+        _free_keys (list[int]): keys removed with `remove` that can be reused by `new`.
         truncation (int): maximally allowed number of excited states for elementary subsystems. Default is 1 for qubit.
         dim (int): subsystem Hilbert space dimension. dim = truncation + 1
     """
+    SHARES_STATES: bool = False
     _registry: dict = {}
     _global_formalism_lock = Lock()
     _global_formalism: str = KET_STATE_FORMALISM
@@ -51,6 +57,7 @@ class QuantumManager(ABC):
     def __init__(self, truncation: int = 1):
         self.states: dict[int, "State"] = {}
         self._least_available: int = 0
+        self._free_keys: list[int] = []
         self.truncation = truncation
         self.dim = self.truncation + 1
 
@@ -144,16 +151,19 @@ class QuantumManager(ABC):
         if len(circuit.measured_qubits) > 0:
             assert meas_samp, "must specify random sample when measuring qubits"
 
-    def _prepare_circuit(self, circuit: "Circuit", keys: list[int]) -> tuple[NDArray, list[int], NDArray]:
-        """Prepare the circuit for execution by constructing the necessary state and transformation matrices.
-        
+    def _prepare_circuit(self, circuit: "Circuit", keys: list[int]) -> tuple[NDArray, list[int], list[int], NDArray]:
+        """Prepare the circuit for execution by constructing the compound state and the qubit order.
+
+        The circuit matrix is applied to the first qubits of the compound state after reordering its qubits
+        (see `apply_unitary_ket` and `apply_unitary_density`), so it is neither padded nor multiplied by swap matrices.
+
         Args:
             circuit (Circuit): quantum circuit to apply.
             keys (list[int]): list of keys for quantum states to apply circuit to.
-        
+
         Returns:
-            tuple: tuple containing the new state, all keys, and the circuit matrix.
-                   Note: the returned circuit matrix contains any necessary swaps to align qubits of new state
+            tuple: tuple containing the compound state, all keys (in the order after applying the circuit),
+                   the qubit order (index in the compound state of each qubit, None if unchanged), and the circuit matrix.
         """
         old_states = []
         all_keys = []
@@ -166,43 +176,59 @@ class QuantumManager(ABC):
                 all_keys += qstate.keys
 
         # construct compound state; order qubits
-        new_state = [1]
-        for state in old_states:
+        new_state = old_states[0]
+        for state in old_states[1:]:
             new_state = kron(new_state, state)
 
-        # get circuit matrix; expand if necessary
         circ_mat = circuit.get_unitary_matrix()
-        if circuit.size < len(all_keys):
-            # pad size of circuit matrix if necessary
-            diff = len(all_keys) - circuit.size
-            circ_mat = kron(circ_mat, identity(2 ** diff))
 
-        # apply any necessary swaps
+        # get order of qubits with circuit qubits first
+        axes = None
         if not all([all_keys.index(key) == i for i, key in enumerate(keys)]):
-            all_keys, swap_mat = self._swap_qubits(all_keys, keys)
-            circ_mat = circ_mat @ swap_mat
+            all_keys, axes = self._reorder_keys(all_keys, keys)
 
-        return new_state, all_keys, circ_mat
+        return new_state, all_keys, axes, circ_mat
+
+    @staticmethod
+    def _reorder_keys(all_keys: list[int], keys: list[int]) -> tuple[list[int], list[int]]:
+        """Compute the order of qubits that places the given keys first.
+
+        Qubits are swapped one at a time: the i-th key is swapped with the qubit at position i.
+
+        Args:
+            all_keys (list[int]): The list of all qubit keys.
+            keys (list[int]): The list of qubit keys to place first.
+
+        Returns:
+            tuple: reordered list of all keys, and the index in `all_keys` of each qubit of the new order.
+        """
+        new_keys = list(all_keys)
+        axes = list(range(len(all_keys)))
+        for i, key in enumerate(keys):
+            j = new_keys.index(key)
+            if j != i:
+                new_keys[i], new_keys[j] = new_keys[j], new_keys[i]
+                axes[i], axes[j] = axes[j], axes[i]
+        return new_keys, axes
 
     @staticmethod
     def _swap_qubits(all_keys: list[int], keys: list[int]) -> tuple[list[int], NDArray]:
         """Swap qubits in the circuit.
-        
+
+        Modifies `all_keys` in place to the new order (see `_reorder_keys`).
+
         Args:
             all_keys (list[int]): The list of all qubit keys.
             keys (list[int]): The list of qubit keys to swap.
-        
+
         Returns:
             tuple: updated list of all keys and the swap matrix.
         """
-        swap_circuit = QubitCircuit(N=len(all_keys))
-        for i, key in enumerate(keys):
-            j = all_keys.index(key)
-            if j != i:
-                gate = Gate("SWAP", targets=[i, j])
-                swap_circuit.add_gate(gate)
-                all_keys[i], all_keys[j] = all_keys[j], all_keys[i]
-        swap_mat = gate_sequence_product(swap_circuit.propagators()).full()
+        new_keys, axes = QuantumManager._reorder_keys(all_keys, keys)
+        all_keys[:] = new_keys
+        num_qubits = len(all_keys)
+        index = arange(2 ** num_qubits).reshape((2,) * num_qubits).transpose(axes).reshape(-1)
+        swap_mat = identity(2 ** num_qubits)[index]
         return all_keys, swap_mat
 
     @abstractmethod
@@ -216,13 +242,50 @@ class QuantumManager(ABC):
 
         pass
 
+    def _new_key(self) -> int:
+        """Method to allocate a key, reusing removed keys first."""
+
+        if self._free_keys:
+            return self._free_keys.pop()
+        key = self._least_available
+        self._least_available += 1
+        return key
+
     def remove(self, key: int) -> None:
         """Method to remove state stored at key.
+
+        The key is reused by `new` if no other key shares its state (or if it was destructively measured).
+        Keys removed while entangled are not reused, since the states of other keys still refer to them.
         
         Args:
             key (int): The key of the state to remove.
         """
-        del self.states[key]
+        state = self.states.pop(key)
+        if state is None or getattr(state, "keys", None) == [key]:
+            self._free_keys.append(key)
+
+    def move_manage_to_server(self, key: int) -> None:
+        """Method to hand the management of a state over to a shared quantum state server.
+
+        Called when a photon using the quantum manager is sent to an entity on another (parallel) timeline.
+        Only supported by managers with `SHARES_STATES` set, as states held by a local quantum manager cannot be accessed
+        from other processes; see `QuantumManagerClient` for a manager sharing states through a `QuantumManagerServer`.
+        `ParallelTimeline.init` checks that partitions with quantum channels to other partitions use such a manager.
+
+        Args:
+            key (int): key of the quantum state.
+
+        Raises:
+            NotImplementedError: if the manager does not share states.
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot share state {key} with other timelines.")
+
+    def flush(self) -> None:
+        """Method to send pending requests to a shared quantum state server.
+
+        Called by parallel timelines at the end of each synchronization window; does nothing for local managers.
+        """
+        pass
 
     def set_states(self, states: dict):
         """Set multiple quantum states.
@@ -249,8 +312,7 @@ class QuantumManagerKet(QuantumManager):
         Returns:
             int: the key of the new state.
         """
-        key = self._least_available
-        self._least_available += 1
+        key = self._new_key()
         self.states[key] = KetState(state, [key])
         return key
 
@@ -267,9 +329,9 @@ class QuantumManagerKet(QuantumManager):
             If non-measurement, dict: empty dictionary.
         """
         super().run_circuit(circuit, keys, meas_samp)
-        new_state, all_keys, circ_mat = self._prepare_circuit(circuit, keys)
+        new_state, all_keys, axes, circ_mat = self._prepare_circuit(circuit, keys)
 
-        new_state = circ_mat @ new_state
+        new_state = apply_unitary_ket(new_state, circ_mat, axes)
 
         if len(circuit.measured_qubits) == 0:
             # set state, return no measurement result
@@ -317,8 +379,9 @@ class QuantumManagerKet(QuantumManager):
         """
         target_all_keys = sorted(state.keys)
         if state.keys != target_all_keys:
-            _, swap_matrix = self._swap_qubits(state.keys, target_all_keys)
-            reordered_state = swap_matrix @ state.state
+            _, axes = self._reorder_keys(state.keys, target_all_keys)
+            state.keys[:] = target_all_keys
+            reordered_state = permute_ket(state.state, axes)
             state.state = reordered_state
             self.set(target_all_keys, reordered_state)
 
@@ -353,46 +416,16 @@ class QuantumManagerKet(QuantumManager):
         Returns:
             dict[int, int]: mapping of measured keys to measurement results.
         """
-        if len(keys) == 1:
-            if len(all_keys) == 1:
-                prob_0 = measure_state_with_cache_ket(tuple(state))
-                if meas_samp < prob_0:
-                    result = 0
-                else:
-                    result = 1
-            else:
-                key = keys[0]
-                num_states = len(all_keys)
-                state_index = all_keys.index(key)
-                state_0, state_1, prob_0 = measure_entangled_state_with_cache_ket(tuple(state), state_index, num_states)
-                if meas_samp < prob_0:
-                    new_state = array(state_0, dtype=complex)
-                    result = 0
-                else:
-                    new_state = array(state_1, dtype=complex)
-                    result = 1
-
-            all_keys.remove(keys[0])
-
-        else:
-            # swap states into correct position
-            if not all([all_keys.index(key) == i for i, key in enumerate(keys)]):
-                all_keys, swap_mat = self._swap_qubits(all_keys, keys)
-                state = swap_mat @ state
-
-            # calculate meas probabilities and projected states
-            len_diff = len(all_keys) - len(keys)
-            new_states, probabilities = measure_multiple_with_cache_ket(tuple(state), len(keys), len_diff)
-
-            # choose result, set as new state
-            for i in range(int(2 ** len(keys))):
-                if meas_samp < sum(probabilities[:i + 1]):
-                    result = i
-                    new_state = new_states[i]
-                    break
-
-            for key in keys:
-                all_keys.remove(key)
+        # bring the measured qubits next to each other (in the order of keys)
+        start = all_keys.index(keys[0])
+        if all_keys[start:start + len(keys)] != keys:
+            all_keys, axes = self._reorder_keys(all_keys, keys)
+            state = permute_ket(state, axes)
+            start = 0
+
+        result, new_state = measure_ket(state, start, len(keys), meas_samp)
+        for key in keys:
+            all_keys.remove(key)
 
         result_states = [array([1, 0]), array([0, 1])]
         result_digits = [int(x) for x in bin(result)[2:]]
@@ -428,8 +461,7 @@ class QuantumManagerDensity(QuantumManager):
         Returns:
             int: key of the new state.
         """
-        key = self._least_available
-        self._least_available += 1
+        key = self._new_key()
         self.states[key] = DensityState(state, [key])
         return key
 
@@ -446,9 +478,9 @@ class QuantumManagerDensity(QuantumManager):
             If non-measurement, dict: empty dictionary.
         """
         super().run_circuit(circuit, keys, meas_samp)
-        new_state, all_keys, circ_mat = super()._prepare_circuit(circuit, keys)
+        new_state, all_keys, axes, circ_mat = super()._prepare_circuit(circuit, keys)
 
-        new_state = circ_mat @ new_state @ circ_mat.conj().T
+        new_state = apply_unitary_density(new_state, circ_mat, axes)
 
         if len(circuit.measured_qubits) == 0:
             # set state, return no measurement result
@@ -516,8 +548,9 @@ class QuantumManagerDensity(QuantumManager):
         """
         target_all_keys = sorted(state.keys)
         if state.keys != target_all_keys:
-            _, swap_matrix = self._swap_qubits(state.keys, target_all_keys)
-            reordered_state = swap_matrix @ state.state @ swap_matrix.conj().T
+            _, axes = self._reorder_keys(state.keys, target_all_keys)
+            state.keys[:] = target_all_keys
+            reordered_state = permute_density(state.state, axes)
             state.state = reordered_state
             self.set(target_all_keys, reordered_state)
 
@@ -537,46 +570,14 @@ class QuantumManagerDensity(QuantumManager):
             dict[int, int]: mapping of measured keys to measurement results.
         """
 
-        if len(keys) == 1:
-            if len(all_keys) == 1:
-                prob_0 = measure_state_with_cache_density(tuple(map(tuple, state)))
-                if meas_samp < prob_0:
-                    result = 0
-                    new_state = [[1, 0], [0, 0]]
-                else:
-                    result = 1
-                    new_state = [[0, 0], [0, 1]]
+        # bring the measured qubits next to each other (in the order of keys)
+        start = all_keys.index(keys[0])
+        if all_keys[start:start + len(keys)] != keys:
+            all_keys, axes = self._reorder_keys(all_keys, keys)
+            state = permute_density(state, axes)
+            start = 0
 
-            else:
-                key = keys[0]
-                num_states = len(all_keys)
-                state_index = all_keys.index(key)
-                state_0, state_1, prob_0 = \
-                    measure_entangled_state_with_cache_density(tuple(map(tuple, state)), state_index, num_states)
-                if meas_samp < prob_0:
-                    new_state = array(state_0, dtype=complex)
-                    result = 0
-                else:
-                    new_state = array(state_1, dtype=complex)
-                    result = 1
-
-        else:
-            # swap states into correct position
-            if not all([all_keys.index(key) == i for i, key in enumerate(keys)]):
-                all_keys, swap_mat = self._swap_qubits(all_keys, keys)
-                state = swap_mat @ state @ swap_mat.conj().T
-
-            # calculate meas probabilities and projected states
-            len_diff = len(all_keys) - len(keys)
-            state_to_measure = tuple(map(tuple, state))
-            new_states, probabilities = measure_multiple_with_cache_density(state_to_measure, len(keys), len_diff)
-
-            # choose result, set as new state
-            for i in range(int(2 ** len(keys))):
-                if meas_samp < sum(probabilities[:i + 1]):
-                    result = i
-                    new_state = new_states[i]
-                    break
+        result, new_state = measure_density(state, start, len(keys), meas_samp)
 
         result_digits = [int(x) for x in bin(result)[2:]]
         while len(result_digits) < len(keys):
@@ -606,8 +607,7 @@ class QuantumManagerDensityFock(QuantumManager):
                 Other inputs are passed to the constructor of `DensityState`.
         """
 
-        key = self._least_available
-        self._least_available += 1
+        key = self._new_key()
         if state is None:
             gnd = [1] + [0] * self.truncation
             self.states[key] = DensityState(gnd, [key], truncation=self.truncation)
@@ -888,6 +888,43 @@ class QuantumManagerDensityFock(QuantumManager):
         self.set(all_keys, output_state)
 
 
+class _BellDiagonalStates(Mapping):
+    """Read-only mapping view of the states of a `QuantumManagerBellDiagonal`.
+
+    Provides the `states` dictionary interface of other quantum managers.
+    States are built from the rows of the table of the manager when accessed.
+    """
+
+    def __init__(self, manager: "QuantumManagerBellDiagonal"):
+        self._manager = manager
+
+    def __getitem__(self, key: int) -> BellDiagonalState:
+        row = self._manager._row_of(key)
+        if row < 0:
+            raise KeyError(key)
+        return BellDiagonalState(self._manager._diag[row], self._manager._row_keys[row].tolist())
+
+    def __contains__(self, key) -> bool:
+        return self._manager._row_of(key) >= 0
+
+    def __iter__(self):
+        rows = self._manager._rows
+        return iter(sorted(key for key, slot in self._manager._slots.items() if rows[slot] >= 0))
+
+    def __len__(self) -> int:
+        return int((self._manager._rows >= 0).sum())
+
+    def pop(self, key: int, *default):
+        state = self[key] if key in self or not default else default[0]
+        self._manager._release(key)
+        return state
+
+    def __delitem__(self, key: int) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._manager._release(key)
+
+
 @QuantumManager.register(BELL_DIAGONAL_STATE_FORMALISM)
 class QuantumManagerBellDiagonal(QuantumManager):
     """Class to track and manage quantum states with the bell diagonal formalism.
@@ -897,10 +934,39 @@ class QuantumManagerBellDiagonal(QuantumManager):
 
     * BDS is only used for entanglement distribution (generation, swapping, purification), assuming underlying errors being purely Pauli.
     * All manipulation results can be tracked analytically, without explicit quantum gates / channels / measurements.
+
+    The states are stored as a table (structure of arrays) rather than as `BellDiagonalState` objects,
+    so that updates are done in place and decoherence of many memories is applied in a single vectorized call.
+    Each entangled pair uses one row of the table; rows of released pairs are reused.
+    Each key uses one slot of the key arrays, mapped by a dictionary (keys may be sparse, e.g. from several partitions);
+    slots of removed keys are reused.
+    The `states` attribute is a read-only view building `BellDiagonalState` objects on access.
+
+    Attributes:
+        states (Mapping[int, BellDiagonalState]): view of the states of the manager.
+        _diag (NDArray): diagonal elements of the pairs (one row per pair).
+        _row_keys (NDArray): keys of the two qubits of each row.
+        _free_rows (list[int]): unused rows of the table.
+        _slots (dict[int, int]): slot of each key in the key arrays.
+        _free_slots (list[int]): unused slots of the key arrays.
+        _rows (NDArray): row of each slot (-1 if the key is not entangled).
+        _rates (NDArray): X, Y, Z decoherence rates (in 1/s) of each slot.
+        _last_update (NDArray): time of the last decoherence update of each slot (-1 if not set).
     """
 
+    INITIAL_CAPACITY = 64
+
     def __init__(self, **kwargs):
         super().__init__()
+        self.states = _BellDiagonalStates(self)
+        self._diag = zeros((self.INITIAL_CAPACITY, 4))
+        self._row_keys = full((self.INITIAL_CAPACITY, 2), -1, dtype=int64)
+        self._free_rows = list(range(self.INITIAL_CAPACITY - 1, -1, -1))
+        self._slots: dict[int, int] = {}
+        self._free_slots = list(range(self.INITIAL_CAPACITY - 1, -1, -1))
+        self._rows = full(self.INITIAL_CAPACITY, -1, dtype=int64)
+        self._rates = zeros((self.INITIAL_CAPACITY, 3))
+        self._last_update = full(self.INITIAL_CAPACITY, -1, dtype=int64)
 
     def new(self, state=None) -> int:
         """Generates new quantum state key for quantum manager.
@@ -916,31 +982,386 @@ class QuantumManagerBellDiagonal(QuantumManager):
         Returns:
             int: quantum state key corresponding to state.
         """
-        key = self._least_available
-        self._least_available += 1
+        key = self._new_key()
+        self._index(key)
         return key
 
-    def get(self, key: int):
+    def get(self, key: int) -> BellDiagonalState:
+        """Method to get the Bell diagonal state of a key.
+
+        The returned state holds a copy of the diagonal elements; use `diagonal` to access them in place.
+        """
         if key not in self.states:
             raise Exception("Attempt to get Bell diagonal state before entanglement.")
 
         return super().get(key)
 
+    def diagonal(self, key: int) -> NDArray:
+        """Method to get the diagonal elements of the state of a key.
+
+        Args:
+            key (int): key of one of the qubits of the pair.
+
+        Returns:
+            NDArray: view of the row of the pair (in I, Z, X, Y order), modified by later updates.
+        """
+        row = self._row_of(key)
+        if row < 0:
+            raise Exception("Attempt to get Bell diagonal state before entanglement.")
+        return self._diag[row]
+
     def set(self, keys: list[int], diag_elems: list[float]) -> None:
+        """Method to set the Bell diagonal state of a pair.
+
+        If `keys` are already entangled with each other, their row is updated in place.
+        If `keys` does not have 2 keys, the states of the keys are removed.
+
+        Args:
+            keys (list[int]): keys of the two qubits of the pair.
+            diag_elems (list[float]): diagonal elements of the state (in I, Z, X, Y order).
+        """
         super().set(keys, diag_elems)
         # assert len(keys) == 2, "Bell diagonal states must have 2 keys."
         if len(keys) != 2:
             # raise Warning("bell diagonal quantum manager received invalid set request")  # optional
             for key in keys:
-                if key in self.states:
-                    self.states.pop(key)
+                self._release(key)
             return
-        new_state = BellDiagonalState(diag_elems, keys)
-        for key in keys:
-            self.states[key] = new_state
+
+        diag = asarray(diag_elems, dtype=float)
+        assert diag.min() >= 0 and diag.max() <= 1.001, \
+            "Illegal value with elem > 1 or elem < 0 in density matrix diagonal elements"
+        assert abs(diag.sum() - 1) < 1e-5, "Density matrix diagonal elements do not sum to 1"
+
+        key0, key1 = keys
+        row = self._row_of(key0)
+        if row < 0 or row != self._row_of(key1):
+            self._release(key0)
+            self._release(key1)
+            row = self._allocate_row(key0, key1)
+        self._diag[row] = diag
 
     def set_to_noiseless(self, keys: list[int]):
         self.set(keys, [float(1), float(0), float(0), float(0)])
 
-    def run_circuit(self, *args, **kwargs):
-        pass
+    def remove(self, key: int) -> None:
+        """Method to remove the state of a key, and its decoherence rates and last update time."""
+        self._release(key)
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            self._rates[slot] = 0
+            self._last_update[slot] = -1
+            self._free_slots.append(slot)
+
+    def set_decoherence_rates(self, key: int, rates: list[float]) -> None:
+        """Method to set the Pauli decoherence rates of the memory holding a key.
+
+        Args:
+            key (int): key of the memory qubit.
+            rates (list[float]): X, Y, Z error rates (in 1/s).
+        """
+        self._rates[self._index(key)] = rates
+
+    def get_last_update(self, key: int) -> int:
+        """Method to get the time of the last decoherence update of a key (-1 if not set)."""
+        return int(self._last_update[self._index(key)])
+
+    def set_last_update(self, key: int, time: int) -> None:
+        """Method to set the time of the last decoherence update of a key."""
+        self._last_update[self._index(key)] = time
+
+    def decohere(self, keys: list[int], now: int) -> None:
+        """Method to apply the idling decoherence of memories to their Bell diagonal states.
+
+        Each memory idling since its last update applies a Pauli channel (with its decoherence rates) to its pair.
+        The channels of all keys are applied with a single vectorized update of the table,
+        and the last update times of the keys are set to `now`.
+        Keys without a last update time (or updated at time 0) are skipped, as in `Memory.bds_decohere`.
+
+        Args:
+            keys (list[int]): keys of the decohering memory qubits.
+            now (int): current simulation time (in ps).
+        """
+        if len(keys) == 0:
+            return
+        slots = self._slots
+        index = unique(asarray([slots[key] for key in keys if key in slots], dtype=int64))
+        last_update = self._last_update[index]
+        rows = self._rows[index]
+        durations = (now - last_update) * 1e-12
+        valid = (durations > 0) & (last_update > 0) & (rows >= 0)
+        if not valid.all():
+            index, rows, durations = index[valid], rows[valid], durations[valid]
+        if len(index) == 0:
+            return
+
+        errors = bds_pauli_errors(self._rates[index], durations)
+        # both qubits of a pair may decohere: apply the channels of the second qubits in a second pass
+        rows, first = unique(rows, return_index=True)
+        self._diag[rows] = bds_convolve(errors[first], self._diag[rows])
+        if len(first) < len(index):
+            second = ones(len(index), dtype=bool)
+            second[first] = False
+            rows = self._rows[index[second]]
+            self._diag[rows] = bds_convolve(errors[second], self._diag[rows])
+        self._last_update[index] = now
+
+    def swap(self, key0: int, key1: int) -> tuple[int, int]:
+        """Method to swap the entanglement of two pairs by a Bell state measurement of two of their qubits.
+
+        The partners of `key0` and `key1` are entangled with the Bell diagonal state obtained by convolution
+        of the states of the two pairs (assuming Pauli corrections on the partner qubits),
+        and the measured keys are released.
+
+        Args:
+            key0 (int): key of the measured qubit of the first pair.
+            key1 (int): key of the measured qubit of the second pair.
+
+        Returns:
+            tuple[int, int]: keys of the qubits of the new pair.
+        """
+        row0, row1 = self._row_of(key0), self._row_of(key1)
+        if row0 < 0 or row1 < 0 or row0 == row1:
+            raise ValueError(f"Keys {key0} and {key1} are not in two Bell diagonal pairs.")
+        partner0 = self._partner(row0, key0)
+        partner1 = self._partner(row1, key1)
+
+        self._diag[row0] = bds_convolve(self._diag[row0:row0 + 1], self._diag[row1:row1 + 1])[0]
+        self._row_keys[row0] = partner0, partner1
+        slots = self._slots
+        self._rows[slots[partner0]] = row0
+        self._rows[slots[partner1]] = row0
+        self._rows[slots[key0]] = -1
+        self._rows[slots[key1]] = -1
+        self._row_keys[row1] = -1
+        self._free_rows.append(row1)
+        return partner0, partner1
+
+    def run_circuit(self, circuit: "Circuit", keys: list[int], meas_samp=None) -> dict[int, int]:
+        """Method to run a circuit on Bell diagonal states.
+
+        Gates are not tracked: the states are assumed to stay in Bell diagonal form (e.g. Pauli corrections).
+        A circuit measuring two qubits of different pairs is treated as a Bell state measurement (entanglement swapping),
+        see `swap`; the 4 outcomes are equally likely for Bell diagonal states.
+
+        Args:
+            circuit (Circuit): circuit to run.
+            keys (list[int]): keys of the qubits of the circuit.
+            meas_samp (float): random number between 0 and 1 used to sample the measurement results.
+
+        Returns:
+            dict[int, int]: measurement result of each measured key.
+        """
+        if len(circuit.measured_qubits) == 0:
+            return {}
+        if len(keys) != 2 or len(circuit.measured_qubits) != 2:
+            raise ValueError("Bell diagonal states only support Bell state measurement of two qubits.")
+
+        self.swap(keys[0], keys[1])
+        outcome = min(int(meas_samp * 4), 3)
+        return {keys[0]: outcome >> 1, keys[1]: outcome & 1}
+
+    def _index(self, key: int) -> int:
+        """Returns the slot of a key in the key arrays, allocating it (and growing the arrays) if needed."""
+        slot = self._slots.get(key)
+        if slot is None:
+            if not self._free_slots:
+                self._grow_keys(2 * len(self._rows))
+            slot = self._slots[key] = self._free_slots.pop()
+        return slot
+
+    def _grow_keys(self, capacity: int) -> None:
+        size = len(self._rows)
+        for name, fill in [("_rows", -1), ("_rates", 0), ("_last_update", -1)]:
+            old = getattr(self, name)
+            new = full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:size] = old
+            setattr(self, name, new)
+        self._free_slots = list(range(capacity - 1, size - 1, -1))
+
+    def _row_of(self, key: int) -> int:
+        slot = self._slots.get(key)
+        if slot is None:
+            return -1
+        return int(self._rows[slot])
+
+    def _partner(self, row: int, key: int) -> int:
+        key0, key1 = self._row_keys[row]
+        return int(key1 if key0 == key else key0)
+
+    def _allocate_row(self, key0: int, key1: int) -> int:
+        if not self._free_rows:
+            capacity = len(self._diag)
+            self._diag = concatenate([self._diag, zeros((capacity, 4))])
+            self._row_keys = concatenate([self._row_keys, full((capacity, 2), -1, dtype=int64)])
+            self._free_rows = list(range(2 * capacity - 1, capacity - 1, -1))
+        row = self._free_rows.pop()
+        self._row_keys[row] = key0, key1
+        self._rows[self._index(key0)] = row
+        self._rows[self._index(key1)] = row
+        return row
+
+    def _release(self, key: int) -> None:
+        """Removes the state of a key; the row is freed once both keys of the pair are released."""
+        row = self._row_of(key)
+        if row < 0:
+            return
+        self._rows[self._slots[key]] = -1
+        partner = self._partner(row, key)
+        if self._row_of(partner) != row:
+            self._row_keys[row] = -1
+            self._free_rows.append(row)
+
+
+@QuantumManager.register(STABILIZER_FORMALISM)
+class QuantumManagerStabilizer(QuantumManager):
+    """Class to track and manage states with the stabilizer formalism.
+
+    Each group of entangled qubits is stored as a stabilizer tableau (see `StabilizerTableau`),
+    so that the cost of gates and measurements is polynomial in the number of entangled qubits.
+    Only circuits of Clifford gates (H, S, Sdg, X, Y, Z, CX, CZ, SWAP, the square roots of iZ and iY,
+    and phase gates with angles multiple of pi/2) followed by measurements in the computational basis can be run.
+
+    Measured qubits are removed from their group, and set to the state of their result (as in the ket vector formalism).
+    """
+
+    MEAS_SAMP_BITS = 52  # random results sampled from the bits of one random number
+
+    def __init__(self, **kwargs):
+        super().__init__()
+
+    def new(self, state=[complex(1), complex(0)]) -> int:
+        """Method to create a new stabilizer state.
+
+        Args:
+            state (list[complex]): amplitudes of the (stabilizer) state of 1 qubit (default [1, 0]).
+
+        Returns:
+            int: key of the new state.
+        """
+        key = self._new_key()
+        self.states[key] = StabilizerState(StabilizerTableau.from_ket(state), [key])
+        return key
+
+    def set(self, keys: list[int], amplitudes: Any) -> None:
+        """Method to set the quantum state at the given keys.
+
+        Args:
+            keys (list[int]): list of quantum manager keys to modify.
+            amplitudes: tableau of the state (StabilizerTableau), or amplitudes of a stabilizer state (list[complex]).
+        """
+        super().set(keys, amplitudes)
+        if isinstance(amplitudes, StabilizerTableau):
+            tableau = amplitudes.copy()
+        else:
+            tableau = StabilizerTableau.from_ket(amplitudes)
+        new_state = StabilizerState(tableau, list(keys))
+        for key in keys:
+            self.states[key] = new_state
+
+    def set_to_zero(self, key: int) -> None:
+        """Set the qubit at the given key to the |0> state.
+
+        Args:
+            key (int): key of the qubit to set to |0>.
+        """
+        self.states[key] = StabilizerState(StabilizerTableau(1), [key])
+
+    def set_to_one(self, key: int) -> None:
+        """Set the qubit at the given key to the |1> state.
+
+        Args:
+            key (int): key of the qubit to set to |1>.
+        """
+        tableau = StabilizerTableau(1)
+        tableau.x_gate(0)
+        self.states[key] = StabilizerState(tableau, [key])
+
+    def run_circuit(self, circuit: "Circuit", keys: list[int], meas_samp=None) -> dict[int, int]:
+        """Method to run a circuit of Clifford gates on a given list of keys.
+
+        Args:
+            circuit (Circuit): quantum circuit to apply.
+            keys (list[int]): list of keys to apply circuit to.
+            meas_samp (float): random number between 0 and 1 used for measurement.
+
+        Returns:
+            If measurement, dict[int, int]: dictionary mapping qstate keys to measurement results.
+            If non-measurement, dict: empty dictionary.
+        """
+        super().run_circuit(circuit, keys, meas_samp)
+
+        # tensor product of the groups of the keys
+        tableau = None
+        all_keys = []
+        for key in keys:
+            qstate = self.states[key]
+            if qstate.keys[0] not in all_keys:
+                tableau = qstate.state.copy() if tableau is None else tableau.combine(qstate.state)
+                all_keys += qstate.keys
+
+        indices = [all_keys.index(key) for key in keys]
+        for name, qubits, arg in circuit.gates:
+            tableau.apply_gate(name, [indices[q] for q in qubits], arg)
+
+        if len(circuit.measured_qubits) == 0:
+            new_state = StabilizerState(tableau, all_keys)
+            for key in all_keys:
+                self.states[key] = new_state
+            return {}
+        else:
+            keys = [keys[i] for i in circuit.measured_qubits]
+            return self._measure(tableau, keys, all_keys, meas_samp)
+
+    def _measure(self, tableau: StabilizerTableau, keys: list[int], all_keys: list[int], meas_samp: float) -> dict[int, int]:
+        """Method to measure qubits at given keys.
+
+        SHOULD NOT be called individually; only from circuit method (unless for unit testing purposes).
+        Modifies quantum state of all qubits given by all_keys.
+
+        Qubits are measured in order; each random result is 0 if `meas_samp < 0.5`, and `meas_samp` is then rescaled to [0, 1).
+        The results are thus the same as sampling the joint distribution of results with `meas_samp`
+        (as done by `QuantumManagerKet`), up to `MEAS_SAMP_BITS` random results;
+        further random results are sampled from a generator seeded with `meas_samp`.
+
+        Args:
+            tableau (StabilizerTableau): tableau of the state to measure (modified in place).
+            keys (list[int]): list of keys to measure.
+            all_keys (list[int]): list of all keys corresponding to the tableau.
+            meas_samp (float): random number between 0 and 1 used for measurement.
+
+        Returns:
+            dict[int, int]: mapping of measured keys to measurement results.
+        """
+        all_keys = list(all_keys)
+        results = {}
+        samp = meas_samp
+        num_random = 0
+        rng = None
+        for key in keys:
+            outcome = int(samp >= 0.5)
+            index = all_keys.index(key)
+            result, random = tableau.measure(index, outcome)
+            # the last qubit of the tableau takes the index of the measured qubit
+            all_keys[index] = all_keys[-1]
+            all_keys.pop()
+            if random:
+                num_random += 1
+                if num_random % self.MEAS_SAMP_BITS == 0:
+                    if rng is None:
+                        rng = default_rng(int(meas_samp * 2 ** self.MEAS_SAMP_BITS))
+                    samp = rng.random()
+                else:
+                    samp = 2 * samp - outcome
+            results[key] = result
+            if result == 0:
+                self.set_to_zero(key)
+            else:
+                self.set_to_one(key)
+
+        if len(all_keys) > 0:
+            new_state = StabilizerState(tableau, all_keys)
+            for key in all_keys:
+                self.states[key] = new_state
+
+        return results
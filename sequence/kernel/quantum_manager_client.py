@@ -0,0 +1,185 @@
+"""Definition of the quantum manager client.
+
+This module defines the QuantumManagerClient class, a quantum manager for one partition of a parallel simulation.
+States are kept by the local quantum manager until a key is sent to another partition;
+the state of the key (with all keys entangled with it) is then moved to the shared `QuantumManagerServer`,
+and all later requests on its keys are forwarded to the server.
+
+Requests without return value (`set`, `remove`, `run_circuit` without measurement) are batched,
+and sent with the next request needing a reply, or when `flush` is called.
+`ParallelTimeline` flushes the requests at the end of each synchronization window,
+so that the other partitions observe them before receiving events of the window.
+"""
+
+from multiprocessing.connection import Client
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..components.circuit import Circuit
+    from .quantum_state import State
+
+from .quantum_manager import QuantumManager
+from ..constants import PARTITION_KEY_SPACE
+
+
+class QuantumManagerClient(QuantumManager):
+    """Class of quantum manager client for parallel simulation (abstract).
+
+    The client is combined with the quantum manager class of a formalism (see `QuantumManagerClient.create`),
+    which handles the states owned by the local partition.
+    Keys are allocated in the range `[partition_id * PARTITION_KEY_SPACE, (partition_id + 1) * PARTITION_KEY_SPACE)`,
+    so that keys of different partitions never collide.
+
+    Note that the states returned by `get` for keys on the server are copies.
+
+    Attributes:
+        address (Any): address of the quantum manager server.
+        partition_id (int): index of the partition using the client.
+        remote_keys (set[int]): keys allocated by this partition and moved to the server.
+        requests (list[tuple]): batched requests not yet sent to the server.
+        max_batch_size (int): maximum number of batched requests before they are sent.
+        request_counter (int): number of requests forwarded to the server.
+        message_counter (int): number of batches sent to the server.
+    """
+
+    SHARES_STATES = True
+    _client_classes: dict = {}
+
+    def __init__(self, address: Any, partition_id: int, max_batch_size: int = 1024, **kwargs):
+        """Constructor for the quantum manager client.
+
+        Args:
+            address (Any): address of the quantum manager server.
+            partition_id (int): index of the partition using the client.
+            max_batch_size (int): maximum number of batched requests before they are sent (default 1024).
+            kwargs: arguments of the quantum manager of the formalism (e.g. `truncation`).
+        """
+        super().__init__(**kwargs)
+        self.address = address
+        self.partition_id = partition_id
+        self.remote_keys: set[int] = set()
+        self.requests: list[tuple] = []
+        self.max_batch_size = max_batch_size
+        self.request_counter = 0
+        self.message_counter = 0
+        self._least_available = partition_id * PARTITION_KEY_SPACE
+        self._conn = Client(address)
+
+    @classmethod
+    def create(cls, address: Any, partition_id: int, formalism: str = None, **kwargs) -> "QuantumManagerClient":
+        """Create a client for the quantum manager of a formalism.
+
+        Args:
+            address (Any): address of the quantum manager server.
+            partition_id (int): index of the partition using the client.
+            formalism (str): formalism of quantum state representation (default None, the global formalism).
+            kwargs: other arguments of the client constructor.
+
+        Returns:
+            QuantumManagerClient: a client combined with the quantum manager class of the formalism.
+        """
+        if formalism is None:
+            formalism = cls.get_active_formalism()
+        if formalism not in cls._registry:
+            raise ValueError(f"Quantum manager '{formalism}' is not registered.")
+
+        manager_class = cls._registry[formalism]
+        if manager_class not in cls._client_classes:
+            name = manager_class.__name__ + "Client"
+            cls._client_classes[manager_class] = type(name, (QuantumManagerClient, manager_class), {})
+        return cls._client_classes[manager_class](address, partition_id, **kwargs)
+
+    def is_remote(self, key: int) -> bool:
+        """Method to check if the state of a key is stored on the server.
+
+        Args:
+            key (int): key of the quantum state.
+
+        Returns:
+            bool: True if the key was moved to the server or allocated by another partition.
+        """
+        return key in self.remote_keys or key // PARTITION_KEY_SPACE != self.partition_id
+
+    def get(self, key: int) -> "State":
+        if self.is_remote(key):
+            return self._request("get", key)
+        return super().get(key)
+
+    def set(self, keys: list[int], amplitudes: Any) -> None:
+        if any(self.is_remote(key) for key in keys):
+            for key in keys:
+                if not self.is_remote(key):
+                    self.states.pop(key, None)
+                    self.remote_keys.add(key)
+            self._push("set", list(keys), amplitudes)
+        else:
+            super().set(keys, amplitudes)
+
+    def run_circuit(self, circuit: "Circuit", keys: list[int], meas_samp=None) -> dict[int, int]:
+        if any(self.is_remote(key) for key in keys):
+            for key in keys:
+                self.move_manage_to_server(key)
+            if len(circuit.measured_qubits) > 0:
+                return self._request("run_circuit", circuit, list(keys), meas_samp)
+            self._push("run_circuit", circuit, list(keys), meas_samp)
+            return {}
+        return super().run_circuit(circuit, keys, meas_samp)
+
+    def remove(self, key: int) -> None:
+        if self.is_remote(key):
+            self.remote_keys.discard(key)
+            self._push("remove", key)
+        else:
+            super().remove(key)
+
+    def move_manage_to_server(self, key: int) -> None:
+        """Method to move the state of a key to the server.
+
+        All keys entangled with the key are moved as well.
+
+        Args:
+            key (int): key of the quantum state.
+        """
+        if self.is_remote(key):
+            return
+        state = self.states.get(key, None)
+        if state is None:
+            # e.g. key of the Bell diagonal formalism before entanglement
+            self.remote_keys.add(key)
+            return
+        keys = list(state.keys)
+        for k in keys:
+            self.states.pop(k, None)
+            self.remote_keys.add(k)
+        self._push("set", keys, state.state)
+
+    def flush(self) -> None:
+        """Method to send the batched requests to the server."""
+
+        if len(self.requests) > 0:
+            self._send()
+
+    def close(self) -> None:
+        """Method to send the batched requests and close the connection to the server."""
+
+        self.flush()
+        self._conn.close()
+
+    def _push(self, *request) -> None:
+        self.requests.append(request)
+        if len(self.requests) >= self.max_batch_size:
+            self._send()
+
+    def _request(self, *request) -> Any:
+        self.requests.append(request)
+        return self._send()
+
+    def _send(self) -> Any:
+        self.request_counter += len(self.requests)
+        self.message_counter += 1
+        self._conn.send(self.requests)
+        self.requests = []
+        error, result = self._conn.recv()
+        if error is not None:
+            raise error
+        return result
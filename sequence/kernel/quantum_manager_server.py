@@ -0,0 +1,153 @@
+"""Definition of the quantum manager server.
+
+This module defines the QuantumManagerServer class, which stores the quantum states shared by the partitions of a parallel simulation.
+The states are kept by a quantum manager of the chosen formalism in a separate server process,
+which serves requests of `QuantumManagerClient` objects over a local socket.
+
+Each message sent by a client is a batch (list) of requests `(method, *args)`, executed in order on the quantum manager.
+The server replies to each batch with `(error, result)`, where `result` is the return value of the last request.
+"""
+
+from multiprocessing import get_context
+from multiprocessing.connection import Client, Connection, Listener
+from threading import Event, Lock, Thread
+from typing import Any
+
+from .quantum_manager import QuantumManager
+
+# methods of the quantum manager that clients may request
+SERVER_METHODS = frozenset(["get", "set", "run_circuit", "remove"])
+_SHUTDOWN = "shutdown"
+
+
+class QuantumManagerServer:
+    """Class of the quantum state server for parallel simulation.
+
+    The server runs in its own process and is shared by all partitions of a parallel simulation.
+    Partitions connect to it through `ParallelTimeline.connect_quantum_manager`.
+
+    Attributes:
+        formalism (str): formalism of the quantum manager of the server.
+        truncation (int): truncation of Hilbert space of the quantum manager of the server.
+        address (Any): address of the server socket (None until started).
+        process (Process): server process (None until started).
+    """
+
+    def __init__(self, formalism: str = None, truncation: int = 1, start_method: str = None):
+        """Constructor for the quantum manager server.
+
+        Args:
+            formalism (str): formalism of quantum state representation (default None, the global formalism).
+            truncation (int): truncation of Hilbert space (currently only for Fock representation).
+            start_method (str): multiprocessing start method (default None, platform default).
+        """
+        if formalism is None:
+            formalism = QuantumManager.get_active_formalism()
+        if formalism not in QuantumManager._registry:
+            raise ValueError(f"Quantum manager '{formalism}' is not registered.")
+        self.formalism = formalism
+        self.truncation = truncation
+        self.address = None
+        self.process = None
+        self._ctx = get_context(start_method)
+
+    def start(self) -> Any:
+        """Method to start the server process.
+
+        Returns:
+            Any: address of the server socket.
+        """
+        assert self.process is None, "quantum manager server already started"
+        recv_conn, send_conn = self._ctx.Pipe(duplex=False)
+        self.process = self._ctx.Process(target=_serve, args=(self.formalism, self.truncation, send_conn), daemon=True)
+        self.process.start()
+        send_conn.close()
+        self.address = recv_conn.recv()
+        recv_conn.close()
+        return self.address
+
+    def stop(self) -> None:
+        """Method to stop the server process.
+
+        All states stored by the server are discarded.
+        """
+        if self.process is None:
+            return
+        conn = Client(self.address)
+        conn.send(_SHUTDOWN)
+        conn.recv()
+        conn.close()
+        self.process.join()
+        self.process = None
+        self.address = None
+
+    def __enter__(self) -> "QuantumManagerServer":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+def execute_batch(manager: QuantumManager, batch: list[tuple]) -> tuple[Exception | None, Any]:
+    """Function to execute a batch of requests on a quantum manager.
+
+    Execution stops at the first request raising an exception.
+
+    Args:
+        manager (QuantumManager): quantum manager holding the states.
+        batch (list[tuple]): requests `(method, *args)`.
+
+    Returns:
+        tuple[Exception | None, Any]: exception raised (if any) and return value of the last request.
+    """
+    result = None
+    try:
+        for method, *args in batch:
+            if method not in SERVER_METHODS:
+                raise ValueError(f"unsupported quantum manager request '{method}'")
+            result = getattr(manager, method)(*args)
+    except Exception as e:
+        return e, None
+    return None, result
+
+
+def _handle(manager: QuantumManager, lock: Lock, conn: Connection, stopping: Event, address: Any) -> None:
+    """Function serving the batches of one client until it disconnects."""
+
+    try:
+        while True:
+            batch = conn.recv()
+            if batch == _SHUTDOWN:
+                stopping.set()
+                conn.send(None)
+                # wake up the main thread waiting for connections
+                Client(address).close()
+                break
+            with lock:
+                reply = execute_batch(manager, batch)
+            conn.send(reply)
+    except (EOFError, OSError):
+        pass
+    finally:
+        conn.close()
+
+
+def _serve(formalism: str, truncation: int, ready_conn: Connection) -> None:
+    """Main function of the server process."""
+
+    manager = QuantumManager._registry[formalism](truncation=truncation)
+    lock = Lock()
+    stopping = Event()
+    listener = Listener()
+    ready_conn.send(listener.address)
+    ready_conn.close()
+
+    while True:
+        conn = listener.accept()
+        if stopping.is_set():
+            conn.close()
+            break
+        Thread(target=_handle, args=(manager, lock, conn, stopping, listener.address), daemon=True).start()
+
+    listener.close()
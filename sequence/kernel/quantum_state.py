@@ -1,19 +1,21 @@
 """Definition of the quantum state classes.
 
 This module defines the classes used to track quantum states in SeQUeNCe.
-These include 2 classes used by a quantum manager, and one used for individual photons:
+These include classes used by a quantum manager, and one used for individual photons:
 
 1. The `KetState` class represents the ket vector formalism and is used by a quantum manager.
 2. The `DensityState` class represents the density matrix formalism and is also used by a quantum manager.
 3. The `FreeQuantumState` class uses the ket vector formalism, and is used by individual photons (not the quantum manager).
+4. The `BellDiagonalState` and `StabilizerState` classes are used by the Bell diagonal and stabilizer quantum managers.
 """
 
 import math
 from abc import ABC
-from numpy import pi, cos, sin, arange, log, log2
+from numpy import pi, cos, sin, arange, log, log2, array, asarray, vdot
 from numpy.random import Generator
 
 from .quantum_utils import *
+from .stabilizer_tableau import StabilizerTableau
 from ..constants import EPSILON
 
 
@@ -292,18 +294,21 @@ class FreeQuantumState(State):
         if len(self.entangled_states) > 1:
             num_states = len(self.entangled_states)
             state_index = self.entangled_states.index(self)
-            state0, state1, prob = measure_entangled_state_with_cache(self.state, basis, state_index, num_states)
+            state = array(self.state)
+            projector0, projector1 = basis_projectors(basis, state_index, num_states)
+            state0 = projector0 @ state
+            prob = vdot(state0, state0).real
             if rng.random() < prob:
-                new_state = state0
+                new_state = state0 / sqrt(prob)
                 result = 0
             else:
-                new_state = state1
+                new_state = (projector1 @ state) / sqrt(1 - prob)
                 result = 1
             new_state = tuple(new_state)
 
         # handle unentangled case
         else:
-            prob = measure_state_with_cache(self.state, basis)
+            prob = measure_probability(self.state, basis[0])
             if rng.random() < prob:
                 new_state = basis[0]
                 result = 0
@@ -363,21 +368,52 @@ class FreeQuantumState(State):
         state = tuple(switched_state)
 
         # math for probability calculations
-        length_diff = len(entangled_list) - len(states)
-
-        new_states, probabilities = measure_multiple_with_cache(state, basis, length_diff)
+        state = array(state)
+        projected = [projector @ state for projector in basis_projectors(basis, 0, len(entangled_list))]
+        probabilities = [max(vdot(vector, vector).real, 0) for vector in projected]
 
         possible_results = arange(0, basis_dimension, 1)
         # result gives index of the basis vector that will be projected to
         res = rng.choice(possible_results, p=probabilities)
-        # project to new state, then reassign quantum state and entangled photons
-        new_state = new_states[res]
+        # project to new state, then reassign quantum state of the entangled states (sharing the reordered list)
+        new_state = tuple(projected[res] / sqrt(probabilities[res]))
         for state in entangled_list:
-            state.quantum_state = new_state
-            state.entangled_photons = entangled_list
+            state.state = new_state
 
         return res
 
+    @staticmethod
+    def measure_batch(bases, states: list["FreeQuantumState"], rng: Generator) -> array:
+        """Method to measure multiple unentangled quantum states at once.
+
+        Gives the same results as calling `measure` on each state in order with the same generator.
+
+        Args:
+            bases (tuple[tuple[complex]] | list[tuple[tuple[complex]]]): measurement basis of all states,
+                or list with the measurement basis of each state.
+            states (list[FreeQuantumState]): list of (unentangled) quantum state objects to measure.
+            rng (Generator): random number generator for measurement
+
+        Returns:
+            array: 0/1 measurement result of each state.
+
+        Side Effects:
+            Modifies the `state` field of the measured states.
+        """
+
+        assert all(len(state.entangled_states) == 1 for state in states), "measure_batch requires unentangled states"
+        basis_vectors = asarray(bases, dtype=complex)
+        single_basis = basis_vectors.ndim == 2
+        vectors0 = basis_vectors[0] if single_basis else basis_vectors[:, 0]
+        amplitudes = array([state.state for state in states], dtype=complex).reshape(-1, 2)
+        probabilities = measure_probabilities(amplitudes, vectors0)
+        results = (rng.random(len(states)) >= probabilities).astype(int)
+
+        for i, (state, result) in enumerate(zip(states, results.tolist())):
+            state.state = bases[result] if single_basis else bases[i][result]
+
+        return results
+
 
 class BellDiagonalState(State):
     """Class to represent a 2-qubit EPR pair as Bell diagonal state.
@@ -409,3 +445,36 @@ class BellDiagonalState(State):
         # note: density matrix diagonal elements are guaranteed to be real from Hermiticity
         self.state = array(diag_elems, dtype=float)
         self.keys = keys
+
+
+class StabilizerState(State):
+    """Class to represent a group of entangled qubits as a stabilizer tableau.
+
+    Attributes:
+        state (StabilizerTableau): tableau of the state. Qubit `i` of the tableau is the qubit of `keys[i]`.
+        keys (list[int]): list of keys (subsystems) associated with this state.
+    """
+
+    def __init__(self, tableau: StabilizerTableau, keys: list[int]):
+        """Constructor for stabilizer state class.
+
+        Args:
+            tableau (StabilizerTableau): tableau of the state.
+            keys (list[int]): list of keys to this state in quantum manager.
+        """
+        super().__init__()
+        assert tableau.num_qubits == len(keys), \
+            f"Tableau of {tableau.num_qubits} qubits does not match the number of keys {len(keys)}"
+
+        self.state = tableau
+        self.keys = keys
+
+    def serialize(self) -> dict:
+        x, z, r = self.state.to_bits()
+        return {"keys": self.keys, "x": x.tolist(), "z": z.tolist(), "r": r.tolist()}
+
+    def deserialize(self, json_data) -> None:
+        self.keys = json_data["keys"]
+        self.state = StabilizerTableau.from_bits(array(json_data["x"]).reshape((-1, len(self.keys))),
+                                                 array(json_data["z"]).reshape((-1, len(self.keys))),
+                                                 json_data["r"])
@@ -1,6 +1,7 @@
 """This module defines functions and objects to manipulate quantum states.
 
 This includes cached measurement of quantum states, and certain useful operators.
+Hits and misses of the caches are reported by `cache_stats`.
 These should not be used directly, but accessed by a QuantumManager instance or by a quantum state.
 """
 
@@ -8,9 +9,11 @@ from functools import lru_cache
 from math import sqrt
 import random
 import math
-from numpy import array, kron, identity, zeros, trace, outer, eye, clip
+from numpy import array, asarray, kron, identity, zeros, trace, outer, eye, clip, cumsum, searchsorted, flatnonzero, \
+    einsum, exp, stack
 from scipy.linalg import sqrtm
 from ..constants import EPSILON
+from ..utils.encoding import polarization, time_bin
 
 
 a = array([[0, 1], [0, 0]])
@@ -20,81 +23,71 @@ povm_0 = (1/2) * (kron(a_dag @ a, eye(2)) - 1j*kron(a, a_dag) + 1j*kron(a_dag, a
 povm_1 = (1/2) * (kron(a_dag @ a, eye(2)) + 1j*kron(a, a_dag) - 1j*kron(a_dag, a) + kron(eye(2), a_dag @ a))
 
 
-@lru_cache(maxsize=1000)
-def measure_state_with_cache(state: tuple[complex, complex], basis: tuple[tuple[complex]]) -> float:
+def measure_probability(state, vector) -> float:
+    """Function to get the probability of measuring a single qubit state in a basis vector.
 
-    state = array(state)
-    u = array(basis[0], dtype=complex)
-    # measurement operator
-    M0 = outer(u.conj(), u)
+    The measurement operator of the vector `v` is `outer(v.conj(), v)`.
 
-    # probability of measuring basis[0]
-    prob_0 = (state.conj().transpose() @ M0.conj().transpose() @ M0 @ state).real
-    return prob_0
+    Args:
+        state (Sequence[complex]): 2 amplitudes of the state.
+        vector (Sequence[complex]): 2 amplitudes of the basis vector.
 
+    Returns:
+        float: probability of the outcome.
+    """
 
-@lru_cache(maxsize=1000)
-def measure_entangled_state_with_cache(state: tuple[complex], basis: tuple[tuple[complex]], state_index: int, num_states: int) \
-        -> tuple[array, array, float]:
+    v0, v1 = vector
+    amplitude = v0 * state[0] + v1 * state[1]
+    return (amplitude.real ** 2 + amplitude.imag ** 2) * (abs(v0) ** 2 + abs(v1) ** 2)
 
-    state = array(state)
-    u = array(basis[0], dtype=complex)
-    v = array(basis[1], dtype=complex)
-    # measurement operator
-    M0 = outer(u.conj(), u)
-    M1 = outer(v.conj(), v)
 
-    # generate projectors
-    projector0 = [1]
-    projector1 = [1]
-    for i in range(num_states):
-        if i == state_index:
-            projector0 = kron(projector0, M0)
-            projector1 = kron(projector1, M1)
-        else:
-            projector0 = kron(projector0, identity(2))
-            projector1 = kron(projector1, identity(2))
+def measure_probabilities(states: array, vectors: array) -> array:
+    """Function to get the probabilities of measuring single qubit states in basis vectors (vectorized `measure_probability`).
 
-    # probability of measuring basis[0]
-    prob_0 = (state.conj().transpose() @ projector0.conj().transpose() @ projector0 @ state).real
-
-    if prob_0 >= 1:
-        state1 = None
-    else:
-        state1 = (projector1 @ state) / sqrt(1 - prob_0)
+    Args:
+        states (array): amplitudes of the states, of shape (n, 2).
+        vectors (array): amplitudes of the basis vectors, of shape (2,) or (n, 2).
 
-    if prob_0 <= 0:
-        state0 = None
-    else:
-        state0 = (projector0 @ state) / sqrt(prob_0)
+    Returns:
+        array: probability of each outcome.
+    """
 
-    return state0, state1, prob_0
+    amplitudes = states @ vectors if vectors.ndim == 1 else einsum("ni,ni->n", vectors, states)
+    return abs(amplitudes) ** 2 * (abs(vectors) ** 2).sum(axis=-1)
 
 
 @lru_cache(maxsize=1000)
-def measure_multiple_with_cache(state: tuple[complex], basis: tuple[tuple[complex]], length_diff: int) \
-        -> tuple[list[array], list[float]]:
+def basis_projectors(basis: tuple[tuple[complex]], index: int = 0, num_qubits: int = 1) -> tuple[array, ...]:
+    """Function to get the projectors of the vectors of a basis on some qubits of a state.
 
-    state = array(state)
-    # construct measurement operators, projectors, and probabilities of measurement
-    projectors = [None] * len(basis)
-    probabilities = [0] * len(basis)
-    for i, vector in enumerate(basis):
+    The basis measures the consecutive qubits `index`, `index + 1`, ... of a state of `num_qubits` qubits.
+
+    Args:
+        basis (tuple[tuple[complex]]): basis vectors (2 ** m vectors of 2 ** m amplitudes, for m measured qubits).
+        index (int): index of the first measured qubit (default 0).
+        num_qubits (int): number of qubits of the state (default 1).
+
+    Returns:
+        tuple[array]: read-only projector of each basis vector.
+    """
+
+    num_measured = int(math.log2(len(basis)))
+    left = identity(2 ** index)
+    right = identity(2 ** (num_qubits - index - num_measured))
+    projectors = []
+    for vector in basis:
         vector = array(vector, dtype=complex)
-        M = outer(vector.conj(), vector)  # measurement operator
-        projectors[i] = kron(M, identity(2 ** length_diff))  # projector
-        probabilities[i] = (state.conj().transpose() @ projectors[i].conj().transpose() @ projectors[i] @ state).real
-        if probabilities[i] < 0:
-            probabilities[i] = 0
+        projector = kron(kron(left, outer(vector.conj(), vector)), right)
+        projector.flags.writeable = False
+        projectors.append(projector)
+    return tuple(projectors)
 
-    return_states = [None] * len(projectors)
-    for i, proj in enumerate(projectors):
-        # project to new state
-        if probabilities[i] > 0:
-            new_state = (proj @ state) / sqrt(probabilities[i])
-            return_states[i] = new_state
 
-    return return_states, probabilities
+# precompute the projectors of the standard encodings, for single photons and photon pairs
+for _basis in polarization["bases"] + time_bin["bases"]:
+    for _num_qubits in (1, 2):
+        for _index in range(_num_qubits):
+            basis_projectors(_basis, _index, _num_qubits)
 
 
 @lru_cache(maxsize=1000)
@@ -410,6 +403,198 @@ def density_partial_trace(state: tuple[tuple[complex]], indices: tuple[int], num
     return output_state
 
 
+def permute_ket(state: array, axes: list[int]) -> array:
+    """Permutes the qubits of a ket vector.
+
+    Args:
+        state (array): input state of `n` qubits.
+        axes (list[int]): for each qubit of the output state, the index of the qubit in the input state.
+
+    Returns:
+        array: state with qubits reordered.
+    """
+
+    num_qubits = len(axes)
+    return array(state).reshape((2,) * num_qubits).transpose(axes).reshape(2 ** num_qubits)
+
+
+def permute_density(state: array, axes: list[int]) -> array:
+    """Permutes the qubits of a density matrix.
+
+    Args:
+        state (array): input state of `n` qubits.
+        axes (list[int]): for each qubit of the output state, the index of the qubit in the input state.
+
+    Returns:
+        array: state with qubits reordered.
+    """
+
+    num_qubits = len(axes)
+    axes = list(axes) + [num_qubits + i for i in axes]
+    dim = 2 ** num_qubits
+    return array(state).reshape((2,) * (2 * num_qubits)).transpose(axes).reshape((dim, dim))
+
+
+def apply_unitary_ket(state: array, unitary: array, axes: list[int] = None) -> array:
+    """Applies a unitary to the first qubits of a ket vector.
+
+    The unitary acts on the first `k` qubits (for a `2^k` by `2^k` unitary), without padding it to the size of the state.
+
+    Args:
+        state (array): input state of `n` qubits.
+        unitary (array): unitary of `k <= n` qubits.
+        axes (list[int]): if given, the qubits are first reordered (see `permute_ket`) (default None).
+
+    Returns:
+        array: output state (in the qubit order given by `axes`).
+    """
+
+    if axes is not None:
+        state = permute_ket(state, axes)
+    dim = len(unitary)
+    return (unitary @ array(state).reshape((dim, -1))).reshape(-1)
+
+
+def apply_unitary_density(state: array, unitary: array, axes: list[int] = None) -> array:
+    """Applies a unitary to the first qubits of a density matrix.
+
+    Computes `(U ⊗ I) rho (U ⊗ I)^dagger`, by contracting `U` with the row and column indices of the first `k` qubits.
+
+    Args:
+        state (array): input state of `n` qubits.
+        unitary (array): unitary of `k <= n` qubits.
+        axes (list[int]): if given, the qubits are first reordered (see `permute_density`) (default None).
+
+    Returns:
+        array: output state (in the qubit order given by `axes`).
+    """
+
+    if axes is not None:
+        state = permute_density(state, axes)
+    state = array(state)
+    total = len(state)
+    dim = len(unitary)
+    rest = total // dim
+    # rows: U @ rho
+    temp = (unitary @ state.reshape((dim, rest * total))).reshape((total, dim, rest))
+    # columns: (U @ rho) @ U^dagger, contracted on the column index of the first qubits
+    temp = (temp.transpose((0, 2, 1)) @ unitary.conj().T).transpose((0, 2, 1))
+    return temp.reshape((total, total))
+
+
+def sample_outcome(probabilities: array, meas_samp: float) -> int:
+    """Samples a measurement outcome from a single random number.
+
+    The outcome is the first index `i` with `meas_samp < sum(probabilities[:i + 1])`,
+    so that for a single qubit the result is 0 if `meas_samp < prob_0`.
+
+    Args:
+        probabilities (array): probabilities of the outcomes.
+        meas_samp (float): random number between 0 and 1.
+
+    Returns:
+        int: index of the outcome.
+    """
+
+    result = int(searchsorted(cumsum(probabilities), meas_samp, side="right"))
+    if result == len(probabilities):
+        # rounding errors: the total probability is slightly below meas_samp
+        result = int(flatnonzero(probabilities)[-1])
+    return result
+
+
+def measure_ket(state: array, start: int, num_measured: int, meas_samp: float) -> tuple[int, array]:
+    """Measures consecutive qubits of a ket vector in the computational basis.
+
+    The probabilities of all outcomes are obtained at once, by summing `|amplitude|^2` over the unmeasured qubits.
+
+    Args:
+        state (array): input state of `n` qubits.
+        start (int): index of the first measured qubit.
+        num_measured (int): number of measured qubits (from `start`).
+        meas_samp (float): random number between 0 and 1 used for measurement (see `sample_outcome`).
+
+    Returns:
+        tuple[int, array]: measurement result (big-endian over the measured qubits),
+            and normalized state of the unmeasured qubits.
+    """
+
+    amplitudes = asarray(state).reshape((2 ** start, 2 ** num_measured, -1))
+    probabilities = (amplitudes.conj() * amplitudes).real.sum(axis=(0, 2))
+    result = sample_outcome(clip(probabilities, 0, 1), meas_samp)
+    output = amplitudes[:, result, :].reshape(-1) / sqrt(probabilities[result])
+    return result, output
+
+
+def measure_density(state: array, start: int, num_measured: int, meas_samp: float) -> tuple[int, array]:
+    """Measures consecutive qubits of a density matrix in the computational basis.
+
+    The probabilities of all outcomes are obtained at once from the diagonal of the density matrix.
+    The output state is `P rho P / p` for the projector `P` of the outcome,
+    so the measured qubits are kept (in the state of the outcome).
+
+    Args:
+        state (array): input state of `n` qubits.
+        start (int): index of the first measured qubit.
+        num_measured (int): number of measured qubits (from `start`).
+        meas_samp (float): random number between 0 and 1 used for measurement (see `sample_outcome`).
+
+    Returns:
+        tuple[int, array]: measurement result (big-endian over the measured qubits), and output state.
+    """
+
+    state = asarray(state)
+    total = len(state)
+    shape = (2 ** start, 2 ** num_measured, total >> (start + num_measured))
+    probabilities = state.diagonal().real.reshape(shape).sum(axis=(0, 2))
+    result = sample_outcome(clip(probabilities, 0, 1), meas_samp)
+    output = zeros(shape + shape, dtype=complex)
+    output[:, result, :, :, result, :] = state.reshape(shape + shape)[:, result, :, :, result, :] / probabilities[result]
+    return result, output.reshape((total, total))
+
+
+# BDS_XOR[i, j] = i ^ j: Pauli errors (in I, Z, X, Y order) compose as the XOR of their indices (up to a phase)
+BDS_XOR = array([[i ^ j for j in range(4)] for i in range(4)])
+
+
+def bds_convolve(errors: array, states: array) -> array:
+    """Applies Pauli channels to Bell diagonal states.
+
+    A Pauli channel with error probabilities `p` (in I, Z, X, Y order) acting on one qubit of a Bell diagonal state `s`
+    gives the state `s'[k] = sum_j p[k ^ j] * s[j]`.
+    The same formula gives the state after entanglement swapping of two Bell diagonal states.
+
+    Args:
+        errors (array): probabilities of the Pauli errors, of shape (m, 4).
+        states (array): diagonal elements of Bell diagonal states, of shape (m, 4).
+
+    Returns:
+        array: diagonal elements of the output states, of shape (m, 4).
+    """
+
+    return einsum("mkj,mj->mk", errors[:, BDS_XOR], states)
+
+
+def bds_pauli_errors(rates: array, durations: array) -> array:
+    """Computes the Pauli error probabilities of memories idling under Pauli decoherence.
+
+    See the entanglement purification (recurrence protocol) paper for the formulae.
+
+    Args:
+        rates (array): X, Y, Z error rates (in 1/s) of the memories, of shape (m, 3).
+        durations (array): idling durations (in s), of shape (m,).
+
+    Returns:
+        array: probabilities of the I, Z, X, Y errors, of shape (m, 4).
+    """
+
+    x_rate, y_rate, z_rate = rates.T
+    a = exp(-2 * (x_rate + y_rate) * durations)
+    b = exp(-2 * (x_rate + z_rate) * durations)
+    c = exp(-2 * (z_rate + y_rate) * durations)
+    return stack([1 + a + b + c, 1 + a - b - c, 1 - a - b + c, 1 - a + b - c], axis=1) / 4
+
+
 def random_state() -> list:
     """Generate a random pure state vector for a single qubit.
     
@@ -494,3 +679,14 @@ def pretty_ket(vector, precision: int = 4, tolerance: float = EPSILON) -> str:
         terms.append(f"({coef}) |{k}⟩")
 
     return " + ".join(terms) if terms else "0"
+
+
+def cache_stats() -> dict:
+    """Function to get the statistics of the caches of this module.
+
+    Returns:
+        dict[str, CacheInfo]: hits, misses, maximum and current size of the cache of each cached function.
+    """
+
+    return {name: function.cache_info() for name, function in globals().items()
+            if callable(function) and hasattr(function, "cache_info")}
@@ -0,0 +1,155 @@
+"""Definition of the random number services of a simulation.
+
+This module defines the RandomService class, deriving independent random generators for the entities of a timeline,
+and the RandomStream class, serving random numbers from pre-generated blocks.
+Generators are derived from the name of an entity (not from its creation order),
+so that they do not change when a network is built in a different order.
+"""
+
+from numpy.random import Generator, SeedSequence, default_rng
+
+
+# spawn key word appended to the seed sequence of a generator to derive the seed sequence of its stream
+# (names only give words from 0 to 255, see `RandomService.seed_sequence`)
+STREAM_SPAWN_KEY = 256
+
+
+def stream_seed_sequence(seed_sequence: SeedSequence) -> SeedSequence:
+    """Function to derive the seed sequence of the stream of a generator, independent of the generator.
+
+    Args:
+        seed_sequence (SeedSequence): seed sequence of the generator.
+
+    Returns:
+        SeedSequence: seed sequence of the stream.
+    """
+
+    return SeedSequence(seed_sequence.entropy, spawn_key=seed_sequence.spawn_key + (STREAM_SPAWN_KEY,))
+
+
+class RandomStream:
+    """Class serving random numbers from pre-generated blocks.
+
+    Each kind of random number (and each Poisson mean) is drawn from the generator `block_size` numbers at a time,
+    saving the overhead of a generator call per number.
+    Numbers are reproducible for a given seed and block size.
+
+    Attributes:
+        generator (Generator): generator of the blocks.
+        block_size (int): number of random numbers drawn at once.
+    """
+
+    BLOCK_SIZE = 1024
+
+    def __init__(self, generator: Generator, block_size: int = BLOCK_SIZE):
+        """Constructor for the random stream class.
+
+        Args:
+            generator (Generator): generator of the blocks.
+            block_size (int): number of random numbers drawn at once (default 1024).
+        """
+
+        assert block_size > 0
+        self.generator: Generator = generator
+        self.block_size: int = block_size
+        self._uniform: list[float] = []
+        self._exponential: list[float] = []
+        self._poisson: dict[float, list[int]] = {}
+
+    def uniform(self) -> float:
+        """Method to get a random number uniformly distributed in [0, 1) (as `Generator.random()`)."""
+
+        if not self._uniform:
+            self._uniform = self.generator.random(self.block_size)[::-1].tolist()
+        return self._uniform.pop()
+
+    def exponential(self, scale: float = 1.0) -> float:
+        """Method to get an exponentially distributed random number.
+
+        Args:
+            scale (float): mean of the distribution (default 1.0).
+        """
+
+        if not self._exponential:
+            self._exponential = self.generator.standard_exponential(self.block_size)[::-1].tolist()
+        return scale * self._exponential.pop()
+
+    def poisson(self, lam: float) -> int:
+        """Method to get a Poisson distributed random number.
+
+        Args:
+            lam (float): mean of the distribution.
+        """
+
+        block = self._poisson.get(lam)
+        if not block:
+            block = self.generator.poisson(lam, self.block_size)[::-1].tolist()
+            self._poisson[lam] = block
+        return block.pop()
+
+
+class RandomService:
+    """Class deriving the random generators of the entities of a timeline.
+
+    The generator of an entity is seeded by a child of the root seed sequence, with a spawn key given by the name of the
+    entity. Generators are thus independent, and reproducible for a given root seed whatever the order of creation.
+
+    Attributes:
+        root (SeedSequence): root seed sequence (random if no seed is given).
+        block_size (int): block size of the random streams.
+    """
+
+    def __init__(self, seed: int = None, block_size: int = RandomStream.BLOCK_SIZE):
+        """Constructor for the random service class.
+
+        Args:
+            seed (int): root seed (default None, i.e. fresh entropy from the operating system).
+            block_size (int): block size of the random streams (default 1024).
+        """
+
+        self.root: SeedSequence = SeedSequence(seed)
+        self.block_size: int = block_size
+
+    def seed(self, seed: int) -> None:
+        """Method to reset the root seed.
+
+        Generators and streams already derived are not changed.
+        """
+
+        self.root = SeedSequence(seed)
+
+    def seed_sequence(self, name: str) -> SeedSequence:
+        """Method to get the seed sequence of an entity.
+
+        Args:
+            name (str): name of the entity.
+
+        Returns:
+            SeedSequence: child of the root seed sequence, with the UTF-8 bytes of the name appended to its spawn key.
+        """
+
+        return SeedSequence(self.root.entropy, spawn_key=self.root.spawn_key + tuple(name.encode()))
+
+    def generator(self, name: str) -> Generator:
+        """Method to get a new generator for an entity.
+
+        Args:
+            name (str): name of the entity.
+
+        Returns:
+            Generator: generator seeded by `seed_sequence(name)`.
+        """
+
+        return default_rng(self.seed_sequence(name))
+
+    def stream(self, name: str) -> RandomStream:
+        """Method to get a new random stream for an entity, independent of the generator of the entity.
+
+        Args:
+            name (str): name of the entity.
+
+        Returns:
+            RandomStream: stream with a generator seeded by `stream_seed_sequence(seed_sequence(name))`.
+        """
+
+        return RandomStream(default_rng(stream_seed_sequence(self.seed_sequence(name))), self.block_size)
@@ -0,0 +1,406 @@
+"""Definition of the stabilizer tableau.
+
+This module defines the StabilizerTableau class, which represents a stabilizer state of `n` qubits
+with the tableau of Aaronson and Gottesman (CHP): `n` destabilizer and `n` stabilizer generators (Pauli strings) with their signs.
+Clifford gates and measurements in the computational basis update the tableau in `O(n)` and `O(n^2)` time respectively,
+so that states of hundreds of entangled qubits can be simulated.
+
+The X and Z bits of the generators are packed in bytes (qubit `j` is bit `j % 8` of byte `j // 8`),
+so that the product of generators operates on whole bytes.
+"""
+
+from math import pi
+
+import numpy as np
+from numpy.typing import NDArray
+
+# single-qubit Clifford gates of `Circuit`, as sequences of elementary gates (up to global phase)
+CLIFFORD_DECOMPOSITIONS = {
+    'root_iZ': ['sdg'],
+    'minus_root_iZ': ['s'],
+    'root_iY': ['h', 'z'],
+    'minus_root_iY': ['z', 'h'],
+}
+_QUARTER_TURNS = {0: [], 1: ['s'], 2: ['z'], 3: ['sdg']}
+_INVERSE = {'s': 'sdg', 'sdg': 's'}
+
+
+class StabilizerTableau:
+    """Class of the stabilizer tableau of a state of `n` qubits.
+
+    Rows `0` to `n - 1` are the destabilizer generators, and rows `n` to `2n - 1` the stabilizer generators.
+    Row `i` represents the Pauli string `(-1)^r[i] P_0 ⊗ ... ⊗ P_{n-1}`,
+    where `P_j` is I, X, Z or Y for the bits `(x, z)` of qubit `j` equal to (0, 0), (1, 0), (0, 1) or (1, 1).
+
+    Attributes:
+        num_qubits (int): number of qubits of the state.
+        x (NDArray): packed X bits of the generators (`2n` rows of `ceil(n / 8)` bytes).
+        z (NDArray): packed Z bits of the generators.
+        r (NDArray): sign bits of the generators.
+    """
+
+    def __init__(self, num_qubits: int):
+        """Constructor of the tableau of the state |0...0>.
+
+        Args:
+            num_qubits (int): number of qubits.
+        """
+        self.num_qubits = num_qubits
+        width = (num_qubits + 7) // 8
+        self.x = np.zeros((2 * num_qubits, width), dtype=np.uint8)
+        self.z = np.zeros((2 * num_qubits, width), dtype=np.uint8)
+        self.r = np.zeros(2 * num_qubits, dtype=np.uint8)
+        qubits = np.arange(num_qubits)
+        masks = (1 << (qubits & 7)).astype(np.uint8)
+        self.x[qubits, qubits >> 3] = masks
+        self.z[qubits + num_qubits, qubits >> 3] = masks
+
+    def copy(self) -> "StabilizerTableau":
+        tableau = StabilizerTableau.__new__(StabilizerTableau)
+        tableau.num_qubits = self.num_qubits
+        tableau.x = self.x.copy()
+        tableau.z = self.z.copy()
+        tableau.r = self.r.copy()
+        return tableau
+
+    def __str__(self):
+        x, z, r = self.to_bits()
+        rows = ["+-"[sign] + "".join("IXZY"[xb + 2 * zb] for xb, zb in zip(x_row, z_row))
+                for x_row, z_row, sign in zip(x, z, r)]
+        return "\n".join(["destabilizers:", *rows[:self.num_qubits], "stabilizers:", *rows[self.num_qubits:]])
+
+    @classmethod
+    def from_bits(cls, x: NDArray, z: NDArray, r: NDArray) -> "StabilizerTableau":
+        """Create a tableau from unpacked bits.
+
+        Args:
+            x (NDArray): X bits of the generators (`2n` by `n`).
+            z (NDArray): Z bits of the generators (`2n` by `n`).
+            r (NDArray): sign bits of the generators (`2n`).
+
+        Returns:
+            StabilizerTableau: the tableau.
+        """
+        tableau = StabilizerTableau.__new__(StabilizerTableau)
+        tableau.num_qubits = x.shape[1]
+        tableau.x = np.packbits(np.asarray(x, dtype=np.uint8), axis=1, bitorder="little")
+        tableau.z = np.packbits(np.asarray(z, dtype=np.uint8), axis=1, bitorder="little")
+        tableau.r = np.array(r, dtype=np.uint8)
+        return tableau
+
+    def to_bits(self) -> tuple[NDArray, NDArray, NDArray]:
+        """Method to unpack the bits of the tableau.
+
+        Returns:
+            tuple[NDArray, NDArray, NDArray]: X bits, Z bits (`2n` by `n`) and sign bits (`2n`).
+        """
+        x = np.unpackbits(self.x, axis=1, count=self.num_qubits, bitorder="little")
+        z = np.unpackbits(self.z, axis=1, count=self.num_qubits, bitorder="little")
+        return x, z, self.r.copy()
+
+    @classmethod
+    def from_ket(cls, amplitudes) -> "StabilizerTableau":
+        """Create the tableau of a stabilizer state given as a ket vector.
+
+        The vector is reduced to |0...0> by a Clifford circuit (X and CX gates moving its support,
+        phase and CZ gates removing its phases, then H gates); the tableau is obtained by applying the inverse circuit to |0...0>.
+
+        Args:
+            amplitudes: amplitudes of the state (qubit 0 is the most significant bit of the index).
+
+        Returns:
+            StabilizerTableau: tableau of the state.
+
+        Raises:
+            ValueError: if the vector is not a stabilizer state.
+        """
+        state = np.array(amplitudes, dtype=complex)
+        num_qubits = int(np.log2(len(state)))
+        if len(state) != 2 ** num_qubits:
+            raise ValueError(f"length of amplitudes {len(state)} is not a power of 2")
+        state = state / np.linalg.norm(state)
+        tol = 1e-6
+        gates = []
+
+        def apply(name: str, qubits: list[int]):
+            nonlocal state
+            gates.append((name, qubits))
+            state = _apply_ket_gate(state, num_qubits, name, qubits)
+
+        def index(qubits) -> int:
+            return sum(1 << (num_qubits - 1 - q) for q in qubits)
+
+        # move a nonzero amplitude to |0...0>
+        offset = int(np.flatnonzero(np.abs(state) > tol)[0])
+        for q in range(num_qubits):
+            if offset >> (num_qubits - 1 - q) & 1:
+                apply('x', [q])
+
+        # reduced basis of the support, and CX gates mapping it to the pivot qubits
+        basis = {}  # pivot qubit -> basis vector (int index)
+        for idx in np.flatnonzero(np.abs(state) > tol):
+            vec = int(idx)
+            for pivot, b in basis.items():
+                if vec >> (num_qubits - 1 - pivot) & 1:
+                    vec ^= b
+            if vec == 0:
+                continue
+            pivot = num_qubits - vec.bit_length()
+            for other in basis:
+                if basis[other] >> (num_qubits - 1 - pivot) & 1:
+                    basis[other] ^= vec
+            basis[pivot] = vec
+        if 2 ** len(basis) != np.count_nonzero(np.abs(state) > tol):
+            raise ValueError("amplitudes do not represent a stabilizer state")
+        for pivot, vec in basis.items():
+            for q in range(num_qubits):
+                if q != pivot and vec >> (num_qubits - 1 - q) & 1:
+                    apply('cx', [pivot, q])
+
+        # remove the phases of the support, then map the uniform superposition to |0...0>
+        pivots = sorted(basis)
+        for p in pivots:
+            turns = int(np.round(np.angle(state[index([p])] / state[0]) / (pi / 2))) % 4
+            for name in _QUARTER_TURNS[(4 - turns) % 4]:
+                apply(name, [p])
+        for i, p in enumerate(pivots):
+            for q in pivots[i + 1:]:
+                if (state[index([p, q])] / state[0]).real < 0:
+                    apply('cz', [p, q])
+        for p in pivots:
+            apply('h', [p])
+        if abs(abs(state[0]) - 1) > tol:
+            raise ValueError("amplitudes do not represent a stabilizer state")
+
+        tableau = cls(num_qubits)
+        for name, qubits in reversed(gates):
+            tableau.apply_gate(_INVERSE.get(name, name), qubits)
+        return tableau
+
+    def to_ket(self) -> NDArray:
+        """Method to compute the ket vector of the state (for a small number of qubits).
+
+        The state is obtained by projecting a vector on the +1 eigenspace of each stabilizer generator.
+        The global phase is chosen so that the first nonzero amplitude is real and positive.
+
+        Returns:
+            NDArray: amplitudes of the state (qubit 0 is the most significant bit of the index).
+        """
+        n = self.num_qubits
+        rng = np.random.default_rng(0)
+        state = rng.normal(size=2 ** n) + 1j * rng.normal(size=2 ** n)
+        x, z, r = self.to_bits()
+        weights = 1 << np.arange(n - 1, -1, -1)
+        indices = np.arange(2 ** n)
+        for row in range(n, 2 * n):
+            x_mask = int(x[row] @ weights)
+            z_mask = int(z[row] @ weights)
+            # (-1)^r i^(number of Y) X^x Z^z
+            phase = (-1) ** int(r[row]) * 1j ** int(np.count_nonzero(x[row] & z[row]))
+            signs = 1 - 2 * (np.bitwise_count(indices & z_mask) & 1).astype(int)
+            applied = np.empty_like(state)
+            applied[indices ^ x_mask] = phase * signs * state
+            state = (state + applied) / 2
+        state /= np.linalg.norm(state)
+        first = state[np.flatnonzero(np.abs(state) > 1e-9)[0]]
+        return state * abs(first) / first
+
+    def combine(self, other: "StabilizerTableau") -> "StabilizerTableau":
+        """Method to compute the tableau of the tensor product of two states.
+
+        Args:
+            other (StabilizerTableau): tableau of the second state (its qubits follow the qubits of this state).
+
+        Returns:
+            StabilizerTableau: tableau of the product state.
+        """
+        n1, n2 = self.num_qubits, other.num_qubits
+        n = n1 + n2
+        width = (n + 7) // 8
+        tableau = StabilizerTableau.__new__(StabilizerTableau)
+        tableau.num_qubits = n
+        # destabilizers of both states, then stabilizers of both states
+        for name in ('x', 'z'):
+            bits = np.zeros((2 * n, width), dtype=np.uint8)
+            bits1 = getattr(self, name)
+            bits[:n1, :bits1.shape[1]] = bits1[:n1]
+            bits[n:n + n1, :bits1.shape[1]] = bits1[n1:]
+            # bits of the other state are shifted by n1 qubits
+            shifted = np.zeros((2 * n2, 8 * width), dtype=np.uint8)
+            shifted[:, n1:n] = np.unpackbits(getattr(other, name), axis=1, count=n2, bitorder="little")
+            shifted = np.packbits(shifted, axis=1, bitorder="little")
+            bits[n1:n] |= shifted[:n2]
+            bits[n + n1:] |= shifted[n2:]
+            setattr(tableau, name, bits)
+        tableau.r = np.concatenate([self.r[:n1], other.r[:n2], self.r[n1:], other.r[n2:]])
+        return tableau
+
+    def _column(self, bits: NDArray, qubit: int) -> NDArray:
+        return (bits[:, qubit >> 3] >> (qubit & 7)) & 1
+
+    def h(self, qubit: int) -> None:
+        b, s = qubit >> 3, qubit & 7
+        xq, zq = self._column(self.x, qubit), self._column(self.z, qubit)
+        self.r ^= xq & zq
+        diff = (xq ^ zq) << s
+        self.x[:, b] ^= diff
+        self.z[:, b] ^= diff
+
+    def s(self, qubit: int) -> None:
+        xq, zq = self._column(self.x, qubit), self._column(self.z, qubit)
+        self.r ^= xq & zq
+        self.z[:, qubit >> 3] ^= xq << (qubit & 7)
+
+    def sdg(self, qubit: int) -> None:
+        xq, zq = self._column(self.x, qubit), self._column(self.z, qubit)
+        self.r ^= xq & (zq ^ 1)
+        self.z[:, qubit >> 3] ^= xq << (qubit & 7)
+
+    def x_gate(self, qubit: int) -> None:
+        self.r ^= self._column(self.z, qubit)
+
+    def y_gate(self, qubit: int) -> None:
+        self.r ^= self._column(self.x, qubit) ^ self._column(self.z, qubit)
+
+    def z_gate(self, qubit: int) -> None:
+        self.r ^= self._column(self.x, qubit)
+
+    def cx(self, control: int, target: int) -> None:
+        xc, zc = self._column(self.x, control), self._column(self.z, control)
+        xt, zt = self._column(self.x, target), self._column(self.z, target)
+        self.r ^= xc & zt & (xt ^ zc ^ 1)
+        self.x[:, target >> 3] ^= xc << (target & 7)
+        self.z[:, control >> 3] ^= zt << (control & 7)
+
+    def cz(self, control: int, target: int) -> None:
+        self.h(target)
+        self.cx(control, target)
+        self.h(target)
+
+    def swap(self, qubit1: int, qubit2: int) -> None:
+        for bits in (self.x, self.z):
+            diff = self._column(bits, qubit1) ^ self._column(bits, qubit2)
+            bits[:, qubit1 >> 3] ^= diff << (qubit1 & 7)
+            bits[:, qubit2 >> 3] ^= diff << (qubit2 & 7)
+
+    def apply_gate(self, name: str, qubits: list[int], arg: float = None) -> None:
+        """Method to apply a Clifford gate of `Circuit`.
+
+        Args:
+            name (str): name of the gate (as in `Circuit.gates`).
+            qubits (list[int]): qubits of the gate.
+            arg (float): argument of the gate (angle of the `phase` gate).
+
+        Raises:
+            ValueError: if the gate is not a Clifford gate.
+        """
+        if name in ('x', 'y', 'z'):
+            getattr(self, name + '_gate')(*qubits)
+        elif name in ('h', 's', 'sdg', 'cx', 'cz', 'swap'):
+            getattr(self, name)(*qubits)
+        elif name in CLIFFORD_DECOMPOSITIONS:
+            for elementary in CLIFFORD_DECOMPOSITIONS[name]:
+                self.apply_gate(elementary, qubits)
+        elif name == 'phase' and abs(arg / (pi / 2) - round(arg / (pi / 2))) < 1e-9:
+            for elementary in _QUARTER_TURNS[round(arg / (pi / 2)) % 4]:
+                self.apply_gate(elementary, qubits)
+        else:
+            raise ValueError(f"gate '{name}' is not a Clifford gate supported by the stabilizer formalism")
+
+    def _rowsum(self, targets: NDArray, source: int) -> None:
+        """Multiply the generators `targets` by the generator `source` (rowsum of CHP)."""
+
+        if len(targets) == 0:
+            return
+        x1, z1 = self.x[source], self.z[source]
+        x2, z2 = self.x[targets], self.z[targets]
+        # exponent of i in the product of the Pauli matrices, summed over qubits
+        plus = (x1 & z1 & z2 & ~x2) | (x1 & ~z1 & z2 & x2) | (~x1 & z1 & x2 & ~z2)
+        minus = (x1 & z1 & x2 & ~z2) | (x1 & ~z1 & z2 & ~x2) | (~x1 & z1 & x2 & z2)
+        exponent = np.bitwise_count(plus).sum(axis=1, dtype=np.int64) - np.bitwise_count(minus).sum(axis=1, dtype=np.int64)
+        exponent += 2 * self.r[targets].astype(np.int64) + 2 * int(self.r[source])
+        self.r[targets] = (exponent % 4) // 2
+        self.x[targets] ^= x1
+        self.z[targets] ^= z1
+
+    def measure(self, qubit: int, outcome: int) -> tuple[int, bool]:
+        """Method to measure a qubit in the computational basis, and remove it from the tableau.
+
+        The measured qubit is in a product state with the other qubits after measurement, so its generators are removed.
+        The last qubit of the tableau then takes the index of the measured qubit.
+
+        Args:
+            qubit (int): index of the measured qubit.
+            outcome (int): result of the measurement if the result is random.
+
+        Returns:
+            tuple[int, bool]: measurement result, and whether the result was random.
+        """
+        n = self.num_qubits
+        xq = self._column(self.x, qubit)
+        stabilizers = np.flatnonzero(xq[n:]) + n
+        if len(stabilizers) > 0:
+            # random result: the stabilizer p anticommuting with Z becomes the destabilizer of Z
+            p = stabilizers[0]
+            others = np.flatnonzero(xq)
+            self._rowsum(others[others != p], p)
+            self.x[p - n], self.z[p - n], self.r[p - n] = self.x[p], self.z[p], self.r[p]
+            self.x[p] = 0
+            self.z[p] = 0
+            self.z[p, qubit >> 3] = 1 << (qubit & 7)
+            self.r[p] = outcome
+            random = True
+        else:
+            # deterministic result: Z is the product of the stabilizers paired with the destabilizers anticommuting with Z
+            destabilizers = np.flatnonzero(xq[:n])
+            p = destabilizers[0] + n
+            for i in destabilizers[1:]:
+                self._rowsum(np.array([p]), i + n)
+                self.x[i] ^= self.x[p - n]
+                self.z[i] ^= self.z[p - n]
+            outcome = int(self.r[p])
+            random = False
+
+        # stabilizer p is now +-Z of the qubit: remove Z from the other generators
+        zq = self._column(self.z, qubit)
+        stabilizers = np.flatnonzero(zq[n:]) + n
+        self._rowsum(stabilizers[stabilizers != p], p)
+        destabilizers = np.flatnonzero(zq[:n])
+        destabilizers = destabilizers[destabilizers != p - n]
+        self.z[destabilizers, qubit >> 3] ^= np.uint8(1 << (qubit & 7))
+
+        # the last qubit takes the place of the measured qubit, so that the bits are not shifted
+        self.swap(qubit, n - 1)
+        self.x = np.delete(self.x, [p - n, p], axis=0)[:, :(n + 6) // 8]
+        self.z = np.delete(self.z, [p - n, p], axis=0)[:, :(n + 6) // 8]
+        self.r = np.delete(self.r, [p - n, p])
+        self.num_qubits = n - 1
+        return outcome, random
+
+
+def _apply_ket_gate(state: NDArray, num_qubits: int, name: str, qubits: list[int]) -> NDArray:
+    """Apply an elementary Clifford gate to a ket vector (used by `StabilizerTableau.from_ket`)."""
+
+    tensor = state.reshape((2,) * num_qubits).copy()
+
+    def where(*values) -> tuple:
+        index = [slice(None)] * num_qubits
+        for q, v in zip(qubits, values):
+            index[q] = v
+        return tuple(index)
+
+    if name == 'x':
+        tensor = np.flip(tensor, axis=qubits[0])
+    elif name == 'cx':
+        control, target = qubits
+        sub = tensor[where(1)]
+        tensor[where(1)] = np.flip(sub, axis=target - (target > control))
+    elif name == 'h':
+        zero, one = tensor[where(0)].copy(), tensor[where(1)].copy()
+        tensor[where(0)] = (zero + one) / np.sqrt(2)
+        tensor[where(1)] = (zero - one) / np.sqrt(2)
+    elif name == 'cz':
+        tensor[where(1, 1)] *= -1
+    else:
+        tensor[where(1)] *= {'s': 1j, 'sdg': -1j, 'z': -1}[name]
+    return tensor.reshape(-1)
@@ -3,11 +3,10 @@
 This module defines the Timeline class, which provides an interface for the simulation kernel and drives event execution.
 All entities are required to have an attached timeline for simulation.
 """
-from _thread import start_new_thread
 from datetime import timedelta
-from sys import stdout
-from time import sleep, time_ns
-from typing import TYPE_CHECKING, Optional, TypeVar
+from logging import DEBUG
+from time import perf_counter_ns, time_ns
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
 
 from numpy import random
 
@@ -15,8 +14,12 @@ if TYPE_CHECKING:
     from .event import Event
     from .entity import Entity
 
+from .checkpoint import load_checkpoint, save_checkpoint
 from .eventlist import EventList
+from .profiler import EventProfiler, RunStats, print_progress, run_stats
 from .quantum_manager import QuantumManager
+from .random_service import RandomService
+from ..constants import HEAP_EVENT_QUEUE
 from ..utils import log
 
 # for timeline formatting
@@ -24,7 +27,6 @@ NANOSECONDS_PER_MILLISECOND = 10**6
 PICOSECONDS_PER_NANOSECOND  = 10**3
 NANOSECONDS_PER_MICROSECOND = 10**3
 MILLISECONDS_PER_SECOND = 10**3
-CARRIAGE_RETURN = '\r'
 
 T = TypeVar("T", bound="Entity")
 
@@ -40,7 +42,15 @@ class Timeline:
     The process of popped event is executed.
     The simulation stops if the timestamp on popped event is equal or larger than the stop time, or if the eventlist is empty.
 
-    To monitor the progress of simulation, the Timeline.show_progress attribute can be modified to show/hide a progress bar.
+    To monitor the progress of simulation, the Timeline.show_progress attribute can be modified to show/hide a progress bar,
+    or a progress callback can be set to receive the progress (`RunStats`) every `progress_interval` seconds.
+    An event profiler can also be enabled with `enable_profiler` (see `EventProfiler`).
+    Without progress report or profiler, the execution loop is not instrumented.
+
+    A stopped simulation can be saved with `checkpoint` and continued from the saved point with `restore`.
+
+    Class Attributes:
+        PROGRESS_CHECK_EVENTS (int): number of executed events between two reads of the wall clock for progress reports.
 
     Attributes:
         events (EventList): the event list of timeline.
@@ -50,18 +60,28 @@ class Timeline:
         schedule_counter (int): the counter of scheduled events
         run_counter (int): the counter of executed events
         is_running (bool): records if the simulation has stopped executing events.
-        show_progress (bool): show/hide the progress bar of simulation.
+        show_progress (bool): show/hide the progress bar of simulation (printed by `print_progress`).
+        progress_callback (Callable[[RunStats], None] | None): function called with the progress of the simulation.
+        progress_interval (float): wall time (s) between two progress reports (default 3).
+        profiler (EventProfiler | None): profiler of the executed events.
         quantum_manager (QuantumManager): quantum state manager.
+        random_service (RandomService): random generators of the entities (used by nodes created without a seed).
     """
-    def __init__(self, stop_time: int = 10 ** 23, formalism: str = None, truncation: int = 1):
+
+    PROGRESS_CHECK_EVENTS = 1024
+
+    def __init__(self, stop_time: int = 10 ** 23, formalism: str = None, truncation: int = 1,
+                 event_queue: str = HEAP_EVENT_QUEUE, seed: int = None):
         """Constructor for timeline.
 
         Args:
             stop_time (int): stop time (in ps) of simulation (default 10 ** 23, approximately 3000 years).
             formalism (str): formalism of quantum state representation.
             truncation (int): truncation of Hilbert space (currently only for Fock representation).
+            event_queue (str): name of the registered event queue implementation (default "heap").
+            seed (int): root seed of the random service (default None, i.e. not reproducible).
         """
-        self.events: EventList = EventList()
+        self.events: EventList = EventList.create(event_queue)
         self.entities: dict[str, "Entity"] = {}
         self.time: int = 0
         self.stop_time: int = stop_time
@@ -69,11 +89,15 @@ class Timeline:
         self.run_counter: int = 0
         self.is_running: bool = False
         self.show_progress: bool = False
+        self.progress_callback: Callable[[RunStats], None] | None = None
+        self.progress_interval: float = 3
+        self.profiler: EventProfiler | None = None
 
         if formalism:
             QuantumManager.set_global_manager_formalism(formalism)
 
         self.quantum_manager: QuantumManager = QuantumManager.create(truncation=truncation)
+        self.random_service: RandomService = RandomService(seed)
 
     def now(self) -> int:
         """Returns current simulation time."""
@@ -85,7 +109,7 @@ class Timeline:
             event.process.owner = self.get_entity_by_name(event.process.owner)
         self.schedule_counter += 1
         event.process.number = self.schedule_counter
-        if event.process.activation == 'expire':
+        if event.process.activation == 'expire' and log.logger.isEnabledFor(DEBUG):
             log.logger.debug(f'Scheduled expiry with ID:#{event.process.number}: Process owner={event.process.owner}, at time {event.time}')  # Log scheduled events
         self.events.push(event)
 
@@ -95,42 +119,200 @@ class Timeline:
         for entity in self.entities.values():
             entity.init()
 
-    def run(self) -> None:
+    def run(self, fast: bool = False) -> None:
         """Main simulation method.
 
         The `run` method begins simulation of events.
         Events are continuously popped and executed, until the simulation time limit is reached or events are exhausted.
         A progress bar may also be displayed, if the `show_progress` flag is set.
+        With a progress callback, `show_progress` or a profiler, the instrumented loop is used (see `_run_instrumented`),
+        even if `fast` is True.
+
+        Args:
+            fast (bool): use the fast execution loop (see `_run_fast`) when progress is not reported and the profiler is
+                disabled (default False).
         """
         log.logger.info("Timeline start simulation")
         tick = time_ns()
         self.is_running = True
 
-        if self.show_progress:
-            self.progress_bar()
+        callback = self.progress_callback
+        if callback is None and self.show_progress:
+            callback = print_progress
+
+        if callback is not None or self.profiler is not None:
+            self._run_instrumented(callback)
+        elif fast:
+            self._run_fast()
+        else:
+            debug = log.logger.isEnabledFor(DEBUG)
+            while len(self.events) > 0:
+                event = self.events.pop()
+
+                if event.time >= self.stop_time:
+                    self.schedule(event)  # return to event list
+                    break
+                assert self.time <= event.time, f"invalid event time for process scheduled on {event.process.owner}"
+                if event.is_invalid():
+                    continue
+
+                self.time = event.time
+                if debug:
+                    if event.process.activation == 'expire':
+                        log.logger.debug(
+                            f"Event #{self.run_counter}: executing expire event={event.process.number}, process owner={event.process.owner}, activation={event.process.activation}")
+                    log.logger.debug(f"Event #{self.run_counter}: process owner={event.process.owner}, activation={event.process.activation}")
+                event.process.run()
+                self.run_counter += 1
+
+        self.is_running = False
+        time_elapsed = time_ns() - tick
+        log.logger.info("Timeline end simulation. Execution Time: {}; Scheduled Event: {}; Executed Event: {}".format(
+                         self.ns_to_human_time(time_elapsed), self.schedule_counter, self.run_counter))
 
-        while len(self.events) > 0:
-            event = self.events.pop()
+    def _run_fast(self) -> None:
+        """Fast execution loop used by `run(fast=True)`.
 
-            if event.time >= self.stop_time:
+        The debug level of the logger is evaluated once before the loop, so no log message is formatted when debug logging is disabled.
+        Processes are dispatched through their bound method (see `Process.bind`), looked up only the first time a process is run.
+        All events with the same timestamp are popped and executed in an inner loop, without updating or checking the simulation time;
+        events are still popped one at a time, as a handler may schedule an event at the current time with a higher priority.
+        The loop returns when the stop time is reached or the event list is empty.
+        """
+        events = self.events
+        pop = events.pop
+        debug = log.logger.isEnabledFor(DEBUG)
+        now = self.time
+        event = pop() if len(events) > 0 else None
+
+        while event is not None:
+            event_time = event.time
+            if event_time >= self.stop_time:
                 self.schedule(event)  # return to event list
                 break
-            assert self.time <= event.time, f"invalid event time for process scheduled on {event.process.owner}"
-            if event.is_invalid():
+            if event._is_removed:
+                event = pop() if len(events) > 0 else None
                 continue
+            if event_time != now:
+                assert now < event_time, f"invalid event time for process scheduled on {event.process.owner}"
+                self.time = now = event_time
+
+            # execute the events of the current timestamp
+            while True:
+                if not event._is_removed:
+                    process = event.process
+                    if debug:
+                        log.logger.debug(f"Event #{self.run_counter}: process owner={process.owner}, activation={process.activation}")
+                    method = process._method
+                    if method is None:
+                        method = process.bind()
+                    method(*process.activation_args, **process.activation_kwargs)
+                    self.run_counter += 1
+                if len(events) == 0:
+                    event = None
+                    break
+                event = pop()
+                if event.time != now or self.stop_time <= now:
+                    break
+
+    def _run_instrumented(self, callback: Callable[[RunStats], None] | None) -> None:
+        """Execution loop with progress reports and event profiling.
+
+        The wall clock is only read every `PROGRESS_CHECK_EVENTS` events to decide if the progress callback is called,
+        and once more when the loop returns.
+        As in `_run_fast`, the debug level of the logger is evaluated once before the loop.
+        If the profiler is enabled, the wall time of each process is recorded,
+        and the event queue is sampled every `profiler.sample_interval` events.
 
-            self.time = event.time
-            if event.process.activation == 'expire':
-                log.logger.debug(
-                    f"Event #{self.run_counter}: executing expire event={event.process.number}, process owner={event.process.owner}, activation={event.process.activation}")
-            log.logger.debug(f"Event #{self.run_counter}: process owner={event.process.owner}, activation={event.process.activation}")
-            event.process.run()
-            self.run_counter += 1
+        Args:
+            callback (Callable[[RunStats], None] | None): progress callback.
+        """
+        events = self.events
+        profiler = self.profiler
+        start = last_report = perf_counter_ns()
+        last_run_counter = self.run_counter
+        last_sim_time = self.time
+        interval = int(self.progress_interval * 1e9)
+        debug = log.logger.isEnabledFor(DEBUG)
+
+        try:
+            while len(events) > 0:
+                event = events.pop()
+
+                if event.time >= self.stop_time:
+                    self.schedule(event)  # return to event list
+                    break
+                assert self.time <= event.time, f"invalid event time for process scheduled on {event.process.owner}"
+                if event.is_invalid():
+                    continue
+
+                self.time = event.time
+                process = event.process
+                if debug:
+                    log.logger.debug(f"Event #{self.run_counter}: process owner={process.owner}, activation={process.activation}")
+                if profiler is None:
+                    process.run()
+                else:
+                    event_tick = perf_counter_ns()
+                    process.run()
+                    profiler.record(process, perf_counter_ns() - event_tick)
+                self.run_counter += 1
+
+                if profiler is not None and self.run_counter % profiler.sample_interval == 0:
+                    profiler.sample_queue(self)
+                if callback is not None and self.run_counter % self.PROGRESS_CHECK_EVENTS == 0:
+                    now = perf_counter_ns()
+                    if now - last_report >= interval:
+                        callback(run_stats(self, (now - start) / 1e9, (last_report - start) / 1e9,
+                                           last_run_counter, last_sim_time))
+                        last_report, last_run_counter, last_sim_time = now, self.run_counter, self.time
+        finally:
+            if callback is not None:
+                callback(run_stats(self, (perf_counter_ns() - start) / 1e9, (last_report - start) / 1e9,
+                                   last_run_counter, last_sim_time))
+
+    def enable_profiler(self, sample_interval: int = 10000) -> EventProfiler:
+        """Method to record the executed events of the following runs.
 
-        self.is_running = False
-        time_elapsed = time_ns() - tick
-        log.logger.info("Timeline end simulation. Execution Time: {}; Scheduled Event: {}; Executed Event: {}".format(
-                         self.ns_to_human_time(time_elapsed), self.schedule_counter, self.run_counter))
+        Args:
+            sample_interval (int): number of executed events between two samples of the event queue (default 10000).
+
+        Returns:
+            EventProfiler: the profiler of the timeline.
+        """
+        self.profiler = EventProfiler(sample_interval)
+        return self.profiler
+
+    def disable_profiler(self) -> None:
+        """Method to stop recording executed events."""
+        self.profiler = None
+
+    def checkpoint(self, path: str, data: Any = None) -> None:
+        """Method to save the simulation to a checkpoint file (see `save_checkpoint`).
+
+        The event list, entities, quantum states and random generator states are saved,
+        so that the simulation can be continued from this point by `restore`.
+
+        Args:
+            path (str): path of the checkpoint file (overwritten).
+            data (Any): other objects to save with the timeline, returned by `load_checkpoint` (default None).
+        """
+        save_checkpoint(self, path, data)
+
+    @staticmethod
+    def restore(path: str) -> "Timeline":
+        """Method to restore a simulation saved by `checkpoint`.
+
+        Entities of the restored timeline are new objects, found with `get_entity_by_name`.
+
+        Args:
+            path (str): path of the checkpoint file.
+
+        Returns:
+            Timeline: the restored timeline.
+        """
+        timeline, _ = load_checkpoint(path)
+        return timeline
 
     def stop(self) -> None:
         """Method to stop simulation."""
@@ -167,26 +349,6 @@ class Timeline:
         """Sets random seed for simulation."""
         random.seed(seed)
 
-    def progress_bar(self):
-        """Method to draw progress bar.
-
-        Progress bar will display the execution time of simulation, as well as the current simulation time.
-        """
-        start_new_thread(self.print_time, ())
-
-    def print_time(self):
-        start_time = time_ns()
-
-        while self.is_running:
-            execution_time = self.ns_to_human_time(time_ns() - start_time)
-            simulation_time = self.ns_to_human_time(self.convert_to_nanoseconds(self.time))
-            stop_time = self.ns_to_human_time(self.convert_to_nanoseconds(self.stop_time))
-            process_bar = f'{CARRIAGE_RETURN}execution time: {execution_time};     simulation time: {simulation_time} / {stop_time}'
-
-            print(f'{process_bar}', end=CARRIAGE_RETURN)
-            stdout.flush()
-            sleep(3)
-
     @staticmethod
     def ns_to_human_time(nanoseconds: float) -> str:
         """Returns a string in the form [D day[s], ][H]H:MM:SS[.UUUUUU]
@@ -1,11 +1,13 @@
 """Definition of Reservation protocol and related tools.
 
 This module provides a definition for the reservation protocol used by the network manager.
-This includes the Reservation, MemoryTimeCard, and QCap classes, which are used by the network manager to track reservations.
+This includes the Reservation, MemoryTimeCard, ReservationCalendar, and QCap classes, which are used by the network manager to track reservations.
 Also included is the definition of the message type used by the reservation protocol.
 """
 
+from bisect import bisect_left, insort
 from enum import Enum, auto
+from operator import attrgetter
 from typing import TYPE_CHECKING, Any
 
 from ..resource_management.memory_manager import MemoryManager
@@ -13,7 +15,7 @@ from ..resource_management.memory_manager import MemoryManager
 if TYPE_CHECKING:
     from ..topology.node import QuantumRouter
 
-from ..resource_management.rule_manager import Rule, Arguments
+from ..resource_management.rule_manager import Rule, RuleMatch, Arguments
 from ..entanglement_management.entanglement_protocol import EntanglementProtocol
 from ..entanglement_management.generation import EntanglementGenerationA
 from ..entanglement_management.purification import BBPSSWProtocol
@@ -26,6 +28,14 @@ from ..resource_management.resource_manager import MemoryInfo
 
 ENTANGLED = 'ENTANGLED'
 RAW = 'RAW'
+PURIFIED = 'PURIFIED'
+# states of memories that can be purified, for each purification mode
+PURIFICATION_STATES = {'until_target': (ENTANGLED, PURIFIED), 'once': (ENTANGLED,)}
+# states of memories that can be swapped
+SWAPPING_STATES = (ENTANGLED, PURIFIED)
+
+_start_time = attrgetter("start_time")
+_end_time = attrgetter("end_time")
 
 
 class RSVPMsgType(Enum):
@@ -191,30 +201,16 @@ def ep_rule_condition1(memory_info: "MemoryInfo", memory_manager: "MemoryManager
     """
     memory_indices = args["memory_indices"]
     reservation = args["reservation"]
-    purification_mode = args["purification_mode"]
-
-    if purification_mode == 'until_target':
-        if (memory_info.index in memory_indices  # this memory (kept)
-                and memory_info.state in ["ENTANGLED", "PURIFIED"]
-                and memory_info.fidelity < reservation.fidelity):
-            for info in memory_manager:
-                if (info != memory_info and info.index in memory_indices  # another memory (meas)
-                        and info.state in ["ENTANGLED", "PURIFIED"]
-                        and info.remote_node == memory_info.remote_node
-                        and info.fidelity == memory_info.fidelity):
-                    assert memory_info.remote_memo != info.remote_memo
-                    return [memory_info, info]
-    elif purification_mode == 'once':
-        if (memory_info.index in memory_indices  # this memory (kept)
-                and memory_info.state == "ENTANGLED"
-                and memory_info.fidelity < reservation.fidelity):
-            for info in memory_manager:
-                if (info != memory_info and info.index in memory_indices  # another memory (meas)
-                        and info.state == "ENTANGLED"
-                        and info.remote_node == memory_info.remote_node
-                        and info.fidelity == memory_info.fidelity):
-                    assert memory_info.remote_memo != info.remote_memo
-                    return [memory_info, info]
+    states = PURIFICATION_STATES.get(args["purification_mode"], ())
+
+    if (memory_info.index in memory_indices  # this memory (kept)
+            and memory_info.state in states
+            and memory_info.fidelity < reservation.fidelity):
+        # another memory (meas)
+        for info in memory_manager.find(states, [memory_info.remote_node], memory_indices):
+            if info != memory_info and info.fidelity == memory_info.fidelity:
+                assert memory_info.remote_memo != info.remote_memo
+                return [memory_info, info]
 
     return []
 
@@ -224,15 +220,10 @@ def ep_rule_condition2(memory_info: "MemoryInfo", manager: "MemoryManager", args
     """
     memory_indices = args["memory_indices"]
     fidelity = args["fidelity"]
-    purification_mode = args["purification_mode"]
-
-    if purification_mode == 'until_target':
-        if memory_info.index in memory_indices and memory_info.state in ["ENTANGLED",
-                                                                         "PURIFIED"] and memory_info.fidelity < fidelity:
-            return [memory_info]
-    elif purification_mode == 'once':
-        if memory_info.index in memory_indices and memory_info.state == "ENTANGLED" and memory_info.fidelity < fidelity:
-            return [memory_info]
+    states = PURIFICATION_STATES.get(args["purification_mode"], ())
+
+    if memory_info.index in memory_indices and memory_info.state in states and memory_info.fidelity < fidelity:
+        return [memory_info]
     return []
 
 
@@ -287,25 +278,13 @@ def es_rule_conditionA(memory_info: "MemoryInfo", memory_manager: "MemoryManager
     left = args["left"]
     right = args["right"]
     fidelity = args["fidelity"]
-    if (memory_info.state in ["ENTANGLED", "PURIFIED"]
+    if (memory_info.state in SWAPPING_STATES
             and memory_info.index in memory_indices
-            and memory_info.remote_node == left
+            and memory_info.remote_node in [left, right]
             and memory_info.fidelity >= fidelity):
-        for memory_info2 in memory_manager:
-            if (memory_info2.state in ["ENTANGLED", "PURIFIED"]
-                    and memory_info2.index in memory_indices
-                    and memory_info2.remote_node == right
-                    and memory_info2.fidelity >= fidelity):
-                return [memory_info, memory_info2]
-    elif (memory_info.state in ["ENTANGLED", "PURIFIED"]
-          and memory_info.index in memory_indices
-          and memory_info.remote_node == right
-          and memory_info.fidelity >= fidelity):
-        for memory_info2 in memory_manager:
-            if (memory_info2.state in ["ENTANGLED", "PURIFIED"]
-                    and memory_info2.index in memory_indices
-                    and memory_info2.remote_node == left
-                    and memory_info2.fidelity >= fidelity):
+        other = right if memory_info.remote_node == left else left
+        for memory_info2 in memory_manager.find(SWAPPING_STATES, [other], memory_indices):
+            if memory_info2.fidelity >= fidelity:
                 return [memory_info, memory_info2]
     return []
 
@@ -316,7 +295,7 @@ def es_rule_conditionB1(memory_info: "MemoryInfo", manager: "MemoryManager", arg
     memory_indices = args["memory_indices"]
     target_remote = args["target_remote"]  # A - B - C. For A: B is the remote node, C is the target remote
     fidelity = args["fidelity"]
-    if (memory_info.state in ["ENTANGLED", "PURIFIED"]
+    if (memory_info.state in SWAPPING_STATES
             and memory_info.index in memory_indices
             # and memory_info.remote_node != path[-1]
             and memory_info.remote_node != target_remote
@@ -334,7 +313,7 @@ def es_rule_conditionB2(memory_info: "MemoryInfo", manager: "MemoryManager", arg
     left = args["left"]
     right = args["right"]
     fidelity = args["fidelity"]
-    if (memory_info.state in ["ENTANGLED", "PURIFIED"]
+    if (memory_info.state in SWAPPING_STATES
             and memory_info.index in memory_indices
             and memory_info.remote_node not in [left, right]
             and memory_info.fidelity >= fidelity):
@@ -355,7 +334,8 @@ class ResourceReservationProtocol(StackProtocol):
         owner (QuantumRouter): node that protocol instance is attached to.
         name (str): label for protocol instance.
         memo_arr (MemoryArray): memory array to track.
-        timecards (list[MemoryTimeCard]): list of reservation cards for all memories on node.
+        calendar (ReservationCalendar): calendar of reservations for all memories on node.
+        timecards (list[MemoryTimeCard]): list of reservation cards for all memories on node (owned by `calendar`).
         es_succ_prob (float): sets `success_probability` of `EntanglementSwappingA` protocols created by rules.
         es_degradation (float): sets `degradation` of `EntanglementSwappingA` protocols created by rules.
         accepted_reservations (list[Reservation]): list of all approved reservation requests.
@@ -372,7 +352,8 @@ class ResourceReservationProtocol(StackProtocol):
 
         super().__init__(owner, name)
         self.memo_arr = owner.components[memory_array_name]
-        self.timecards = [MemoryTimeCard(i) for i in range(len(self.memo_arr))]
+        self.calendar = ReservationCalendar(len(self.memo_arr))
+        self.timecards = self.calendar.timecards
         self.es_succ_prob = 1
         self.es_degradation = 0.95
         self.purification_mode = 'until_target'  # once or until_target.
@@ -449,8 +430,7 @@ class ResourceReservationProtocol(StackProtocol):
                 new_msg = ResourceReservationMessage(RSVPMsgType.REJECT, self.name, msg.reservation, path=path)
                 self._push(dst=None, msg=new_msg, next_hop=src)
         elif msg.msg_type == RSVPMsgType.REJECT:
-            for card in self.timecards:
-                card.remove(msg.reservation)
+            self.calendar.remove(msg.reservation)
             if msg.reservation.initiator == self.owner.name:
                 self._pop(msg=msg)
             else:
@@ -483,6 +463,9 @@ class ResourceReservationProtocol(StackProtocol):
     def schedule(self, reservation: "Reservation") -> bool:
         """Method to attempt reservation request. If attempt succeeded, return True; otherwise, return False.
 
+        Reservations that ended before the current time are removed from the calendar first.
+        The reservation is added to the first free memories (in order of index).
+
         Args:
             reservation (Reservation): reservation to approve or reject.
 
@@ -494,20 +477,12 @@ class ResourceReservationProtocol(StackProtocol):
             counter = reservation.memory_size
         else:  # e.g., entanglement swapping nodes needs twice amount of memory
             counter = reservation.memory_size * 2
-        timecards = []
-        for timecard in self.timecards:
-            if timecard.add(reservation):
-                counter -= 1
-                timecards.append(timecard)
-            if counter == 0:  # attempt reservation succeeded: enough memory (timecard)
-                break
-
-        if counter > 0:  # attempt reservation failed: not enough memory (timecard)
-            for timecard in timecards:
-                timecard.remove(reservation)  # remove reservation from the timecard that have added the reservation
+        self.calendar.expire(self.owner.timeline.now())
+        memory_indices = self.calendar.find_free(reservation.start_time, reservation.end_time, counter)
+        if len(memory_indices) < counter:  # attempt reservation failed: not enough memory (timecard)
             return False
 
-        return True
+        return self.calendar.add(reservation, memory_indices)
 
     def create_rules(self, path: list[str], reservation: "Reservation") -> list["Rule"]:
         """Method to create rules for a successful request.
@@ -523,10 +498,7 @@ class ResourceReservationProtocol(StackProtocol):
         """
 
         rules = []
-        memory_indices = []
-        for card in self.timecards:
-            if reservation in card.reservations:
-                memory_indices.append(card.memory_index)
+        memory_indices = self.calendar.get_memory_indices(reservation)
 
         index = path.index(self.owner.name)  # the location of this node along the path from initiator to responder
 
@@ -535,7 +507,8 @@ class ResourceReservationProtocol(StackProtocol):
             condition_args = {"memory_indices": memory_indices[:reservation.memory_size]}
             action_args = {"mid": self.owner.map_to_middle_node[path[index - 1]],
                            "path": path, "index": index}
-            rule = Rule(10, eg_rule_action1, eg_rule_condition, action_args, condition_args)
+            match = RuleMatch([RAW], condition_args["memory_indices"])
+            rule = Rule(10, eg_rule_action1, eg_rule_condition, action_args, condition_args, match)
             rules.append(rule)
 
         if index < len(path) - 1:
@@ -546,7 +519,8 @@ class ResourceReservationProtocol(StackProtocol):
 
             action_args = {"mid": self.owner.map_to_middle_node[path[index + 1]],
                            "path": path, "index": index, "name": self.owner.name, "reservation": reservation}
-            rule = Rule(10, eg_rule_action2, eg_rule_condition, action_args, condition_args)
+            match = RuleMatch([RAW], condition_args["memory_indices"])
+            rule = Rule(10, eg_rule_action2, eg_rule_condition, action_args, condition_args, match)
             rules.append(rule)
 
         # 2. create rules for entanglement purification
@@ -554,7 +528,8 @@ class ResourceReservationProtocol(StackProtocol):
             condition_args = {"memory_indices": memory_indices[:reservation.memory_size], "reservation": reservation,
                               "purification_mode": self.purification_mode}
             action_args = {}
-            rule = Rule(10, ep_rule_action1, ep_rule_condition1, action_args, condition_args)
+            match = RuleMatch(PURIFICATION_STATES.get(self.purification_mode, ()), condition_args["memory_indices"])
+            rule = Rule(10, ep_rule_action1, ep_rule_condition1, action_args, condition_args, match)
             rules.append(rule)
 
         if index < len(path) - 1:
@@ -567,7 +542,8 @@ class ResourceReservationProtocol(StackProtocol):
                                   "purification_mode": self.purification_mode}
 
             action_args = {}
-            rule = Rule(10, ep_rule_action2, ep_rule_condition2, action_args, condition_args)
+            match = RuleMatch(PURIFICATION_STATES.get(self.purification_mode, ()), condition_args["memory_indices"])
+            rule = Rule(10, ep_rule_action2, ep_rule_condition2, action_args, condition_args, match)
             rules.append(rule)
 
         # 3. create rules for entanglement swapping
@@ -575,13 +551,15 @@ class ResourceReservationProtocol(StackProtocol):
             condition_args = {"memory_indices": memory_indices, "target_remote": path[-1],
                               "fidelity": reservation.fidelity}
             action_args = {}
-            rule = Rule(10, es_rule_actionB, es_rule_conditionB1, action_args, condition_args)
+            match = RuleMatch(SWAPPING_STATES, memory_indices)
+            rule = Rule(10, es_rule_actionB, es_rule_conditionB1, action_args, condition_args, match)
             rules.append(rule)
         elif index == len(path) - 1:
             action_args = {}
             condition_args = {"memory_indices": memory_indices, "target_remote": path[0],
                               "fidelity": reservation.fidelity}
-            rule = Rule(10, es_rule_actionB, es_rule_conditionB1, action_args, condition_args)
+            match = RuleMatch(SWAPPING_STATES, memory_indices)
+            rule = Rule(10, es_rule_actionB, es_rule_conditionB1, action_args, condition_args, match)
             rules.append(rule)
         else:
             _path = path[:]
@@ -597,11 +575,13 @@ class ResourceReservationProtocol(StackProtocol):
             condition_args = {"memory_indices": memory_indices, "left": left, "right": right,
                               "fidelity": reservation.fidelity}
             action_args = {"es_succ_prob": self.es_succ_prob, "es_degradation": self.es_degradation}
-            rule = Rule(10, es_rule_actionA, es_rule_conditionA, action_args, condition_args)
+            match = RuleMatch(SWAPPING_STATES, memory_indices, [left, right])
+            rule = Rule(10, es_rule_actionA, es_rule_conditionA, action_args, condition_args, match)
             rules.append(rule)
 
             action_args = {}
-            rule = Rule(10, es_rule_actionB, es_rule_conditionB2, action_args, condition_args)
+            match = RuleMatch(SWAPPING_STATES, memory_indices)
+            rule = Rule(10, es_rule_actionB, es_rule_conditionB2, action_args, condition_args, match)
             rules.append(rule)
 
         for rule in rules:
@@ -631,12 +611,10 @@ class ResourceReservationProtocol(StackProtocol):
             event = Event(reservation.end_time, process, self.owner.timeline.schedule_counter)
             self.owner.timeline.schedule(event)
 
-        for card in self.timecards:
-            if reservation in card.reservations:
-                process = Process(self.owner.resource_manager, "update",
-                                  [None, self.memo_arr[card.memory_index], "RAW"])
-                event = Event(reservation.end_time, process, self.owner.timeline.schedule_counter)
-                self.owner.timeline.schedule(event)
+        for memory_index in self.calendar.get_memory_indices(reservation):
+            process = Process(self.owner.resource_manager, "update", [None, self.memo_arr[memory_index], "RAW"])
+            event = Event(reservation.end_time, process, self.owner.timeline.schedule_counter)
+            self.owner.timeline.schedule(event)
 
     def received_message(self, src, msg):
         """Method to receive messages directly (should not be used; receive through network manager)."""
@@ -730,20 +708,26 @@ class MemoryTimeCard:
     """Class for tracking reservations on a specific memory.
        Each quantum memory in a memory array is associated with a memory time card
 
+    Reservations on a card never overlap, so the list sorted by start time is also sorted by end time.
+    Positions are found by binary search on the start (or end) times.
+
     Attributes:
         memory_index (int): index of memory being tracked (in memory array).
-        reservations (list[Reservation]): list of reservations for the memory.
+        reservations (list[Reservation]): list of reservations for the memory, sorted by time.
+        calendar (ReservationCalendar): calendar indexing the reservations of the card (default None).
     """
 
-    def __init__(self, memory_index: int):
+    def __init__(self, memory_index: int, calendar: "ReservationCalendar" = None):
         """Constructor for time card class.
 
         Args:
             memory_index (int): index of memory to track.
+            calendar (ReservationCalendar): calendar of the node owning the memory (default None).
         """
 
         self.memory_index = memory_index
         self.reservations = []
+        self.calendar = calendar
 
     def add(self, reservation: "Reservation") -> bool:
         """Method to add reservation.
@@ -760,6 +744,8 @@ class MemoryTimeCard:
         position = self.schedule_reservation(reservation)
         if position >= 0:
             self.reservations.insert(position, reservation)
+            if self.calendar is not None:
+                self.calendar._index_add(reservation, self.memory_index)
             return True
         else:
             return False
@@ -774,42 +760,195 @@ class MemoryTimeCard:
             bool: if reservation was already on the memory (return True) or not (return False).
         """
 
-        try:
-            position = self.reservations.index(reservation)
+        # start times on a card are unique, so only one reservation may be equal
+        position = bisect_left(self.reservations, reservation.start_time, key=_start_time)
+        if position < len(self.reservations) and self.reservations[position] == reservation:
             self.reservations.pop(position)
+            if self.calendar is not None:
+                self.calendar._index_remove(reservation, self.memory_index)
             return True
-        except ValueError:
-            return False
+        return False
 
     def schedule_reservation(self, reservation: "Reservation") -> int:
         """Method to add reservation to a memory.
 
         Will return index at which reservation can be inserted into memory reservation list.
-        If no space found for reservation, will raise an exception.
+        If no space found for reservation, will return -1.
 
         Args:
             reservation (Reservation): reservation to schedule.
 
         Returns:
-            int: index to insert reservation in reservation list.
+            int: index to insert reservation in reservation list (-1 if the reservation overlaps another).
+        """
 
-        Raises:
-            Exception: no valid index to insert reservation.
+        return self.find_position(reservation.start_time, reservation.end_time)
+
+    def find_position(self, start_time: int, end_time: int) -> int:
+        """Method to find where a reservation over [start_time, end_time] can be inserted.
+
+        Args:
+            start_time (int): start time of the interval (inclusive).
+            end_time (int): end time of the interval (inclusive).
+
+        Returns:
+            int: index to insert the interval in reservation list (-1 if the interval overlaps a reservation).
         """
 
-        start, end = 0, len(self.reservations) - 1
-        while start <= end:
-            mid = (start + end) // 2
-            if self.reservations[mid].start_time > reservation.end_time:
-                end = mid - 1
-            elif self.reservations[mid].end_time < reservation.start_time:
-                start = mid + 1
-            elif (max(self.reservations[mid].start_time, reservation.start_time) <=
-                  min(self.reservations[mid].end_time, reservation.end_time)):
-                return -1
-            else:
-                raise Exception("Unexpected status")
-        return start
+        reservations = self.reservations
+        position = bisect_left(reservations, start_time, key=_start_time)
+        if position < len(reservations) and reservations[position].start_time <= end_time:
+            return -1
+        if position > 0 and reservations[position - 1].end_time >= start_time:
+            return -1
+        return position
+
+    def expire(self, time: int) -> list["Reservation"]:
+        """Method to remove reservations ended before a given time.
+
+        Args:
+            time (int): reservations with `end_time < time` are removed.
+
+        Returns:
+            list[Reservation]: removed reservations.
+        """
+
+        position = bisect_left(self.reservations, time, key=_end_time)
+        expired = self.reservations[:position]
+        del self.reservations[:position]
+        if self.calendar is not None:
+            for reservation in expired:
+                self.calendar._index_remove(reservation, self.memory_index)
+        return expired
+
+
+class ReservationCalendar:
+    """Class for tracking the reservations on all memories of a node.
+
+    The calendar owns one `MemoryTimeCard` per memory and indexes the memories held by each reservation,
+    so that the memories of a reservation are found (and released) without scanning all cards.
+    Reservations added to or removed from the cards directly are also indexed.
+
+    Attributes:
+        timecards (list[MemoryTimeCard]): reservation cards of the memories (indexed by memory index).
+    """
+
+    def __init__(self, num_memories: int):
+        """Constructor for the calendar class.
+
+        Args:
+            num_memories (int): number of memories on the node.
+        """
+
+        self.timecards = [MemoryTimeCard(i, self) for i in range(num_memories)]
+        self._memory_indices: dict["Reservation", list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._memory_indices)
+
+    def __contains__(self, reservation: "Reservation") -> bool:
+        return reservation in self._memory_indices
+
+    def get_memory_indices(self, reservation: "Reservation") -> list[int]:
+        """Method to get the memories held by a reservation.
+
+        Args:
+            reservation (Reservation): reservation to look up.
+
+        Returns:
+            list[int]: sorted indices of the memories reserved (empty if the reservation is not on the calendar).
+        """
+
+        return list(self._memory_indices.get(reservation, ()))
+
+    def find_free(self, start_time: int, end_time: int, k: int) -> list[int]:
+        """Method to find memories free over an interval.
+
+        Memories are searched in order of index.
+
+        Args:
+            start_time (int): start time of the interval (inclusive).
+            end_time (int): end time of the interval (inclusive).
+            k (int): number of memories wanted.
+
+        Returns:
+            list[int]: indices of (at most) the first `k` free memories.
+        """
+
+        free = []
+        if k <= 0:
+            return free
+        for card in self.timecards:
+            if card.find_position(start_time, end_time) >= 0:
+                free.append(card.memory_index)
+                if len(free) == k:
+                    break
+        return free
+
+    def add(self, reservation: "Reservation", memory_indices: list[int]) -> bool:
+        """Method to add a reservation on several memories.
+
+        The reservation is added to all memories or to none of them.
+
+        Args:
+            reservation (Reservation): reservation to add.
+            memory_indices (list[int]): indices of memories to reserve.
+
+        Returns:
+            bool: whether the reservation was added.
+        """
+
+        added = []
+        for index in memory_indices:
+            card = self.timecards[index]
+            if not card.add(reservation):
+                for card in added:
+                    card.remove(reservation)
+                return False
+            added.append(card)
+        return True
+
+    def remove(self, reservation: "Reservation") -> bool:
+        """Method to release all memories held by a reservation.
+
+        Args:
+            reservation (Reservation): reservation to remove.
+
+        Returns:
+            bool: if reservation was on the calendar (return True) or not (return False).
+        """
+
+        memory_indices = self._memory_indices.get(reservation)
+        if memory_indices is None:
+            return False
+        for index in list(memory_indices):
+            self.timecards[index].remove(reservation)
+        return True
+
+    def expire(self, time: int) -> int:
+        """Method to garbage-collect reservations ended before a given time.
+
+        Args:
+            time (int): reservations with `end_time < time` are removed.
+
+        Returns:
+            int: number of reservations removed from the calendar.
+        """
+
+        count = len(self._memory_indices)
+        for card in self.timecards:
+            if card.reservations and card.reservations[0].end_time < time:
+                card.expire(time)
+        return count - len(self._memory_indices)
+
+    def _index_add(self, reservation: "Reservation", memory_index: int) -> None:
+        insort(self._memory_indices.setdefault(reservation, []), memory_index)
+
+    def _index_remove(self, reservation: "Reservation", memory_index: int) -> None:
+        memory_indices = self._memory_indices[reservation]
+        memory_indices.remove(memory_index)
+        if not memory_indices:
+            del self._memory_indices[reservation]
 
 
 class QCap:
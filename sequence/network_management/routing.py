@@ -2,11 +2,20 @@
 
 This module defines the StaticRouting protocol, which uses a pre-generated static routing table to direct reservation hops.
 Routing tables may be created manually, or generated and installed automatically by the `Topology` class.
+The `RoutingTable` class computes the shortest-path next hops of all nodes of a network, shared by their routing protocols.
 Also included is the message type used by the routing protocol.
 """
 
+from collections.abc import Iterator, MutableMapping
 from enum import Enum
+from itertools import islice
 from typing import TYPE_CHECKING
+
+import numpy as np
+from networkx import Graph, NetworkXNoPath, shortest_simple_paths
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
 if TYPE_CHECKING:
     from ..topology.node import Node
 
@@ -14,6 +23,274 @@ from ..message import Message
 from ..protocol import StackProtocol
 
 
+class RoutingTable:
+    """Class of the next-hop table shared by all nodes of a network.
+
+    Routes follow the shortest paths over weighted (undirected) channels, computed with one shortest-path tree per node.
+    The route between two nodes is taken from the tree of the node with the smaller name,
+    so that both directions use the same path.
+    Adding or removing a channel only recomputes the trees it changes.
+
+    Attributes:
+        names (list[str]): node names, indexed by node id.
+        ids (dict[str, int]): mapping of node names to node id.
+        distances (np.ndarray): shortest-path distances, indexed by [source id, destination id] (inf if unreachable).
+        next_hops (np.ndarray): id of the next node, indexed by [source id, destination id] (-1 if none).
+    """
+
+    def __init__(self, names: list[str] = (), channels: list[tuple[str, str, float]] = ()):
+        """Constructor for the routing table.
+
+        Args:
+            names (list[str]): names of nodes (default empty).
+            channels (list[tuple[str, str, float]]): channels `(node1, node2, cost)` between nodes (default empty).
+                A later channel between the same nodes replaces the earlier one.
+        """
+
+        self.names: list[str] = []
+        self.ids: dict[str, int] = {}
+        self.distances = np.zeros((0, 0))
+        self.next_hops = np.zeros((0, 0), dtype=np.int32)
+        self._predecessors = np.zeros((0, 0), dtype=np.int32)
+        self._first_hops = np.zeros((0, 0), dtype=np.int32)
+        self._rank = np.zeros(0, dtype=np.int64)
+        self._edges: dict[tuple[int, int], float] = {}
+
+        self._add_nodes(names)
+        for node1, node2, cost in channels:
+            self._edges[self._edge_key(node1, node2)] = cost
+        self._update(np.arange(len(self.names)))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def add_node(self, name: str) -> int:
+        """Method to add a node (without channels).
+
+        Args:
+            name (str): name of the node.
+
+        Returns:
+            int: id of the node.
+        """
+
+        if name not in self.ids:
+            self._add_nodes([name])
+        return self.ids[name]
+
+    def add_channel(self, node1: str, node2: str, cost: float) -> None:
+        """Method to add a channel between two nodes (or change its cost).
+
+        Nodes not yet in the table are added.
+
+        Args:
+            node1 (str): name of the first node.
+            node2 (str): name of the second node.
+            cost (float): cost of the channel (e.g. distance).
+        """
+
+        for name in [node1, node2]:
+            self.add_node(name)
+        key = self._edge_key(node1, node2)
+        old_cost = self._edges.get(key)
+        if old_cost == cost:
+            return
+        a, b = key
+        if old_cost is not None and cost > old_cost:
+            sources = self._sources_using(a, b)
+        else:
+            dist = self.distances
+            sources = np.flatnonzero((dist[:, a] + cost < dist[:, b]) | (dist[:, b] + cost < dist[:, a]))
+        self._edges[key] = cost
+        self._update(sources)
+
+    def remove_channel(self, node1: str, node2: str) -> None:
+        """Method to remove the channel between two nodes.
+
+        Args:
+            node1 (str): name of the first node.
+            node2 (str): name of the second node.
+
+        Raises:
+            KeyError: no channel between the nodes.
+        """
+
+        key = self._edge_key(node1, node2)
+        del self._edges[key]
+        self._update(self._sources_using(*key))
+
+    def get_next_hop(self, src: str, dst: str) -> str | None:
+        """Method to get the next node on the route between two nodes.
+
+        Args:
+            src (str): name of the source node.
+            dst (str): name of the destination node.
+
+        Returns:
+            str | None: name of the next node (None if there is no route).
+        """
+
+        next_hop = self.next_hops[self.ids[src], self.ids[dst]]
+        if next_hop < 0:
+            return None
+        return self.names[next_hop]
+
+    def get_destinations(self, src: str) -> list[str]:
+        """Method to get the nodes reachable from a node.
+
+        Args:
+            src (str): name of the source node.
+
+        Returns:
+            list[str]: names of the reachable nodes (in order of id, excluding the source).
+        """
+
+        return [self.names[i] for i in np.flatnonzero(self.next_hops[self.ids[src]] >= 0)]
+
+    def get_forwarding_table(self, src: str) -> dict[str, str]:
+        """Method to get the forwarding table of a node.
+
+        Args:
+            src (str): name of the source node.
+
+        Returns:
+            dict[str, str]: mapping of destination node names to name of node for next hop.
+        """
+
+        row = self.next_hops[self.ids[src]]
+        return {self.names[i]: self.names[row[i]] for i in np.flatnonzero(row >= 0)}
+
+    def k_shortest_paths(self, src: str, dst: str, k: int) -> list[list[str]]:
+        """Method to get alternative routes between two nodes.
+
+        Args:
+            src (str): name of the source node.
+            dst (str): name of the destination node.
+            k (int): maximum number of paths.
+
+        Returns:
+            list[list[str]]: up to `k` loopless paths (lists of node names), in order of increasing cost.
+        """
+
+        graph = Graph()
+        graph.add_nodes_from(self.names)
+        graph.add_weighted_edges_from((self.names[a], self.names[b], cost) for (a, b), cost in self._edges.items())
+        try:
+            return list(islice(shortest_simple_paths(graph, src, dst, weight="weight"), k))
+        except NetworkXNoPath:
+            return []
+
+    def _add_nodes(self, names: list[str]) -> None:
+        """Method to add nodes without channels, growing the tables once."""
+
+        old_size = len(self.names)
+        for name in names:
+            if name not in self.ids:
+                self.ids[name] = len(self.names)
+                self.names.append(name)
+        size = len(self.names)
+        if size == old_size:
+            return
+
+        distances = np.full((size, size), np.inf)
+        distances[:old_size, :old_size] = self.distances
+        np.fill_diagonal(distances, 0)
+        self.distances = distances
+        for attr in ["next_hops", "_predecessors", "_first_hops"]:
+            table = np.full((size, size), -1, dtype=np.int32)
+            table[:old_size, :old_size] = getattr(self, attr)
+            setattr(self, attr, table)
+        self._rank = np.argsort(np.argsort(np.array(self.names)))
+
+    def _edge_key(self, node1: str, node2: str) -> tuple[int, int]:
+        a, b = self.ids[node1], self.ids[node2]
+        return (a, b) if a < b else (b, a)
+
+    def _sources_using(self, a: int, b: int) -> np.ndarray:
+        """Ids of nodes whose shortest-path tree uses the channel between nodes `a` and `b`."""
+
+        return np.flatnonzero((self._predecessors[:, b] == a) | (self._predecessors[:, a] == b))
+
+    def _update(self, sources: np.ndarray) -> None:
+        """Method to recompute the shortest-path trees of some nodes, and the next hops depending on them."""
+
+        if len(sources) == 0:
+            return
+        size = len(self.names)
+        if self._edges:
+            rows, cols = zip(*self._edges)
+            graph = csr_matrix((list(self._edges.values()), (rows, cols)), shape=(size, size))
+        else:
+            graph = csr_matrix((size, size))
+        distances, predecessors = dijkstra(graph, directed=False, indices=sources, return_predecessors=True)
+        predecessors[predecessors < 0] = -1
+        self.distances[sources] = distances
+        self._predecessors[sources] = predecessors
+
+        # first hop from each source: follow predecessors up to a child of the source (by pointer doubling)
+        ids = np.arange(size)
+        up = np.where((predecessors == sources[:, None]) | (predecessors < 0), ids, predecessors)
+        while True:
+            ancestors = np.take_along_axis(up, up, axis=1)
+            if np.array_equal(ancestors, up):
+                break
+            up = ancestors
+        self._first_hops[sources] = np.where(predecessors < 0, -1, up)
+
+        # route from the node with the smaller name:
+        # next hop of `s` towards `d` is the first hop of `s` if `d > s`, else the predecessor of `s` from `d`
+        rank = self._rank
+        self.next_hops[sources] = np.where(rank[None, :] > rank[sources, None],
+                                           self._first_hops[sources], self._predecessors[:, sources].T)
+        self.next_hops[:, sources] = np.where(rank[sources][None, :] > rank[:, None],
+                                              self._first_hops[:, sources], self._predecessors[sources].T)
+
+
+class ForwardingTable(MutableMapping):
+    """Class of the forwarding table of a node using a shared routing table.
+
+    Rules set on the forwarding table take precedence over the next hops of the routing table.
+
+    Attributes:
+        routing_table (RoutingTable): shared routing table.
+        node (str): name of the node.
+        rules (dict[str, str]): rules set on the node, mapping destination node names to name of node for next hop.
+    """
+
+    def __init__(self, routing_table: RoutingTable, node: str, rules: dict = None):
+        self.routing_table = routing_table
+        self.node = node
+        self.rules = {} if rules is None else rules
+
+    def __getitem__(self, dst: str) -> str:
+        if dst in self.rules:
+            return self.rules[dst]
+        next_hop = None
+        if dst in self.routing_table:
+            next_hop = self.routing_table.get_next_hop(self.node, dst)
+        if next_hop is None:
+            raise KeyError(dst)
+        return next_hop
+
+    def __setitem__(self, dst: str, next_node: str) -> None:
+        self.rules[dst] = next_node
+
+    def __delitem__(self, dst: str) -> None:
+        del self.rules[dst]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.rules
+        for dst in self.routing_table.get_destinations(self.node):
+            if dst not in self.rules:
+                yield dst
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
 class StaticRoutingMessage(Message):
     """Message used for communications between routing protocol instances.
 
@@ -41,6 +318,7 @@ class StaticRoutingProtocol(StackProtocol):
         own (Node): node that protocol instance is attached to.
         name (str): label for protocol instance.
         forwarding_table (dict[str, str]): mapping of destination node names to name of node for next hop.
+        routing_table (RoutingTable): shared routing table (default None), see `set_routing_table`.
     """
     
     def __init__(self, owner: "Node", name: str, forwarding_table: dict):
@@ -54,10 +332,39 @@ class StaticRoutingProtocol(StackProtocol):
 
         super().__init__(owner, name)
         self.forwarding_table = forwarding_table
+        self.routing_table = None
 
     def get_forwarding_table(self) -> dict:
         return self.forwarding_table
 
+    def set_routing_table(self, routing_table: RoutingTable) -> None:
+        """Method to use a shared routing table.
+
+        Rules of the current forwarding table are kept and take precedence over the routing table.
+
+        Args:
+            routing_table (RoutingTable): routing table including the node.
+        """
+
+        rules = self.forwarding_table.rules if isinstance(self.forwarding_table, ForwardingTable) \
+            else self.forwarding_table
+        self.routing_table = routing_table
+        self.forwarding_table = ForwardingTable(routing_table, self.owner.name, rules)
+
+    def k_shortest_paths(self, dst: str, k: int) -> list[list[str]]:
+        """Method to get alternative routes to a destination (requires a routing table).
+
+        Args:
+            dst (str): name of destination node.
+            k (int): maximum number of paths.
+
+        Returns:
+            list[list[str]]: up to `k` loopless paths from this node, in order of increasing cost.
+        """
+
+        assert self.routing_table is not None, "k shortest paths require a routing table"
+        return self.routing_table.k_shortest_paths(self.owner.name, dst, k)
+
     def add_forwarding_rule(self, dst: str, next_node: str):
         """Adds mapping {dst: next_node} to forwarding table."""
 
@@ -8,8 +8,11 @@ There are three states of quantum memory represented by the string: "RAW", "OCCU
 * "ENTANGLED" denotes a free memory that is entangling with other memories. 
 
 This is done through instances of the MemoryInfo class, which track a single memory.
+The memory manager indexes the memory info objects by state and remote node,
+so that rule conditions can look up candidate memories without scanning every memory.
 """
 
+from collections.abc import Collection, Iterable
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .resource_manager import ResourceManager
@@ -26,6 +29,8 @@ class MemoryManager:
         memory_array (MemoryArray): memory array object to be tracked.
         memory_map (list[MemoryInfo]): array of memory info objects corresponding to memory array.
         resource_manager (ResourceManager): resource manager object using the memory manager.
+        _buckets (dict[tuple[str, str], set[int]]): indices of the memories of each (state, remote node) pair.
+        _memory_indices (dict[Memory, int]): index of each memory in the memory array.
     """
 
     def __init__(self, memory_array: "MemoryArray"):
@@ -39,6 +44,11 @@ class MemoryManager:
         self.memory_array.attach(self)
         self.memory_map = [MemoryInfo(memory, index) for index, memory in enumerate(self.memory_array)]
         self.resource_manager = None
+        self._buckets: dict[tuple[str, str | None], set[int]] = {}
+        self._memory_indices = {memory: index for index, memory in enumerate(self.memory_array)}
+        for info in self.memory_map:
+            info.memory_manager = self
+            self._buckets.setdefault((info.state, info.remote_node), set()).add(info.index)
 
     def set_resource_manager(self, resource_manager: "ResourceManager") -> None:
         """Method to set the resource manager."""
@@ -77,9 +87,47 @@ class MemoryManager:
     def get_info_by_memory(self, memory: "Memory") -> "MemoryInfo":
         """Gets memory info object for a desired memory."""
 
-        index = self.memory_array.memories.index(memory)
+        index = self._memory_indices.get(memory)
+        if index is None or self.memory_array.memories[index] is not memory:
+            # the memory array was modified after the manager was created
+            index = self.memory_array.memories.index(memory)
+            self._memory_indices[memory] = index
         return self.memory_map[index]
 
+    def find(self, states: Iterable[str], remote_nodes: Iterable[str | None] | None = None,
+             memory_indices: Collection[int] | None = None) -> list["MemoryInfo"]:
+        """Method to find the memories with given states and remote nodes.
+
+        Only the memories of the matching (state, remote node) buckets are examined.
+
+        Args:
+            states (Iterable[str]): allowed states of the memories.
+            remote_nodes (Iterable[str | None]): allowed remote nodes of the memories (default None, any remote node).
+            memory_indices (Collection[int]): allowed indices of the memories (default None, any memory).
+
+        Returns:
+            list[MemoryInfo]: memory info objects of the matching memories, in the order of the memory array.
+        """
+
+        states = set(states)
+        if remote_nodes is None:
+            buckets = [bucket for (state, _), bucket in self._buckets.items() if state in states]
+        else:
+            buckets = [self._buckets.get((state, remote_node), ()) for state in states for remote_node in remote_nodes]
+        indices = set().union(*buckets)
+        if memory_indices is not None:
+            indices = [index for index in indices if index in memory_indices]
+        return [self.memory_map[index] for index in sorted(indices)]
+
+    def _move(self, info: "MemoryInfo", old_key: tuple[str, str | None]) -> None:
+        """Method to move a memory info object to the bucket of its new state and remote node."""
+
+        bucket = self._buckets[old_key]
+        bucket.discard(info.index)
+        if not bucket:
+            del self._buckets[old_key]
+        self._buckets.setdefault((info.state, info.remote_node), set()).add(info.index)
+
     def get_memory_by_name(self, memory_name: str) -> "Memory":
         return self.memory_array.get_memory_by_name(memory_name)
 
@@ -104,6 +152,7 @@ class MemoryInfo:
         fidelity (int): fidelity of entanglement for memory.
         expire_event (Event): expiration event for the memory.
         entangle_time (int): time at which most recent entanglement is achieved.
+        memory_manager (MemoryManager): memory manager indexing the memory info object (None if not managed).
     """
 
     RAW = "RAW"
@@ -120,15 +169,38 @@ class MemoryInfo:
             state (str): state of memory to be monitored (default "RAW").
         """
 
+        self.memory_manager = None
         self.memory = memory
         self.index = index
-        self.state = state
-        self.remote_node = None
+        self._state = state
+        self._remote_node = None
         self.remote_memo = None
         self.fidelity = 0
         self.expire_event = None
         self.entangle_time = -1
 
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @state.setter
+    def state(self, state: str) -> None:
+        old_key = (self._state, self._remote_node)
+        self._state = state
+        if self.memory_manager is not None:
+            self.memory_manager._move(self, old_key)
+
+    @property
+    def remote_node(self) -> str | None:
+        return self._remote_node
+
+    @remote_node.setter
+    def remote_node(self, remote_node: str | None) -> None:
+        old_key = (self._state, self._remote_node)
+        self._remote_node = remote_node
+        if self.memory_manager is not None:
+            self.memory_manager._move(self, old_key)
+
     def __str__(self) -> str:
         return f'name={self.memory.name}, remote={self.remote_memo}, fidelity={self.fidelity:.6f}'
 
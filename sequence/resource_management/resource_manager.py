@@ -136,7 +136,13 @@ class ResourceManager:
         log.logger.info(f'{self.owner.name} load rule={rule}')
         self.rule_manager.load(rule)
 
-        for memory_info in self.memory_manager:  # iterate through each memory, and check if the rule is valid on each memory
+        if rule.match is not None and rule.match.memory_indices is not None:
+            memories = [self.memory_manager[index] for index in sorted(rule.match.memory_indices)]
+        else:
+            memories = self.memory_manager
+        for memory_info in memories:  # iterate through candidate memories, and check if the rule is valid on each memory
+            if not rule.matches(memory_info):
+                continue
             memories_info = rule.is_valid(memory_info)  # is valid means condition is satisfied
             if len(memories_info) > 0:
                 rule.do(memories_info)
@@ -200,9 +206,9 @@ class ResourceManager:
         if protocol in self.pending_protocols:
             self.pending_protocols.remove(protocol)
 
-        # iterate all the rules and check if there is a valid rule
+        # iterate the rules matching the memory and check if there is a valid rule
         memo_info = self.memory_manager.get_info_by_memory(memory)
-        for rule in self.rule_manager:
+        for rule in self.rule_manager.get_candidates(memo_info):
             memories_info = rule.is_valid(memo_info)
             if len(memories_info) > 0:
                 rule.do(memories_info)
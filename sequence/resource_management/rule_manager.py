@@ -2,8 +2,11 @@
 
 This module defines the rule manager, which is used by the resource manager to instantiate and control entanglement protocols.
 This is achieved through rules (also defined in this module), which if met define a set of actions to take.
+Rules may declare match keys (`RuleMatch`), so that the rule manager only evaluates them on candidate memories.
 """
 
+from bisect import insort
+from collections.abc import Collection
 from typing import TYPE_CHECKING, Any
 from collections.abc import Callable
 from ..utils import log
@@ -27,9 +30,15 @@ class RuleManager:
     The RuleManager checks available rules when the state of a memory is updated.
     Rules that are met have their action executed by the rule manager.
 
+    Rules with match keys on memory indices are indexed by memory index;
+    other rules are evaluated for every memory (fallback path).
+
     Attributes:
         rules (list[Rules]): list of installed rules.
         resource_manager (ResourceManager): reference to the resource manager using this rule manager.
+        _rules_by_index (dict[int, list[Rule]]): rules matching each memory index (in the order of `rules`).
+        _unindexed_rules (list[Rule]): rules without memory indices in their match keys (in the order of `rules`).
+        _load_count (int): number of rules loaded, used to order rules of the same priority.
     """
 
     def __init__(self):
@@ -37,6 +46,9 @@ class RuleManager:
 
         self.rules = []
         self.resource_manager = None
+        self._rules_by_index: dict[int, list[Rule]] = {}
+        self._unindexed_rules: list[Rule] = []
+        self._load_count = 0
 
     def set_resource_manager(self, resource_manager: "ResourceManager"):
         """Method to set overseeing resource manager.
@@ -69,6 +81,15 @@ class RuleManager:
             else:
                 right = mid - 1
         self.rules.insert(left, rule)
+
+        # rules of the same priority are ordered from the latest loaded (as in `rules`)
+        self._load_count += 1
+        rule._order = (rule.priority, -self._load_count)
+        if rule.match is None or rule.match.memory_indices is None:
+            insort(self._unindexed_rules, rule, key=Rule.order)
+        else:
+            for index in rule.match.memory_indices:
+                insort(self._rules_by_index.setdefault(index, []), rule, key=Rule.order)
         return True
 
     def expire(self, rule: "Rule") -> list["EntanglementProtocol"]:
@@ -83,11 +104,31 @@ class RuleManager:
         """
         if rule in self.rules:
             self.rules.remove(rule)
+            if rule.match is None or rule.match.memory_indices is None:
+                self._unindexed_rules.remove(rule)
+            else:
+                for index in rule.match.memory_indices:
+                    self._rules_by_index[index].remove(rule)
         else:
             log.logger.info(f'{self.resource_manager.owner} rule not exist: {rule}')
         return rule.protocols
         
 
+    def get_candidates(self, memory_info: "MemoryInfo") -> list["Rule"]:
+        """Method to get the rules whose match keys match a memory.
+
+        Args:
+            memory_info (MemoryInfo): memory info object of the memory.
+
+        Returns:
+            list[Rule]: matching rules, in the order of `rules`.
+        """
+
+        rules = self._rules_by_index.get(memory_info.index, [])
+        if self._unindexed_rules:
+            rules = sorted(rules + self._unindexed_rules, key=Rule.order)
+        return [rule for rule in rules if rule.matches(memory_info)]
+
     def get_memory_manager(self):
         return self.resource_manager.get_memory_manager()
 
@@ -108,10 +149,44 @@ class RuleManager:
             return 'Rule Manager'
 
 
+class RuleMatch:
+    """Match keys of a rule.
+
+    The rule manager only evaluates the condition of a rule on memories matching all of its match keys,
+    so the keys should be necessary conditions of the condition function.
+
+    Attributes:
+        states (frozenset[str]): allowed states of the memories (None for any state).
+        memory_indices (frozenset[int]): allowed indices of the memories (None for any memory).
+        remote_nodes (frozenset[str]): allowed remote nodes of the memories (None for any remote node).
+    """
+
+    def __init__(self, states: Collection[str] = None, memory_indices: Collection[int] = None,
+                 remote_nodes: Collection[str | None] = None):
+        self.states = None if states is None else frozenset(states)
+        self.memory_indices = None if memory_indices is None else frozenset(memory_indices)
+        self.remote_nodes = None if remote_nodes is None else frozenset(remote_nodes)
+
+    def matches(self, memory_info: "MemoryInfo") -> bool:
+        """Method to check if a memory matches the keys.
+
+        Args:
+            memory_info (MemoryInfo): memory info object to test.
+
+        Returns:
+            bool: if the state, index and remote node of the memory are allowed.
+        """
+
+        return ((self.states is None or memory_info.state in self.states)
+                and (self.memory_indices is None or memory_info.index in self.memory_indices)
+                and (self.remote_nodes is None or memory_info.remote_node in self.remote_nodes))
+
+
 class Rule:
     """Definition of rule for the rule manager.
 
     Rule objects are installed on and interacted with by the rule manager.
+    Rules without match keys are evaluated on every memory.
 
     Attributes:
         priority (int): priority of the rule, used as a tiebreaker when conditions of multiple rules are met.
@@ -121,9 +196,11 @@ class Rule:
         protocols (list[Protocols]): protocols created by rule.
         rule_manager (RuleManager): reference to rule manager object where rule is installed.
         reservation (Reservation): associated reservation.
+        match (RuleMatch): match keys of the rule (None to evaluate the rule on every memory).
     """
 
-    def __init__(self, priority: int, action: ActionFunc, condition: ConditionFunc, action_args: Arguments, condition_args: Arguments):
+    def __init__(self, priority: int, action: ActionFunc, condition: ConditionFunc, action_args: Arguments, condition_args: Arguments,
+                 match: RuleMatch = None):
         """Constructor for rule class."""
 
         self.priority: int = priority
@@ -134,6 +211,13 @@ class Rule:
         self.protocols: list[EntanglementProtocol] = []
         self.rule_manager = None
         self.reservation = None
+        self.match: RuleMatch | None = match
+        self._order = (priority, 0)
+
+    def order(self) -> tuple[int, int]:
+        """Returns the sort key of the rule in its rule manager."""
+
+        return self._order
 
     def __str__(self):
         action_name_list = str(self.action).split(' ')
@@ -169,6 +253,11 @@ class Rule:
         for dst, req_func, args in zip(req_dsts, req_condition_funcs, req_args):
             self.rule_manager.send_request(protocol, dst, req_func, args)
 
+    def matches(self, memory_info: "MemoryInfo") -> bool:
+        """Method to check if a memory matches the match keys of the rule (see `RuleMatch`)."""
+
+        return self.match is None or self.match.matches(memory_info)
+
     def is_valid(self, memory_info: "MemoryInfo") -> list["MemoryInfo"]:
         """Method to check for memories meeting condition.
 
@@ -1,12 +1,9 @@
-import json
-import numpy as np
-from networkx import Graph, dijkstra_path, exception
-
 from .topology import Topology as Topo
 from ..kernel.timeline import Timeline
 from .node import BSMNode
-from ..constants import SPEED_OF_LIGHT
-from typing import Dict, List, Type
+from ..network_management.routing import RoutingTable
+from ..constants import HEAP_EVENT_QUEUE
+from typing import Dict, List, TextIO, Type
 from .node import Node, DQCNode
 
 
@@ -23,6 +20,7 @@ class DQCNetTopo(Topo):
         qchannels (list[QuantumChannel]): list of quantum channel objects in network.
         cchannels (list[ClassicalChannel]): list of classical channel objects in network.
         tl (Timeline): the timeline used for simulation
+        routing_table (RoutingTable): next hops between nodes, shared by their routing protocols.
     """
     BSM_NODE = "BSMNode"
     MEET_IN_THE_MID = "meet_in_the_middle"
@@ -36,25 +34,25 @@ class DQCNetTopo(Topo):
         self.encoding_type = None
         super().__init__(conf_file_name)
 
-    def _load(self, filename: str):
-        with open(filename) as fh:
-            config = json.load(fh)
+    def _load(self, filename: str | TextIO):
+        config = self._read_config(filename)
 
-        self._get_templates(config)
+        self._run_stage(self._get_templates, config)
         # quantum connections are only supported by sequential simulation so far
-        self._add_qconnections(config)
-        self._add_timeline(config)
-        self._map_bsm_routers(config)
-        self._add_nodes(config)
-        self._add_bsm_node_to_router()
-        self._add_qchannels(config)
-        self._add_cchannels(config)
-        self._add_cconnections(config)
-        self._generate_forwarding_table(config)
+        self._run_stage(self._add_qconnections, config)
+        self._run_stage(self._add_timeline, config)
+        self._run_stage(self._map_bsm_routers, config)
+        self._run_stage(self._add_nodes, config)
+        self._run_stage(self._add_bsm_node_to_router)
+        self._run_stage(self._add_qchannels, config)
+        self._run_stage(self._add_cchannels, config)
+        self._run_stage(self._add_cconnections, config)
+        self._run_stage(self._generate_forwarding_table, config)
 
     def _add_timeline(self, config: dict):
         stop_time = config.get(Topo.STOP_TIME, float('inf'))
-        self.tl = Timeline(stop_time)
+        event_queue = config.get(Topo.EVENT_QUEUE, HEAP_EVENT_QUEUE)
+        self.tl = Timeline(stop_time, event_queue=event_queue)
 
     def _map_bsm_routers(self, config):
         for qc in config[Topo.ALL_Q_CHANNEL]:
@@ -95,79 +93,9 @@ class DQCNetTopo(Topo):
             if r1 is not None:
                 r1.add_bsm_node(bsm, r0_str)
 
-    def _add_qconnections(self, config: dict):
-        """generate bsm_info, qc_info, and cc_info for the q_connections."""
-        for q_connect in config.get(Topo.ALL_Q_CONNECT, []):
-            node1 = q_connect[Topo.CONNECT_NODE_1]
-            node2 = q_connect[Topo.CONNECT_NODE_2]
-            attenuation = q_connect[Topo.ATTENUATION]
-            distance = q_connect[Topo.DISTANCE] // 2
-            channel_type = q_connect[Topo.TYPE]
-            cc_delay = []                                   # generate classical channel delay
-            for cc in config.get(self.ALL_C_CHANNEL, []):   # classical channel
-                if cc[self.SRC] == node1 and cc[self.DST] == node2:
-                    delay = cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / SPEED_OF_LIGHT)
-                    cc_delay.append(delay)
-                elif cc[self.SRC] == node2 and cc[self.DST] == node1:
-                    delay = cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / SPEED_OF_LIGHT)
-                    cc_delay.append(delay)
-
-            for cc in config.get(self.ALL_C_CONNECT, []):  # classical connection
-                if (cc[self.CONNECT_NODE_1] == node1 and cc[self.CONNECT_NODE_2] == node2) \
-                        or (cc[self.CONNECT_NODE_1] == node2 and cc[self.CONNECT_NODE_2] == node1):
-                    delay = cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / SPEED_OF_LIGHT)
-                    cc_delay.append(delay)
-            if len(cc_delay) == 0:
-                assert 0, q_connect
-            cc_delay = np.mean(cc_delay) // 2
-
-            if channel_type == self.MEET_IN_THE_MID:
-                bsm_name = f"BSM.{node1}.{node2}.auto"  # the intermediate BSM node
-                bsm_seed = q_connect.get(Topo.SEED, 0)
-                bsm_template_name = q_connect.get(Topo.TEMPLATE, None)
-                bsm_info = {self.NAME: bsm_name,
-                            self.TYPE: self.BSM_NODE,
-                            self.SEED: bsm_seed,
-                            self.TEMPLATE: bsm_template_name}
-                config[self.ALL_NODE].append(bsm_info)
-
-                for src in [node1, node2]:
-                    qc_name = f"QC.{src}.{bsm_name}"  # the quantum channel
-                    qc_info = {self.NAME: qc_name,
-                               self.SRC: src,
-                               self.DST: bsm_name,
-                               self.DISTANCE: distance,
-                               self.ATTENUATION: attenuation}
-                    if self.ALL_Q_CHANNEL not in config:
-                        config[self.ALL_Q_CHANNEL] = []
-                    config[self.ALL_Q_CHANNEL].append(qc_info)
-
-                    cc_name = f"CC.{src}.{bsm_name}"  # the classical channel
-                    cc_info = {self.NAME: cc_name,
-                               self.SRC: src,
-                               self.DST: bsm_name,
-                               self.DISTANCE: distance,
-                               self.DELAY: cc_delay}
-                    if self.ALL_C_CHANNEL not in config:
-                        config[self.ALL_C_CHANNEL] = []
-                    config[self.ALL_C_CHANNEL].append(cc_info)
-
-                    cc_name = f"CC.{bsm_name}.{src}"
-                    cc_info = {self.NAME: cc_name,
-                               self.SRC: bsm_name,
-                               self.DST: src,
-                               self.DISTANCE: distance,
-                               self.DELAY: cc_delay}
-                    config[self.ALL_C_CHANNEL].append(cc_info)
-            else:
-                raise NotImplementedError("Unknown type of quantum connection")
-
     def _generate_forwarding_table(self, config: dict):
         """For static routing."""
-        graph = Graph()
-        for node in config[Topo.ALL_NODE]:
-            if node[Topo.TYPE] == self.DQC_NODE:
-                graph.add_node(node[Topo.NAME])
+        names = [node[Topo.NAME] for node in config[Topo.ALL_NODE] if node[Topo.TYPE] == self.DQC_NODE]
 
         costs = {}
         for qc in self.qchannels:
@@ -178,22 +106,10 @@ class DQCNetTopo(Topo):
                 costs[bsm] = [router] + costs[bsm]
                 costs[bsm][-1] += qc.distance
 
-        graph.add_weighted_edges_from(costs.values())
-        for src in self.nodes[self.DQC_NODE]:
-            for dst_name in graph.nodes:
-                if src.name == dst_name:
-                    continue
-                try:
-                    if dst_name > src.name:
-                        path = dijkstra_path(graph, src.name, dst_name)
-                    else:
-                        path = dijkstra_path(graph, dst_name, src.name)[::-1]
-                    next_hop = path[1]
-                    # routing protocol locates at the bottom of the stack
-                    routing_protocol = src.network_manager.protocol_stack[0]  # guarantee that [0] is the routing protocol?
-                    routing_protocol.add_forwarding_rule(dst_name, next_hop)
-                except exception.NetworkXNoPath:
-                    pass
+        self.routing_table = RoutingTable(names, [tuple(cost) for cost in costs.values()])
+        for node in self.nodes[self.DQC_NODE]:
+            # routing protocol locates at the bottom of the stack
+            node.network_manager.protocol_stack[0].set_routing_table(self.routing_table)
 
     def infer_qubit_to_node(self, total_wires: int) -> dict[int, str]:
         """Auto-infer the {wire_index: node_name} map by 
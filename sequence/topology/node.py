@@ -19,10 +19,14 @@ if TYPE_CHECKING:
     from ..components.optical_channel import QuantumChannel, ClassicalChannel
     from ..components.memory import Memory
     from ..components.photon import Photon
+    from ..components.photon_train import PhotonTrain
     from ..app.request_app import RequestApp
     from ..app.teleport_app import TeleportApp
 
 from ..kernel.entity import Entity, ClassicalEntity
+from ..kernel.event import Event
+from ..kernel.process import Process
+from ..kernel.random_service import RandomStream, stream_seed_sequence
 from ..components.memory import MemoryArray
 from ..components.bsm import SingleAtomBSM, SingleHeraldedBSM
 from ..components.light_source import LightSource
@@ -33,7 +37,7 @@ from ..entanglement_management.generation import EntanglementGenerationB
 from ..resource_management.resource_manager import ResourceManager
 from ..network_management.network_manager import NewNetworkManager, NetworkManager
 from ..utils.encoding import *
-from ..utils import log
+from ..utils import log, trace
 
 
 class Node(Entity):
@@ -48,6 +52,7 @@ class Node(Entity):
         qchannels (dict[str, QuantumChannel]): mapping of destination node names to quantum channel instances.
         protocols (list[Protocol]): list of attached protocols.
         generator (np.random.Generator): random number generator used by node.
+        stream (RandomStream): buffered random numbers used by node (independent of `generator`).
         components (dict[str, Entity]): mapping of local component names to objects.
         first_component_name (str): name of component that first receives incoming qubits.
         gate_fid (float): fidelity of multi-qubit gates (usually CNOT) that can be performed on the node.
@@ -59,7 +64,7 @@ class Node(Entity):
 
         name (str): name of node instance.
         timeline (Timeline): timeline for simulation.
-        seed (int): seed for random number generator, default None
+        seed (int): seed for random number generator, default None (derived from the name by `timeline.random_service`)
         """
 
         log.logger.info(f"Create Node {name}")
@@ -68,7 +73,7 @@ class Node(Entity):
         self.cchannels = {}  # mapping of destination node names to classical channels
         self.qchannels = {}  # mapping of destination node names to quantum channels
         self.protocols = []
-        self.generator = np.random.default_rng(seed)
+        self.set_seed(timeline.random_service.seed_sequence(name) if seed is None else seed)
         self.components = {}
         self.first_component_name = None
 
@@ -83,10 +88,15 @@ class Node(Entity):
 
     def set_seed(self, seed: int) -> None:
         self.generator = np.random.default_rng(seed)
+        self.stream = RandomStream(np.random.default_rng(stream_seed_sequence(self.generator.bit_generator.seed_seq)),
+                                   self.timeline.random_service.block_size)
 
     def get_generator(self) -> np.random.Generator:
         return self.generator
 
+    def get_stream(self) -> RandomStream:
+        return self.stream
+
     def add_component(self, component: Entity) -> None:
         """Adds a hardware component to the node.
 
@@ -137,7 +147,10 @@ class Node(Entity):
             msg (Message): message to transmit.
             priority (int): priority for transmitted message (default inf).
         """
-        log.logger.info(f"{self.name} send message {msg} to {dst}")
+        if log.is_tracked("node"):
+            log.logger.info(f"{self.name} send message {msg} to {dst}")
+        if trace.is_traced("node"):
+            trace.recorder.record(self.name, "send_message", dst)
 
         if priority == inf:
             priority = self.timeline.schedule_counter
@@ -152,7 +165,10 @@ class Node(Entity):
             src (str): name of node sending the message.
             msg (Message): message transmitted from node.
         """
-        log.logger.info(f"{self.name} receive message {msg} from {src}")
+        if log.is_tracked("node"):
+            log.logger.info(f"{self.name} receive message {msg} from {src}")
+        if trace.is_traced("node"):
+            trace.recorder.record(self.name, "receive_message", src)
         # signal to protocol that we've received a message
         if msg.receiver is not None:
             for protocol in self.protocols:
@@ -173,6 +189,11 @@ class Node(Entity):
 
         self.qchannels[dst].transmit(qubit, self)
 
+    def send_train(self, dst: str, train: "PhotonTrain") -> None:
+        """Interface for quantum channel `transmit_train` method."""
+
+        self.qchannels[dst].transmit_train(train, self)
+
     def receive_qubit(self, src: str, qubit) -> None:
         """Method to receive qubits from quantum channel.
 
@@ -184,6 +205,20 @@ class Node(Entity):
         """
         self.components[self.first_component_name].get(qubit)
 
+    def receive_train(self, src: str, train: "PhotonTrain") -> None:
+        """Method to receive a train of photons from quantum channel.
+
+        By default, the photons are materialized and received one by one (via `receive_qubit`) at their arrival times.
+
+        Args:
+            src (str): name of node where the photons were sent from.
+            train (PhotonTrain): transmitted photons.
+        """
+
+        for photon, time in zip(train.to_photons(), train.times.tolist()):
+            process = Process(self, "receive_qubit", [src, photon])
+            self.timeline.schedule(Event(time, process))
+
     def get_components_by_type(self, component_type: str | type) -> list:
         """Method to return all components of a specific type.
         Args:
@@ -343,7 +378,10 @@ class QuantumRouter(Node):
             msg (Message): the received message.
         """
 
-        log.logger.info(f"{self.name} receive message {msg} from {src}")
+        if log.is_tracked("node"):
+            log.logger.info(f"{self.name} receive message {msg} from {src}")
+        if trace.is_traced("node"):
+            trace.recorder.record(self.name, "receive_message", src)
         if msg.receiver == "network_manager":
             self.network_manager.received_message(src, msg)
         elif msg.receiver == "resource_manager":
@@ -715,6 +753,22 @@ class QKDNode(Node):
     def get(self, photon: "Photon", **kwargs):
         self.send_qubit(self.destination, photon)
 
+    def get_train(self, train: "PhotonTrain", **kwargs):
+        self.send_train(self.destination, train)
+
+    def receive_train(self, src: str, train: "PhotonTrain") -> None:
+        """Method to receive a train of photons from quantum channel.
+
+        The train is forwarded to the `get_train` method of the first component if it has one
+        (e.g. `QSDetectorPolarization`), otherwise the photons are received one by one (see `Node.receive_train`).
+        """
+
+        component = self.components[self.first_component_name]
+        if hasattr(component, "get_train"):
+            component.get_train(train)
+        else:
+            super().receive_train(src, train)
+
 
 class ClassicalNode(ClassicalEntity):
     """Base node type that has only classical capabilties.
@@ -727,6 +781,7 @@ class ClassicalNode(ClassicalEntity):
         cchannels (dict[str, ClassicalChannel]): mapping of destination node names to classical channel instances.
         protocols (list[Protocol]): list of attached protocols.
         generator (np.random.Generator): random number generator used by node.
+        stream (RandomStream): buffered random numbers used by node (independent of `generator`).
     """
 
     def __init__(self, name: str, timeline: "Timeline", seed: int = None):
@@ -734,7 +789,7 @@ class ClassicalNode(ClassicalEntity):
 
         name (str): name of node instance.
         timeline (Timeline): timeline for simulation.
-        seed (int): seed for random number generator, default None
+        seed (int): seed for random number generator, default None (derived from the name by `timeline.random_service`)
         """
 
         log.logger.info(f"Create Node {name}")
@@ -742,7 +797,7 @@ class ClassicalNode(ClassicalEntity):
         self.owner = self
         self.cchannels = {}  # mapping of destination node names to classical channels
         self.protocols = []
-        self.generator = np.random.default_rng(seed)
+        self.set_seed(timeline.random_service.seed_sequence(name) if seed is None else seed)
         self.components = {}
 
     def init(self) -> None:
@@ -750,10 +805,15 @@ class ClassicalNode(ClassicalEntity):
 
     def set_seed(self, seed: int) -> None:
         self.generator = np.random.default_rng(seed)
+        self.stream = RandomStream(np.random.default_rng(stream_seed_sequence(self.generator.bit_generator.seed_seq)),
+                                   self.timeline.random_service.block_size)
 
     def get_generator(self) -> np.random.Generator:
         return self.generator
 
+    def get_stream(self) -> RandomStream:
+        return self.stream
+
     def assign_cchannel(self, cchannel: "ClassicalChannel", another: str) -> None:
         """Method to assign a classical channel to the node.
 
@@ -774,7 +834,10 @@ class ClassicalNode(ClassicalEntity):
             msg (Message): message to transmit.
             priority (int): priority for transmitted message (default inf).
         """
-        log.logger.info(f"{self.name} send message {msg} to {dst}")
+        if log.is_tracked("node"):
+            log.logger.info(f"{self.name} send message {msg} to {dst}")
+        if trace.is_traced("node"):
+            trace.recorder.record(self.name, "send_message", dst)
 
         if priority == inf:
             priority = self.timeline.schedule_counter
@@ -789,7 +852,10 @@ class ClassicalNode(ClassicalEntity):
             src (str): name of node sending the message.
             msg (Message): message transmitted from node.
         """
-        log.logger.info(f"{self.name} receive message {msg} from {src}")
+        if log.is_tracked("node"):
+            log.logger.info(f"{self.name} receive message {msg} from {src}")
+        if trace.is_traced("node"):
+            trace.recorder.record(self.name, "receive_message", src)
         # signal to protocol that we've received a message
         if msg.receiver is not None:
             for protocol in self.protocols:
@@ -851,7 +917,10 @@ class DQCNode(QuantumRouter):
             msg (Message): the received message.
         """
 
-        log.logger.info(f"{self.name} receive message {msg} from {src}")
+        if log.is_tracked("node"):
+            log.logger.info(f"{self.name} receive message {msg} from {src}")
+        if trace.is_traced("node"):
+            trace.recorder.record(self.name, "receive_message", src)
         if msg.receiver == "network_manager":
             self.network_manager.received_message(src, msg)
         elif msg.receiver == "resource_manager":
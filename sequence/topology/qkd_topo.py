@@ -1,8 +1,9 @@
-import json
+from typing import TextIO
 
 from .topology import Topology as Topo
 from .node import QKDNode
 from ..kernel.timeline import Timeline
+from ..constants import HEAP_EVENT_QUEUE
 
 
 class QKDTopo(Topo):
@@ -20,19 +21,20 @@ class QKDTopo(Topo):
     """
     QKD_NODE = "QKDNode"
 
-    def _load(self, filename):
-        topo_config = json.load(open(filename))
+    def _load(self, filename: str | TextIO):
+        topo_config = self._read_config(filename)
 
-        self._get_templates(topo_config)
-        self._add_timeline(topo_config)
-        self._add_nodes(topo_config)
-        self._add_qchannels(topo_config)
-        self._add_cchannels(topo_config)
-        self._add_cconnections(topo_config)
+        self._run_stage(self._get_templates, topo_config)
+        self._run_stage(self._add_timeline, topo_config)
+        self._run_stage(self._add_nodes, topo_config)
+        self._run_stage(self._add_qchannels, topo_config)
+        self._run_stage(self._add_cchannels, topo_config)
+        self._run_stage(self._add_cconnections, topo_config)
 
     def _add_timeline(self, config):
         stop_time = config.get(Topo.STOP_TIME, float('inf'))
-        self.tl = Timeline(stop_time)
+        event_queue = config.get(Topo.EVENT_QUEUE, HEAP_EVENT_QUEUE)
+        self.tl = Timeline(stop_time, event_queue=event_queue)
 
     def _add_nodes(self, config):
         for node in config[Topo.ALL_NODE]:
@@ -1,9 +1,8 @@
-import json
-import numpy as np
+from typing import TextIO
 
 from .topology import Topology as Topo
 from ..kernel.timeline import Timeline
-from ..constants import SPEED_OF_LIGHT
+from ..constants import HEAP_EVENT_QUEUE
 
 from .qlan.orchestrator import QlanOrchestratorNode
 from .qlan.client import QlanClientNode
@@ -62,26 +61,26 @@ class QlanStarTopo(Topo):
         super().__init__(conf_file_name)
 
 
-    def _load(self, filename: str):
-        with open(filename) as fh:
-            config = json.load(fh)
+    def _load(self, filename: str | TextIO):
+        config = self._read_config(filename)
 
-        self._get_templates(config)
-        self._add_parameters(config)
+        self._run_stage(self._get_templates, config)
+        self._run_stage(self._add_parameters, config)
 
         # quantum connections are only supported by sequential simulation so far
-        self._add_qconnections(config)
+        self._run_stage(self._add_qconnections, config)
 
-        self._add_timeline(config)
-        self._add_nodes(config)
-        self._add_qchannels(config)
-        self._add_cchannels(config)
-        self._add_cconnections(config)
-        self._add_protocols()
+        self._run_stage(self._add_timeline, config)
+        self._run_stage(self._add_nodes, config)
+        self._run_stage(self._add_qchannels, config)
+        self._run_stage(self._add_cchannels, config)
+        self._run_stage(self._add_cconnections, config)
+        self._run_stage(self._add_protocols)
 
     def _add_timeline(self, config: dict):
         stop_time = config.get(Topo.STOP_TIME, float('inf'))
-        self.tl = Timeline(stop_time)
+        event_queue = config.get(Topo.EVENT_QUEUE, HEAP_EVENT_QUEUE)
+        self.tl = Timeline(stop_time, event_queue=event_queue)
     
     def _add_parameters(self, config: dict):
 
@@ -170,29 +169,7 @@ class QlanStarTopo(Topo):
             client.resource_manager.create_protocol()
 
     def _add_qconnections(self, config: dict):
-        '''generate bsm_info, qc_info, and cc_info for the q_connections
-        '''
+        """check that the nodes of each quantum connection are also connected by classical channels or connections."""
+        delays = self._index_classical_delays(config)
         for q_connect in config.get(Topo.ALL_Q_CONNECT, []):
-            node1 = q_connect[Topo.CONNECT_NODE_1]
-            node2 = q_connect[Topo.CONNECT_NODE_2]
-            attenuation = q_connect[Topo.ATTENUATION]
-            distance = q_connect[Topo.DISTANCE] // 2
-            channel_type = q_connect[Topo.TYPE]
-            cc_delay = []                                   
-            for cc in config.get(self.ALL_C_CHANNEL, []):   
-                if cc[self.SRC] == node1 and cc[self.DST] == node2:
-                    delay = cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / SPEED_OF_LIGHT)
-                    cc_delay.append(delay)
-                elif cc[self.SRC] == node2 and cc[self.DST] == node1:
-                    delay = cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / SPEED_OF_LIGHT)
-                    cc_delay.append(delay)
-
-            for cc in config.get(self.ALL_C_CONNECT, []):  
-                if (cc[self.CONNECT_NODE_1] == node1 and cc[self.CONNECT_NODE_2] == node2) \
-                        or (cc[self.CONNECT_NODE_1] == node2 and cc[self.CONNECT_NODE_2] == node1):
-                    delay = cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / SPEED_OF_LIGHT)
-                    cc_delay.append(delay)
-            if len(cc_delay) == 0:
-                assert 0, q_connect
-            cc_delay = np.mean(cc_delay) // 2
-
+            self._qconnection_delay(q_connect, delays)
@@ -1,12 +1,15 @@
-import json
-import numpy as np
-from networkx import Graph, dijkstra_path, exception
+from math import ceil
+from typing import TextIO
+
+from networkx import Graph
 
 from .topology import Topology as Topo
 from ..kernel.timeline import Timeline
+from ..kernel.parallel_timeline import ParallelTimeline
 from ..kernel.quantum_manager import KET_STATE_FORMALISM, QuantumManager
 from .node import BSMNode, QuantumRouter
-from ..constants import SPEED_OF_LIGHT
+from ..network_management.routing import RoutingTable
+from ..constants import HEAP_EVENT_QUEUE
 
 
 class RouterNetTopo(Topo):
@@ -16,48 +19,71 @@ class RouterNetTopo(Topo):
     nodes, quantum  channels, classical channels and timeline for simulation
     could be generated by using this class.
 
+    If a `partition_id` is given, only the nodes of that partition are generated, on a ParallelTimeline.
+    The number of partitions is given by the `process_num` field of the configuration,
+    and nodes are assigned to partitions by their `group` field (see `_assign_groups`).
+
     Attributes:
         bsm_to_router_map (dict[str, list[Node]]): mapping of bsm node to two connected routers
         nodes (dict[str, list[Node]]): mapping of type of node to a list of same type node.
         qchannels (list[QuantumChannel]): list of quantum channel objects in network.
         cchannels (list[ClassicalChannel]): list of classical channel objects in network.
         tl (Timeline): the timeline used for simulation
+        routing_table (RoutingTable): next hops between routers, shared by their routing protocols.
+        partition_id (int | None): partition generated by this topology (None for sequential simulation).
+        groups (dict[str, int]): mapping of node names to partition index (parallel simulation only).
     """
     BSM_NODE = "BSMNode"
     MEET_IN_THE_MID = "meet_in_the_middle"
     MEMO_ARRAY_SIZE = "memo_size"     # NOTE meant for communication memories
     PORT = "port"
     PROC_NUM = "process_num"
+    GROUP = "group"
+    LOOKAHEAD = "lookahead"
     QUANTUM_ROUTER = "QuantumRouter"
     CONTROLLER = "Controller"
 
-    def __init__(self, conf_file_name: str):
+    def __init__(self, conf_file_name: str, partition_id: int | None = None):
+        """Constructor for the router network topology.
+
+        Args:
+            conf_file_name (str): the name of configuration file.
+            partition_id (int | None): partition to generate for parallel simulation (default None, sequential).
+        """
         self.bsm_to_router_map = {}
         self.encoding_type = None
+        self.partition_id = partition_id
+        self.groups: dict[str, int] = {}
         super().__init__(conf_file_name)
 
-    def _load(self, filename: str):
-        with open(filename) as fh:
-            config = json.load(fh)
+    def _load(self, filename: str | TextIO):
+        config = self._read_config(filename)
 
-        self._get_templates(config)
+        self._run_stage(self._get_templates, config)
         # quantum connections are only supported by sequential simulation so far
-        self._add_qconnections(config)
-        self._add_timeline(config)
-        self._map_bsm_routers(config)
-        self._add_nodes(config)
-        self._add_bsm_node_to_router()
-        self._add_qchannels(config)
-        self._add_cchannels(config)
-        self._add_cconnections(config)
-        self._generate_forwarding_table(config)
+        self._run_stage(self._add_qconnections, config)
+        self._run_stage(self._add_timeline, config)
+        self._run_stage(self._map_bsm_routers, config)
+        self._run_stage(self._add_nodes, config)
+        self._run_stage(self._add_bsm_node_to_router)
+        self._run_stage(self._add_qchannels, config)
+        self._run_stage(self._add_cchannels, config)
+        self._run_stage(self._add_cconnections, config)
+        self._run_stage(self._generate_forwarding_table, config)
 
     def _add_timeline(self, config: dict):
         stop_time = config.get(Topo.STOP_TIME, 10 ** 23)
         formalism = config.get(Topo.FORMALISM, KET_STATE_FORMALISM)
         truncation = config.get(Topo.TRUNC, 1)
+        event_queue = config.get(Topo.EVENT_QUEUE, HEAP_EVENT_QUEUE)
         QuantumManager.set_global_manager_formalism(formalism)
-        self.tl = Timeline(stop_time=stop_time, truncation=truncation)
+        if self.partition_id is None:
+            self.tl = Timeline(stop_time=stop_time, truncation=truncation, event_queue=event_queue)
+        else:
+            num_partitions = config[self.PROC_NUM]
+            lookahead = config.get(self.LOOKAHEAD, None)
+            self.tl = ParallelTimeline(self.partition_id, num_partitions, lookahead=lookahead, stop_time=stop_time,
+                                       truncation=truncation, event_queue=event_queue)
 
     def _map_bsm_routers(self, config):
         for qc in config[Topo.ALL_Q_CHANNEL]:
@@ -67,11 +93,77 @@ class RouterNetTopo(Topo):
             else:
                 self.bsm_to_router_map[dst] = [src]
 
+    def _assign_groups(self, config: dict, num_partitions: int) -> dict[str, int]:
+        """Method to assign nodes to partitions for parallel simulation.
+
+        Nodes with a `group` field keep it.
+        Other routers are visited in breadth-first order over quantum connections and split into `num_partitions` chunks of equal size,
+        so that neighboring routers tend to share a partition.
+        Other BSM nodes join the partition of their first router.
+
+        Args:
+            config (dict): the configuration (after expanding quantum connections).
+            num_partitions (int): number of partitions.
+
+        Returns:
+            dict[str, int]: mapping of node names to partition index.
+        """
+        groups = {}
+        routers = []
+        for node in config[Topo.ALL_NODE]:
+            name = node[Topo.NAME]
+            if self.GROUP in node:
+                groups[name] = node[self.GROUP]
+            elif node[Topo.TYPE] != self.BSM_NODE:
+                routers.append(name)
+
+        graph = Graph()
+        graph.add_nodes_from(routers)
+        for others in self.bsm_to_router_map.values():
+            if len(others) == 2 and others[0] in graph and others[1] in graph:
+                graph.add_edge(*others)
+
+        index = {name: i for i, name in enumerate(routers)}
+        order = []
+        visited = set()
+        for start in routers:
+            if start in visited:
+                continue
+            queue = [start]
+            visited.add(start)
+            while queue:
+                name = queue.pop(0)
+                order.append(name)
+                for neighbor in sorted(graph.neighbors(name), key=index.get):
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        queue.append(neighbor)
+
+        chunk = max(ceil(len(order) / num_partitions), 1)
+        for i, name in enumerate(order):
+            groups[name] = i // chunk
+
+        for node in config[Topo.ALL_NODE]:
+            name = node[Topo.NAME]
+            if name not in groups:
+                others = self.bsm_to_router_map.get(name, [])
+                groups[name] = groups.get(others[0], 0) if others else 0
+
+        for name, group in groups.items():
+            assert 0 <= group < num_partitions, f"node {name} assigned to invalid partition {group}"
+        return groups
+
     def _add_nodes(self, config: dict):
+        if self.partition_id is not None:
+            self.groups = self._assign_groups(config, self.tl.num_partitions)
+
         for node in config[Topo.ALL_NODE]:
             seed = node[Topo.SEED]
             node_type = node[Topo.TYPE]
             name = node[Topo.NAME]
+            if self.partition_id is not None and self.groups[name] != self.partition_id:
+                self.tl.add_foreign_entity(name, self.groups[name])
+                continue
             template_name = node.get(Topo.TEMPLATE, None)
             template = self.templates.get(template_name, {})
 
@@ -97,102 +189,24 @@ class RouterNetTopo(Topo):
             if r1 is not None:
                 r1.add_bsm_node(bsm, r0_str)
 
-    def _add_qconnections(self, config: dict):
-        """generate bsm_info, qc_info, and cc_info for the q_connections."""
-        for q_connect in config.get(Topo.ALL_Q_CONNECT, []):
-            node1 = q_connect[Topo.CONNECT_NODE_1]
-            node2 = q_connect[Topo.CONNECT_NODE_2]
-            attenuation = q_connect[Topo.ATTENUATION]
-            distance = q_connect[Topo.DISTANCE] // 2
-            channel_type = q_connect[Topo.TYPE]
-            cc_delay = []                                   # generate classical channel delay
-            for cc in config.get(self.ALL_C_CHANNEL, []):   # classical channel
-                if cc[self.SRC] == node1 and cc[self.DST] == node2:
-                    delay = cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / SPEED_OF_LIGHT)
-                    cc_delay.append(delay)
-                elif cc[self.SRC] == node2 and cc[self.DST] == node1:
-                    delay = cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / SPEED_OF_LIGHT)
-                    cc_delay.append(delay)
-
-            for cc in config.get(self.ALL_C_CONNECT, []):  # classical connection
-                if (cc[self.CONNECT_NODE_1] == node1 and cc[self.CONNECT_NODE_2] == node2) \
-                        or (cc[self.CONNECT_NODE_1] == node2 and cc[self.CONNECT_NODE_2] == node1):
-                    delay = cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / SPEED_OF_LIGHT)
-                    cc_delay.append(delay)
-            if len(cc_delay) == 0:
-                assert 0, q_connect
-            cc_delay = np.mean(cc_delay) // 2
-
-            if channel_type == self.MEET_IN_THE_MID:
-                bsm_name = f"BSM.{node1}.{node2}.auto"  # the intermediate BSM node
-                bsm_seed = q_connect.get(Topo.SEED, 0)
-                bsm_template_name = q_connect.get(Topo.TEMPLATE, None)
-                bsm_info = {self.NAME: bsm_name,
-                            self.TYPE: self.BSM_NODE,
-                            self.SEED: bsm_seed,
-                            self.TEMPLATE: bsm_template_name}
-                config[self.ALL_NODE].append(bsm_info)
-
-                for src in [node1, node2]:
-                    qc_name = f"QC.{src}.{bsm_name}"  # the quantum channel
-                    qc_info = {self.NAME: qc_name,
-                               self.SRC: src,
-                               self.DST: bsm_name,
-                               self.DISTANCE: distance,
-                               self.ATTENUATION: attenuation}
-                    if self.ALL_Q_CHANNEL not in config:
-                        config[self.ALL_Q_CHANNEL] = []
-                    config[self.ALL_Q_CHANNEL].append(qc_info)
-
-                    cc_name = f"CC.{src}.{bsm_name}"  # the classical channel
-                    cc_info = {self.NAME: cc_name,
-                               self.SRC: src,
-                               self.DST: bsm_name,
-                               self.DISTANCE: distance,
-                               self.DELAY: cc_delay}
-                    if self.ALL_C_CHANNEL not in config:
-                        config[self.ALL_C_CHANNEL] = []
-                    config[self.ALL_C_CHANNEL].append(cc_info)
-
-                    cc_name = f"CC.{bsm_name}.{src}"
-                    cc_info = {self.NAME: cc_name,
-                               self.SRC: bsm_name,
-                               self.DST: src,
-                               self.DISTANCE: distance,
-                               self.DELAY: cc_delay}
-                    config[self.ALL_C_CHANNEL].append(cc_info)
-            else:
-                raise NotImplementedError("Unknown type of quantum connection")
-
     def _generate_forwarding_table(self, config: dict):
         """For static routing."""
-        graph = Graph()
-        for node in config[Topo.ALL_NODE]:
-            if node[Topo.TYPE] == self.QUANTUM_ROUTER:
-                graph.add_node(node[Topo.NAME])
+        names = [node[Topo.NAME] for node in config[Topo.ALL_NODE] if node[Topo.TYPE] == self.QUANTUM_ROUTER]
+        routers = set(names)
 
+        # use the configuration, since channels of other partitions are not generated in parallel simulation
         costs = {}
-        for qc in self.qchannels:
-            router, bsm = qc.sender.name, qc.receiver
+        for qc in config.get(Topo.ALL_Q_CHANNEL, []):
+            router, bsm, distance = qc[Topo.SRC], qc[Topo.DST], qc[Topo.DISTANCE]
+            if router not in routers:
+                continue
             if bsm not in costs:
-                costs[bsm] = [router, qc.distance]
+                costs[bsm] = [router, distance]
             else:
                 costs[bsm] = [router] + costs[bsm]
-                costs[bsm][-1] += qc.distance
-
-        graph.add_weighted_edges_from(costs.values())
-        for src in self.nodes[self.QUANTUM_ROUTER]:
-            for dst_name in graph.nodes:
-                if src.name == dst_name:
-                    continue
-                try:
-                    if dst_name > src.name:
-                        path = dijkstra_path(graph, src.name, dst_name)
-                    else:
-                        path = dijkstra_path(graph, dst_name, src.name)[::-1]
-                    next_hop = path[1]
-                    # routing protocol locates at the bottom of the stack
-                    routing_protocol = src.network_manager.protocol_stack[0]  # guarantee that [0] is the routing protocol?
-                    routing_protocol.add_forwarding_rule(dst_name, next_hop)
-                except exception.NetworkXNoPath:
-                    pass
+                costs[bsm][-1] += distance
+
+        self.routing_table = RoutingTable(names, [tuple(cost) for cost in costs.values()])
+        for node in self.nodes[self.QUANTUM_ROUTER]:
+            # routing protocol locates at the bottom of the stack
+            node.network_manager.protocol_stack[0].set_routing_table(self.routing_table)
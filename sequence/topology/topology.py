@@ -3,16 +3,29 @@
 This module provides a definition of the Topology class, which can be used to
 manage a network's structure.
 Topology instances automatically perform many useful network functions.
+
+Configurations are JSON files, or newline-delimited JSON files (see `load_config`) for very large networks.
 """
+import json
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from typing import TYPE_CHECKING, Optional
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Optional, TextIO
+
+import numpy as np
 
 if TYPE_CHECKING:
     from ..kernel.timeline import Timeline
 
 from .node import *
 from ..components.optical_channel import QuantumChannel, ClassicalChannel
+from ..constants import SPEED_OF_LIGHT
+from ..utils import log
+
+# file suffixes of newline-delimited JSON configurations
+NDJSON_SUFFIXES = (".jsonl", ".ndjson")
 
 
 class Topology(ABC):
@@ -27,6 +40,7 @@ class Topology(ABC):
         qchannels (list[QuantumChannel]): list of quantum channel objects in network.
         cchannels (list[ClassicalChannel]): list of classical channel objects in network.
         tl (Timeline): the timeline used for simulation
+        load_times (dict[str, float]): wall-clock time (s) of each stage of loading the configuration.
     """
 
     ALL_C_CONNECT = "cconnections"    # a connection consist of two opposite direction channels
@@ -51,30 +65,148 @@ class Topology(ABC):
     GATE_FIDELITY = "gate_fidelity"
     MEASUREMENT_FIDELITY = "measurement_fidelity"
     FORMALISM = "formalism"  # "ket_vector", "density_matrix", "bell_diagonal", etc
+    EVENT_QUEUE = "event_queue"  # "heap", "keyed_heap", "calendar"
+    BSM_NODE = "BSMNode"
+    MEET_IN_THE_MID = "meet_in_the_middle"
+    # fields of the configuration holding lists (items may be given one per line in newline-delimited JSON)
+    LIST_FIELDS = (ALL_NODE, ALL_Q_CONNECT, ALL_Q_CHANNEL, ALL_C_CONNECT, ALL_C_CHANNEL)
 
-    
-    def __init__(self, conf_file_name: str):
+    def __init__(self, conf_file_name: str | TextIO):
         """Constructor for topology class.
 
         Args:
-            conf_file_name (str): the name of configuration file
+            conf_file_name (str | TextIO): the name of configuration file, or a readable text stream (see `load_config`).
         """
         self.nodes: dict[str, list[Node]] = defaultdict(list)
         self.qchannels: list[QuantumChannel] = []
         self.cchannels: list[ClassicalChannel] = []
         self.templates: dict[str, dict] = {}
         self.tl: Timeline | None = None
+        self.load_times: dict[str, float] = {}
         self._load(conf_file_name)
+        log.logger.info(f"Topology loaded in {sum(self.load_times.values()):.3f} s: "
+                        + ", ".join(f"{stage} {t:.3f} s" for stage, t in self.load_times.items()))
 
     @abstractmethod
-    def _load(self, filename: str):
+    def _load(self, filename: str | TextIO):
         """Method for parsing configuration file and generate network
 
         Args:
-            filename (str): the name of configuration file
+            filename (str | TextIO): the name of configuration file, or a readable text stream.
         """
         pass
 
+    def _read_config(self, filename: str | TextIO) -> dict:
+        """Method to read the configuration, timed as the `load_config` stage."""
+
+        return self._run_stage(load_config, filename)
+
+    def _run_stage(self, stage: Callable, *args):
+        """Method to run a stage of loading and record its time in `load_times`.
+
+        Args:
+            stage (Callable): function of the stage (its name, without leading underscores, names the stage).
+            *args: arguments of the stage.
+
+        Returns:
+            Any: return value of the stage.
+        """
+
+        tick = perf_counter()
+        result = stage(*args)
+        name = stage.__name__.lstrip("_")
+        self.load_times[name] = self.load_times.get(name, 0) + perf_counter() - tick
+        return result
+
+    def _index_classical_delays(self, config: dict) -> dict[tuple[str, str], list[float]]:
+        """Method to index the delays of the classical channels and connections by (unordered) node pair.
+
+        Args:
+            config (dict): the configuration.
+
+        Returns:
+            dict[tuple[str, str], list[float]]: delays between each pair of nodes (sorted names),
+                those of classical channels first, in order of the configuration.
+        """
+
+        delays = defaultdict(list)
+        for cc in config.get(self.ALL_C_CHANNEL, []):
+            delay = cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / SPEED_OF_LIGHT)
+            delays[_node_pair(cc[self.SRC], cc[self.DST])].append(delay)
+        for cc in config.get(self.ALL_C_CONNECT, []):
+            delay = cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / SPEED_OF_LIGHT)
+            delays[_node_pair(cc[self.CONNECT_NODE_1], cc[self.CONNECT_NODE_2])].append(delay)
+        return delays
+
+    def _qconnection_delay(self, q_connect: dict, delays: dict[tuple[str, str], list[float]]) -> float:
+        """Method to get the classical delay between a node of a quantum connection and the middle of the connection.
+
+        Args:
+            q_connect (dict): the quantum connection.
+            delays (dict[tuple[str, str], list[float]]): classical delays indexed by `_index_classical_delays`.
+
+        Returns:
+            float: half of the mean classical delay between the nodes of the quantum connection.
+        """
+
+        cc_delay = delays.get(_node_pair(q_connect[self.CONNECT_NODE_1], q_connect[self.CONNECT_NODE_2]))
+        if not cc_delay:
+            assert 0, q_connect
+        return np.mean(cc_delay) // 2
+
+    def _add_qconnections(self, config: dict):
+        """generate bsm_info, qc_info, and cc_info for the q_connections.
+
+        Each quantum connection of type `meet_in_the_middle` is expanded into a BSM node in the middle,
+        a quantum channel from each node to the BSM node, and classical channels between each node and the BSM node.
+        The classical delay is half of the mean delay of the classical channels and connections between the nodes.
+        """
+        q_connects = config.get(self.ALL_Q_CONNECT, [])
+        if not q_connects:
+            return
+        delays = self._index_classical_delays(config)
+        bsm_infos, qc_infos, cc_infos = [], [], []
+        for q_connect in q_connects:
+            node1 = q_connect[self.CONNECT_NODE_1]
+            node2 = q_connect[self.CONNECT_NODE_2]
+            attenuation = q_connect[self.ATTENUATION]
+            distance = q_connect[self.DISTANCE] // 2
+            channel_type = q_connect[self.TYPE]
+            cc_delay = self._qconnection_delay(q_connect, delays)
+
+            if channel_type == self.MEET_IN_THE_MID:
+                bsm_name = f"BSM.{node1}.{node2}.auto"  # the intermediate BSM node
+                bsm_seed = q_connect.get(self.SEED, 0)
+                bsm_template_name = q_connect.get(self.TEMPLATE, None)
+                bsm_infos.append({self.NAME: bsm_name,
+                                  self.TYPE: self.BSM_NODE,
+                                  self.SEED: bsm_seed,
+                                  self.TEMPLATE: bsm_template_name})
+
+                for src in [node1, node2]:
+                    qc_infos.append({self.NAME: f"QC.{src}.{bsm_name}",  # the quantum channel
+                                     self.SRC: src,
+                                     self.DST: bsm_name,
+                                     self.DISTANCE: distance,
+                                     self.ATTENUATION: attenuation})
+                    cc_infos.append({self.NAME: f"CC.{src}.{bsm_name}",  # the classical channel
+                                     self.SRC: src,
+                                     self.DST: bsm_name,
+                                     self.DISTANCE: distance,
+                                     self.DELAY: cc_delay})
+                    cc_infos.append({self.NAME: f"CC.{bsm_name}.{src}",
+                                     self.SRC: bsm_name,
+                                     self.DST: src,
+                                     self.DISTANCE: distance,
+                                     self.DELAY: cc_delay})
+            else:
+                raise NotImplementedError("Unknown type of quantum connection")
+
+        config[self.ALL_NODE].extend(bsm_infos)
+        if qc_infos:
+            config.setdefault(self.ALL_Q_CHANNEL, []).extend(qc_infos)
+            config.setdefault(self.ALL_C_CHANNEL, []).extend(cc_infos)
+
     def _get_templates(self, config: dict) -> None:
         templates = config.get(Topology.ALL_TEMPLATES, {})
         self.templates = templates
@@ -132,3 +264,69 @@ class Topology(ABC):
 
     def get_nodes(self) -> dict[str, list["Node"]]:
         return self.nodes
+
+
+def _node_pair(node1: str, node2: str) -> tuple[str, str]:
+    return (node1, node2) if node1 <= node2 else (node2, node1)
+
+
+def load_config(source: str | TextIO) -> dict:
+    """Function to read a topology configuration.
+
+    A configuration is a JSON object, or newline-delimited JSON (NDJSON) for very large networks.
+    Each line of NDJSON is an object whose fields are merged into the configuration:
+    for the list fields (`Topology.LIST_FIELDS`), an object value is appended to the list and a list value extends it;
+    other fields are set. For example::
+
+        {"stop_time": 1e12, "templates": {}}
+        {"nodes": {"name": "r0", "type": "QuantumRouter", "seed": 0}}
+        {"nodes": {"name": "r1", "type": "QuantumRouter", "seed": 1}}
+        {"qconnections": {"node1": "r0", "node2": "r1", ...}}
+
+    NDJSON is read line by line, without holding the text of the file in memory.
+
+    Args:
+        source (str | TextIO): name of the configuration file (NDJSON if the suffix is `.jsonl` or `.ndjson`),
+            or a readable text stream (NDJSON if its first non-empty line is a complete JSON object).
+
+    Returns:
+        dict: the configuration.
+    """
+
+    if isinstance(source, (str, Path)):
+        with open(source) as fh:
+            if Path(source).suffix in NDJSON_SUFFIXES:
+                return _merge_records(fh, {})
+            return load_config(fh)
+
+    first = ""
+    for first in source:
+        if first.strip():
+            break
+    try:
+        record = json.loads(first)
+    except json.JSONDecodeError:
+        return json.loads(first + source.read())
+    if not isinstance(record, dict):
+        raise ValueError("topology configuration must be a JSON object")
+    return _merge_records(source, _merge_record({}, record))
+
+
+def _merge_records(lines, config: dict) -> dict:
+    for line in lines:
+        if line.strip():
+            _merge_record(config, json.loads(line))
+    return config
+
+
+def _merge_record(config: dict, record: dict) -> dict:
+    for key, value in record.items():
+        if key in Topology.LIST_FIELDS:
+            items = config.setdefault(key, [])
+            if isinstance(value, list):
+                items.extend(value)
+            else:
+                items.append(value)
+        else:
+            config[key] = value
+    return config
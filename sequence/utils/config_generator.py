@@ -21,7 +21,7 @@ def add_default_args(parser):
     parser.add_argument('qc_length', type=float, help='distance between nodes (in km)')
     parser.add_argument('qc_atten', type=float, help='quantum channel attenuation (in dB/m)')
     parser.add_argument('cc_delay', type=float, help='classical channel delay (in ms)')
-    parser.add_argument('-f', '--formalism', type=str, default='ket_vector', help='the formalism of the quantum state. Options: ket_vector, density_matrix, bell_diagonal')
+    parser.add_argument('-f', '--formalism', type=str, default='ket_vector', help='the formalism of the quantum state. Options: ket_vector, density_matrix, bell_diagonal, stabilizer')
     parser.add_argument('-d', '--directory', type=str, default='.', help='name of output directory')
     parser.add_argument('-o', '--output', type=str, default='out.json', help='name of output config file')
     parser.add_argument('-s', '--stop', type=float, default=float('inf'), help='stop time (in s)')
@@ -0,0 +1,179 @@
+"""Exact conversions between simulation time (in ps) and periods of a frequency.
+
+Times, frequencies and resolutions (int or float) are converted to exact ratios of integers,
+so that time bins and detection times are computed with integer arithmetic.
+The results are the same as computing with 80-bit `gmpy2.mpfr` numbers, as done previously:
+when an 80-bit rounding error could change a result (values within 2^-77 relative of a rounding threshold),
+the functions fall back to the `mpfr` computation.
+"""
+
+from operator import index
+
+import gmpy2
+
+from ..constants import SECOND, EPSILON
+
+gmpy2.get_context().precision = 80  # 80 bits ~ 24 decimal digits ~ sufficient for 10,000 years of ps timing
+EPSILON_MPFR = gmpy2.mpfr(EPSILON)
+PS_PER_SECOND = gmpy2.mpz(SECOND)
+# bound on the relative rounding error of the mpfr computations (at most three roundings at 80 bits)
+_ERROR_BITS = 77
+_MAX_EXACT = 1 << 80
+_EPSILON_NUM, _EPSILON_DEN = EPSILON.as_integer_ratio()
+
+
+def as_ratio(value: int | float) -> tuple[int, int]:
+    """Function to get a number as an exact ratio of integers.
+
+    Args:
+        value (int | float): number (Python or NumPy scalar).
+
+    Returns:
+        tuple[int, int]: numerator and (positive) denominator.
+    """
+
+    if type(value) is int:
+        return value, 1
+    if isinstance(value, float):
+        return value.as_integer_ratio()
+    try:
+        return index(value), 1
+    except TypeError:
+        return float(value).as_integer_ratio()
+
+
+def time_to_timebin(time: int | float, frequency: int | float) -> int:
+    """Function to convert a simulation time to a time bin of a frequency.
+
+    Time bin `k` starts at `k * 10^12 / frequency` ps.
+    The time is rounded to the nearest bin (ties to even),
+    then moved to the next bin if it is more than `EPSILON` of a period after the start of a bin.
+
+    Args:
+        time (int | float): simulation time (ps).
+        frequency (int | float): frequency of the time bins (Hz).
+
+    Returns:
+        int: time bin.
+    """
+
+    time_num, time_den = as_ratio(time)
+    freq_num, freq_den = as_ratio(frequency)
+    num = time_num * freq_num
+    den = time_den * freq_den * SECOND
+    if num < 0 or freq_num <= 0:
+        return _mpfr_time_to_timebin(time, frequency)
+    time_bin, remainder = divmod(num, den)
+    half_diff = 2 * remainder - den
+    # the fraction of a bin (remainder / den) is compared with EPSILON
+    eps_diff = remainder * _EPSILON_DEN - _EPSILON_NUM * den
+    bound = (time_bin + 1) * den
+    if remainder == 0 or half_diff == 0:
+        if num >= _MAX_EXACT:
+            return _mpfr_time_to_timebin(time, frequency)
+    elif min(remainder, den - remainder, abs(half_diff)) << _ERROR_BITS <= bound:
+        return _mpfr_time_to_timebin(time, frequency)
+    if abs(eps_diff) << _ERROR_BITS <= bound * _EPSILON_DEN:
+        return _mpfr_time_to_timebin(time, frequency)
+
+    if half_diff > 0 or (half_diff == 0 and time_bin & 1):
+        time_bin += 1
+    if eps_diff > 0:
+        time_bin += 1       # round to the next time bin
+    return time_bin
+
+
+def timebin_to_time(time_bin: int, frequency: int | float) -> int:
+    """Function to convert a time bin of a frequency to simulation time.
+
+    Args:
+        time_bin (int): time bin.
+        frequency (int | float): frequency of the time bins (Hz).
+
+    Returns:
+        int: start time of the bin, rounded to the nearest ps (ties to even).
+    """
+
+    freq_num, freq_den = as_ratio(frequency)
+    num = time_bin * SECOND
+    if not 0 <= num < _MAX_EXACT or freq_num <= 0:
+        return _mpfr_timebin_to_time(time_bin, frequency)
+    time, remainder = divmod(num * freq_den, freq_num)
+    half_diff = 2 * remainder - freq_num
+    if remainder == 0 or half_diff == 0:
+        if 2 * time + 1 >= _MAX_EXACT:
+            return _mpfr_timebin_to_time(time_bin, frequency)
+    elif abs(half_diff) << _ERROR_BITS <= (time + 1) * 2 * freq_num:
+        return _mpfr_timebin_to_time(time_bin, frequency)
+    if half_diff > 0 or (half_diff == 0 and time & 1):
+        time += 1
+    return time
+
+
+def round_to_resolution(time: int | float, resolution: int | float) -> int:
+    """Function to round a time to the nearest multiple of a resolution (ties to even multiples).
+
+    Args:
+        time (int | float): simulation time (ps).
+        resolution (int | float): time resolution (ps).
+
+    Returns:
+        int: index of the nearest multiple.
+    """
+
+    time_num, time_den = as_ratio(time)
+    res_num, res_den = as_ratio(resolution)
+    num = time_num * res_den
+    den = time_den * res_num
+    if den <= 0 or abs(time_num) >= _MAX_EXACT:
+        return _mpfr_round_to_resolution(time, resolution)
+    index_, remainder = divmod(num, den)
+    diff = 2 * remainder - den
+    if diff == 0:
+        # exact tie, representable at 80 bits
+        if abs(2 * index_ + 1) < _MAX_EXACT:
+            return index_ + (index_ & 1)
+        return _mpfr_round_to_resolution(time, resolution)
+    if abs(diff) << _ERROR_BITS <= (abs(index_) + 1) * 2 * den:
+        return _mpfr_round_to_resolution(time, resolution)
+    return index_ + (diff > 0)
+
+
+def period_ceil(frequency: int | float) -> int:
+    """Function to get the period of a frequency, rounded up to ps.
+
+    Args:
+        frequency (int | float): frequency (Hz).
+
+    Returns:
+        int: period (ps).
+    """
+
+    freq_num, freq_den = as_ratio(frequency)
+    if freq_num <= 0:
+        return _mpfr_period_ceil(frequency)
+    period, remainder = divmod(SECOND * freq_den, freq_num)
+    if remainder:
+        if min(remainder, freq_num - remainder) << _ERROR_BITS <= (period + 1) * freq_num:
+            return _mpfr_period_ceil(frequency)
+        period += 1
+    return period
+
+
+def _mpfr_time_to_timebin(time, frequency) -> int:
+    time_bin = gmpy2.mpfr(time) * gmpy2.mpfr(frequency) / PS_PER_SECOND
+    if time_bin - gmpy2.floor(time_bin) > EPSILON_MPFR:
+        return int(time_bin) + 1       # round to the next time bin
+    return int(time_bin)
+
+
+def _mpfr_timebin_to_time(time_bin, frequency) -> int:
+    return int(gmpy2.mpfr(gmpy2.mpz(time_bin) * PS_PER_SECOND) / gmpy2.mpfr(frequency))
+
+
+def _mpfr_round_to_resolution(time, resolution) -> int:
+    return int(gmpy2.rint(gmpy2.mpfr(time) / gmpy2.mpfr(resolution)))
+
+
+def _mpfr_period_ceil(frequency) -> int:
+    return int(gmpy2.ceil(gmpy2.mpfr("1e12") / gmpy2.mpfr(frequency)))
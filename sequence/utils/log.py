@@ -4,6 +4,7 @@ This module defines the behavior for the default SeQUeNCe logging system.
 The logger used and log format are specified here.
 Modules will use the `logger` attribute as a normal logging system, saving log outputs in a user specified file.
 If a file is not set, no output will be recorded.
+Hot paths check `is_tracked` before formatting their messages.
 
 Attributes:
     logger (Logger): logger object used for logging by sequence modules.
@@ -75,6 +76,17 @@ def track_module(module_name: str):
         _log_modules.append(module_name)
 
 
+def is_tracked(module_name: str, level: int = logging.INFO) -> bool:
+    """Function to check if the messages of a module are recorded, before formatting them.
+
+    Args:
+        module_name (str): name of the module (file name without extension, as given to `track_module`).
+        level (int): level of the messages (default INFO).
+    """
+
+    return module_name in _log_modules and logger.isEnabledFor(level)
+
+
 def remove_module(module_name: str):
     """Sets a given module to no longer be tracked."""
 
@@ -0,0 +1,212 @@
+"""Binary trace of simulation events.
+
+This module defines the TraceRecorder class, recording typed event records
+(simulation time, entity, event kind, peer entity and numeric value) in a preallocated buffer,
+as a compact alternative to text logging of hot paths (e.g. message and photon transmission).
+Records are flushed in chunks to a columnar `.npz` file (one `.npy` array per column and chunk), read back by `read_trace`.
+
+Tracing uses the module names tracked by the logging system (see `log.track_module`):
+modules call `is_traced` with their name before building a record.
+
+Attributes:
+    recorder (TraceRecorder | None): trace recorder used by sequence modules (None if tracing is disabled).
+    RECORD_DTYPE (np.dtype): type of the records.
+"""
+
+from typing import TYPE_CHECKING
+import zipfile
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..kernel.timeline import Timeline
+
+from . import log
+
+
+RECORD_DTYPE = np.dtype([("time", np.int64), ("entity", np.int32), ("kind", np.int16), ("peer", np.int32),
+                         ("value", np.float64)])
+recorder: "TraceRecorder | None" = None
+
+
+class TraceRecorder:
+    """Class recording typed event records of a simulation.
+
+    Entities and event kinds are stored as integer ids, given in order of first use.
+    With a file, records are written to the file every `capacity` records (and when closing the recorder).
+    Without a file, the buffer is a ring keeping the last `capacity` records.
+
+    Attributes:
+        timeline (Timeline): timeline giving the time of the records.
+        path (str | None): path of the trace file (None to keep records in memory).
+        capacity (int): number of records of the buffer.
+        buffer (np.ndarray): preallocated records (of type `RECORD_DTYPE`).
+        entity_ids (dict[str, int]): id of each entity name.
+        kind_ids (dict[str, int]): id of each event kind.
+        num_records (int): number of records since the creation of the recorder.
+        num_chunks (int): number of chunks written to the file.
+    """
+
+    def __init__(self, timeline: "Timeline", path: str = None, capacity: int = 1 << 16):
+        """Constructor for the trace recorder class.
+
+        Args:
+            timeline (Timeline): timeline giving the time of the records.
+            path (str): path of the trace file, overwritten (default None, i.e. records are kept in memory).
+            capacity (int): number of records of the buffer (default 65536).
+        """
+
+        assert capacity > 0
+        self.timeline = timeline
+        self.path = path
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=RECORD_DTYPE)
+        self.entity_ids: dict[str, int] = {}
+        self.kind_ids: dict[str, int] = {}
+        self.num_records = 0
+        self.num_chunks = 0
+        self._index = 0
+        if path is not None:
+            zipfile.ZipFile(path, "w").close()
+
+    def entity_id(self, name: str) -> int:
+        """Method to get the id of an entity name (registered at first use)."""
+
+        entity_id = self.entity_ids.get(name)
+        if entity_id is None:
+            entity_id = self.entity_ids[name] = len(self.entity_ids)
+        return entity_id
+
+    def kind_id(self, kind: str) -> int:
+        """Method to get the id of an event kind (registered at first use)."""
+
+        kind_id = self.kind_ids.get(kind)
+        if kind_id is None:
+            kind_id = self.kind_ids[kind] = len(self.kind_ids)
+        return kind_id
+
+    def record(self, entity: str, kind: str, peer: str = None, value: float = 0.0) -> None:
+        """Method to record an event at the current simulation time.
+
+        Args:
+            entity (str): name of the entity.
+            kind (str): kind of event (e.g. "send_message").
+            peer (str): name of the other entity of the event (default None, recorded as -1).
+            value (float): numeric payload of the event (default 0.0).
+        """
+
+        peer_id = -1 if peer is None else self.entity_id(peer)
+        self.buffer[self._index] = (self.timeline.now(), self.entity_id(entity), self.kind_id(kind), peer_id, value)
+        self.num_records += 1
+        self._index += 1
+        if self._index == self.capacity:
+            if self.path is not None:
+                self.flush()
+            else:
+                self._index = 0
+
+    def records(self) -> np.ndarray:
+        """Method to get the records kept in the buffer (in order), i.e. not yet written to the file."""
+
+        if self.path is None and self.num_records > self.capacity:
+            return np.concatenate((self.buffer[self._index:], self.buffer[:self._index]))
+        return self.buffer[:self._index].copy()
+
+    def flush(self) -> None:
+        """Method to write the records of the buffer to the file as a new chunk."""
+
+        assert self.path is not None, "recorder without file"
+        if self._index == 0:
+            return
+        with zipfile.ZipFile(self.path, "a") as zf:
+            chunk = self.buffer[:self._index]
+            for column in RECORD_DTYPE.names:
+                with zf.open(f"{column}_{self.num_chunks:06d}.npy", "w", force_zip64=True) as fh:
+                    np.lib.format.write_array(fh, np.ascontiguousarray(chunk[column]))
+        self.num_chunks += 1
+        self._index = 0
+
+    def close(self) -> None:
+        """Method to write the remaining records and the names of entities and event kinds to the file."""
+
+        if self.path is None:
+            return
+        self.flush()
+        with zipfile.ZipFile(self.path, "a") as zf:
+            for column, names in [("entities", self.entity_ids), ("kinds", self.kind_ids)]:
+                with zf.open(f"{column}.npy", "w") as fh:
+                    np.lib.format.write_array(fh, np.array(list(names), dtype=str))
+
+    def to_dataframe(self):
+        """Method to get the records kept in the buffer as a pandas DataFrame (see `read_trace`)."""
+
+        return _to_dataframe(self.records(), list(self.entity_ids), list(self.kind_ids))
+
+
+def _to_dataframe(records: np.ndarray, entities: list[str], kinds: list[str]):
+    import pandas as pd
+
+    return pd.DataFrame({"time": records["time"],
+                         "entity": pd.Categorical.from_codes(records["entity"], categories=entities),
+                         "kind": pd.Categorical.from_codes(records["kind"], categories=kinds),
+                         "peer": pd.Categorical.from_codes(records["peer"], categories=entities),
+                         "value": records["value"]})
+
+
+def read_trace(path: str):
+    """Function to load a trace file as a pandas DataFrame.
+
+    Args:
+        path (str): path of the trace file (written by `TraceRecorder`).
+
+    Returns:
+        pandas.DataFrame: one row per record, with columns time (int), entity, kind and peer (categorical,
+            missing peers are NaN) and value (float).
+    """
+
+    with np.load(path) as data:
+        num_chunks = sum(1 for key in data.files if key.startswith("time_"))
+        records = np.zeros(0, dtype=RECORD_DTYPE)
+        if num_chunks:
+            records = np.zeros(sum(len(data[f"time_{chunk:06d}"]) for chunk in range(num_chunks)), dtype=RECORD_DTYPE)
+            for column in RECORD_DTYPE.names:
+                records[column] = np.concatenate([data[f"{column}_{chunk:06d}"] for chunk in range(num_chunks)])
+        entities = data["entities"].tolist() if "entities" in data.files else []
+        kinds = data["kinds"].tolist() if "kinds" in data.files else []
+    return _to_dataframe(records, entities, kinds)
+
+
+def start_trace(timeline: "Timeline", path: str = None, capacity: int = 1 << 16) -> TraceRecorder:
+    """Function to start recording the traced events of the tracked modules (see `log.track_module`).
+
+    Args:
+        timeline (Timeline): timeline giving the time of the records.
+        path (str): path of the trace file (default None, i.e. records are kept in memory).
+        capacity (int): number of records of the buffer (default 65536).
+
+    Returns:
+        TraceRecorder: the recorder used by sequence modules.
+    """
+
+    global recorder
+    recorder = TraceRecorder(timeline, path, capacity)
+    return recorder
+
+
+def stop_trace() -> None:
+    """Function to stop recording events and close the trace file."""
+
+    global recorder
+    if recorder is not None:
+        recorder.close()
+        recorder = None
+
+
+def is_traced(module_name: str) -> bool:
+    """Function to check if the events of a module are recorded.
+
+    Args:
+        module_name (str): name of the module, as tracked by `log.track_module` (file name without extension).
+    """
+
+    return recorder is not None and module_name in log._log_modules
@@ -48,7 +48,7 @@ def test_init():
     bsm = make_bsm("bsm", tl, encoding_type="time_bin", detectors=detectors)
     tl.init()
 
-    assert len(tl.events) == len(detectors) * 2
+    assert len(tl.events) == len(detectors)
 
 
 def test_base_get():
@@ -77,6 +77,20 @@ def test_base_get():
     assert len(bsm.photons) == 1
 
 
+def test_base_get_release():
+    # photons that are not measured, and photons of previous arrival times, release their quantum manager state
+    tl = Timeline()
+    bsm = make_bsm("bsm", tl, encoding_type="polarization", detectors=[{}] * 4)
+    for _ in range(3):
+        bsm.get(Photon("", tl, location=1, use_qm=True))
+    assert len(bsm.photons) == 1
+    assert len(tl.quantum_manager.states) == 3
+
+    tl.time = 1
+    bsm.get(Photon("", tl, location=1, use_qm=True))
+    assert len(tl.quantum_manager.states) == 1
+
+
 def test_polarization_get():
     tl = Timeline()
     detectors = [{"efficiency": 1}] * 4
@@ -1,9 +1,9 @@
 import numpy as np
 from math import sqrt
 
-from sequence.components.circuit import Circuit
+from sequence.components.circuit import Circuit, import_qutip
 from numpy import array, array_equal, identity
-from pytest import raises
+from pytest import raises, importorskip
 
 
 def test_h():
@@ -210,3 +210,65 @@ def test_serialization():
     assert deserailized_circuit.size == circuit.size
     assert deserailized_circuit.gates == circuit.gates
     assert deserailized_circuit.measured_qubits == circuit.measured_qubits
+
+
+def test_unitary_cache():
+    qc1 = Circuit(3)
+    qc1.h(0)
+    qc1.cx(0, 2)
+    qc2 = Circuit(3)
+    qc2.h(0)
+    qc2.cx(0, 2)
+    qc2.measure(1)
+    # circuits with the same gates share one read-only matrix
+    assert qc1.get_unitary_matrix() is qc2.get_unitary_matrix()
+    assert not qc1.get_unitary_matrix().flags.writeable
+
+    qc2.x(0)
+    assert not array_equal(qc1.get_unitary_matrix(), qc2.get_unitary_matrix())
+
+
+def test_to_qutip():
+    gate_sequence_product = importorskip("qutip_qip.operations").gate_sequence_product
+
+    rng = np.random.default_rng(0)
+    single = ["h", "x", "y", "z", "t", "s", "sdg", "root_iZ", "minus_root_iZ", "root_iY", "minus_root_iY"]
+    for _ in range(10):
+        qc = Circuit(4)
+        for _ in range(12):
+            qubits = [int(q) for q in rng.permutation(4)]
+            choice = rng.integers(len(single) + 5)
+            if choice < len(single):
+                getattr(qc, single[choice])(qubits[0])
+            elif choice == len(single):
+                qc.cx(qubits[0], qubits[1])
+            elif choice == len(single) + 1:
+                qc.cz(qubits[0], qubits[1])
+            elif choice == len(single) + 2:
+                qc.ccx(qubits[0], qubits[1], qubits[2])
+            elif choice == len(single) + 3:
+                qc.swap(qubits[0], qubits[1])
+            else:
+                qc.phase(qubits[0], rng.random() * 2 * np.pi)
+        expect = gate_sequence_product(qc.to_qutip().propagators()).full()
+        assert np.allclose(qc.get_unitary_matrix(), expect)
+
+
+def test_gate_functions():
+    Qobj = importorskip("qutip").Qobj
+    from sequence.components import circuit
+
+    # the gate functions return qutip operators, the matrix functions return the same gates as NumPy arrays
+    for name in ["x", "y", "z", "s", "sdg", "t", "root_iZ", "minus_root_iZ", "root_iY", "minus_root_iY"]:
+        gate = getattr(circuit, f"{name}_gate")()
+        matrix = getattr(circuit, f"{name}_matrix")()
+        assert isinstance(gate, Qobj) and gate.dims == [[2], [2]]
+        assert isinstance(matrix, np.ndarray)
+        assert np.allclose(gate.full(), matrix)
+        assert array_equal(matrix, circuit.GATE_MATRICES[name])
+
+
+def test_import_qutip():
+    # missing optional dependencies point to the qutip extra
+    with raises(ImportError, match=r"sequence\[qutip\]"):
+        import_qutip("qutip_missing_module")
@@ -3,6 +3,7 @@ import numpy as np
 
 from sequence.components.detector import *
 from sequence.components.photon import Photon
+from sequence.components.photon_train import PhotonTrain
 from sequence.kernel.timeline import Timeline
 from sequence.kernel.quantum_manager import FOCK_DENSITY_MATRIX_FORMALISM, QuantumManager
 from sequence.utils.encoding import polarization, time_bin, absorptive, fock
@@ -45,7 +46,7 @@ def create_detector(efficiency=0.9, dark_count=0, count_rate=25e6, time_resoluti
 def test_Detector_init():
     detector, parent, tl = create_detector(dark_count=10)
     tl.init()
-    assert len(tl.events) == 2
+    assert len(tl.events) == 1
 
 
 def test_Detector_get():
@@ -631,6 +632,32 @@ def test_QSDetectorPolarizationStatic_vs_dynamic():
     # Dynamic: first 50 to detector 0, last 50 split randomly
     assert len(dynamic_times[0]) >= 50
 
+
+def test_QSDetectorPolarization_get_train():
+    tl = Timeline()
+    qsdetector = QSDetectorPolarization("qsd", tl)
+    qsdetector.update_detector_params(0, "efficiency", 1)
+    qsdetector.update_detector_params(1, "efficiency", 1)
+    for i in range(2):
+        qsdetector.update_detector_params(i, "time_resolution", 1)
+    frequency = 1e5
+    period = int(1e12 / frequency)
+    basis_list = [np.random.randint(2) for _ in range(1000)]
+    bit_list = [np.random.randint(2) for _ in range(1000)]
+    qsdetector.set_basis_list(basis_list, 0, frequency)
+    tl.init()
+
+    states = [polarization["bases"][basis][bit] for basis, bit in zip(basis_list, bit_list)]
+    train = PhotonTrain(tl, states, np.zeros(1000), np.arange(1000) * period)
+    qsdetector.get_train(train)
+    tl.run()
+
+    trigger_times = qsdetector.get_photon_times()
+    for bit in range(2):
+        assert trigger_times[bit] == [i * period for i in range(1000) if bit_list[i] == bit]
+    assert sum(detector.photon_counter for detector in qsdetector.detectors) == 1000
+
+
 import pytest
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from sequence.components.fiber_quantum_channel import fiberQuantumChannel, FiberSpec, FiberSection
+from sequence.components.fiber_quantum_channel import fiberQuantumChannel, FiberSpec, FiberSection, fiber_optics, _fiber_optics
 from sequence.components.photon import Photon
 from sequence.kernel.timeline import Timeline
 from sequence.topology.node import Node
@@ -446,6 +446,41 @@ def test_fiberQuantumChannel_init_with_timeline():
     assert channel.base_group_delay_s > 0.0
 
 
+def test_fiberQuantumChannel_link_model_cache(monkeypatch):
+    """Test the link model is recomputed at init only when the fiber specs change."""
+    tl = Timeline()
+    channel = fiberQuantumChannel(name="qc", timeline=tl, attenuation=0.0, distance=1000.0)
+    calls = []
+    compute = channel._compute_link_model
+    monkeypatch.setattr(channel, "_compute_link_model", lambda: calls.append(1) or compute())
+
+    tl.init()
+    J = channel.J_total.copy()
+    tl.init()
+    assert len(calls) == 1
+
+    channel.sections[0].spec.core_ellipticity = 1.01
+    tl.init()
+    assert len(calls) == 2
+    assert not np.allclose(channel.J_total, J)
+    assert np.allclose(channel._jones_ops["signal"], np.kron(channel.J_total, np.eye(2)))
+    assert channel._base_delay_ps == int(round(channel.base_group_delay_s * 1e12))
+
+
+def test_fiber_optics_cache():
+    """Test propagation constants are cached by spec values and wavelength."""
+    spec = FiberSpec(core_ellipticity=1.005)
+    beta, neff, d_beta_lin, d_beta_circ = fiber_optics(spec, 1550e-9)
+    assert neff == pytest.approx(beta / (2 * np.pi / 1550e-9))
+    assert d_beta_lin > 0
+    assert d_beta_circ == 0
+
+    hits = _fiber_optics.cache_info().hits
+    assert fiber_optics(FiberSpec(core_ellipticity=1.005), 1550e-9) == (beta, neff, d_beta_lin, d_beta_circ)
+    assert _fiber_optics.cache_info().hits == hits + 1
+    assert fiber_optics(spec, 1551e-9)[0] != beta
+
+
 def test_fiberQuantumChannel_set_ends():
     """Test setting channel endpoints."""
     tl = Timeline()
@@ -566,6 +601,43 @@ def test_fiberQuantumChannel_applies_jones_matrix():
     norm = np.sum(np.abs(final_state)**2)
     assert abs(norm - 1.0) < 1e-6, "State should remain normalized"
 
+
+def test_fiberQuantumChannel_transmit_train():
+    """Test that a photon train gets the Jones matrix and delays of the channel."""
+    from sequence.components.photon_train import PhotonTrain
+
+    class FakeNode(Node):
+        def __init__(self, name, tl):
+            Node.__init__(self, name, tl)
+            self.received = []
+            self.generator = np.random.default_rng(SEED)
+
+        def receive_train(self, src, train):
+            self.received.append(train)
+
+        def get_generator(self):
+            return self.generator
+
+    tl = Timeline()
+    spec = FiberSpec(core_ellipticity=1.01)
+    channel = fiberQuantumChannel(name="test_channel", timeline=tl, attenuation=0.0, distance=1000.0, spec=spec)
+    sender = FakeNode("sender", tl)
+    receiver = FakeNode("receiver", tl)
+    channel.set_ends(sender, receiver.name)
+    tl.init()
+
+    train = PhotonTrain(tl, [(complex(1), complex(0))] * 100, np.full(100, 1550.5), np.arange(100) * 1000)
+    channel.transmit_train(train, sender)
+    tl.run()
+
+    assert len(receiver.received) == 1
+    received = receiver.received[0]
+    assert len(received) == 100
+    assert np.allclose(received.states, channel.J_total @ np.array([1, 0]))
+    base_ps = int(round(channel.base_group_delay_s * 1e12))
+    delays = received.times - np.arange(100) * 1000
+    assert np.all(np.abs(delays - base_ps) <= channel.tau_dgd_s * 1e12 / 2 + abs(channel.DCD_ps_per_nm_km) + 1)
+
 # ============================================================================
 # Test 10: Multi-Section Fiber - Uniform Properties
 # ============================================================================
@@ -1496,8 +1568,8 @@ def test_raman_noise_photon_generation():
     Test that noise photons are actually generated and transmitted.
     
     This tests the full pipeline:
-    1. _schedule_next_noise_photon() schedules Poisson-distributed events
-    2. _generate_and_transmit_noise_photon() creates random-polarization photons
+    1. _schedule_next_noise_photon() starts Poisson-distributed events
+    2. _receive_noise_photon() records random-polarization noise at the receiver
     3. Noise photons are transmitted through channel (experience loss, PMD, CD)
     4. Noise photons arrive at receiver
     
@@ -1524,7 +1596,7 @@ def test_raman_noise_photon_generation():
                 self.signal_photon_count += 1
         
         def receive_noise_photon(self):
-            # Called by fiberQuantumChannel._generate_and_transmit_noise_photon()
+            # Called by fiberQuantumChannel._receive_noise_photon()
             self.noise_photon_count += 1
             self.received_photons.append({
                 'time': self.timeline.now(),
@@ -1585,6 +1657,11 @@ def test_raman_noise_photon_generation():
         if photon_info['is_noise']:
             assert photon_info['name'] == 'raman_noise', \
                 "Noise photons should be named 'raman_noise'"
+
+    # Test 4: Noise photons are received through scheduled events, after the propagation delay of the channel
+    noise_times = [photon_info['time'] for photon_info in receiver.received_photons if photon_info['is_noise']]
+    assert noise_times == sorted(noise_times)
+    assert noise_times[0] >= channel._base_delay_ps > 0
             
 # ============================================================================
 # Run Tests
@@ -184,6 +184,45 @@ def test_SPDCBellSource_photon_statistics():
     assert 0.5 * expected < len(receiver_p0.log) < 1.5 * expected
     assert 0.5 * expected < len(receiver_t0.log) < 1.5 * expected
 
+
+def test_light_source_emit_train():
+    class TrainReceiver(Receiver):
+        def get_train(self, train):
+            self.log.append((self.timeline.now(), train))
+
+    tl = Timeline()
+    FREQ, MEAN = 1e8, 0.1
+    ls = LightSource("ls", tl, frequency=FREQ, mean_photon_num=MEAN, photon_train=True)
+    receiver = TrainReceiver(tl)
+    ls.add_receiver(receiver)
+    state_list = [polarization["bases"][i % 2][i // 2 % 2] for i in range(1000)]
+
+    tl.init()
+    ls.emit(state_list)
+    tl.run()
+
+    assert len(receiver.log) == 1
+    time, train = receiver.log[0]
+    assert time == 0
+    assert abs(len(train) / 1000 - MEAN) < 0.05
+    assert ls.photon_counter == len(train)
+    for index, emit_time, state in zip(train.indices, train.times, train.states):
+        assert tuple(state) == state_list[index]
+        assert emit_time == index * (1e12 / FREQ)
+
+    # receivers without `get_train` receive the photons one by one
+    receiver = Receiver(tl)
+    ls._receivers[0] = receiver
+    start_time = tl.now()
+    ls.emit_train(state_list)
+    tl.run()
+    assert len(receiver.log) > 0
+    for time, qubit in receiver.log:
+        index = int(qubit.name)
+        assert state_list[index] == qubit.quantum_state.state
+        assert time == start_time + index * (1e12 / FREQ)
+
+
 import pytest
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
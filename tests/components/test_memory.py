@@ -5,6 +5,7 @@ from sequence.components.memory import *
 from sequence.kernel.event import Event
 from sequence.kernel.process import Process
 from sequence.kernel.timeline import Timeline
+from sequence.constants import BELL_DIAGONAL_STATE_FORMALISM, KET_STATE_FORMALISM
 from sequence.entanglement_management.entanglement_protocol import EntanglementProtocol
 
 SEED = 0
@@ -99,6 +100,47 @@ def test_Memory_update_state():
     assert np.all(tl.quantum_manager.get(mem.qstate_key).state == np.array(new_state))
 
 
+def test_Memory_bds_decohere_other_formalism():
+    # decoherence of Bell diagonal states does nothing with other quantum managers
+    tl = Timeline()
+    mem = Memory("mem", tl, fidelity=1, frequency=0, efficiency=1, coherence_time=1, wavelength=500,
+                 decoherence_errors=[1/3, 1/3, 1/3])
+    state = tl.quantum_manager.get(mem.qstate_key).state.copy()
+    tl.time = 10 ** 12
+    mem.bds_decohere()
+    assert np.array_equal(tl.quantum_manager.get(mem.qstate_key).state, state)
+
+
+def test_Memory_bds_decohere_update_params():
+    # decoherence uses the parameters of the memories at the time of decoherence
+    tl = Timeline(formalism=BELL_DIAGONAL_STATE_FORMALISM)
+    ma = MemoryArray("ma", tl, num_memories=2, fidelity=1, frequency=0, efficiency=1, coherence_time=1,
+                     wavelength=500, decoherence_errors=[1/3, 1/3, 1/3])
+    mem0, mem1 = ma.memories
+    tl.quantum_manager.set([mem0.qstate_key, mem1.qstate_key], [1, 0, 0, 0])
+    mem0.last_update_time = mem1.last_update_time = 1
+
+    ma.update_memory_params("decoherence_rate", 0)
+    tl.time = 5 * 10 ** 11
+    mem0.bds_decohere()
+    mem1.bds_decohere()
+    assert np.array_equal(tl.quantum_manager.get(mem0.qstate_key).state, [1, 0, 0, 0])
+
+    ma.update_memory_params("decoherence_rate", 1)
+    ma.update_memory_params("decoherence_errors", [0, 0, 1])
+    tl.time = 10 ** 12
+    mem0.bds_decohere()
+    p_z = (1 - np.exp(-2 * 0.5)) / 2
+    assert np.allclose(tl.quantum_manager.get(mem0.qstate_key).state, [1 - p_z, p_z, 0, 0])
+    QuantumManager.set_global_manager_formalism(KET_STATE_FORMALISM)
+
+    # the last update time is kept by the memory if the quantum manager is replaced
+    tl.quantum_manager = QuantumManager.create()
+    assert mem0.last_update_time == -1
+    mem0.last_update_time = 10
+    assert mem0.last_update_time == 10
+
+
 def test_Memory_excite():
     NUM_TESTS = 1000
 
@@ -269,6 +311,30 @@ def test_Absorpive_get_skip_bins():
     assert stored["photon"] is photon
 
 
+def test_Absorptive_get_release():
+    # photons that are not stored release their quantum manager state
+    PERIOD = 1
+    MODE_NUM = 10
+    tl = Timeline()
+    mem = AbsorptiveMemory("mem", tl, 1e12/PERIOD, 1, perfect_efficiency, MODE_NUM, 500)
+    mem.is_prepared = True
+    tl.init()
+
+    mem.get(Photon("", tl, 500, use_qm=True))  # stored
+    mem.get(Photon("", tl, 500, use_qm=True))  # occupied mode
+    tl.time += PERIOD
+    mem.get(Photon("", tl, 1000, use_qm=True))  # wavelength mismatch
+    tl.time += MODE_NUM * PERIOD
+    mem.get(Photon("", tl, 500, use_qm=True))  # out of range
+    assert len(tl.quantum_manager.states) == 1
+
+    lossy_mem = AbsorptiveMemory("lossy_mem", tl, 1e12/PERIOD, 0, perfect_efficiency, MODE_NUM, 500)
+    lossy_mem.is_prepared = True
+    lossy_mem.absorb_start_time = tl.now()
+    lossy_mem.get(Photon("", tl, 500, use_qm=True))  # not absorbed
+    assert len(tl.quantum_manager.states) == 1
+
+
 def test_Absorptive_retrieve():
     PERIOD = 1
     MODE_NUM = 100
@@ -0,0 +1,70 @@
+import numpy as np
+
+from sequence.components.noise_process import PoissonProcess
+from sequence.kernel.entity import Entity
+from sequence.kernel.timeline import Timeline
+
+SEED = 0
+
+
+class Counter(Entity):
+    def __init__(self, name, tl):
+        super().__init__(name, tl)
+        self.generator = np.random.default_rng(SEED)
+        self.log = []
+
+    def init(self):
+        pass
+
+    def get_generator(self):
+        return self.generator
+
+    def click(self):
+        self.log.append(self.timeline.now())
+
+
+def run(rate, stop_time, block_size=PoissonProcess.BLOCK_SIZE):
+    tl = Timeline(stop_time)
+    counter = Counter("counter", tl)
+    process = PoissonProcess(counter, "click", rate, block_size=block_size)
+    process.start()
+    assert len(tl.events) == 1
+    tl.run()
+    return counter.log
+
+
+def test_PoissonProcess_rate():
+    rate = 1e6
+    log = run(rate, 1e11)
+    assert abs(len(log) / (rate * 0.1) - 1) < 0.01
+    assert log == sorted(log)
+    gaps = np.diff(log)
+    assert abs(np.mean(gaps) / 1e6 - 1) < 0.01
+    assert abs(np.std(gaps) / np.mean(gaps) - 1) < 0.02
+
+
+def test_PoissonProcess_reproducible():
+    assert run(1e6, 1e9) == run(1e6, 1e9)
+    # arrival times do not depend on the block size
+    assert run(1e6, 1e9, block_size=7) == run(1e6, 1e9, block_size=5000)
+
+
+def test_PoissonProcess_stop():
+    tl = Timeline()
+    counter = Counter("counter", tl)
+    process = PoissonProcess(counter, "click", 1e6)
+    process.start()
+    process.start()
+    tl.stop_time = 1e8
+    tl.run()
+    assert abs(len(counter.log) / 100 - 1) < 0.3
+
+    process.stop()
+    assert process.next_event is None
+    tl.stop_time = 1e9
+    tl.run()
+    assert counter.log[-1] < 1e8
+
+    process.rate = 0
+    process.start()
+    assert process.next_event is None
@@ -132,3 +132,49 @@ def test_QuantumChannel_schedule_transmit():
     tl.time = 2
     time = qc.schedule_transmit(0)
     assert time == 3
+    assert sorted(qc.send_bins) == sorted(qc._send_bin_set) == [0, 1, 2, 3]
+
+
+def test_QuantumChannel_timebin():
+    tl = Timeline()
+    qc = QuantumChannel("qc", tl, attenuation=0, distance=1e3, frequency=3e9)
+    assert qc.time_to_timebin(0, qc.frequency) == 0
+    assert qc.time_to_timebin(1000, qc.frequency) == 3
+    assert qc.time_to_timebin(1001, qc.frequency) == 4
+    assert qc.timebin_to_time(3, qc.frequency) == 1000
+    assert qc.timebin_to_time(4, qc.frequency) == 1333
+    assert qc.timebin_to_time(5, qc.frequency) == 1667
+
+
+def test_QuantumChannel_transmit_train():
+    from sequence.components.photon_train import PhotonTrain
+
+    class FakeNode(Node):
+        def __init__(self, name, tl):
+            Node.__init__(self, name, tl)
+            self.log = []
+            self.generator = np.random.default_rng(SEED)
+
+        def receive_qubit(self, src, photon):
+            self.log.append((src, self.timeline.now(), photon.name))
+
+        def get_generator(self):
+            return self.generator
+
+    tl = Timeline()
+    qc = QuantumChannel("qc", tl, attenuation=0.0002, distance=1e4)
+    sender = FakeNode("sender", tl)
+    receiver = FakeNode("receiver", tl)
+    qc.set_ends(sender, receiver.name)
+    tl.init()
+
+    train = PhotonTrain(tl, [(complex(1), complex(0))] * 1000, np.zeros(1000), np.arange(1000))
+    qc.transmit_train(train, sender)
+    tl.run()
+
+    # photons are received one by one at their arrival times (default `Node.receive_train`)
+    expect_rate = 1 - qc.loss
+    assert abs(len(receiver.log) / 1000 - expect_rate) < 0.1
+    for src, time, name in receiver.log:
+        assert src == sender.name
+        assert time == int(name) + qc.delay
@@ -90,3 +90,39 @@ def test_add_loss():
 
     photon.add_loss(0.5)
     assert photon.loss == 0.75
+
+
+def test_unchecked():
+    tl = Timeline()
+    photon = Photon.unchecked("p", tl, wavelength=1550, quantum_state=(complex(0), complex(1)))
+    reference = Photon("p", tl, wavelength=1550, quantum_state=(complex(0), complex(1)))
+    for attr in Photon.__slots__:
+        if attr != "quantum_state":
+            assert getattr(photon, attr) == getattr(reference, attr)
+    assert photon.quantum_state.state == reference.quantum_state.state
+    assert Photon.unchecked("", tl).quantum_state.state == (complex(1), complex(0))
+    assert not hasattr(photon, "__dict__")
+
+
+def test_release():
+    tl = Timeline()
+    qm = tl.quantum_manager
+    photon = Photon("", tl, use_qm=True)
+    key = photon.quantum_state
+    photon.release()
+    assert key not in qm.states
+    assert photon.timeline is None and photon.quantum_state is None
+    photon.release()  # released once
+
+    # key is reused, and the released photon does not alias the new state
+    reused = Photon.unchecked("", tl, use_qm=True)
+    assert reused.quantum_state == key
+    with pytest.raises(KeyError):
+        qm.get(photon.quantum_state)
+
+    # photons without timeline (e.g. sharing the key of a memory) keep their state
+    memory_key = qm.new()
+    photon = Photon.unchecked("", tl, use_qm=True, quantum_state=memory_key)
+    photon.timeline = None
+    photon.release()
+    assert memory_key in qm.states
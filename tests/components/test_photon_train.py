@@ -0,0 +1,75 @@
+import numpy as np
+
+from sequence.components.photon_train import PhotonTrain
+from sequence.kernel.timeline import Timeline
+from sequence.utils.encoding import polarization
+
+SEED = 0
+
+
+def create_train(num_photons=1000):
+    tl = Timeline()
+    states = [polarization["bases"][0][i % 2] for i in range(num_photons)]
+    times = np.arange(num_photons) * 1000
+    return PhotonTrain(tl, states, np.full(num_photons, 1550.0), times)
+
+
+def test_PhotonTrain_select():
+    train = create_train(10)
+    assert len(train) == 10
+    odd = train.select(train.indices % 2 == 1)
+    assert len(odd) == 5
+    assert odd.times.tolist() == [1000, 3000, 5000, 7000, 9000]
+    assert np.allclose(odd.states, [[0, 1]] * 5)
+    odd.add_delay(5)
+    assert odd.times[0] == 1005
+    assert train.times[1] == 1000
+
+
+def test_PhotonTrain_loss_and_noise():
+    rng = np.random.default_rng(SEED)
+    train = create_train()
+    kept = train.apply_loss(0.3, rng)
+    assert abs(len(kept) / len(train) - 0.7) < 0.05
+
+    mask = np.zeros(len(kept), dtype=bool)
+    mask[:10] = True
+    before = kept.states.copy()
+    kept.random_noise(mask, rng)
+    assert np.allclose(kept.states[10:], before[10:])
+    assert np.allclose(np.sum(np.abs(kept.states) ** 2, axis=1), 1)
+    assert np.allclose(kept.states[:10].imag, 0)
+
+
+def test_PhotonTrain_apply_jones():
+    train = create_train(4)
+    x_gate = np.array([[0, 1], [1, 0]], dtype=complex)
+    train.apply_jones(x_gate)
+    assert np.allclose(train.states, [[0, 1], [1, 0], [0, 1], [1, 0]])
+    hadamard = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+    train.apply_jones(np.stack([hadamard, np.eye(2), hadamard, np.eye(2)]))
+    assert np.allclose(train.states, [[1 / np.sqrt(2), -1 / np.sqrt(2)], [1, 0],
+                                      [1 / np.sqrt(2), -1 / np.sqrt(2)], [1, 0]])
+
+
+def test_PhotonTrain_measure():
+    rng = np.random.default_rng(SEED)
+    train = create_train()
+    bases = np.array(polarization["bases"], dtype=complex)
+
+    # measurement in the basis of the states is deterministic
+    results = train.measure(bases[np.zeros(len(train), dtype=int)], rng)
+    assert results.tolist() == [i % 2 for i in range(len(train))]
+
+    # measurement in the conjugate basis is random
+    results = train.measure(bases[np.ones(len(train), dtype=int)], rng)
+    assert abs(results.mean() - 0.5) < 0.05
+    assert np.allclose(train.states, bases[1][results])
+
+
+def test_PhotonTrain_to_photons():
+    train = create_train(3)
+    photons = train.to_photons()
+    assert [photon.name for photon in photons] == ["0", "1", "2"]
+    assert photons[1].quantum_state.state == (complex(0), complex(1))
+    assert photons[2].wavelength == 1550
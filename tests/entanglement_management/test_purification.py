@@ -3,8 +3,11 @@ import pytest
 
 from sequence.components.memory import Memory
 from sequence.components.optical_channel import ClassicalChannel
-from sequence.constants import SQRT_HALF, PHI_PLUS, PHI_MINUS, PSI_PLUS, PSI_MINUS
-from sequence.entanglement_management.purification import BBPSSWCircuit, BBPSSWMessage, BBPSSWMsgType, BBPSSWProtocol
+from sequence.constants import SQRT_HALF, PHI_PLUS, PHI_MINUS, PSI_PLUS, PSI_MINUS, BELL_DIAGONAL_STATE_FORMALISM, \
+    KET_STATE_FORMALISM
+from sequence.entanglement_management.purification import BBPSSWCircuit, BBPSSWMessage, BBPSSWMsgType, BBPSSWProtocol, \
+    BBPSSW_BDS
+from sequence.kernel.quantum_manager import QuantumManager
 from sequence.kernel.timeline import Timeline
 from sequence.topology.node import Node
 
@@ -667,3 +670,113 @@ def test_BBPSSW_success_rate():
         tl.run()
 
     assert abs(counter1 / (counter1 + counter2) - success_probability(fidelity)) < 0.1
+
+
+def bds_decohered(state, rates, t):
+    # single-qubit Pauli channel on the diagonal elements (in I, Z, X, Y order)
+    x_rate, y_rate, z_rate = rates
+    p_i = (1 + np.exp(-2 * (x_rate + y_rate) * t) + np.exp(-2 * (x_rate + z_rate) * t) + np.exp(-2 * (z_rate + y_rate) * t)) / 4
+    p_x = (1 - np.exp(-2 * (x_rate + y_rate) * t) - np.exp(-2 * (x_rate + z_rate) * t) + np.exp(-2 * (z_rate + y_rate) * t)) / 4
+    p_y = (1 - np.exp(-2 * (x_rate + y_rate) * t) + np.exp(-2 * (x_rate + z_rate) * t) - np.exp(-2 * (z_rate + y_rate) * t)) / 4
+    p_z = (1 + np.exp(-2 * (x_rate + y_rate) * t) - np.exp(-2 * (x_rate + z_rate) * t) - np.exp(-2 * (z_rate + y_rate) * t)) / 4
+    transform_mtx = np.array([[p_i, p_z, p_x, p_y],
+                              [p_z, p_i, p_y, p_x],
+                              [p_x, p_y, p_i, p_z],
+                              [p_y, p_x, p_z, p_i]])
+    return transform_mtx @ state
+
+
+def bds_purified(kept, meas, is_twirled):
+    # BBPSSW (twirled) or DEJMPS output state with perfect gates and measurements
+    if is_twirled:
+        kept = np.array([kept[0]] + [(1 - kept[0]) / 3] * 3)
+        meas = np.array([meas[0]] + [(1 - meas[0]) / 3] * 3)
+    p_succ = (kept[0] + kept[1]) * (meas[0] + meas[1]) + (kept[2] + kept[3]) * (meas[2] + meas[3])
+    new_state = np.array([kept[0] * meas[0] + kept[1] * meas[1],
+                          kept[0] * meas[1] + kept[1] * meas[0],
+                          kept[2] * meas[2] + kept[3] * meas[3],
+                          kept[2] * meas[3] + kept[3] * meas[2]]) / p_succ
+    if is_twirled:
+        new_state = np.array([new_state[0]] + [(1 - new_state[0]) / 3] * 3)
+    return p_succ, new_state
+
+
+def test_BBPSSW_BDS():
+    # purification on the Bell diagonal quantum manager updates the row of the kept pair in place
+    kept_state = np.array([0.85, 0.05, 0.07, 0.03])
+    meas_state = np.array([0.8, 0.1, 0.04, 0.06])
+    decoherence_errors = [0.5, 0.3, 0.2]
+    start_time = 10 ** 9
+    counter = 0
+    for is_twirled in [True, False]:
+        for i in range(20):
+            tl = Timeline(formalism=BELL_DIAGONAL_STATE_FORMALISM)
+            a1 = FakeNode("a1", tl)
+            a2 = FakeNode("a2", tl)
+            a1.set_seed(2 * i)
+            a2.set_seed(2 * i + 1)
+            cc0 = ClassicalChannel("cc0", tl, 0, 1e5)
+            cc1 = ClassicalChannel("cc1", tl, 0, 1e5)
+            cc0.delay = ONE_MILLISECOND
+            cc1.delay = ONE_MILLISECOND
+            cc0.set_ends(a1, a2.name)
+            cc1.set_ends(a2, a1.name)
+            kept1, kept2, meas1, meas2 = [Memory(name, tl, fidelity=1, frequency=0, efficiency=1, coherence_time=1,
+                                                 wavelength=HALF_MICRON, decoherence_errors=decoherence_errors)
+                                          for name in ['kept1', 'kept2', 'meas1', 'meas2']]
+            tl.init()
+
+            tl.quantum_manager.set([kept1.qstate_key, kept2.qstate_key], kept_state)
+            tl.quantum_manager.set([meas1.qstate_key, meas2.qstate_key], meas_state)
+            for memo in [kept1, kept2, meas1, meas2]:
+                memo.last_update_time = 1
+            kept1.entangled_memory = {'node_id': 'a2', 'memo_id': 'kept2'}
+            kept2.entangled_memory = {'node_id': 'a1', 'memo_id': 'kept1'}
+            meas1.entangled_memory = {'node_id': 'a2', 'memo_id': 'meas2'}
+            meas2.entangled_memory = {'node_id': 'a1', 'memo_id': 'meas1'}
+            kept1.fidelity = kept2.fidelity = kept_state[0]
+            meas1.fidelity = meas2.fidelity = meas_state[0]
+            kept_row = tl.quantum_manager.diagonal(kept1.qstate_key)
+
+            ep1 = BBPSSW_BDS(a1, "a1.ep1", kept1, meas1, is_twirled=is_twirled)
+            ep2 = BBPSSW_BDS(a2, "a2.ep2", kept2, meas2, is_twirled=is_twirled)
+            a1.protocols.append(ep1)
+            a2.protocols.append(ep2)
+            ep1.set_others(ep2.name, a2.name, [kept2.name, meas2.name])
+            ep2.set_others(ep1.name, a1.name, [kept1.name, meas1.name])
+
+            # both memories of each pair idle from time 1 until the start of purification
+            rates = [error * kept1.decoherence_rate for error in decoherence_errors]
+            idle_time = (start_time - 1) * 1e-12
+            kept_input = bds_decohered(bds_decohered(kept_state, rates, idle_time), rates, idle_time)
+            meas_input = bds_decohered(bds_decohered(meas_state, rates, idle_time), rates, idle_time)
+            p_succ, purified = bds_purified(kept_input, meas_input, is_twirled)
+
+            tl.time = start_time
+            ep1.start()
+            assert ep1.purification_res()[0] == pytest.approx(p_succ)
+            ep2.start()
+            tl.run()
+
+            assert (meas1, RAW) in a1.resource_manager.log
+            assert (meas2, RAW) in a2.resource_manager.log
+            assert meas1.qstate_key not in tl.quantum_manager.states
+            if ep1.meas_res == ep2.meas_res:
+                counter += 1
+                # both kept memories idle during the classical communication of the results
+                wait_time = ONE_MILLISECOND * 1e-12
+                expected = bds_decohered(bds_decohered(purified, rates, wait_time), rates, wait_time)
+                assert np.allclose(tl.quantum_manager.diagonal(kept1.qstate_key), expected)
+                assert np.allclose(kept_row, expected)
+                assert tl.quantum_manager.get(kept1.qstate_key).keys == [kept1.qstate_key, kept2.qstate_key]
+                assert kept1.fidelity == kept2.fidelity == pytest.approx(expected[0])
+                assert a1.resource_manager.log[-1] == (kept1, PURIFIED)
+                assert a2.resource_manager.log[-1] == (kept2, PURIFIED)
+            else:
+                assert kept1.fidelity == kept2.fidelity == 0
+                assert kept1.qstate_key not in tl.quantum_manager.states
+                assert a1.resource_manager.log[-1] == (kept1, RAW)
+                assert a2.resource_manager.log[-1] == (kept2, RAW)
+
+    assert 0 < counter < 40
+    QuantumManager.set_global_manager_formalism(KET_STATE_FORMALISM)
@@ -3,6 +3,8 @@ import pytest
 from sequence.components.memory import Memory
 from sequence.components.optical_channel import ClassicalChannel
 from sequence.kernel.timeline import Timeline
+from sequence.kernel.quantum_manager import QuantumManager
+from sequence.constants import BELL_DIAGONAL_STATE_FORMALISM, KET_STATE_FORMALISM
 from sequence.entanglement_management.swapping import *
 from sequence.topology.node import Node
 
@@ -559,3 +561,81 @@ def test_EntanglementSwapping():
             assert a3.resource_manager.log[-1] == (memo4, "RAW")
 
     assert abs((counter1 / (counter1 + counter2)) - 0.2) < 0.1
+
+
+def test_EntanglementSwapping_BDS():
+    # swapping on the Bell diagonal quantum manager composes the Pauli errors of the two pairs
+    states = [numpy.array([0.85, 0.05, 0.07, 0.03]), numpy.array([0.8, 0.1, 0.04, 0.06])]
+    decoherence_errors = [0.5, 0.3, 0.2]
+    swap_time = 10 ** 9
+    for i in range(20):
+        tl = Timeline(formalism=BELL_DIAGONAL_STATE_FORMALISM)
+        a1 = FakeNode("a1", tl)
+        a2 = FakeNode("a2", tl)
+        a3 = FakeNode("a3", tl)
+        a1.set_seed(3 * i)
+        a2.set_seed(3 * i + 1)
+        a3.set_seed(3 * i + 2)
+        cc0 = ClassicalChannel("a2-a1", tl, 0, 1e5)
+        cc1 = ClassicalChannel("a2-a3", tl, 0, 1e5)
+        cc0.set_ends(a2, a1.name)
+        cc1.set_ends(a2, a3.name)
+        tl.init()
+
+        memories = [Memory(name, tl, 1, 0, 1, 1, 500, decoherence_errors=decoherence_errors)
+                    for name in ["a1.0", "a2.0", "a2.1", "a3.0"]]
+        memo1, memo2, memo3, memo4 = memories
+        memo1.entangled_memory = {'node_id': 'a2', 'memo_id': memo2.name}
+        memo2.entangled_memory = {'node_id': 'a1', 'memo_id': memo1.name}
+        memo3.entangled_memory = {'node_id': 'a3', 'memo_id': memo4.name}
+        memo4.entangled_memory = {'node_id': 'a2', 'memo_id': memo3.name}
+        tl.quantum_manager.set([memo1.qstate_key, memo2.qstate_key], states[0])
+        tl.quantum_manager.set([memo3.qstate_key, memo4.qstate_key], states[1])
+        for memory, state in zip(memories, [states[0], states[0], states[1], states[1]]):
+            memory.fidelity = state[0]
+            memory.last_update_time = 1
+
+        es1 = EntanglementSwappingB(a1, "a1.ESb0", memo1)
+        a1.protocols.append(es1)
+        es2 = EntanglementSwappingA(a2, "a2.ESa0", memo2, memo3)
+        a2.protocols.append(es2)
+        es3 = EntanglementSwappingB(a3, "a3.ESb1", memo4)
+        a3.protocols.append(es3)
+        es1.set_others(es2.name, a2.name, [memo2.name, memo3.name])
+        es3.set_others(es2.name, a2.name, [memo2.name, memo3.name])
+        es2.set_others(es1.name, a1.name, [memo1.name])
+        es2.set_others(es3.name, a3.name, [memo4.name])
+
+        tl.time = swap_time
+        es2.start()
+        tl.run()
+
+        # the middle memories idle from time 1 until swapping (a single-qubit Pauli channel on each pair)
+        x_rate, y_rate, z_rate = [error * memo2.decoherence_rate for error in decoherence_errors]
+        t = (swap_time - 1) * 1e-12
+        p_i = (1 + numpy.exp(-2 * (x_rate + y_rate) * t) + numpy.exp(-2 * (x_rate + z_rate) * t) + numpy.exp(-2 * (z_rate + y_rate) * t)) / 4
+        p_x = (1 - numpy.exp(-2 * (x_rate + y_rate) * t) - numpy.exp(-2 * (x_rate + z_rate) * t) + numpy.exp(-2 * (z_rate + y_rate) * t)) / 4
+        p_y = (1 - numpy.exp(-2 * (x_rate + y_rate) * t) + numpy.exp(-2 * (x_rate + z_rate) * t) - numpy.exp(-2 * (z_rate + y_rate) * t)) / 4
+        p_z = (1 + numpy.exp(-2 * (x_rate + y_rate) * t) - numpy.exp(-2 * (x_rate + z_rate) * t) - numpy.exp(-2 * (z_rate + y_rate) * t)) / 4
+        transform_mtx = numpy.array([[p_i, p_z, p_x, p_y],
+                                     [p_z, p_i, p_y, p_x],
+                                     [p_x, p_y, p_i, p_z],
+                                     [p_y, p_x, p_z, p_i]])
+        left, right = transform_mtx @ states[0], transform_mtx @ states[1]
+        # I, Z, X, Y errors compose as the XOR of their indices
+        expected = numpy.zeros(4)
+        for j in range(4):
+            for k in range(4):
+                expected[j ^ k] += left[j] * right[k]
+
+        assert numpy.allclose(tl.quantum_manager.diagonal(memo1.qstate_key), expected)
+        assert tl.quantum_manager.get(memo4.qstate_key).keys == [memo1.qstate_key, memo4.qstate_key]
+        assert memo2.qstate_key not in tl.quantum_manager.states
+        assert memo3.qstate_key not in tl.quantum_manager.states
+        assert memo1.fidelity == memo4.fidelity == pytest.approx(states[0][0] * states[1][0] * es2.degradation)
+        assert memo1.entangled_memory["node_id"] == "a3"
+        assert memo4.entangled_memory["node_id"] == "a1"
+        assert a1.resource_manager.log[-1] == (memo1, "ENTANGLED")
+        assert a3.resource_manager.log[-1] == (memo4, "ENTANGLED")
+
+    QuantumManager.set_global_manager_formalism(KET_STATE_FORMALISM)
@@ -0,0 +1,113 @@
+import random
+
+import numpy as np
+import pytest
+
+from sequence.components.optical_channel import QuantumChannel
+from sequence.components.photon import Photon
+from sequence.constants import (CALENDAR_EVENT_QUEUE, DENSITY_MATRIX_FORMALISM, HEAP_EVENT_QUEUE,
+                                 KEYED_HEAP_EVENT_QUEUE)
+from sequence.kernel.checkpoint import load_checkpoint, OUT_OF_BAND_BYTES
+from sequence.kernel.event import Event
+from sequence.kernel.process import Process
+from sequence.kernel.quantum_manager import QuantumManager
+from sequence.kernel.timeline import Timeline
+from sequence.topology.node import Node
+from sequence.utils.encoding import polarization
+
+SEED = 0
+
+
+class Receiver(Node):
+    def __init__(self, name, tl):
+        super().__init__(name, tl)
+        self.log = []
+
+    def receive_qubit(self, src, qubit):
+        self.log.append((self.timeline.now(), qubit.quantum_state.state))
+
+
+class Sender:
+    def __init__(self, node, channel, num_photons):
+        self.node = node
+        self.channel = channel
+        self.num_photons = num_photons
+
+    def send(self):
+        photon = Photon(str(self.num_photons), self.node.timeline, encoding_type=polarization)
+        self.channel.transmit(photon, self.node)
+        self.num_photons -= 1
+        if self.num_photons > 0:
+            process = Process(self, "send", [])
+            self.node.timeline.schedule(Event(self.node.timeline.now() + 1000, process))
+
+
+def build(event_queue):
+    tl = Timeline(stop_time=500_000, event_queue=event_queue, seed=SEED)
+    sender = Node("sender", tl)
+    receiver = Receiver("receiver", tl)
+    qc = QuantumChannel("qc", tl, attenuation=0.0002, distance=10000, polarization_fidelity=0.9)
+    qc.set_ends(sender, receiver.name)
+    tl.init()
+    Sender(sender, qc, 1000).send()
+    return tl
+
+
+@pytest.mark.parametrize("event_queue", [HEAP_EVENT_QUEUE, KEYED_HEAP_EVENT_QUEUE, CALENDAR_EVENT_QUEUE])
+def test_checkpoint_restore(tmp_path, event_queue):
+    path = tmp_path / "checkpoint.zip"
+    tl = build(event_queue)
+    tl.run()
+    tl.checkpoint(path)
+
+    tl.stop_time = 10 ** 12
+    tl.run()
+    expected = tl.get_entity_by_name("receiver").log
+    assert 0 < len(expected) < 1000
+
+    for _ in range(2):
+        restored = Timeline.restore(path)
+        assert restored.time == 499_000
+        receiver = restored.get_entity_by_name("receiver")
+        assert receiver is not tl.get_entity_by_name("receiver")
+        assert receiver.timeline is restored
+        restored.stop_time = 10 ** 12
+        restored.run()
+        assert receiver.log == expected
+        assert (restored.run_counter, restored.schedule_counter) == (tl.run_counter, tl.schedule_counter)
+
+
+def test_checkpoint_states(tmp_path):
+    path = tmp_path / "checkpoint.zip"
+    QuantumManager.set_global_manager_formalism(DENSITY_MATRIX_FORMALISM)
+    tl = Timeline()
+    keys = [tl.quantum_manager.new() for _ in range(6)]
+    tl.quantum_manager.set(keys, np.diag(np.arange(64) / np.arange(64).sum()))
+    small = tl.quantum_manager.new()
+    assert tl.quantum_manager.get(keys[0]).state.nbytes >= OUT_OF_BAND_BYTES
+    tl.progress_callback = lambda stats: None
+    random.seed(SEED)
+    np.random.seed(SEED)
+    tl.checkpoint(path, data={"keys": keys})
+    QuantumManager.clear_active_formalism()
+    expected_random = (random.random(), np.random.random())
+
+    restored, data = load_checkpoint(path)
+    assert QuantumManager.get_active_formalism() == DENSITY_MATRIX_FORMALISM
+    QuantumManager.clear_active_formalism()
+    assert (random.random(), np.random.random()) == expected_random
+    assert data == {"keys": keys}
+    assert restored.progress_callback is None
+    state = restored.quantum_manager.get(keys[0]).state
+    assert np.array_equal(state, tl.quantum_manager.get(keys[0]).state)
+    assert state.flags.writeable
+    assert type(restored.quantum_manager) is type(tl.quantum_manager)
+    assert np.array_equal(restored.quantum_manager.get(small).state, tl.quantum_manager.get(small).state)
+    assert restored.quantum_manager.new() == tl.quantum_manager.new()
+
+
+def test_checkpoint_running(tmp_path):
+    tl = Timeline()
+    tl.is_running = True
+    with pytest.raises(AssertionError):
+        tl.checkpoint(tmp_path / "checkpoint.zip")
@@ -50,6 +50,12 @@ def test_get_generator():
     foo.owner = owner
     assert foo.get_generator() == rng
 
+    # no owner: generator of the entity given by the random service of the timeline
+    foo = Foo("foo3", Timeline(seed=0))
+    assert foo.get_generator() is foo.get_generator()
+    assert foo.get_generator().random() == Foo("foo3", Timeline(seed=0)).get_generator().random()
+    assert foo.get_stream() is foo.get_stream()
+
     # ClassicalEntity
 
     # owner does not have generator
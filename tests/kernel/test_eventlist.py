@@ -1,6 +1,7 @@
+import pytest
 from numpy import random
 from sequence.kernel.event import Event
-from sequence.kernel.eventlist import EventList
+from sequence.kernel.eventlist import EventList, KeyedEventList, CalendarEventList
 from sequence.kernel.process import Process
 
 MAX_TS = 100
@@ -163,3 +164,146 @@ def test_top():
         top_event = el.top()
         popped_event = el.pop()
         assert top_event == popped_event
+
+
+def test_create():
+    el = EventList.create("heap")
+    assert type(el) is EventList
+    el = EventList.create("keyed_heap")
+    assert type(el) is KeyedEventList
+    el = EventList.create("calendar")
+    assert type(el) is CalendarEventList
+
+    with pytest.raises(ValueError):
+        EventList.create("unknown")
+
+
+def test_keyed_pop():
+    random.seed(0)
+    el = KeyedEventList()
+    for t, p in zip(random.randint(MIN_TS, MAX_TS, 100), random.randint(MIN_TS, 5, 100)):
+        el.push(Event(t, process, p))
+
+    last_key = (-float("inf"), -float("inf"))
+    while not el.isempty():
+        top_event = el.top()
+        event = el.pop()
+        assert top_event is event
+        assert (event.time, event.priority) >= last_key
+        last_key = (event.time, event.priority)
+
+
+def test_keyed_fifo_ties():
+    el = KeyedEventList()
+    events = [Event(5, process, 1) for _ in range(20)]
+    for e in events:
+        el.push(e)
+
+    popped = [el.pop() for _ in range(len(events))]
+    assert all(e1 is e2 for e1, e2 in zip(events, popped))
+
+
+def test_keyed_remove():
+    el = KeyedEventList()
+    e1 = Event(0, process)
+    e2 = Event(1, process)
+    el.push(e1)
+    el.push(e2)
+
+    el.remove(e1)
+    assert e1.is_invalid()
+    assert len(el) == 1 and el.tombstones == 1
+    assert list(el) == [e2]
+    assert el.pop() is e2
+    assert el.isempty()
+
+
+def test_keyed_compaction():
+    el = KeyedEventList(compaction_ratio=0.5, compaction_min_size=10)
+    events = [Event(t, process) for t in range(100)]
+    for e in events:
+        el.push(e)
+
+    for e in events[:60]:
+        el.remove(e)
+
+    assert len(el) == 40
+    assert len(el.data) < 100
+    assert el.tombstones < len(el.data)
+    assert [el.pop().time for _ in range(40)] == list(range(60, 100))
+
+
+def test_keyed_update_event_time():
+    random.seed(1)
+    for i in range(100):
+        el = KeyedEventList()
+        events = [Event(random.randint(1, 100), process) for _ in range(i + 10)]
+        for e in events:
+            el.push(e)
+
+        event = events[random.randint(len(events))]
+        new_time = random.randint(1, 200)
+        el.update_event_time(event, new_time)
+        assert event.time == new_time
+        assert len(el) == len(events)
+
+        popped = []
+        while not el.isempty():
+            popped.append(el.pop())
+        assert sorted(e.time for e in events) == [e.time for e in popped]
+        assert any(e is event for e in popped)
+
+    # events that were popped or removed are not rescheduled
+    el = KeyedEventList()
+    events = [Event(10, process), Event(20, process)]
+    for e in events:
+        el.push(e)
+    el.remove(events[1])
+    assert el.pop() is events[0]
+    el.update_event_time(events[0], 30)
+    el.update_event_time(events[1], 30)
+    assert events[0].time == 10 and events[1].time == 20
+    assert el.isempty()
+
+
+def test_calendar_matches_keyed():
+    rng = random.default_rng(0)
+    keyed, calendar = KeyedEventList(compaction_min_size=16), CalendarEventList(compaction_min_size=16)
+    pairs = []
+    now = 0
+    for _ in range(2000):
+        r = rng.random()
+        if r < 0.5 or keyed.isempty():
+            time, priority = now + int(rng.integers(0, 1000)), int(rng.integers(0, 3))
+            pair = (Event(time, process, priority), Event(time, process, priority))
+            keyed.push(pair[0])
+            calendar.push(pair[1])
+            pairs.append(pair)
+        elif r < 0.6:
+            e1, e2 = pairs[rng.integers(len(pairs))]
+            keyed.remove(e1)
+            calendar.remove(e2)
+        elif r < 0.7:
+            e1, e2 = pairs[rng.integers(len(pairs))]
+            time = now + int(rng.integers(0, 5000))
+            keyed.update_event_time(e1, time)
+            calendar.update_event_time(e2, time)
+        else:
+            e1, e2 = keyed.pop(), calendar.pop()
+            assert (e1.time, e1.priority) == (e2.time, e2.priority)
+            assert any(p1 is e1 and p2 is e2 for p1, p2 in pairs)
+            now = e1.time
+        assert len(keyed) == len(calendar)
+
+    while not keyed.isempty():
+        assert calendar.top() is calendar.pop()
+        keyed.pop()
+    assert calendar.isempty()
+
+
+def test_calendar_sparse_times():
+    el = CalendarEventList(bucket_width=10)
+    times = [0, 5, 10 ** 6, 10 ** 12, 3, 10 ** 6 + 1]
+    for t in times:
+        el.push(Event(t, process))
+    assert [el.pop().time for _ in times] == sorted(times)
@@ -0,0 +1,128 @@
+import pytest
+
+from sequence.components.optical_channel import ClassicalChannel, QuantumChannel
+from sequence.kernel.event import Event
+from sequence.kernel.parallel_timeline import ParallelTimeline, run_parallel
+from sequence.kernel.process import Process
+from sequence.kernel.timeline import Timeline
+from sequence.message import Message
+from sequence.topology.node import Node
+
+NUM_NODES = 4
+DELAY = 1000
+STOP_TIME = 50 * DELAY
+
+
+class PingMessage(Message):
+    def __init__(self, hops: int):
+        super().__init__("ping", None)
+        self.payload = hops
+
+
+class PingNode(Node):
+    """Node forwarding a message around a ring of nodes."""
+
+    def __init__(self, name, timeline, next_node):
+        super().__init__(name, timeline)
+        self.next_node = next_node
+        self.log = []
+
+    def start(self):
+        self.send_message(self.next_node, PingMessage(0))
+
+    def receive_message(self, src, msg):
+        self.log.append((self.timeline.now(), src, msg.payload))
+        self.send_message(self.next_node, PingMessage(msg.payload + 1))
+
+
+def build_ring(tl, partition_of=None):
+    names = [f"node{i}" for i in range(NUM_NODES)]
+    nodes = []
+    for i, name in enumerate(names):
+        if partition_of is not None and partition_of(i) != tl.partition_id:
+            tl.add_foreign_entity(name, partition_of(i))
+            continue
+        node = PingNode(name, tl, names[(i + 1) % NUM_NODES])
+        cc = ClassicalChannel(f"cc_{name}", tl, 1e3, delay=DELAY + i)
+        cc.set_ends(node, names[(i + 1) % NUM_NODES])
+        nodes.append(node)
+
+    for node in nodes:
+        if node.name == "node0":
+            tl.schedule(Event(0, Process(node, "start", [])))
+    return nodes
+
+
+def ring_worker(partition_id, connections, num_partitions):
+    tl = ParallelTimeline(partition_id, num_partitions, stop_time=STOP_TIME)
+    tl.set_connections(connections)
+    nodes = build_ring(tl, lambda i: i * num_partitions // NUM_NODES)
+    tl.init()
+    tl.run()
+    return {node.name: node.log for node in nodes}, tl.lookahead, tl.exchange_counter
+
+
+def test_schedule_foreign():
+    tl = ParallelTimeline(0, 2)
+    tl.add_foreign_entity("remote", 1)
+    event = Event(10, Process("remote", "receive_message", []))
+    tl.schedule(event)
+    assert len(tl.events) == 0
+    assert len(tl.event_buffer[1]) == 1
+    assert tl.event_buffer[1][0][0] == 10
+
+    with pytest.raises(AssertionError):
+        tl.add_foreign_entity("self", 0)
+
+
+def test_init_quantum_channel():
+    # quantum channels to other partitions need a quantum manager sharing its states
+    tl = ParallelTimeline(0, 2)
+    tl.add_foreign_entity("remote", 1)
+    node = Node("local", tl)
+    qc = QuantumChannel("qc", tl, 2e-4, 1e3)
+    qc.set_ends(node, "remote")
+    assert not tl.quantum_manager.SHARES_STATES
+    with pytest.raises(ValueError, match="qc"):
+        tl.init()
+    with pytest.raises(NotImplementedError):
+        tl.quantum_manager.move_manage_to_server(tl.quantum_manager.new())
+
+
+def test_run_single_partition():
+    tl = ParallelTimeline(0, 1, stop_time=STOP_TIME)
+    nodes = build_ring(tl)
+    tl.init()
+    tl.run()
+    assert len(nodes[1].log) > 0
+
+
+@pytest.mark.parametrize("num_partitions, lookahead", [(2, DELAY + 1), (4, DELAY)])
+def test_run_parallel(num_partitions, lookahead):
+    tl = Timeline(STOP_TIME)
+    nodes = build_ring(tl)
+    tl.init()
+    tl.run()
+    expected = {node.name: node.log for node in nodes}
+
+    results = run_parallel(ring_worker, num_partitions, args=(num_partitions,))
+    logs = {}
+    for node_logs, partition_lookahead, exchanged in results:
+        logs.update(node_logs)
+        # minimum delay of the channels crossing partitions
+        assert partition_lookahead == lookahead
+        assert exchanged > 0
+    assert logs == expected
+
+
+def failing_worker(partition_id, connections):
+    tl = ParallelTimeline(partition_id, 2)
+    tl.set_connections(connections)
+    if partition_id == 1:
+        raise ValueError("partition failure")
+    tl.run()
+
+
+def test_run_parallel_failure():
+    with pytest.raises(RuntimeError, match="partition failure"):
+        run_parallel(failing_worker, 2)
@@ -22,3 +22,33 @@ def test_run():
     assert a.counter == 1 and b.counter == 0
     p2.run()
     assert a.counter == 1 and b.counter == -10
+
+
+def test_run_lookup():
+    class Dummy():
+        def __init__(self):
+            self.counter = 0
+
+        def add(self, x):
+            self.counter += x
+
+        def minus(self, x):
+            self.counter -= x
+
+    # the method is looked up when the process is first run, so that changes of the owner are used
+    a = Dummy()
+    p = Process(a, "add", [1])
+    assert p._method is None
+    a.add = lambda x: setattr(a, "counter", a.counter - x)
+    p.run()
+    assert a.counter == -1 and p._method is a.add
+
+    # the bound method is looked up again when the owner or the activation is reassigned
+    b = Dummy()
+    p.owner = b
+    assert p._method is None
+    p.run()
+    assert a.counter == -1 and b.counter == 1
+    p.activation = "minus"
+    p.run()
+    assert a.counter == -1 and b.counter == 0
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from sequence.constants import KEYED_HEAP_EVENT_QUEUE
+from sequence.kernel.entity import Entity
+from sequence.kernel.event import Event
+from sequence.kernel.process import Process
+from sequence.kernel.timeline import Timeline
+
+
+class Dummy(Entity):
+    def __init__(self, name, timeline):
+        Entity.__init__(self, name, timeline)
+        self.counter = 0
+
+    def init(self):
+        pass
+
+    def operate(self):
+        self.counter += 1
+
+    def tick(self, period):
+        self.counter += 1
+        self.timeline.schedule(Event(self.timeline.now() + period, Process(self, "tick", [period])))
+
+
+def build(event_queue):
+    tl = Timeline(stop_time=10000, event_queue=event_queue)
+    dummies = [Dummy(f"dummy{i}", tl) for i in range(2)]
+    for i, dummy in enumerate(dummies):
+        dummy.tick(i + 1)
+        for t in range(100):
+            event = Event(t, Process(dummy, "operate", []))
+            tl.schedule(event)
+            if t % 2:
+                tl.remove_event(event)
+    return tl, dummies
+
+
+@pytest.mark.parametrize("event_queue", ["heap", KEYED_HEAP_EVENT_QUEUE])
+def test_EventProfiler(event_queue):
+    tl, dummies = build(event_queue)
+    profiler = tl.enable_profiler(sample_interval=1000)
+    tl.run()
+
+    # same execution as without profiler
+    expected, expected_dummies = build(event_queue)
+    expected.run()
+    assert tl.run_counter == expected.run_counter
+    assert [d.counter for d in dummies] == [d.counter for d in expected_dummies]
+
+    assert profiler.activations[("Dummy", "operate")][0] == 100
+    assert profiler.activations[("Dummy", "tick")][0] == 9999 + 4999
+    assert all(wall_time > 0 for _, wall_time in profiler.activations.values())
+    assert profiler.entities == {"dummy0": 50 + 9999, "dummy1": 50 + 4999}
+    assert len(profiler.queue_samples) == tl.run_counter // 1000
+    assert all(size == 2 and ratio == 0 for _, _, size, ratio in profiler.queue_samples[1:])
+
+    data = json.loads(profiler.to_json())
+    assert {(a["class"], a["activation"], a["count"]) for a in data["activations"]} == \
+        {("Dummy", "operate", 100), ("Dummy", "tick", 14998)}
+    assert data["entities"] == profiler.entities
+    assert len(data["queue"]) == len(profiler.queue_samples)
+
+    lines = profiler.to_collapsed(weight="count").splitlines()
+    assert sorted(lines) == ["Timeline.run;Dummy;operate 100", "Timeline.run;Dummy;tick 14998"]
+
+    df = profiler.to_dataframe()
+    assert list(df.columns) == ["class", "activation", "count", "wall_time", "wall_time_per_event"]
+    assert df["count"].sum() == tl.run_counter
+
+    tl.disable_profiler()
+    assert tl.profiler is None
+
+
+def test_sample_queue_tombstones():
+    tl, _ = build("heap")
+    profiler = tl.enable_profiler()
+    profiler.sample_queue(tl)
+    # 2 tick events, 200 operate events of which 100 removed
+    _, _, size, ratio = profiler.queue_samples[0]
+    assert size == 202 and ratio == pytest.approx(100 / 202)
+
+    tl, _ = build(KEYED_HEAP_EVENT_QUEUE)
+    profiler = tl.enable_profiler()
+    profiler.sample_queue(tl)
+    _, _, size, ratio = profiler.queue_samples[0]
+    assert size == 102 and ratio == pytest.approx(100 / 202)
+
+
+def test_progress_callback():
+    tl, _ = build("heap")
+    reports = []
+    tl.progress_callback = reports.append
+    tl.progress_interval = 0
+    tl.run()
+
+    # one report per PROGRESS_CHECK_EVENTS events, and one at the end
+    assert len(reports) == tl.run_counter // Timeline.PROGRESS_CHECK_EVENTS + 1
+    last = reports[-1]
+    assert last.run_counter == tl.run_counter
+    assert last.sim_time == tl.time and last.stop_time == tl.stop_time
+    assert all(report.events_per_second > 0 and report.sim_wall_ratio >= 0 for report in reports[:-1])
+    assert [report.run_counter for report in reports] == sorted(report.run_counter for report in reports)
+
+
+def test_show_progress(capsys):
+    tl, _ = build("heap")
+    tl.show_progress = True
+    tl.run()
+    out = capsys.readouterr().out
+    assert "simulation time" in out and "events/s" in out
@@ -1,6 +1,7 @@
 import numpy as np
 from scipy.linalg import fractional_matrix_power
 import math
+import pytest
 
 from sequence.kernel.quantum_manager import *
 from sequence.components.circuit import Circuit
@@ -58,6 +59,14 @@ def test_qmanager_remove():
     qm.remove(0)
     assert len(qm.states.keys()) == 0
 
+    # keys of removed states are reused, unless entangled with other keys
+    key1, key2, key3 = qm.new(), qm.new(), qm.new()
+    qm.set([key2, key3], [complex(1), complex(0), complex(0), complex(0)])
+    qm.remove(key1)
+    qm.remove(key2)
+    assert qm.new() == key1
+    assert qm.new() == key3 + 1
+
 
 def test_qmanager_circuit():
     qm = QuantumManagerKet()
@@ -201,6 +210,93 @@ def test_qmanager_circuit_density():
     assert np.array_equal(density1.state, density2.state)
 
 
+def random_unitary(dim, rng):
+    mat = rng.normal(size=(dim, dim)) + 1j * rng.normal(size=(dim, dim))
+    q, _ = np.linalg.qr(mat)
+    return q
+
+
+def test_qmanager_circuit_tensor():
+    # compare with the circuit matrix padded with identity and multiplied by the swap matrix
+    rng = np.random.default_rng(0)
+    for qm_class in [QuantumManagerKet, QuantumManagerDensity]:
+        qm = qm_class()
+        sizes = [2, 1, 2]
+        groups = []
+        for size in sizes:
+            keys = [qm.new() for _ in range(size)]
+            ket = rng.normal(size=2 ** size) + 1j * rng.normal(size=2 ** size)
+            ket /= np.linalg.norm(ket)
+            qm.set(keys, ket)
+            groups.append(keys)
+        circuit_keys = [groups[2][1], groups[0][1], groups[1][0]]
+        unitary = random_unitary(8, rng)
+
+        all_keys = groups[0] + groups[1] + groups[2]
+        state = qm.get(groups[0][0]).state
+        for keys in groups[1:]:
+            state = np.kron(state, qm.get(keys[0]).state)
+        expected_keys = list(all_keys)
+        _, swap_mat = qm._swap_qubits(expected_keys, circuit_keys)
+        circ_mat = np.kron(unitary, np.identity(4)) @ swap_mat
+        if qm_class is QuantumManagerKet:
+            expected = circ_mat @ state
+        else:
+            expected = circ_mat @ state @ circ_mat.conj().T
+
+        qm.run_circuit(DumbCircuit(3, unitary), circuit_keys)
+        output = qm.get(circuit_keys[0])
+        assert output.keys == expected_keys
+        assert output.keys[:3] == circuit_keys
+        assert np.allclose(output.state, expected)
+
+
+# circuits applied to groups of entangled qubits: input kets of the groups, circuit size, gates, target qubits
+# given as (group, qubit), and output ket with the order of its qubits (indices in the concatenated groups),
+# as computed by the qutip-based `run_circuit` of version 0.8.4 (swap matrices and identity-padded circuit matrices)
+REFERENCE_CIRCUITS = [
+    ([[0.6, 0.8j, 0, 0], [1, 1j]], 2,
+     [("h", [0]), ("cx", [0, 1]), ("t", [1]), ("root_iY", [0])], [(1, 0), (0, 0)],
+     [2, 0, 1],
+     [0.21213203 + 0.21213203j, -0.28284271 + 0.28284271j, 0.3, 0.4j,
+      -0.21213203 - 0.21213203j, 0.28284271 - 0.28284271j, 0.3, 0.4j]),
+    ([[0.6, 0.8], [1, -1j], [0, 1]], 3,
+     [("ccx", [0, 1, 2]), ("phase", [2], 0.3), ("swap", [0, 2]), ("h", [1]), ("s", [0])], [(2, 0), (0, 0), (1, 0)],
+     [2, 0, 1],
+     [0, 0.3 - 0.4j, 0, 0.3 + 0.4j, 0, 0.16839286 + 0.47079066j, 0, 0.40480903 - 0.29347853j]),
+    ([[1, 0, 2j, 0, 0, 2, 0, 0]], 2,
+     [("y", [0]), ("cz", [0, 1]), ("sdg", [1]), ("minus_root_iZ", [0]), ("x", [1])], [(0, 2), (0, 0)],
+     [2, 0, 1],
+     [-0.47140452 + 0.47140452j, 0, 0, 0, 0, 0, -0.23570226 + 0.23570226j, -0.47140452 - 0.47140452j]),
+]
+
+
+@pytest.mark.parametrize("groups, size, gates, targets, order, expected", REFERENCE_CIRCUITS)
+@pytest.mark.parametrize("qm_class", [QuantumManagerKet, QuantumManagerDensity])
+def test_qmanager_circuit_reference(qm_class, groups, size, gates, targets, order, expected):
+    qm = qm_class()
+    keys = []
+    for ket in groups:
+        ket = np.array(ket, dtype=complex)
+        ket /= np.linalg.norm(ket)
+        group = [qm.new() for _ in range(int(math.log2(len(ket))))]
+        qm.set(group, ket if qm_class is QuantumManagerKet else np.outer(ket, ket.conj()))
+        keys.append(group)
+    circuit = Circuit(size)
+    for name, indices, *args in gates:
+        getattr(circuit, name)(*indices, *args)
+
+    circuit_keys = [keys[group][qubit] for group, qubit in targets]
+    qm.run_circuit(circuit, circuit_keys)
+    output = qm.get(circuit_keys[0])
+    all_keys = [key for group in keys for key in group]
+    assert output.keys == [all_keys[i] for i in order]
+    expected = np.array(expected)
+    if qm_class is QuantumManagerDensity:
+        expected = np.outer(expected, expected.conj())
+    assert np.allclose(output.state, expected)
+
+
 def test_qmanager__measure():
     NUM_TESTS = 1000
 
@@ -347,6 +443,49 @@ def test_qmanager__measure_density():
     assert abs((len(meas_0) / NUM_TESTS) - 0.5) < 0.1
 
 
+def test_qmanager__measure_vectorized():
+    # compare with the projectors of measure_multiple_with_cache_ket/density, for all subsets of 3 qubits
+    rng = np.random.default_rng(0)
+    ket = rng.normal(size=8) + 1j * rng.normal(size=8)
+    ket /= np.linalg.norm(ket)
+    rho = np.outer(ket, ket.conj()) * 0.8 + np.identity(8) * 0.025
+    measured_keys = [[0], [1], [2], [0, 1], [2, 1], [0, 2], [1, 2], [2, 0, 1]]
+
+    for keys in measured_keys:
+        rest = [k for k in range(3) if k not in keys]
+        axes = keys + rest
+        expected_kets, ket_probs = measure_multiple_with_cache_ket(tuple(permute_ket(ket, axes)), len(keys), len(rest))
+        expected_rhos, rho_probs = \
+            measure_multiple_with_cache_density(tuple(map(tuple, permute_density(rho, axes))), len(keys), len(rest))
+        for samp in rng.random(10):
+            circuit = Circuit(3)
+            for k in keys:
+                circuit.measure(k)
+
+            qm = QuantumManagerKet()
+            qm_keys = [qm.new() for _ in range(3)]
+            qm.set(qm_keys, ket)
+            res = qm.run_circuit(circuit, qm_keys, samp)
+            result = int(np.searchsorted(np.cumsum(ket_probs), samp, side="right"))
+            digits = [int(x) for x in format(result, f"0{len(keys)}b")]
+            assert res == dict(zip(keys, digits))
+            if len(rest) > 0:
+                state = qm.get(rest[0])
+                output = permute_ket(state.state, [state.keys.index(k) for k in rest])
+                assert np.allclose(output, expected_kets[result])
+
+            qm = QuantumManagerDensity()
+            qm_keys = [qm.new() for _ in range(3)]
+            qm.set(qm_keys, rho)
+            res = qm.run_circuit(circuit, qm_keys, samp)
+            result = int(np.searchsorted(np.cumsum(rho_probs), samp, side="right"))
+            digits = [int(x) for x in format(result, f"0{len(keys)}b")]
+            assert res == dict(zip(keys, digits))
+            state = qm.get(0)
+            output = permute_density(state.state, [state.keys.index(k) for k in axes])
+            assert np.allclose(output, expected_rhos[result])
+
+
 def test_qmanager_prepare_state_fock():
     qm = QuantumManagerDensityFock(truncation=2)
     state_0 = [1, 0, 0]
@@ -557,3 +696,208 @@ def test_qmanager_measure_fock():
             raise Exception()
 
     assert abs((len(meas_0) / NUM_TESTS) - 0.5) < 0.1
+
+
+def test_qmanager_bell_diagonal():
+    qm = QuantumManagerBellDiagonal()
+    keys = [qm.new() for _ in range(4)]
+    assert keys[0] not in qm.states
+    with pytest.raises(Exception):
+        qm.get(keys[0])
+
+    qm.set(keys[:2], [0.9, 0.05, 0.03, 0.02])
+    qm.set(keys[2:], [1, 0, 0, 0])
+    diag = qm.diagonal(keys[0])
+    assert qm.get(keys[1]).keys == keys[:2]
+    assert np.allclose(qm.get(keys[1]).state, [0.9, 0.05, 0.03, 0.02])
+    assert len(qm.states) == 4 and sorted(qm.states) == keys
+
+    # the row of a pair is updated in place
+    qm.set(keys[1::-1], [0.8, 0.1, 0.05, 0.05])
+    assert np.allclose(diag, [0.8, 0.1, 0.05, 0.05])
+    assert qm.diagonal(keys[1]) is not diag and np.shares_memory(qm.diagonal(keys[1]), diag)
+
+    # the row is reused once both keys are released
+    qm.set([keys[0]], [complex(1), complex(0)])
+    assert keys[0] not in qm.states and keys[1] in qm.states
+    qm.set([keys[1]], [complex(1), complex(0)])
+    new_keys = [qm.new() for _ in range(2)]
+    qm.set(new_keys, [0.7, 0.1, 0.1, 0.1])
+    assert np.shares_memory(qm.diagonal(new_keys[0]), diag)
+    assert len(qm.states) == 4
+
+    # the table grows beyond its initial capacity
+    keys = [qm.new() for _ in range(4 * qm.INITIAL_CAPACITY)]
+    for key1, key2 in zip(keys[::2], keys[1::2]):
+        qm.set([key1, key2], [0.25] * 4)
+    assert qm.get(keys[-1]).keys == keys[-2:]
+    assert np.allclose(qm.get(new_keys[1]).state, [0.7, 0.1, 0.1, 0.1])
+
+
+def test_qmanager_bell_diagonal_sparse_keys():
+    # keys of distant partitions do not grow the key arrays
+    qm = QuantumManagerBellDiagonal()
+    keys = [5, 2 ** 40 + 5]
+    qm.set(keys, [0.9, 0.05, 0.03, 0.02])
+    qm.set_decoherence_rates(keys[1], [1, 2, 3])
+    assert len(qm._rows) == QuantumManagerBellDiagonal.INITIAL_CAPACITY
+    assert sorted(qm.states) == keys
+    assert qm.get(keys[1]).keys == keys
+
+    # slots of removed keys are reused
+    slot = qm._slots[keys[1]]
+    qm.remove(keys[1])
+    assert keys[1] not in qm.states and keys[0] in qm.states
+    qm.set([keys[0], 2 ** 41], [1, 0, 0, 0])
+    assert qm._slots[2 ** 41] == slot
+    assert np.array_equal(qm._rates[slot], [0, 0, 0]) and qm.get_last_update(2 ** 41) == -1
+
+    # invalid states are rejected without changing the stored state
+    with pytest.raises(AssertionError):
+        qm.set([keys[0], 2 ** 41], [0.5, 0.5, 0.5, 0.5])
+    with pytest.raises(AssertionError):
+        qm.set([keys[0], 7], [1.5, -0.5, 0, 0])
+    assert qm.get(keys[0]).keys == [keys[0], 2 ** 41]
+    assert np.array_equal(qm.diagonal(keys[0]), [1, 0, 0, 0])
+    assert 7 not in qm.states
+
+
+def test_qmanager_bell_diagonal_decohere():
+    rates = np.array([[100, 200, 300], [50, 0, 0], [0, 0, 10], [10, 10, 10]], dtype=float)
+    states = [[0.9, 0.05, 0.03, 0.02], [0.7, 0.1, 0.1, 0.1]]
+    qm_batch, qm_single = QuantumManagerBellDiagonal(), QuantumManagerBellDiagonal()
+    for qm in [qm_batch, qm_single]:
+        keys = [qm.new() for _ in range(4)]
+        qm.set(keys[:2], states[0])
+        qm.set(keys[2:], states[1])
+        for key, rate in zip(keys, rates):
+            qm.set_decoherence_rates(key, rate)
+            qm.set_last_update(key, 10 ** 9)
+    qm_single.set_last_update(keys[3], -1)
+    qm_batch.set_last_update(keys[3], -1)
+
+    qm_batch.decohere(keys, 10 ** 10)
+    for key in keys:
+        qm_single.decohere([key], 10 ** 10)
+    for key in keys:
+        assert np.allclose(qm_batch.get(key).state, qm_single.get(key).state)
+    assert [qm_batch.get_last_update(key) for key in keys] == [10 ** 10] * 3 + [-1]
+
+    # single-qubit Pauli channel, as the transform matrix of the diagonal elements
+    x_rate, y_rate, z_rate = rates[2]
+    t = 9e-3
+    p_i = (1 + np.exp(-2 * (x_rate + y_rate) * t) + np.exp(-2 * (x_rate + z_rate) * t) + np.exp(-2 * (z_rate + y_rate) * t)) / 4
+    p_z = (1 + np.exp(-2 * (x_rate + y_rate) * t) - np.exp(-2 * (x_rate + z_rate) * t) - np.exp(-2 * (z_rate + y_rate) * t)) / 4
+    assert np.allclose(qm_batch.get(keys[2]).state, [p_i * 0.7 + p_z * 0.1, p_i * 0.1 + p_z * 0.7, 0.1, 0.1])
+
+
+def test_qmanager_bell_diagonal_swap():
+    # entanglement swapping with Pauli corrections gives the same state as the density matrix formalism
+    bell = np.array([[1, 0, 0, 1], [1, 0, 0, -1], [0, 1, 1, 0], [0, 1, -1, 0]]) / np.sqrt(2)  # I, Z, X, Y order
+    states = [np.array([0.85, 0.05, 0.07, 0.03]), np.array([0.6, 0.2, 0.15, 0.05])]
+    bsm = Circuit(2)
+    bsm.cx(0, 1)
+    bsm.h(0)
+    bsm.measure(0)
+    bsm.measure(1)
+    corrections = {}
+    for meas_res, gates in [((1, 0), ['z']), ((0, 1), ['x']), ((1, 1), ['x', 'z'])]:
+        corrections[meas_res] = Circuit(1)
+        for gate in gates:
+            getattr(corrections[meas_res], gate)(0)
+
+    for meas_samp in [0.1, 0.3, 0.6, 0.9]:
+        qm_density, qm_bds = QuantumManagerDensity(), QuantumManagerBellDiagonal()
+        keys = [qm_density.new() for _ in range(4)]
+        assert keys == [qm_bds.new() for _ in range(4)]
+        for pair, state in zip([keys[:2], keys[2:]], states):
+            qm_density.set(pair, bell.T @ np.diag(state) @ bell)
+            qm_bds.set(pair, state)
+
+        res_density = qm_density.run_circuit(bsm, keys[1:3], meas_samp)
+        meas_res = (res_density[keys[1]], res_density[keys[2]])
+        if meas_res in corrections:
+            qm_density.run_circuit(corrections[meas_res], [keys[3]])
+        res_bds = qm_bds.run_circuit(bsm, keys[1:3], meas_samp)
+        assert qm_bds.run_circuit(corrections[(1, 1)], [keys[3]]) == {}
+
+        assert keys[1] not in qm_bds.states and keys[2] not in qm_bds.states
+        assert qm_bds.get(keys[3]).keys == [keys[0], keys[3]]
+        # reduced state of the end qubits (the measured qubits are in a product state)
+        qm_density.run_circuit(Circuit(4), [keys[0], keys[3], keys[1], keys[2]])
+        rho = np.trace(qm_density.get(keys[0]).state.reshape([4] * 4), axis1=1, axis2=3)
+        assert np.allclose(qm_bds.get(keys[0]).state, np.diag(bell @ rho @ bell.T).real)
+        assert set(res_bds.values()) <= {0, 1}
+
+
+def test_qmanager_stabilizer_circuit():
+    # random Clifford circuits give the same results and states as the ket vector formalism
+    rng = np.random.default_rng(1)
+    single_gates = ['h', 'x', 'y', 'z', 's', 'sdg', 'root_iZ', 'minus_root_iZ', 'root_iY', 'minus_root_iY']
+    for _ in range(100):
+        num_qubits = int(rng.integers(1, 5))
+        circuit = Circuit(num_qubits)
+        for _ in range(10):
+            if num_qubits > 1 and rng.random() < 0.4:
+                name = ['cx', 'cz', 'swap'][rng.integers(3)]
+                qubits = rng.choice(num_qubits, 2, replace=False)
+                getattr(circuit, name)(int(qubits[0]), int(qubits[1]))
+            else:
+                getattr(circuit, single_gates[rng.integers(len(single_gates))])(int(rng.integers(num_qubits)))
+        for q in rng.permutation(num_qubits)[:rng.integers(num_qubits + 1)]:
+            circuit.measure(int(q))
+        samp = rng.random()
+
+        qm_ket, qm_stab = QuantumManagerKet(), QuantumManagerStabilizer()
+        keys = [qm_ket.new() for _ in range(num_qubits)]
+        assert keys == [qm_stab.new() for _ in range(num_qubits)]
+        keys = rng.permutation(keys).tolist()
+        assert qm_ket.run_circuit(circuit, keys, samp) == qm_stab.run_circuit(circuit, keys, samp)
+        for key in keys:
+            ket, stab = qm_ket.get(key), qm_stab.get(key)
+            assert sorted(ket.keys) == sorted(stab.keys)
+            expected = permute_ket(ket.state, [ket.keys.index(k) for k in stab.keys])
+            first = expected[np.flatnonzero(np.abs(expected) > 1e-9)[0]]
+            assert np.allclose(stab.state.to_ket(), expected * abs(first) / first)
+
+
+def test_qmanager_stabilizer_large():
+    # linear cluster state of 300 qubits; measuring the inner qubits in the X basis leaves a Bell pair
+    qm = QuantumManagerStabilizer()
+    keys = [qm.new() for _ in range(300)]
+    h = Circuit(1)
+    h.h(0)
+    cz = Circuit(2)
+    cz.cz(0, 1)
+    for key in keys:
+        qm.run_circuit(h, [key])
+    for key1, key2 in zip(keys, keys[1:]):
+        qm.run_circuit(cz, [key1, key2])
+    assert qm.get(keys[0]).keys == keys
+
+    meas_x = Circuit(1)
+    meas_x.h(0)
+    meas_x.measure(0)
+    results = [qm.run_circuit(meas_x, [key], rng_samp)[key]
+               for key, rng_samp in zip(keys[1:-1], np.random.default_rng(0).random(298))]
+    assert 0 < sum(results) < 298
+    state = qm.get(keys[0])
+    assert state.keys == [keys[0], keys[-1]]
+    # maximally entangled pair
+    assert np.allclose(np.linalg.svd(state.state.to_ket().reshape((2, 2)), compute_uv=False), [0.5 ** 0.5] * 2)
+
+    # GHZ state of 100 qubits, with 99 qubits measured in one circuit
+    keys = [qm.new() for _ in range(100)]
+    circuit = Circuit(100)
+    circuit.h(0)
+    for i in range(1, 100):
+        circuit.cx(0, i)
+        circuit.measure(i)
+    results = qm.run_circuit(circuit, keys, 0.3)
+    assert len(set(results.values())) == 1
+    assert qm.get(keys[0]).keys == [keys[0]]
+
+    circuit = Circuit(1)
+    circuit.t(0)
+    with pytest.raises(ValueError):
+        qm.run_circuit(circuit, [keys[0]])
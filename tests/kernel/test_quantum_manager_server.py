@@ -0,0 +1,195 @@
+import numpy as np
+import pytest
+
+from sequence.components.circuit import Circuit
+from sequence.components.optical_channel import QuantumChannel
+from sequence.components.photon import Photon
+from sequence.constants import KET_STATE_FORMALISM, DENSITY_MATRIX_FORMALISM, STABILIZER_FORMALISM, PARTITION_KEY_SPACE
+from sequence.kernel.event import Event
+from sequence.kernel.parallel_timeline import ParallelTimeline, run_parallel
+from sequence.kernel.process import Process
+from sequence.kernel.quantum_manager import QuantumManagerKet, QuantumManagerDensity, QuantumManagerStabilizer
+from sequence.kernel.quantum_manager_client import QuantumManagerClient
+from sequence.kernel.quantum_manager_server import QuantumManagerServer
+from sequence.topology.node import Node
+
+SQRT_HALF = 0.5 ** 0.5
+
+
+@pytest.fixture(scope="module")
+def ket_server():
+    with QuantumManagerServer(KET_STATE_FORMALISM) as server:
+        yield server
+
+
+def bell_circuit():
+    circ = Circuit(2)
+    circ.h(0)
+    circ.cx(0, 1)
+    return circ
+
+
+def test_client_local(ket_server):
+    client = QuantumManagerClient.create(ket_server.address, 1, formalism=KET_STATE_FORMALISM)
+    assert isinstance(client, QuantumManagerKet)
+
+    keys = [client.new(), client.new()]
+    assert keys == [PARTITION_KEY_SPACE, PARTITION_KEY_SPACE + 1]
+    client.run_circuit(bell_circuit(), keys)
+    assert np.allclose(client.get(keys[0]).state, [SQRT_HALF, 0, 0, SQRT_HALF])
+    # local states are not sent to the server
+    assert client.message_counter == 0
+    client.close()
+
+
+def test_client_server(ket_server):
+    client = QuantumManagerClient.create(ket_server.address, 0, formalism=KET_STATE_FORMALISM)
+    keys = [client.new(), client.new()]
+    client.run_circuit(bell_circuit(), keys)
+
+    # moving one key moves the entangled state
+    client.move_manage_to_server(keys[1])
+    assert client.is_remote(keys[0]) and client.is_remote(keys[1])
+    assert len(client.states) == 0
+    state = client.get(keys[0])
+    assert state.keys == keys
+    assert np.allclose(state.state, [SQRT_HALF, 0, 0, SQRT_HALF])
+    assert client.message_counter == 1
+
+    # requests without return value are batched
+    circ = Circuit(1)
+    circ.x(0)
+    client.run_circuit(circ, [keys[0]])
+    client.set([keys[1]], [0, 1])
+    assert len(client.requests) == 2
+    assert client.get(keys[1]).state.tolist() == [0, 1]
+    assert client.message_counter == 2
+
+    # measurement is executed on the server
+    circ = Circuit(1)
+    circ.measure(0)
+    assert client.run_circuit(circ, [keys[0]], 0.5) == {keys[0]: 1}
+
+    client.remove(keys[0])
+    with pytest.raises(KeyError):
+        client.get(keys[0])
+    client.close()
+
+
+def test_client_shared(ket_server):
+    client0 = QuantumManagerClient.create(ket_server.address, 0, formalism=KET_STATE_FORMALISM)
+    client1 = QuantumManagerClient.create(ket_server.address, 1, formalism=KET_STATE_FORMALISM)
+    keys = [client0.new(), client0.new()]
+    client0.run_circuit(bell_circuit(), keys)
+    client0.move_manage_to_server(keys[1])
+    client0.flush()
+
+    # the other partition measures the shared key, with a local key in the same circuit
+    local_key = client1.new()
+    circ = Circuit(2)
+    circ.measure(0)
+    circ.measure(1)
+    result = client1.run_circuit(circ, [keys[1], local_key], 0.9)
+    assert result[local_key] == 0
+    assert client1.is_remote(local_key)
+
+    circ = Circuit(1)
+    circ.measure(0)
+    assert client0.run_circuit(circ, [keys[0]], 0.2) == {keys[0]: result[keys[1]]}
+    client0.close()
+    client1.close()
+
+
+def test_client_density():
+    with QuantumManagerServer(DENSITY_MATRIX_FORMALISM) as server:
+        client = QuantumManagerClient.create(server.address, 0, formalism=DENSITY_MATRIX_FORMALISM)
+        assert isinstance(client, QuantumManagerDensity)
+        key = client.new()
+        client.move_manage_to_server(key)
+        circ = Circuit(1)
+        circ.h(0)
+        client.run_circuit(circ, [key])
+        assert np.allclose(client.get(key).state, [[0.5, 0.5], [0.5, 0.5]])
+        client.close()
+
+
+def test_client_stabilizer():
+    with QuantumManagerServer(STABILIZER_FORMALISM) as server:
+        client = QuantumManagerClient.create(server.address, 0, formalism=STABILIZER_FORMALISM)
+        assert isinstance(client, QuantumManagerStabilizer)
+        keys = [client.new(), client.new()]
+        client.run_circuit(bell_circuit(), keys)
+        client.move_manage_to_server(keys[0])
+        assert np.allclose(client.get(keys[1]).state.to_ket(), [SQRT_HALF, 0, 0, SQRT_HALF])
+        circ = Circuit(2)
+        circ.measure(0)
+        circ.measure(1)
+        assert client.run_circuit(circ, keys, 0.7) == {keys[0]: 1, keys[1]: 1}
+        client.close()
+
+
+def test_connect_quantum_manager(ket_server):
+    tl = ParallelTimeline(1, 2, formalism=KET_STATE_FORMALISM)
+    key = tl.quantum_manager.new()
+    assert key == PARTITION_KEY_SPACE
+    tl.connect_quantum_manager(ket_server.address)
+    assert isinstance(tl.quantum_manager, QuantumManagerClient)
+    assert tl.quantum_manager.get(key).keys == [key]
+    assert tl.quantum_manager.new() == key + 1
+    tl.quantum_manager.close()
+
+
+class Sender(Node):
+    def __init__(self, name, timeline, receiver):
+        super().__init__(name, timeline)
+        self.receiver = receiver
+        self.result = None
+
+    def send(self):
+        qm = self.timeline.quantum_manager
+        self.memory_key = qm.new()
+        photon = Photon("photon", self.timeline, use_qm=True)
+        qm.run_circuit(bell_circuit(), [self.memory_key, photon.quantum_state])
+        self.qchannels[self.receiver].transmit(photon, self)
+
+    def measure(self):
+        circ = Circuit(1)
+        circ.measure(0)
+        res = self.timeline.quantum_manager.run_circuit(circ, [self.memory_key], self.get_generator().random())
+        self.result = res[self.memory_key]
+
+
+class Receiver(Node):
+    def __init__(self, name, timeline):
+        super().__init__(name, timeline)
+        self.result = None
+
+    def receive_qubit(self, src, qubit):
+        self.result = Photon.measure(None, qubit, self.get_generator())
+
+
+def photon_worker(partition_id, connections, address, seed):
+    tl = ParallelTimeline(partition_id, 2, formalism=KET_STATE_FORMALISM, stop_time=10 ** 12)
+    tl.set_connections(connections)
+    if partition_id == 0:
+        node = Sender("sender", tl, "receiver")
+        qc = QuantumChannel("qc", tl, 0, 1000)
+        qc.set_ends(node, "receiver")
+        tl.add_foreign_entity("receiver", 1)
+        tl.schedule(Event(0, Process(node, "send", [])))
+        tl.schedule(Event(10 ** 9, Process(node, "measure", [])))
+    else:
+        node = Receiver("receiver", tl)
+        tl.add_foreign_entity("sender", 0)
+    node.set_seed(seed + partition_id)
+    tl.connect_quantum_manager(address)
+    tl.init()
+    tl.run()
+    return node.result
+
+
+def test_photon_across_partitions(ket_server):
+    for seed in range(4):
+        sender_result, receiver_result = run_parallel(photon_worker, 2, args=(ket_server.address, seed))
+        assert sender_result in (0, 1)
+        assert sender_result == receiver_result
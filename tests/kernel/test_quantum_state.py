@@ -3,6 +3,7 @@ from numpy.random import default_rng
 import pytest
 
 from sequence.kernel.quantum_state import KetState, FreeQuantumState
+from sequence.kernel.quantum_utils import basis_projectors, cache_stats
 from sequence.utils.encoding import polarization
 
 
@@ -124,6 +125,67 @@ def test_measure_entangled():
         assert abs(0.5 - counter / 1000) < 0.1
 
 
+def test_measure_batch():
+    states = [(complex(1), complex(0)),
+              (complex(0), complex(1)),
+              (complex(sqrt(1 / 2)), complex(sqrt(1 / 2))),
+              (complex(-sqrt(1 / 2)), complex(sqrt(1 / 2)))] * 250
+    bases = [polarization['bases'][i % 2] for i in range(len(states))]
+
+    for basis in [polarization['bases'][1], bases]:
+        expected = []
+        generator = default_rng(0)
+        for i, s in enumerate(states):
+            qs = FreeQuantumState()
+            qs.set_state_single(s)
+            b = basis if basis is not bases else bases[i]
+            expected.append((qs.measure(b, generator), qs.state))
+
+        quantum_states = []
+        for s in states:
+            qs = FreeQuantumState()
+            qs.set_state_single(s)
+            quantum_states.append(qs)
+        results = FreeQuantumState.measure_batch(basis, quantum_states, default_rng(0))
+        assert list(zip(results.tolist(), [qs.state for qs in quantum_states])) == expected
+
+
+def test_measure_multiple():
+    bell_basis = ((complex(sqrt(1 / 2)), complex(0), complex(0), complex(sqrt(1 / 2))),
+                  (complex(sqrt(1 / 2)), complex(0), complex(0), complex(-sqrt(1 / 2))),
+                  (complex(0), complex(sqrt(1 / 2)), complex(sqrt(1 / 2)), complex(0)),
+                  (complex(0), complex(sqrt(1 / 2)), complex(-sqrt(1 / 2)), complex(0)))
+    for res, bell_state in enumerate(bell_basis):
+        qs1, qs2 = FreeQuantumState(), FreeQuantumState()
+        qs1.combine_state(qs2)
+        qs1.set_state(bell_state)
+        assert FreeQuantumState.measure_multiple(bell_basis, [qs1, qs2], rng) == res
+        assert qs1.state == qs2.state
+        # up to a global phase
+        assert abs(sum(a.conjugate() * b for a, b in zip(bell_state, qs1.state))) == pytest.approx(1)
+
+    # |00> gives |Phi+> or |Phi->
+    counter = 0
+    for _ in range(1000):
+        qs1, qs2 = FreeQuantumState(), FreeQuantumState()
+        qs1.combine_state(qs2)
+        res = FreeQuantumState.measure_multiple(bell_basis, [qs1, qs2], rng)
+        assert res in [0, 1]
+        counter += res
+    assert abs(0.5 - counter / 1000) < 0.1
+
+
+def test_basis_projectors():
+    basis = polarization['bases'][1]
+    projectors = basis_projectors(basis, 1, 2)
+    assert all(p.shape == (4, 4) and not p.flags.writeable for p in projectors)
+    assert (projectors[0] + projectors[1]).flatten().tolist() == pytest.approx([1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1])
+
+    hits = cache_stats()['basis_projectors'].hits
+    assert basis_projectors(basis, 1, 2) is projectors
+    assert cache_stats()['basis_projectors'].hits == hits + 1
+
+
 def test_polarization_noise():
     qs = FreeQuantumState()
     pass
@@ -0,0 +1,87 @@
+import numpy as np
+
+from sequence.components.optical_channel import QuantumChannel
+from sequence.components.photon import Photon
+from sequence.kernel.random_service import RandomService, RandomStream
+from sequence.kernel.timeline import Timeline
+from sequence.topology.node import Node
+from sequence.utils.encoding import polarization
+
+SEED = 0
+
+
+class Receiver(Node):
+    def __init__(self, name, tl):
+        super().__init__(name, tl)
+        self.log = []
+
+    def receive_qubit(self, src, qubit):
+        self.log.append((self.timeline.now(), qubit.quantum_state.state))
+
+
+def test_RandomStream():
+    # uniform numbers are the numbers of the generator, whatever the block size
+    expected = np.random.default_rng(SEED).random(100).tolist()
+    for block_size in [1, 7, 1024]:
+        stream = RandomStream(np.random.default_rng(SEED), block_size)
+        assert [stream.uniform() for _ in range(100)] == expected
+
+    stream = RandomStream(np.random.default_rng(SEED))
+    exponential = [stream.exponential(2.0) for _ in range(10000)]
+    assert abs(np.mean(exponential) / 2 - 1) < 0.05
+    poisson = [stream.poisson(0.1) for _ in range(10000)]
+    assert abs(np.mean(poisson) / 0.1 - 1) < 0.1
+    assert all(type(n) is int for n in poisson)
+    poisson = [stream.poisson(10) for _ in range(10000)]
+    assert abs(np.mean(poisson) / 10 - 1) < 0.05
+
+
+def test_RandomService():
+    service = RandomService(SEED)
+    assert service.generator("a").random() == RandomService(SEED).generator("a").random()
+    assert service.generator("a").random() != service.generator("b").random()
+    assert service.generator("a").random() != RandomService(SEED + 1).generator("a").random()
+    # the stream of an entity is independent of its generator
+    assert service.stream("a").uniform() != service.generator("a").random()
+
+
+def test_node_generators():
+    # generators of nodes created without seed depend on the timeline seed and the name, not the order of creation
+    tl1 = Timeline(seed=SEED)
+    nodes1 = [Node(name, tl1) for name in ["a", "b", "c"]]
+    tl2 = Timeline(seed=SEED)
+    nodes2 = [Node(name, tl2) for name in ["c", "b", "a"]][::-1]
+    for node1, node2 in zip(nodes1, nodes2):
+        assert node1.get_generator().random() == node2.get_generator().random()
+        assert node1.get_stream().uniform() == node2.get_stream().uniform()
+
+    # seeded nodes
+    tl = Timeline(seed=SEED + 1)
+    node = Node("a", tl, seed=SEED)
+    assert node.get_generator().random() == np.random.default_rng(SEED).random()
+    stream = node.get_stream()
+    node.set_seed(SEED)
+    assert node.get_stream() is not stream
+    assert node.get_stream().uniform() == stream.uniform()
+
+
+def run_channel(seed):
+    tl = Timeline(seed=seed)
+    sender = Node("sender", tl)
+    receiver = Receiver("receiver", tl)
+    qc = QuantumChannel("qc", tl, attenuation=0.0002, distance=10000, polarization_fidelity=0.9)
+    qc.set_ends(sender, receiver.name)
+    tl.init()
+    for i in range(1000):
+        photon = Photon(str(i), tl, encoding_type=polarization)
+        qc.transmit(photon, sender)
+        tl.time = tl.time + 1
+    tl.run()
+    return receiver.log
+
+
+def test_determinism():
+    log = run_channel(SEED)
+    assert 0 < len(log) < 1000
+    assert run_channel(SEED) == log
+    assert run_channel(SEED + 1) != log
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from sequence.components.circuit import GATE_MATRICES
+from sequence.kernel.stabilizer_tableau import StabilizerTableau
+
+SQRT_HALF = 0.5 ** 0.5
+
+
+def test_tableau_zero_state():
+    tableau = StabilizerTableau(10)
+    assert str(StabilizerTableau(2)) == "\n".join(["destabilizers:", "+XI", "+IX", "stabilizers:", "+ZI", "+IZ"])
+    expected = np.zeros(2 ** 10)
+    expected[0] = 1
+    assert np.allclose(tableau.to_ket(), expected)
+
+
+def test_tableau_gates():
+    # each gate applied to the 2-qubit state |+>|0> and compared with its matrix
+    start = np.kron([SQRT_HALF, SQRT_HALF], [1, 0])
+    for name in ['h', 'x', 'y', 'z', 's', 'sdg', 'root_iZ', 'minus_root_iZ', 'root_iY', 'minus_root_iY', 'cx', 'cz', 'swap']:
+        matrix = GATE_MATRICES[name]
+        size = int(np.log2(len(matrix)))
+        if size == 1:
+            matrix = np.kron(matrix, np.identity(2))
+        for qubits in ([0, 1], [1, 0]):
+            tableau = StabilizerTableau.from_ket(start)
+            tableau.apply_gate(name, qubits[:size])
+            if qubits == [1, 0]:
+                swap = GATE_MATRICES['swap']
+                expected = swap @ matrix @ swap @ start
+            else:
+                expected = matrix @ start
+            first = expected[np.flatnonzero(np.abs(expected) > 1e-9)[0]]
+            expected = expected * abs(first) / first
+            assert np.allclose(tableau.to_ket(), expected), name
+
+    tableau = StabilizerTableau(1)
+    tableau.apply_gate('phase', [0], np.pi / 2)
+    tableau.apply_gate('h', [0])
+    with pytest.raises(ValueError):
+        tableau.apply_gate('t', [0])
+    with pytest.raises(ValueError):
+        tableau.apply_gate('phase', [0], 0.1)
+
+
+def test_tableau_from_ket():
+    ghz = np.zeros(8, dtype=complex)
+    ghz[0] = ghz[7] = SQRT_HALF
+    assert np.allclose(StabilizerTableau.from_ket(ghz).to_ket(), ghz)
+    cluster = np.array([1, 1, 1, -1, 1j, 1j, -1j, 1j]) / 8 ** 0.5
+    assert np.allclose(StabilizerTableau.from_ket(cluster).to_ket(), cluster)
+    assert np.allclose(StabilizerTableau.from_ket(-1j * cluster).to_ket(), cluster)
+
+    with pytest.raises(ValueError):
+        StabilizerTableau.from_ket([0.6, 0.8])
+    with pytest.raises(ValueError):
+        StabilizerTableau.from_ket([SQRT_HALF, SQRT_HALF * np.exp(0.25j * np.pi)])
+    with pytest.raises(ValueError):
+        StabilizerTableau.from_ket([0.5, 0.5, 0.5, 0, 0.5])
+
+
+def test_tableau_measure():
+    # Bell pair: first result is random, second result is deterministic
+    tableau = StabilizerTableau.from_ket([SQRT_HALF, 0, 0, SQRT_HALF])
+    assert tableau.measure(0, 1) == (1, True)
+    assert tableau.num_qubits == 1
+    assert np.allclose(tableau.to_ket(), [0, 1])
+    assert tableau.measure(0, 0) == (1, False)
+    assert tableau.num_qubits == 0
+
+    # the remaining qubits keep their order
+    tableau = StabilizerTableau.from_ket(np.kron([1, 0], np.kron([SQRT_HALF, SQRT_HALF], [0, 1])))
+    assert tableau.measure(1, 0) == (0, True)
+    assert np.allclose(tableau.to_ket(), [0, 1, 0, 0])
+
+
+def test_tableau_combine():
+    ghz = np.zeros(8, dtype=complex)
+    ghz[0] = ghz[7] = SQRT_HALF
+    plus = np.array([SQRT_HALF, 1j * SQRT_HALF])
+    tableau1 = StabilizerTableau.from_ket(ghz)
+    tableau2 = StabilizerTableau.from_ket(np.kron(plus, np.kron(ghz, [0, 1])))
+    combined = tableau1.combine(tableau2)
+    assert combined.num_qubits == 8
+    assert np.allclose(combined.to_ket(), np.kron(ghz, np.kron(plus, np.kron(ghz, [0, 1]))))
+    assert np.allclose(tableau2.combine(tableau1).combine(StabilizerTableau(1)).to_ket(),
+                       np.kron(np.kron(plus, np.kron(ghz, [0, 1])), np.kron(ghz, [1, 0])))
@@ -146,3 +146,66 @@ def test_schedule():
     tl.init()
     tl.run()
     assert tl.run_counter == SCHEDULE_NUM == e1.counter
+
+
+def test_keyed_event_queue():
+    tl = Timeline(event_queue="keyed_heap")
+    dummys = [Dummy(f"{i}", tl) for i in range(3)]
+    events = [Event(10, Process(dummy, "click", [])) for dummy in dummys]
+    for event in events:
+        tl.schedule(event)
+
+    tl.remove_event(events[0])
+    tl.update_event_time(events[1], 30)
+    tl.update_event_time(events[2], 20)
+    tl.init()
+    tl.run()
+
+    assert dummys[0].click_time is None
+    assert dummys[1].click_time == 30 and dummys[2].click_time == 20
+    assert tl.run_counter == 2 and len(tl.events) == 0
+
+
+def test_run_fast():
+    tl = Timeline(stop_time=100)
+    dummys = [Dummy(f"{i}", tl) for i in range(4)]
+    events = []
+    for i, dummy in enumerate(dummys):
+        # two events share the same timestamp, one event is after stop time
+        event = Event([10, 10, 50, 200][i], Process(dummy.name, "click", []))
+        tl.schedule(event)
+        events.append(event)
+    tl.remove_event(events[1])
+
+    tl.init()
+    tl.run(fast=True)
+
+    assert dummys[0].click_time == 10 and dummys[2].click_time == 50
+    assert dummys[1].click_time is None and dummys[3].click_time is None
+    assert tl.run_counter == 2 and tl.now() == 50
+    assert len(tl.events) == 1
+
+    tl.stop_time = 300
+    tl.run(fast=True)
+    assert dummys[3].click_time == 200 and tl.run_counter == 3
+
+    # methods replaced after scheduling are called, and the run counter is updated during the run
+    counters = []
+    dummys[0].click = lambda: counters.append(tl.run_counter)
+    for time in [400, 400, 500]:
+        tl.schedule(Event(time, Process(dummys[0], "click", [])))
+    tl.stop_time = 1000
+    tl.run(fast=True)
+    assert counters == [3, 4, 5] and tl.run_counter == 6
+
+    # a handler may stop the timeline or schedule an earlier event at the current timestamp
+    order = []
+    dummys[1].click = lambda: (order.append(1), tl.schedule(Event(1100, Process(dummys[2], "click", []), priority=0)))
+    dummys[2].click = lambda: order.append(2)
+    dummys[3].click = lambda: (order.append(3), tl.stop())
+    for dummy, priority in zip(dummys[1:], [1, 2, 3]):
+        tl.schedule(Event(1100, Process(dummy, "click", []), priority=priority))
+    tl.schedule(Event(1100, Process(dummys[1], "click", []), priority=4))
+    tl.stop_time = 2000
+    tl.run(fast=True)
+    assert order == [1, 2, 2, 3] and tl.now() == 1100 and len(tl.events) == 1
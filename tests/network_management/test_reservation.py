@@ -44,6 +44,36 @@ def test_MemoryTimeCard_schedule_reservation():
             assert timecard.reservations[i - 1].end_time < r.start_time
 
 
+def test_ReservationCalendar():
+    calendar = ReservationCalendar(4)
+    r1 = Reservation("a", "b", 10, 20, 2, 0.9)
+    r2 = Reservation("a", "c", 15, 30, 2, 0.9)
+    r3 = Reservation("a", "d", 40, 50, 1, 0.9)
+    assert calendar.find_free(10, 20, 2) == [0, 1]
+    assert calendar.add(r1, [0, 1]) is True
+    assert calendar.find_free(15, 30, 2) == [2, 3]
+    assert calendar.add(r2, [1, 2]) is False
+    assert len(calendar.timecards[2].reservations) == 0 and r2 not in calendar
+    assert calendar.add(r2, [3, 2]) is True
+    assert calendar.get_memory_indices(r2) == [2, 3]
+    assert calendar.find_free(18, 25, 4) == []
+
+    # reservations added to the cards directly are indexed
+    calendar.timecards[1].add(r3)
+    assert calendar.get_memory_indices(r3) == [1]
+
+    assert calendar.remove(r1) is True
+    assert calendar.remove(r1) is False
+    assert calendar.get_memory_indices(r1) == []
+    assert calendar.find_free(10, 20, 4) == [0, 1]
+
+    assert calendar.expire(31) == 1
+    assert r2 not in calendar and len(calendar) == 1
+    assert all(len(calendar.timecards[i].reservations) == 0 for i in [0, 2, 3])
+    assert calendar.expire(50) == 0
+    assert calendar.expire(51) == 1 and len(calendar) == 0
+
+
 class FakeNode(QuantumRouter):
     def __init__(self, name, timeline, memo_size=50):
         super().__init__(name, timeline, memo_size)
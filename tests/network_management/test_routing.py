@@ -0,0 +1,72 @@
+import numpy as np
+from networkx import Graph, dijkstra_path
+
+from sequence.kernel.timeline import Timeline
+from sequence.topology.node import QuantumRouter
+from sequence.network_management.routing import RoutingTable, ForwardingTable
+
+
+def test_RoutingTable():
+    # ring a - b - c - d - a, with a shortcut a - c
+    channels = [("a", "b", 1), ("b", "c", 1), ("c", "d", 1), ("d", "a", 1.5), ("a", "c", 3)]
+    table = RoutingTable(["a", "b", "c", "d", "e"], channels)
+    assert table.get_next_hop("a", "c") == "b"
+    assert table.get_next_hop("c", "a") == "b"
+    assert table.get_next_hop("a", "d") == "d"
+    assert table.get_next_hop("a", "e") is None
+    assert table.distances[table.ids["a"], table.ids["c"]] == 2
+    assert table.get_forwarding_table("b") == {"a": "a", "c": "c", "d": "c"}
+
+    table.remove_channel("a", "b")
+    assert table.get_next_hop("a", "c") == "d"
+    assert table.get_next_hop("b", "a") == "c"
+    table.add_channel("a", "c", 1)
+    assert table.get_next_hop("a", "c") == "c"
+    table.add_channel("a", "c", 4)
+    assert table.get_next_hop("a", "c") == "d"
+    table.add_channel("d", "e", 1)
+    assert table.get_next_hop("a", "e") == "d"
+    assert table.get_next_hop("e", "b") == "d"
+    table.add_channel("a", "b", 0.5)
+    assert table.get_next_hop("d", "b") == "a"
+
+    assert table.k_shortest_paths("a", "c", 2) == [["a", "b", "c"], ["a", "d", "c"]]
+
+
+def test_RoutingTable_matches_dijkstra():
+    rng = np.random.default_rng(0)
+    names = [f"r{i}" for i in range(40)]
+    channels = []
+    for _ in range(80):
+        a, b = rng.choice(len(names), 2, replace=False)
+        channels.append((names[a], names[b], rng.random()))
+    graph = Graph()
+    graph.add_nodes_from(names)
+    graph.add_weighted_edges_from(channels)
+    table = RoutingTable(names, channels)
+
+    for src in names:
+        for dst in names:
+            if src == dst or graph.degree(src) == 0 or graph.degree(dst) == 0:
+                continue
+            if dst > src:
+                path = dijkstra_path(graph, src, dst)
+            else:
+                path = dijkstra_path(graph, dst, src)[::-1]
+            assert table.get_next_hop(src, dst) == path[1]
+
+
+def test_ForwardingTable():
+    tl = Timeline()
+    node = QuantumRouter("a", tl)
+    routing = node.network_manager.protocol_stack[0]
+    routing.add_forwarding_rule("x", "b")
+    table = RoutingTable(["a", "b", "c"], [("a", "b", 1), ("b", "c", 1)])
+    routing.set_routing_table(table)
+    assert isinstance(routing.forwarding_table, ForwardingTable)
+    assert dict(routing.forwarding_table) == {"x": "b", "b": "b", "c": "b"}
+    routing.update_forwarding_rule("c", "c")
+    assert routing.forwarding_table["c"] == "c"
+    assert len(routing.forwarding_table) == 3
+    assert "d" not in routing.forwarding_table
+    assert routing.k_shortest_paths("c", 1) == [["a", "b", "c"]]
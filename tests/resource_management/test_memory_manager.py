@@ -41,3 +41,25 @@ def test_update():
     assert manager[0].remote_memo == 0
 
 
+
+
+def test_find():
+    tl = Timeline()
+    arr = MemoryArray("memo_arr", tl, num_memories=10)
+    manager = MemoryManager(arr)
+    assert manager.find(["RAW"]) == list(manager)
+
+    for i, remote_node in [(1, "alice"), (3, "bob"), (4, "alice"), (7, "alice")]:
+        arr[i].entangled_memory = {"node_id": remote_node, "memo_id": i}
+        manager.update(arr[i], "ENTANGLED")
+    manager.update(arr[5], "OCCUPIED")
+
+    assert manager.find(["ENTANGLED"], ["alice"]) == [manager[1], manager[4], manager[7]]
+    assert manager.find(["ENTANGLED"], ["alice"], [0, 1, 7]) == [manager[1], manager[7]]
+    assert manager.find(["ENTANGLED", "OCCUPIED"]) == [manager[1], manager[3], manager[4], manager[5], manager[7]]
+    assert manager.find(["RAW"], [None]) == [manager[i] for i in [0, 2, 6, 8, 9]]
+
+    manager.update(arr[4], "RAW")
+    assert manager.find(["ENTANGLED"], ["alice"]) == [manager[1], manager[7]]
+    assert manager.find(["RAW"], ["alice"]) == []
+    assert manager.get_info_by_memory(arr[4]) is manager[4]
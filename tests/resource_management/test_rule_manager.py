@@ -2,7 +2,7 @@ from numpy import random
 from sequence.components.memory import Memory
 from sequence.kernel.timeline import Timeline
 from sequence.resource_management.memory_manager import MemoryInfo
-from sequence.resource_management.rule_manager import RuleManager, Rule
+from sequence.resource_management.rule_manager import RuleManager, Rule, RuleMatch
 
 random.seed(1)
 
@@ -96,3 +96,41 @@ def test_RuleManager_expire():
     protocol = ruleset.expire(rule)
     assert len(ruleset) == 0
     assert protocol == ["protocol"]
+
+
+def test_RuleManager_get_candidates():
+    class FakeInfo:
+        def __init__(self, index, state, remote_node):
+            self.index = index
+            self.state = state
+            self.remote_node = remote_node
+
+    rule_manager = RuleManager()
+    rules = []
+    for _ in range(100):
+        priority = random.randint(5)
+        indices = random.choice(10, 3, replace=False).tolist()
+        if random.random() < 0.2:
+            match = None
+        elif random.random() < 0.2:
+            match = RuleMatch(["ENTANGLED"], None, ["left"])
+        else:
+            match = RuleMatch(["RAW", "ENTANGLED"][:random.randint(1, 3)], indices)
+        rule = Rule(priority, None, None, None, None, match)
+        rule_manager.load(rule)
+        rules.append(rule)
+
+    def check_candidates():
+        # the candidates are the matching rules, in the order of the rule manager
+        for index in range(10):
+            for state in ["RAW", "ENTANGLED"]:
+                for remote_node in [None, "left", "right"]:
+                    info = FakeInfo(index, state, remote_node)
+                    expected = [rule for rule in rule_manager if rule.match is None or rule.match.matches(info)]
+                    assert rule_manager.get_candidates(info) == expected
+
+    check_candidates()
+    for rule in rules[::2]:
+        rule_manager.expire(rule)
+    assert len(rule_manager) == 50
+    check_candidates()
@@ -0,0 +1,111 @@
+import json
+
+import numpy as np
+import pytest
+
+from sequence.components.optical_channel import QuantumChannel
+from sequence.components.photon import Photon
+from sequence.constants import DENSITY_MATRIX_FORMALISM
+from sequence.experiment import aggregate, parameter_grid, read_results, reseed, run_sweep
+from sequence.kernel.quantum_manager import QuantumManager
+from sequence.kernel.timeline import Timeline
+from sequence.topology.node import Node
+from sequence.utils.encoding import polarization
+
+
+class Receiver(Node):
+    def __init__(self, name, tl):
+        super().__init__(name, tl)
+        self.count = 0
+
+    def receive_qubit(self, src, qubit):
+        self.count += 1
+
+
+def build():
+    tl = Timeline()
+    sender = Node("sender", tl)
+    receiver = Receiver("receiver", tl)
+    qc = QuantumChannel("qc", tl, attenuation=0.0002, distance=10000)
+    qc.set_ends(sender, receiver.name)
+    return tl
+
+
+def run(tl, params, seed):
+    if params["distance"] < 0:
+        raise ValueError("negative distance")
+    qc = tl.get_entity_by_name("qc")
+    qc.distance = params["distance"]
+    tl.init()
+    sender = tl.get_entity_by_name("sender")
+    for i in range(params["photons"]):
+        qc.transmit(Photon(str(i), tl, encoding_type=polarization), sender)
+        tl.time += 1
+    tl.run()
+    return {"received": tl.get_entity_by_name("receiver").count}
+
+
+def test_parameter_grid():
+    assert parameter_grid({"a": [1, 2], "b": ["x", "y"]}) == [{"a": 1, "b": "x"}, {"a": 1, "b": "y"},
+                                                            {"a": 2, "b": "x"}, {"a": 2, "b": "y"}]
+    assert parameter_grid([{"a": 1}, {"a": 3}]) == [{"a": 1}, {"a": 3}]
+
+
+def test_reseed():
+    tl1, tl2 = build(), build()
+    reseed(tl1, 1)
+    reseed(tl2, 1)
+    assert tl1.get_entity_by_name("sender").get_generator().random() == \
+        tl2.get_entity_by_name("sender").get_generator().random()
+    assert tl1.get_entity_by_name("qc").get_stream().uniform() == tl2.get_entity_by_name("qc").get_stream().uniform()
+    reseed(tl2, 2)
+    assert tl1.get_entity_by_name("sender").get_generator().random() != \
+        tl2.get_entity_by_name("sender").get_generator().random()
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_run_sweep(tmp_path, processes):
+    path = tmp_path / "results.jsonl"
+    grid = {"distance": [-1, 1000, 50000], "photons": [200]}
+    results = run_sweep(build, run, grid, range(3), path=path, processes=processes)
+
+    assert len(results) == 9
+    assert results["point"].tolist() == [0, 0, 0, 1, 1, 1, 2, 2, 2]
+    assert results["seed"].tolist() == [0, 1, 2] * 3
+    # failures are isolated
+    assert all("negative distance" in error for error in results["error"][:3])
+    assert results["error"][3:].isna().all()
+    assert results["received"][:3].isna().all()
+    # replicas are reproducible and independent
+    received = results["received"][3:].tolist()
+    assert received == run_sweep(build, run, grid, range(3), processes=1)["received"][3:].tolist()
+    assert len(set(received[:3])) > 1
+    assert np.mean(received[:3]) > np.mean(received[3:])
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 9
+    assert {json.loads(line)["seed"] for line in lines} == {0, 1, 2}
+    stored = read_results(path).sort_values(["point", "seed"], ignore_index=True)
+    assert stored["received"][3:].tolist() == received
+
+    summary = aggregate(results)
+    assert summary["distance"].tolist() == [-1, 1000, 50000]
+    assert summary["replicas"].tolist() == [0, 3, 3]
+    assert summary["failures"].tolist() == [3, 0, 0]
+    assert np.isnan(summary["received_mean"][0])
+    assert summary["received_mean"][1] == pytest.approx(np.mean(received[:3]))
+    assert summary["received_ci"][1] > 0
+
+
+def run_formalism(tl, params, seed):
+    return {"density": int(QuantumManager.get_active_formalism() == DENSITY_MATRIX_FORMALISM)}
+
+
+def test_run_sweep_spawn_formalism():
+    QuantumManager.set_global_manager_formalism(DENSITY_MATRIX_FORMALISM)
+    try:
+        results = run_sweep(build, run_formalism, [{}], [0, 1], processes=2, start_method="spawn")
+    finally:
+        QuantumManager.clear_active_formalism()
+    assert results["error"].isna().all()
+    assert results["density"].tolist() == [1, 1]
@@ -1,3 +1,5 @@
+import json
+
 from sequence.topology.router_net_topo import RouterNetTopo
 from sequence.kernel.timeline import Timeline
 
@@ -69,3 +71,61 @@ def test_sequential_simulation():
     for r in topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER):
         assert len(r.network_manager.protocol_stack[0].forwarding_table) > 0
 
+
+
+def test_parallel_partition(tmp_path):
+    from sequence.kernel.parallel_timeline import ParallelTimeline
+
+    with open("tests/topology/router_net_topo_sample_config.json") as fh:
+        config = json.load(fh)
+    config[RouterNetTopo.PROC_NUM] = 2
+    config_file = tmp_path / "parallel_config.json"
+    with open(config_file, "w") as fh:
+        json.dump(config, fh)
+
+    topos = [RouterNetTopo(str(config_file), partition_id=i) for i in range(2)]
+    local_names = []
+    for i, topo in enumerate(topos):
+        tl = topo.get_timeline()
+        assert isinstance(tl, ParallelTimeline)
+        assert tl.partition_id == i and tl.num_partitions == 2
+        names = [node.name for nodes in topo.get_nodes().values() for node in nodes]
+        assert all(topo.groups[name] == i for name in names)
+        assert all(topo.groups[name] != i for name in tl.foreign_entities)
+        local_names += names
+
+    # every node is generated by exactly one partition
+    assert sorted(local_names) == sorted(topos[0].groups)
+    # routers connected through a BSM node share a partition
+    assert topos[0].groups["e1"] == topos[0].groups["e2"] == topos[0].groups["bsm0"]
+    assert topos[0].groups["e3"] == topos[0].groups["e4"]
+
+
+def test_ndjson_config(tmp_path):
+    from io import StringIO
+    from sequence.topology.topology import load_config
+
+    with open("tests/topology/router_net_topo_sample_config.json") as fh:
+        config = json.load(fh)
+
+    # one line per list item, other fields on the first line
+    lines = [json.dumps({key: value for key, value in config.items() if key not in RouterNetTopo.LIST_FIELDS})]
+    for key in RouterNetTopo.LIST_FIELDS:
+        for item in config.get(key, []):
+            lines.append(json.dumps({key: item}))
+    config_file = tmp_path / "config.jsonl"
+    config_file.write_text("\n".join(lines) + "\n")
+
+    assert load_config(str(config_file)) == config
+    assert load_config(StringIO("\n".join(lines))) == config
+    assert load_config(StringIO(json.dumps(config, indent=4))) == config
+
+    topo = RouterNetTopo(str(config_file))
+    expected = RouterNetTopo("tests/topology/router_net_topo_sample_config.json")
+    for node_type, nodes in expected.get_nodes().items():
+        assert [n.name for n in topo.get_nodes_by_type(node_type)] == [n.name for n in nodes]
+    assert sorted(cc.name for cc in topo.get_cchannels()) == sorted(cc.name for cc in expected.get_cchannels())
+    assert [qc.name for qc in topo.get_qchannels()] == [qc.name for qc in expected.get_qchannels()]
+    assert list(topo.load_times) == ["load_config", "get_templates", "add_qconnections", "add_timeline",
+                                     "map_bsm_routers", "add_nodes", "add_bsm_node_to_router", "add_qchannels",
+                                     "add_cchannels", "add_cconnections", "generate_forwarding_table"]
@@ -0,0 +1,34 @@
+import numpy as np
+
+from sequence.utils.exact_time import time_to_timebin, timebin_to_time, round_to_resolution, period_ceil, \
+    _mpfr_time_to_timebin, _mpfr_timebin_to_time, _mpfr_round_to_resolution, _mpfr_period_ceil
+
+
+def test_time_to_timebin():
+    rng = np.random.default_rng(0)
+    frequencies = [1e12, 8e7, 3e9, 1e9 / 3, 2.5e8, 7919.0, 1e6 + 0.1]
+    for frequency in frequencies:
+        period = 1e12 / frequency
+        for time_bin in range(200):
+            for time in [int(time_bin * period) + offset for offset in (-1, 0, 1)]:
+                if time >= 0:
+                    assert time_to_timebin(time, frequency) == _mpfr_time_to_timebin(time, frequency)
+            assert timebin_to_time(time_bin, frequency) == _mpfr_timebin_to_time(time_bin, frequency)
+        for time in rng.integers(0, 10 ** 18, 200):
+            time = int(time)
+            assert time_to_timebin(time, frequency) == _mpfr_time_to_timebin(time, frequency)
+        for time_bin in rng.integers(0, 10 ** 9, 200):
+            time_bin = int(time_bin)
+            assert timebin_to_time(time_bin, frequency) == _mpfr_timebin_to_time(time_bin, frequency)
+    # numpy scalars and float times
+    assert time_to_timebin(np.int64(1000), np.float64(3e9)) == 3
+    assert time_to_timebin(1000.5, 3e9) == _mpfr_time_to_timebin(1000.5, 3e9)
+
+
+def test_round_to_resolution():
+    rng = np.random.default_rng(1)
+    for resolution in [1, 2, 3, 150, 1e3 / 7]:
+        for time in list(range(0, 1000)) + [int(t) for t in rng.integers(0, 10 ** 18, 500)]:
+            assert round_to_resolution(time, resolution) == _mpfr_round_to_resolution(time, resolution)
+    for count_rate in [25e6, 3e7, 7919.0, 1e12, 6.5e11, 1e9 / 3]:
+        assert period_ceil(count_rate) == _mpfr_period_ceil(count_rate)
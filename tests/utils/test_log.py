@@ -34,6 +34,15 @@ def test_track_module():
         assert mod in lg._log_modules
 
 
+def test_is_tracked():
+    lg.set_logger_level("INFO")
+    lg.track_module("test4")
+    assert lg.is_tracked("test4")
+    assert not lg.is_tracked("test4", logging.DEBUG)
+    assert not lg.is_tracked("test5")
+    lg.remove_module("test4")
+
+
 def test_log():
     open(filename, 'w').close()
 
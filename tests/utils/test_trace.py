@@ -0,0 +1,97 @@
+from enum import Enum, auto
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sequence.components.optical_channel import ClassicalChannel
+from sequence.kernel.timeline import Timeline
+from sequence.message import Message
+from sequence.topology.node import Node
+from sequence.utils import log, trace
+from sequence.utils.trace import TraceRecorder, read_trace
+
+
+class DummyMsgType(Enum):
+    TEST = auto()
+
+
+@pytest.fixture
+def tracked_modules():
+    modules = list(log._log_modules)
+    yield
+    log._log_modules[:] = modules
+    trace.stop_trace()
+
+
+def test_TraceRecorder_ring():
+    tl = Timeline()
+    recorder = TraceRecorder(tl, capacity=4)
+    for i in range(6):
+        tl.time = i
+        recorder.record("a" if i % 2 else "b", "kind", "c", i / 2)
+
+    records = recorder.records()
+    assert recorder.num_records == 6
+    assert records["time"].tolist() == [2, 3, 4, 5]
+    assert records["value"].tolist() == [1, 1.5, 2, 2.5]
+
+    df = recorder.to_dataframe()
+    assert df["entity"].tolist() == ["b", "a", "b", "a"]
+    assert df["peer"].tolist() == ["c"] * 4
+    assert df["kind"].tolist() == ["kind"] * 4
+
+
+def test_TraceRecorder_file(tmp_path):
+    path = str(tmp_path / "trace.npz")
+    tl = Timeline()
+    recorder = TraceRecorder(tl, path, capacity=3)
+    for i in range(7):
+        tl.time = i * 10
+        recorder.record(f"e{i % 3}", "send" if i % 2 else "receive", None if i == 0 else "e0", i)
+    assert recorder.num_chunks == 2
+    recorder.close()
+    assert recorder.num_chunks == 3
+
+    # columns are stored as arrays of an npz archive
+    with np.load(path) as data:
+        assert data["time_000002"].tolist() == [60]
+        assert data["entities"].tolist() == ["e0", "e1", "e2"]
+
+    df = read_trace(path)
+    assert df["time"].tolist() == [i * 10 for i in range(7)]
+    assert df["entity"].tolist() == [f"e{i % 3}" for i in range(7)]
+    assert df["kind"].tolist() == ["send" if i % 2 else "receive" for i in range(7)]
+    assert pd.isna(df["peer"][0]) and df["peer"][1:].tolist() == ["e0"] * 6
+    assert df["value"].tolist() == list(range(7))
+
+
+def test_trace_modules(tmp_path, tracked_modules):
+    path = str(tmp_path / "trace.npz")
+    tl = Timeline()
+    n1 = Node("n1", tl)
+    n2 = Node("n2", tl)
+    cc = ClassicalChannel("cc", tl, 1e3, delay=1000)
+    cc.set_ends(n1, n2.name)
+
+    # modules are not tracked
+    recorder = trace.start_trace(tl, path)
+    n1.send_message("n2", Message(DummyMsgType.TEST, None))
+    tl.run()
+    assert recorder.num_records == 0
+
+    log.track_module("node")
+    log.track_module("optical_channel")
+    assert trace.is_traced("node") and not trace.is_traced("memory")
+    start = tl.now()
+    n1.send_message("n2", Message(DummyMsgType.TEST, None))
+    tl.run()
+    trace.stop_trace()
+    assert trace.recorder is None
+
+    df = read_trace(path)
+    assert df["kind"].tolist() == ["send_message", "transmit_message", "receive_message"]
+    assert df["entity"].tolist() == ["n1", "cc", "n2"]
+    assert df["peer"].tolist() == ["n2", "n2", "n1"]
+    assert df["time"].tolist() == [start, start, start + 1000]
+    assert df["value"][1] == 1000
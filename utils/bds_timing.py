@@ -0,0 +1,107 @@
+"""Benchmark of the Bell diagonal state table against per-pair state objects.
+
+A round of `n` pairs decoheres the memories of all pairs (both qubits), then updates the states of all pairs,
+as done by entanglement purification with the BDS formalism.
+    - objects: the previous implementation, where each pair is a `BellDiagonalState` stored in a dictionary,
+      and each memory builds the transform matrix of its Pauli channel.
+    - table: `QuantumManagerBellDiagonal`, where the states are rows of a table,
+      decohered by a single `decohere` call and updated in place by `set`.
+The net number of memory blocks allocated by a round (blocks still allocated after the round) is counted with `tracemalloc`.
+
+Usage:
+    python utils/bds_timing.py [num_rounds]
+"""
+
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from sequence.kernel.quantum_manager import QuantumManagerBellDiagonal
+from sequence.kernel.quantum_state import BellDiagonalState
+
+
+RATES = [10.0, 20.0, 30.0]
+STATE = [0.9, 0.05, 0.03, 0.02]
+ROUND_TIME = 10 ** 8  # 100 us between rounds
+
+
+def pauli_errors(x_rate, y_rate, z_rate, t):
+    a, b, c = np.exp(-2 * (x_rate + y_rate) * t), np.exp(-2 * (x_rate + z_rate) * t), np.exp(-2 * (z_rate + y_rate) * t)
+    return (1 + a + b + c) / 4, (1 - a - b + c) / 4, (1 - a + b - c) / 4, (1 + a - b - c) / 4
+
+
+class ObjectStates:
+    """Previous implementation: one state object per pair, one transform matrix per memory."""
+
+    def __init__(self, num_pairs: int):
+        self.states = {}
+        self.last_update = {}
+        for key in range(0, 2 * num_pairs, 2):
+            self.set([key, key + 1], STATE)
+            self.last_update[key] = self.last_update[key + 1] = 1
+
+    def set(self, keys, diag_elems):
+        state = BellDiagonalState(diag_elems, keys)
+        for key in keys:
+            self.states[key] = state
+
+    def run_round(self, now: int):
+        for key in self.states:
+            t = (now - self.last_update[key]) * 1e-12
+            p_i, p_x, p_y, p_z = pauli_errors(*RATES, t)
+            transform_mtx = np.array([[p_i, p_z, p_x, p_y],
+                                      [p_z, p_i, p_y, p_x],
+                                      [p_x, p_y, p_i, p_z],
+                                      [p_y, p_x, p_z, p_i]])
+            state = self.states[key]
+            self.set(state.keys, transform_mtx @ state.state)
+            self.last_update[key] = now
+        for key in range(0, len(self.states), 2):
+            self.set([key, key + 1], STATE)
+
+
+class TableStates:
+    """Bell diagonal quantum manager: batched decoherence and in-place updates."""
+
+    def __init__(self, num_pairs: int):
+        self.qm = QuantumManagerBellDiagonal()
+        self.keys = [self.qm.new() for _ in range(2 * num_pairs)]
+        for key in self.keys:
+            self.qm.set_decoherence_rates(key, RATES)
+            self.qm.set_last_update(key, 1)
+        for key in range(0, 2 * num_pairs, 2):
+            self.qm.set([key, key + 1], STATE)
+
+    def run_round(self, now: int):
+        self.qm.decohere(self.keys, now)
+        for key in range(0, len(self.keys), 2):
+            self.qm.set([key, key + 1], STATE)
+
+
+def measure(states, num_rounds: int) -> tuple[float, float]:
+    states.run_round(ROUND_TIME)  # warm-up
+    tick = time.perf_counter()
+    for i in range(num_rounds):
+        states.run_round((i + 2) * ROUND_TIME)
+    elapsed = (time.perf_counter() - tick) / num_rounds
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    states.run_round((num_rounds + 2) * ROUND_TIME)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "lineno") if stat.count_diff > 0)
+    return elapsed, blocks
+
+
+if __name__ == "__main__":
+    num_rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print("time per round (ms) and net memory blocks allocated by one round")
+    print(f"{'pairs':>6} {'objects':>10} {'table':>10} {'obj blocks':>11} {'tab blocks':>11}")
+    for num_pairs in [10, 100, 1000, 10000]:
+        object_time, object_blocks = measure(ObjectStates(num_pairs), num_rounds)
+        table_time, table_blocks = measure(TableStates(num_pairs), num_rounds)
+        print(f"{num_pairs:>6} {object_time * 1e3:>10.3f} {table_time * 1e3:>10.3f} {object_blocks:>11} {table_blocks:>11}")
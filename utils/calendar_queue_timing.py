@@ -0,0 +1,134 @@
+"""Benchmark of the calendar event queue against the heap-based event queues.
+
+Three workloads are measured for each event queue implementation:
+    - hold: classic hold model, where each popped event is pushed back one pulse period later (queue operations only).
+    - qkd: the BB84 setup of `example/qkd/bb84_logging.py` (80 MHz light source, logging disabled).
+    - starlight: the `example/starlight/starlight.json` network with `RandomRequestApp` on every router.
+
+Usage:
+    python utils/calendar_queue_timing.py [qkd_stop_time] [starlight_stop_time]
+"""
+
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+from sequence.app.random_request import RandomRequestApp
+from sequence.components.optical_channel import QuantumChannel, ClassicalChannel
+from sequence.constants import CALENDAR_EVENT_QUEUE, HEAP_EVENT_QUEUE, KEYED_HEAP_EVENT_QUEUE
+from sequence.kernel.event import Event
+from sequence.kernel.eventlist import EventList
+from sequence.kernel.process import Process
+from sequence.kernel.timeline import Timeline
+from sequence.qkd.BB84 import pair_bb84_protocols
+from sequence.topology.node import QKDNode
+from sequence.topology.router_net_topo import RouterNetTopo
+
+
+EVENT_QUEUES = [HEAP_EVENT_QUEUE, KEYED_HEAP_EVENT_QUEUE, CALENDAR_EVENT_QUEUE]
+STARLIGHT_CONFIG = os.path.join(os.path.dirname(__file__), "..", "example", "starlight", "starlight.json")
+
+
+def hold(event_queue: str, num_events: int = 10000, num_ops: int = 300000, period: int = 12500) -> tuple[float, int]:
+    events = EventList.create(event_queue)
+    process = Process(None, "hold", [])
+    for i in range(num_events):
+        events.push(Event(i * period // num_events, process))
+
+    tick = time.perf_counter()
+    for _ in range(num_ops):
+        event = events.pop()
+        event.time += period
+        events.push(event)
+    return time.perf_counter() - tick, num_ops
+
+
+def qkd_timeline(event_queue: str, stop_time: int) -> Timeline:
+    distance = 1e3
+    tl = Timeline(stop_time, event_queue=event_queue)
+
+    qc0 = QuantumChannel("qc0", tl, distance=distance, polarization_fidelity=0.97, attenuation=0.0002)
+    qc1 = QuantumChannel("qc1", tl, distance=distance, polarization_fidelity=0.97, attenuation=0.0002)
+    cc0 = ClassicalChannel("cc0", tl, distance=distance)
+    cc1 = ClassicalChannel("cc1", tl, distance=distance)
+    cc0.delay += 1e9
+    cc1.delay += 1e9
+
+    alice = QKDNode("alice", tl, stack_size=1)
+    alice.set_seed(0)
+    alice.update_lightsource_params("frequency", 80e6)
+    alice.update_lightsource_params("mean_photon_num", 0.1)
+
+    bob = QKDNode("bob", tl, stack_size=1)
+    bob.set_seed(1)
+    for i in range(2):
+        for name, param in {"efficiency": 0.8, "dark_count": 10, "time_resolution": 10, "count_rate": 50e6}.items():
+            bob.update_detector_params(i, name, param)
+
+    qc0.set_ends(alice, bob.name)
+    qc1.set_ends(bob, alice.name)
+    cc0.set_ends(alice, bob.name)
+    cc1.set_ends(bob, alice.name)
+
+    pair_bb84_protocols(alice.protocol_stack[0], bob.protocol_stack[0])
+    tl.schedule(Event(0, Process(alice.protocol_stack[0], "push", [256, math.inf, 6e12])))
+    return tl
+
+
+def starlight_timeline(event_queue: str, stop_time: int) -> Timeline:
+    with open(STARLIGHT_CONFIG) as fh:
+        config = json.load(fh)
+    config[RouterNetTopo.STOP_TIME] = stop_time
+    config[RouterNetTopo.EVENT_QUEUE] = event_queue
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as fh:
+        json.dump(config, fh)
+    try:
+        topo = RouterNetTopo(fh.name)
+    finally:
+        os.remove(fh.name)
+
+    tl = topo.get_timeline()
+    routers = topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER)
+    for node in routers:
+        memory_array = node.get_components_by_type("MemoryArray")[0]
+        memory_array.update_memory_params("frequency", 2e3)
+        memory_array.update_memory_params("coherence_time", 1.3)
+    for qc in topo.get_qchannels():
+        qc.frequency = 1e11
+
+    router_names = [node.name for node in routers]
+    for i, node in enumerate(routers):
+        others = [name for name in router_names if name != node.name]
+        app = RandomRequestApp(node, others, i, min_dur=1e13, max_dur=2e13, min_size=10,
+                               max_size=25, min_fidelity=0.8, max_fidelity=1.0)
+        app.start()
+    return tl
+
+
+def run(tl: Timeline) -> tuple[float, int]:
+    tl.init()
+    tick = time.perf_counter()
+    tl.run()
+    return time.perf_counter() - tick, tl.run_counter
+
+
+if __name__ == "__main__":
+    qkd_stop_time = float(sys.argv[1]) if len(sys.argv) > 1 else 2e10
+    starlight_stop_time = float(sys.argv[2]) if len(sys.argv) > 2 else 2e12
+
+    for num_events in [10 ** 3, 10 ** 5, 10 ** 6]:
+        print(f"hold ({num_events} pending events, queue operations only)")
+        for event_queue in EVENT_QUEUES:
+            elapsed, executed = hold(event_queue, num_events)
+            print(f"    {event_queue:>12}: {executed} pop/push in {elapsed:.3f} s, {executed / elapsed:,.0f} ops/s")
+
+    for workload, builder, stop_time in [("qkd", qkd_timeline, qkd_stop_time),
+                                         ("starlight", starlight_timeline, starlight_stop_time)]:
+        print(f"{workload} (stop time {stop_time:.0e} ps)")
+        for event_queue in EVENT_QUEUES:
+            elapsed, executed = run(builder(event_queue, stop_time))
+            print(f"    {event_queue:>12}: {executed} events in {elapsed:.3f} s, {executed / elapsed:,.0f} events/s")
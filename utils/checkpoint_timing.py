@@ -0,0 +1,90 @@
+"""Benchmark of warm-start parameter sweeps with checkpoints, on the `example/starlight` network.
+
+For each swapping success probability of the sweep, the network is simulated for `warmup` seconds
+(entanglement generation with the random requests of the example), then for `measure` more seconds
+with the swapping success probability of the sweep.
+    - cold: the network is built, initialized and warmed up again for every value.
+    - warm: the network is warmed up once and saved with `Timeline.checkpoint`, then restored for every value.
+The total wall time of the sweep, the time to save and restore the checkpoint and its size are reported,
+and the results of both sweeps are checked to be identical.
+
+Usage:
+    python utils/checkpoint_timing.py [warmup] [measure] [num_values]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from sequence.app.random_request import RandomRequestApp
+from sequence.constants import SECOND
+from sequence.kernel.timeline import Timeline
+from sequence.topology.router_net_topo import RouterNetTopo
+
+
+CONFIG = os.path.join(os.path.dirname(__file__), "..", "example", "starlight", "starlight.json")
+
+
+def warm_up(warmup: float) -> Timeline:
+    """Builds the network of the starlight example and runs its first `warmup` seconds."""
+    topo = RouterNetTopo(CONFIG)
+    tl = topo.get_timeline()
+    routers = topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER)
+    router_names = [node.name for node in routers]
+    for i, node in enumerate(routers):
+        others = [name for name in router_names if name != node.name]
+        app = RandomRequestApp(node, others, i, min_dur=1e13, max_dur=2e13, min_size=10, max_size=25,
+                               min_fidelity=0.8, max_fidelity=1.0)
+        app.start()
+    tl.init()
+    tl.stop_time = int(warmup * SECOND)
+    tl.run()
+    return tl
+
+
+def measure(tl: Timeline, success_rate: float, duration: float) -> list:
+    """Sets the swapping success probability of the routers and runs the network for `duration` more seconds."""
+    routers = [entity for entity in tl.entities.values() if hasattr(entity, "network_manager")]
+    for node in routers:
+        node.network_manager.protocol_stack[1].set_swapping_success_rate(success_rate)
+    tl.stop_time = tl.now() + int(duration * SECOND)
+    tl.run()
+    return [(node.name, node.app.reserves, node.app.get_all_throughput()) for node in routers]
+
+
+if __name__ == "__main__":
+    warmup = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 1
+    num_values = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    success_rates = np.linspace(0.5, 1, num_values)
+
+    tick = time.perf_counter()
+    cold = [measure(warm_up(warmup), rate, duration) for rate in success_rates]
+    cold_time = time.perf_counter() - tick
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "starlight.ckpt")
+        tick = time.perf_counter()
+        tl = warm_up(warmup)
+        warmup_time = time.perf_counter() - tick
+        tl.checkpoint(path)
+        save_time = time.perf_counter() - tick - warmup_time
+        size = os.path.getsize(path)
+
+        restore_times = []
+        warm = []
+        for rate in success_rates:
+            restore_tick = time.perf_counter()
+            restored = Timeline.restore(path)
+            restore_times.append(time.perf_counter() - restore_tick)
+            warm.append(measure(restored, rate, duration))
+        warm_time = time.perf_counter() - tick
+
+    print(f"starlight: {warmup:g} s warm-up, {duration:g} s per value, {num_values} values")
+    print(f"warm-up: {warmup_time:.3f} s, checkpoint: {save_time:.3f} s ({size / 1e6:.2f} MB), "
+          f"restore: {np.mean(restore_times):.3f} s")
+    print(f"cold sweep: {cold_time:.2f} s, warm sweep: {warm_time:.2f} s, speedup: {cold_time / warm_time:.2f}")
+    print(f"identical results: {cold == warm}")
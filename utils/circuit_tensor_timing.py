@@ -0,0 +1,91 @@
+"""Benchmark of `run_circuit` with tensor contraction against padded circuit matrices.
+
+A state of `n` qubits (2 to 14) is prepared, and a 1-qubit gate and a 2-qubit gate are applied
+to the last qubits of the state (so that qubits must be reordered).
+    - padded: the previous implementation, where the circuit matrix is padded with `kron(circ_mat, identity(2 ** diff))`
+      and multiplied by a swap matrix built with qutip.
+    - tensor: `QuantumManager.run_circuit`, which contracts the circuit matrix with the target qubits only.
+The padded implementation is only timed up to `MAX_PADDED_QUBITS` qubits (its matrices have `4^n` elements).
+
+Usage:
+    python utils/circuit_tensor_timing.py [max_ket_qubits] [max_density_qubits]
+"""
+
+import sys
+import time
+
+import numpy as np
+from qutip_qip.circuit import QubitCircuit
+from qutip_qip.operations import gate_sequence_product, Gate
+
+from sequence.components.circuit import Circuit
+from sequence.kernel.quantum_manager import QuantumManagerKet, QuantumManagerDensity
+
+
+NUM_TRIALS = 5
+MAX_PADDED_QUBITS = {"ket": 11, "density": 9}
+
+
+def padded_run(qm, circuit: Circuit, keys: list[int]) -> np.ndarray:
+    """Previous implementation of `run_circuit` (without measurement), returning the output state."""
+
+    state = qm.states[keys[0]]
+    all_keys = list(state.keys)
+    circ_mat = circuit.get_unitary_matrix()
+    if circuit.size < len(all_keys):
+        circ_mat = np.kron(circ_mat, np.identity(2 ** (len(all_keys) - circuit.size)))
+    swap_circuit = QubitCircuit(N=len(all_keys))
+    for i, key in enumerate(keys):
+        j = all_keys.index(key)
+        if j != i:
+            swap_circuit.add_gate(Gate("SWAP", targets=[i, j]))
+            all_keys[i], all_keys[j] = all_keys[j], all_keys[i]
+    circ_mat = circ_mat @ gate_sequence_product(swap_circuit.propagators()).full()
+    if isinstance(qm, QuantumManagerKet):
+        return circ_mat @ state.state
+    return circ_mat @ state.state @ circ_mat.conj().T
+
+
+def prepare(qm_class, num_qubits: int):
+    qm = qm_class()
+    keys = [qm.new() for _ in range(num_qubits)]
+    rng = np.random.default_rng(num_qubits)
+    ket = rng.normal(size=2 ** num_qubits) + 1j * rng.normal(size=2 ** num_qubits)
+    qm.set(keys, ket / np.linalg.norm(ket))
+    return qm, keys
+
+
+def best_time(func) -> float:
+    times = []
+    for _ in range(NUM_TRIALS):
+        tick = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - tick)
+    return min(times)
+
+
+if __name__ == "__main__":
+    max_qubits = {"ket": int(sys.argv[1]) if len(sys.argv) > 1 else 14,
+                  "density": int(sys.argv[2]) if len(sys.argv) > 2 else 10}
+
+    gates = {}
+    gates[1] = Circuit(1)
+    gates[1].h(0)
+    gates[2] = Circuit(2)
+    gates[2].cx(0, 1)
+
+    for name, qm_class in [("ket", QuantumManagerKet), ("density", QuantumManagerDensity)]:
+        print(f"{name}: time (ms) of a 1-qubit and a 2-qubit gate on the last qubits of an n-qubit state")
+        print(f"{'n':>4} {'padded 1q':>10} {'tensor 1q':>10} {'padded 2q':>10} {'tensor 2q':>10}")
+        for num_qubits in range(2, max_qubits[name] + 1):
+            row = []
+            for size in [1, 2]:
+                circuit = gates[size]
+                qm, keys = prepare(qm_class, num_qubits)
+                targets = keys[-size:][::-1]
+                if num_qubits <= MAX_PADDED_QUBITS[name]:
+                    row.append(best_time(lambda: padded_run(qm, circuit, targets)))
+                else:
+                    row.append(None)
+                row.append(best_time(lambda: qm.run_circuit(circuit, targets)))
+            print(f"{num_qubits:>4} " + " ".join(f"{t * 1e3:>10.3f}" if t is not None else f"{'-':>10}" for t in row))
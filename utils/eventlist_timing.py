@@ -0,0 +1,77 @@
+"""Benchmark of Timeline event queue implementations.
+
+The workload mimics memories whose expiration events are postponed every time the memory is touched:
+each `Worker` keeps a far-future expiration event and, on every activation, reschedules itself and
+either postpones (`Timeline.update_event_time`) or cancels and replaces (`Timeline.remove_event`) its expiration.
+
+Usage:
+    python utils/eventlist_timing.py [num_workers] [stop_time]
+"""
+
+import sys
+import time
+
+from numpy import random
+
+from sequence.constants import HEAP_EVENT_QUEUE, KEYED_HEAP_EVENT_QUEUE
+from sequence.kernel.entity import Entity
+from sequence.kernel.event import Event
+from sequence.kernel.process import Process
+from sequence.kernel.timeline import Timeline
+
+
+EXPIRE_TIME = 10 ** 9
+PERIOD = 1000
+
+
+class Worker(Entity):
+    def __init__(self, name, timeline, rng):
+        super().__init__(name, timeline)
+        self.rng = rng
+        self.expiration_event = None
+
+    def init(self):
+        self.schedule_expire()
+        self.schedule_work(self.rng.integers(PERIOD))
+
+    def schedule_work(self, delay):
+        process = Process(self, "work", [])
+        self.timeline.schedule(Event(self.timeline.now() + delay, process))
+
+    def schedule_expire(self):
+        process = Process(self, "expire", [])
+        self.expiration_event = Event(self.timeline.now() + EXPIRE_TIME, process)
+        self.timeline.schedule(self.expiration_event)
+
+    def work(self):
+        if self.rng.random() < 0.5:
+            self.timeline.update_event_time(self.expiration_event, self.timeline.now() + EXPIRE_TIME)
+        else:
+            self.timeline.remove_event(self.expiration_event)
+            self.schedule_expire()
+        self.schedule_work(PERIOD)
+
+    def expire(self):
+        pass
+
+
+def run(event_queue: str, num_workers: int, stop_time: int) -> tuple[float, int]:
+    tl = Timeline(stop_time, event_queue=event_queue)
+    for i in range(num_workers):
+        Worker(f"worker_{i}", tl, random.default_rng(i))
+    tl.init()
+
+    tick = time.perf_counter()
+    tl.run()
+    elapsed = time.perf_counter() - tick
+    return elapsed, tl.run_counter
+
+
+if __name__ == "__main__":
+    num_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    stop_time = int(sys.argv[2]) if len(sys.argv) > 2 else 100 * PERIOD
+
+    print(f"workers: {num_workers}, stop time: {stop_time} ps")
+    for event_queue in [HEAP_EVENT_QUEUE, KEYED_HEAP_EVENT_QUEUE]:
+        elapsed, executed = run(event_queue, num_workers, stop_time)
+        print(f"{event_queue:>12}: {executed} events in {elapsed:.3f} s, {executed / elapsed:,.0f} events/s")
@@ -0,0 +1,77 @@
+"""Benchmark of a parameter sweep with `sequence.experiment.run_sweep`, on the `example/starlight` network.
+
+Each point of the sweep sets the swapping success probability of the routers and simulates `duration` seconds
+of the random requests of the example, for each of `num_seeds` seeds.
+The sweep is run in the calling process (1 process) and in a pool of one worker process per CPU.
+The wall time, runs/s and CPU utilization (CPU time over wall time and number of processes) are reported,
+and the results of both sweeps are checked to be identical.
+
+Usage:
+    python utils/experiment_timing.py [num_points] [num_seeds] [duration]
+"""
+
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+from sequence.app.random_request import RandomRequestApp
+from sequence.constants import SECOND
+from sequence.experiment import aggregate, app_metrics, run_sweep
+from sequence.topology.router_net_topo import RouterNetTopo
+
+
+CONFIG = os.path.join(os.path.dirname(__file__), "..", "example", "starlight", "starlight.json")
+
+
+def build() -> RouterNetTopo:
+    topo = RouterNetTopo(CONFIG)
+    routers = topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER)
+    router_names = [node.name for node in routers]
+    for i, node in enumerate(routers):
+        others = [name for name in router_names if name != node.name]
+        RandomRequestApp(node, others, i, min_dur=1e13, max_dur=2e13, min_size=10, max_size=25,
+                         min_fidelity=0.8, max_fidelity=1.0)
+    return topo
+
+
+def run(topo: RouterNetTopo, params: dict, seed: int) -> dict:
+    tl = topo.get_timeline()
+    for node in topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER):
+        node.network_manager.protocol_stack[1].set_swapping_success_rate(params["success_rate"])
+        node.app.start()
+    tl.init()
+    tl.stop_time = int(params["duration"] * SECOND)
+    tl.run()
+    return app_metrics(tl)
+
+
+def cpu_time(who: int) -> float:
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+if __name__ == "__main__":
+    num_points = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    num_seeds = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 1.5
+    grid = {"success_rate": np.linspace(0.5, 1, num_points).tolist(), "duration": [duration]}
+    num_runs = num_points * num_seeds
+
+    print(f"starlight: {num_points} points x {num_seeds} seeds, {duration:g} s per run")
+    print(f"{'processes':>10} {'wall (s)':>10} {'runs/s':>10} {'CPU util':>10}")
+    results = []
+    for processes in [1, os.cpu_count()]:
+        cpu = cpu_time(resource.RUSAGE_SELF) + cpu_time(resource.RUSAGE_CHILDREN)
+        tick = time.perf_counter()
+        results.append(run_sweep(build, run, grid, range(num_seeds), processes=processes))
+        wall = time.perf_counter() - tick
+        cpu = cpu_time(resource.RUSAGE_SELF) + cpu_time(resource.RUSAGE_CHILDREN) - cpu
+        print(f"{processes:>10} {wall:>10.2f} {num_runs / wall:>10.1f} {cpu / wall / processes:>10.0%}")
+
+    first, last = results
+    metrics = ["reservations", "throughput", "wait_time"]
+    print(f"identical results: {first[metrics].equals(last[metrics])}, failures: {last['error'].notna().sum()}")
+    print(aggregate(last)[["success_rate", "replicas", "reservations_mean", "reservations_ci"]].head())
@@ -0,0 +1,83 @@
+"""Benchmark of `fiberQuantumChannel` with entangled photon pairs of varying bandwidth.
+
+An `SpdcSourceNode` sends signal and idler photons through two 10 km fiber channels
+(elliptical, bent and twisted fiber) to two receivers, for bandwidths of the SPDC source from 0 to 5 nm.
+    - init: time to initialize the timeline, with the fiber optics cache cleared (cold)
+      and after changing the temperature of the fiber to a value already evaluated (warm).
+    - pairs: number of photon pairs per second of wall time emitted, transmitted and received.
+
+Usage:
+    python utils/fiber_channel_timing.py [num_pulses]
+"""
+
+import sys
+import time
+
+from sequence.components.fiber_quantum_channel import fiberQuantumChannel, FiberSpec, _fiber_optics
+from sequence.kernel.timeline import Timeline
+from sequence.topology.node import Node
+from sequence.topology.optical_nodes import SpdcSourceNode
+
+
+BANDWIDTHS = [0, 0.1, 1, 5]
+DISTANCE = 10e3
+
+
+class Receiver(Node):
+    def __init__(self, name, timeline):
+        super().__init__(name, timeline)
+        self.counter = 0
+
+    def receive_qubit(self, src, qubit):
+        self.counter += 1
+
+
+def build(bandwidth: float) -> tuple[Timeline, SpdcSourceNode, list[fiberQuantumChannel]]:
+    tl = Timeline()
+    source = SpdcSourceNode("source", tl, {"bandwidth": bandwidth, "mean_photon_num": 0.1})
+    source.set_seed(0)
+    channels = []
+    for name in ["signal", "idler"]:
+        spec = FiberSpec(core_ellipticity=1.005, bend_radius_m=0.1, twist_rate_rad_per_m=0.2)
+        receiver = Receiver(name, tl)
+        qc = fiberQuantumChannel(f"qc.{name}", tl, attenuation=0.0002, distance=DISTANCE, spec=spec)
+        qc.set_ends(source, receiver.name)
+        channels.append(qc)
+    return tl, source, channels
+
+
+def time_init(tl: Timeline, channels: list[fiberQuantumChannel]) -> tuple[float, float]:
+    _fiber_optics.cache_clear()
+    tick = time.perf_counter()
+    tl.init()
+    cold = time.perf_counter() - tick
+
+    for qc in channels:
+        qc.spec.temperature_C += 10
+    tl.init()
+    for qc in channels:
+        qc.spec.temperature_C -= 10
+    tick = time.perf_counter()
+    tl.init()
+    warm = time.perf_counter() - tick
+    return cold, warm
+
+
+def run(bandwidth: float, num_pulses: int) -> tuple[float, float, float]:
+    tl, source, channels = build(bandwidth)
+    cold, warm = time_init(tl, channels)
+    tick = time.perf_counter()
+    source.emit(num_pulses)
+    tl.run()
+    elapsed = time.perf_counter() - tick
+    return cold, warm, source.emission_count / elapsed
+
+
+if __name__ == "__main__":
+    num_pulses = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+
+    print(f"init time (ms) and photon pairs per second of wall time over {DISTANCE / 1e3:.0f} km fibers")
+    print(f"{'bandwidth':>10} {'init cold':>10} {'init warm':>10} {'pairs':>10}")
+    for bandwidth in BANDWIDTHS:
+        cold, warm, rate = run(bandwidth, num_pulses)
+        print(f"{bandwidth:>10} {cold * 1e3:>10.2f} {warm * 1e3:>10.2f} {rate:>10.0f}")
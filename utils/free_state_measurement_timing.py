@@ -0,0 +1,140 @@
+"""Benchmark of the measurement of photon states stored locally (`FreeQuantumState`).
+
+`n` photons with random polarization states are measured in the diagonal basis,
+either unentangled (single) or entangled with a second photon (pair),
+and `n / 10` random photon pairs are measured in the Bell basis (bell).
+    - cached: the previous implementation, with the probabilities and projected states
+      cached by state and basis (`lru_cache` on tuples, missing for random states).
+    - projectors: `FreeQuantumState.measure` and `measure_multiple`, with the precomputed projectors of the basis.
+    - batch: `FreeQuantumState.measure_batch`, measuring all unentangled photons in one call.
+The number of measurements per second is reported.
+
+Usage:
+    python utils/free_state_measurement_timing.py [num_photons]
+"""
+
+from functools import lru_cache
+import sys
+import time
+
+import numpy as np
+
+from sequence.kernel.quantum_state import FreeQuantumState, swap_bits
+from sequence.utils.encoding import polarization
+
+
+BASIS = polarization["bases"][1]
+BELL_BASIS = ((complex(np.sqrt(1 / 2)), complex(0), complex(0), complex(np.sqrt(1 / 2))),
+              (complex(np.sqrt(1 / 2)), complex(0), complex(0), complex(-np.sqrt(1 / 2))),
+              (complex(0), complex(np.sqrt(1 / 2)), complex(np.sqrt(1 / 2)), complex(0)),
+              (complex(0), complex(np.sqrt(1 / 2)), complex(-np.sqrt(1 / 2)), complex(0)))
+
+
+@lru_cache(maxsize=1000)
+def measure_state_with_cache(state, basis):
+    state = np.array(state)
+    u = np.array(basis[0], dtype=complex)
+    M0 = np.outer(u.conj(), u)
+    return (state.conj().transpose() @ M0.conj().transpose() @ M0 @ state).real
+
+
+@lru_cache(maxsize=1000)
+def measure_entangled_state_with_cache(state, basis, state_index, num_states):
+    state = np.array(state)
+    u = np.array(basis[0], dtype=complex)
+    v = np.array(basis[1], dtype=complex)
+    M0 = np.outer(u.conj(), u)
+    M1 = np.outer(v.conj(), v)
+    projector0 = [1]
+    projector1 = [1]
+    for i in range(num_states):
+        projector0 = np.kron(projector0, M0 if i == state_index else np.identity(2))
+        projector1 = np.kron(projector1, M1 if i == state_index else np.identity(2))
+    prob_0 = (state.conj().transpose() @ projector0.conj().transpose() @ projector0 @ state).real
+    state1 = None if prob_0 >= 1 else (projector1 @ state) / np.sqrt(1 - prob_0)
+    state0 = None if prob_0 <= 0 else (projector0 @ state) / np.sqrt(prob_0)
+    return state0, state1, prob_0
+
+
+@lru_cache(maxsize=1000)
+def measure_multiple_with_cache(state, basis, length_diff):
+    state = np.array(state)
+    projectors = [None] * len(basis)
+    probabilities = [0] * len(basis)
+    for i, vector in enumerate(basis):
+        vector = np.array(vector, dtype=complex)
+        M = np.outer(vector.conj(), vector)
+        projectors[i] = np.kron(M, np.identity(2 ** length_diff))
+        probabilities[i] = max((state.conj().transpose() @ projectors[i].conj().transpose() @ projectors[i] @ state).real, 0)
+    return_states = [(proj @ state) / np.sqrt(p) if p > 0 else None for proj, p in zip(projectors, probabilities)]
+    return return_states, probabilities
+
+
+class CachedState(FreeQuantumState):
+    def measure(self, basis, rng):
+        if len(self.entangled_states) > 1:
+            state0, state1, prob = measure_entangled_state_with_cache(
+                self.state, basis, self.entangled_states.index(self), len(self.entangled_states))
+            result = 0 if rng.random() < prob else 1
+            new_state = tuple(state0 if result == 0 else state1)
+        else:
+            prob = measure_state_with_cache(self.state, basis)
+            result = 0 if rng.random() < prob else 1
+            new_state = basis[result]
+        for s in self.entangled_states:
+            s.state = new_state
+        return result
+
+    @staticmethod
+    def measure_multiple(basis, states, rng):
+        entangled_list = states[0].entangled_states
+        pos_state_0 = entangled_list.index(states[0])
+        pos_state_1 = entangled_list.index(states[1])
+        switched_state = [complex(0)] * len(states[0].state)
+        for i, coefficient in enumerate(states[0].state):
+            switched_state[swap_bits(i, pos_state_0, pos_state_1)] = coefficient
+        new_states, probabilities = measure_multiple_with_cache(tuple(switched_state), basis,
+                                                                len(entangled_list) - len(states))
+        res = rng.choice(np.arange(0, len(basis), 1), p=probabilities)
+        for state in entangled_list:
+            state.state = tuple(new_states[res])
+        return res
+
+
+def random_states(state_class, num_photons: int, entangled: bool) -> list[FreeQuantumState]:
+    rng = np.random.default_rng(0)
+    states = []
+    for angle in rng.random(num_photons) * 2 * np.pi:
+        qs = state_class()
+        qs.set_state_single((complex(np.cos(angle)), complex(np.sin(angle))))
+        if entangled:
+            qs.combine_state(state_class())
+        states.append(qs)
+    return states
+
+
+def run(state_class, num_photons: int, mode: str) -> float:
+    states = random_states(state_class, num_photons, mode in ["pair", "bell"])
+    rng = np.random.default_rng(1)
+    tick = time.perf_counter()
+    if mode == "batch":
+        state_class.measure_batch(BASIS, states, rng)
+    elif mode == "bell":
+        for qs in states:
+            state_class.measure_multiple(BELL_BASIS, list(qs.entangled_states), rng)
+    else:
+        for qs in states:
+            qs.measure(BASIS, rng)
+    return num_photons / (time.perf_counter() - tick)
+
+
+if __name__ == "__main__":
+    num_photons = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+
+    print(f"measurements per second of {num_photons} random states")
+    print(f"{'':>8} {'cached':>10} {'projectors':>10} {'batch':>10}")
+    for mode in ["single", "pair", "bell"]:
+        cached = run(CachedState, num_photons // 10 if mode == "bell" else num_photons, mode)
+        projectors = run(FreeQuantumState, num_photons // 10 if mode == "bell" else num_photons, mode)
+        batch = f"{run(FreeQuantumState, num_photons, 'batch'):>10.0f}" if mode == "single" else f"{'':>10}"
+        print(f"{mode:>8} {cached:>10.0f} {projectors:>10.0f} {batch}")
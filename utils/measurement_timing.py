@@ -0,0 +1,101 @@
+"""Benchmark of vectorized measurement against the cached projector helpers.
+
+Three measurement patterns are timed on ket vectors and density matrices:
+    - bell: Bell state measurement of the two middle qubits of two Bell pairs (entanglement swapping).
+    - ghz: measurement of all qubits of an n-qubit GHZ state.
+    - qlan: measurement of the first n - 2 qubits of an n-qubit GHZ state, leaving a Bell pair (as in QLAN protocols).
+For each pattern
+    - projectors: the previous implementation, where the state is converted to tuples
+      and the projectors of all outcomes are built by `measure_multiple_with_cache_ket/density`.
+      The helpers are called without their cache (simulated states rarely repeat).
+    - vectorized: `measure_ket/measure_density`, as used by `QuantumManager._measure`.
+The projector implementation is only timed up to `MAX_PROJECTOR_QUBITS` qubits.
+
+Usage:
+    python utils/measurement_timing.py [max_ket_qubits] [max_density_qubits]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from sequence.kernel.quantum_utils import measure_multiple_with_cache_ket, measure_multiple_with_cache_density, \
+    measure_ket, measure_density, permute_ket
+
+
+NUM_TRIALS = 5
+MAX_PROJECTOR_QUBITS = {"ket": 10, "density": 7}
+MEAS_SAMP = 0.25
+
+
+def ghz(num_qubits: int) -> np.ndarray:
+    state = np.zeros(2 ** num_qubits, dtype=complex)
+    state[0] = state[-1] = 0.5 ** 0.5
+    return state
+
+
+def bell_pairs() -> tuple[np.ndarray, int, int]:
+    """Two Bell pairs, with the middle qubits (1 and 2) moved to the front."""
+    state = np.kron(ghz(2), ghz(2))
+    return permute_ket(state, [1, 2, 0, 3]), 2, 4
+
+
+def projector_measure(name: str, state, num_measured: int, num_qubits: int):
+    len_diff = num_qubits - num_measured
+    if name == "ket":
+        new_states, probabilities = measure_multiple_with_cache_ket.__wrapped__(tuple(state), num_measured, len_diff)
+    else:
+        new_states, probabilities = \
+            measure_multiple_with_cache_density.__wrapped__(tuple(map(tuple, state)), num_measured, len_diff)
+    for i in range(2 ** num_measured):
+        if MEAS_SAMP < sum(probabilities[:i + 1]):
+            return i, new_states[i]
+
+
+def vectorized_measure(name: str, state, num_measured: int, num_qubits: int):
+    if name == "ket":
+        return measure_ket(state, 0, num_measured, MEAS_SAMP)
+    return measure_density(state, 0, num_measured, MEAS_SAMP)
+
+
+def best_time(func) -> float:
+    times = []
+    for _ in range(NUM_TRIALS):
+        tick = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - tick)
+    return min(times)
+
+
+def time_pattern(name: str, state: np.ndarray, num_measured: int, num_qubits: int) -> list:
+    if name == "density":
+        state = np.outer(state, state.conj())
+    row = []
+    if num_qubits <= MAX_PROJECTOR_QUBITS[name]:
+        row.append(best_time(lambda: projector_measure(name, state, num_measured, num_qubits)))
+    else:
+        row.append(None)
+    row.append(best_time(lambda: vectorized_measure(name, state, num_measured, num_qubits)))
+    return row
+
+
+def format_row(label, row: list) -> str:
+    return f"{label:>6} " + " ".join(f"{t * 1e3:>11.3f}" if t is not None else f"{'-':>11}" for t in row)
+
+
+if __name__ == "__main__":
+    max_qubits = {"ket": int(sys.argv[1]) if len(sys.argv) > 1 else 14,
+                  "density": int(sys.argv[2]) if len(sys.argv) > 2 else 9}
+
+    for name in ["ket", "density"]:
+        print(f"{name}: measurement time (ms)")
+        print(f"{'n':>6} {'projectors':>11} {'vectorized':>11}")
+        state, num_measured, num_qubits = bell_pairs()
+        print(format_row("bell", time_pattern(name, state, num_measured, num_qubits)))
+        print(f"{'n':>6} {'ghz proj':>11} {'ghz vec':>11} {'qlan proj':>11} {'qlan vec':>11}")
+        for num_qubits in range(3, max_qubits[name] + 1):
+            state = ghz(num_qubits)
+            row = time_pattern(name, state, num_qubits, num_qubits)
+            row += time_pattern(name, state, num_qubits - 2, num_qubits)
+            print(format_row(num_qubits, row))
@@ -0,0 +1,66 @@
+"""Benchmark of detector dark counts.
+
+A detector with dark count rates from 10^3 to 10^6 Hz is simulated for `n` ms.
+    - events: the previous implementation, scheduling an `add_dark_count` and a `record_detection` event per dark count
+      and sampling one inter-arrival time per dark count.
+    - process: `PoissonProcess`, sampling inter-arrival times in blocks and scheduling one event per dark count.
+The number of dark counts per second of wall time and the number of executed events are reported.
+
+Usage:
+    python utils/noise_process_timing.py [sim_time_ms]
+"""
+
+import sys
+import time
+
+from sequence.components.detector import Detector
+from sequence.constants import MILLISECOND
+from sequence.kernel.event import Event
+from sequence.kernel.process import Process
+from sequence.kernel.timeline import Timeline
+from sequence.topology.node import Node
+
+
+RATES = [1e3, 1e4, 1e5, 1e6]
+
+
+class EventDetector(Detector):
+    def add_dark_count(self) -> None:
+        time_to_next = int(self.get_generator().exponential(1 / self.dark_count) * 1e12)
+        time = time_to_next + self.timeline.now()
+        self.timeline.schedule(Event(time, Process(self, "add_dark_count", [])))
+        self.timeline.schedule(Event(time, Process(self, "record_detection", [])))
+
+
+class Counter:
+    def __init__(self):
+        self.counter = 0
+
+    def trigger(self, detector, info):
+        self.counter += 1
+
+
+def run(detector_class, dark_count: float, sim_time: int) -> tuple[float, int, int]:
+    tl = Timeline(sim_time)
+    node = Node("node", tl, seed=0)
+    detector = detector_class("detector", tl, dark_count=dark_count, count_rate=1e12)
+    detector.owner = node
+    counter = Counter()
+    detector.attach(counter)
+    tl.init()
+    tick = time.perf_counter()
+    tl.run()
+    return time.perf_counter() - tick, counter.counter, tl.run_counter
+
+
+if __name__ == "__main__":
+    sim_time = int(float(sys.argv[1]) * MILLISECOND) if len(sys.argv) > 1 else 100 * MILLISECOND
+
+    print(f"dark counts per second of wall time over {sim_time / MILLISECOND:.0f} ms of simulation")
+    print(f"{'rate (Hz)':>10} {'events':>10} {'executed':>9} {'process':>10} {'executed':>9}")
+    for rate in RATES:
+        row = []
+        for detector_class in [EventDetector, Detector]:
+            elapsed, counts, executed = run(detector_class, rate, sim_time)
+            row.append(f"{counts / elapsed:>10.0f} {executed:>9}")
+        print(f"{rate:>10.0e} " + " ".join(row))
@@ -0,0 +1,100 @@
+"""Benchmark of `ParallelTimeline` on a chain of entanglement generating router pairs.
+
+The network is a chain of `2 * num_pairs` quantum routers.
+Routers `2k` and `2k + 1` are connected through a middle BSM node and continuously generate entanglement
+for the duration of one request of `RequestApp`; all neighboring routers are connected by classical channels.
+Each pair is assigned to one partition (`group` field), so only classical channels cross partitions
+and the lookahead is the classical channel delay.
+
+The simulation is run sequentially on a `Timeline` and on 1, 2, 4, ... partitions, up to the number of cores.
+
+Usage:
+    python utils/parallel_timeline_timing.py [num_pairs] [stop_time]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from sequence.app.request_app import RequestApp
+from sequence.kernel.parallel_timeline import run_parallel
+from sequence.topology.router_net_topo import RouterNetTopo
+
+
+MEMO_SIZE = 10
+CC_DELAY = 1e9
+
+
+def chain_config(num_pairs: int, stop_time: int, num_partitions: int) -> dict:
+    nodes = []
+    qconnections = []
+    cconnections = []
+    for i in range(2 * num_pairs):
+        pair = i // 2
+        nodes.append({"name": f"r{i}", "type": RouterNetTopo.QUANTUM_ROUTER, "seed": i, "memo_size": MEMO_SIZE,
+                      "group": pair * num_partitions // num_pairs})
+        if i > 0:
+            cconnections.append({"node1": f"r{i - 1}", "node2": f"r{i}", "delay": CC_DELAY})
+    for pair in range(num_pairs):
+        qconnections.append({"node1": f"r{2 * pair}", "node2": f"r{2 * pair + 1}", "attenuation": 0.0002,
+                             "distance": 2000, "type": RouterNetTopo.MEET_IN_THE_MID})
+    return {"stop_time": stop_time, "process_num": num_partitions, "nodes": nodes,
+            "qconnections": qconnections, "cconnections": cconnections}
+
+
+def build(config: dict, partition_id: int | None) -> RouterNetTopo:
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as fh:
+        json.dump(config, fh)
+    try:
+        topo = RouterNetTopo(fh.name, partition_id=partition_id)
+    finally:
+        os.remove(fh.name)
+
+    stop_time = config["stop_time"]
+    for router in topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER):
+        index = int(router.name[1:])
+        if index % 2 == 0:
+            app = RequestApp(router)
+            app.start(f"r{index + 1}", 10 * CC_DELAY, stop_time, MEMO_SIZE, 0.5)
+    return topo
+
+
+def worker(partition_id: int, connections: dict, config: dict) -> tuple[float, int]:
+    topo = build(config, partition_id)
+    tl = topo.get_timeline()
+    tl.set_connections(connections)
+    tl.init()
+    tick = time.perf_counter()
+    tl.run()
+    return time.perf_counter() - tick, tl.run_counter
+
+
+def run_sequential(config: dict) -> tuple[float, int]:
+    tl = build(config, None).get_timeline()
+    tl.init()
+    tick = time.perf_counter()
+    tl.run()
+    return time.perf_counter() - tick, tl.run_counter
+
+
+if __name__ == "__main__":
+    num_pairs = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    stop_time = int(float(sys.argv[2])) if len(sys.argv) > 2 else int(2e12)
+
+    print(f"{num_pairs} router pairs, {MEMO_SIZE} memories, stop time {stop_time:.0e} ps")
+    elapsed, executed = run_sequential(chain_config(num_pairs, stop_time, 1))
+    print(f"    sequential: {executed} events in {elapsed:.3f} s, {executed / elapsed:,.0f} events/s")
+
+    num_partitions = 1
+    while num_partitions <= min(os.cpu_count(), num_pairs):
+        config = chain_config(num_pairs, stop_time, num_partitions)
+        tick = time.perf_counter()
+        results = run_parallel(worker, num_partitions, args=(config,))
+        wall = time.perf_counter() - tick
+        elapsed = max(r[0] for r in results)
+        executed = sum(r[1] for r in results)
+        print(f"    {num_partitions:>2} partitions: {executed} events in {elapsed:.3f} s "
+              f"({wall:.3f} s with setup), {executed / elapsed:,.0f} events/s")
+        num_partitions *= 2
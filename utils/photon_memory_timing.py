@@ -0,0 +1,77 @@
+"""Benchmark of the memory and construction time of photons.
+
+`n` photons are kept in flight (in a list), storing their state locally (polarization)
+or in the quantum manager (Fock encoding, `use_qm=True`).
+    - legacy: the previous layout of `Photon`, with an instance `__dict__` and a `__del__` finalizer removing its key.
+    - photon: `Photon` with `__slots__`, constructed with validation.
+    - unchecked: `Photon.unchecked()`, the constructor of internal callers.
+The memory allocated per in-flight photon (including its local state or quantum manager state),
+and the number of photons created and deleted per second are reported.
+
+Usage:
+    python utils/photon_memory_timing.py [num_photons]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from sequence.components.photon import Photon
+from sequence.kernel.timeline import Timeline
+from sequence.utils.encoding import polarization, fock
+
+
+class LegacyPhoton(Photon):
+    # without __slots__, instances have a __dict__ (as Photon had)
+    def __del__(self):
+        if self.use_qm and self.timeline is not None:
+            self.timeline.quantum_manager.remove(self.quantum_state)
+
+
+STATE = (complex(0.6), complex(0.8))
+
+
+def create(constructor, timeline: Timeline, num_photons: int, use_qm: bool) -> list:
+    if use_qm:
+        return [constructor("", timeline, wavelength=1550, encoding_type=fock, use_qm=True) for _ in range(num_photons)]
+    return [constructor("", timeline, wavelength=1550, encoding_type=polarization, quantum_state=STATE)
+            for _ in range(num_photons)]
+
+
+def run(constructor, num_photons: int, use_qm: bool) -> tuple[float, float, float]:
+    tl = Timeline()
+    gc.collect()
+    tracemalloc.start()
+    photons = create(constructor, tl, num_photons, use_qm)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if use_qm:
+        for photon in photons:
+            photon.release()
+    del photons
+
+    tl = Timeline()
+    gc.collect()
+    tick = time.perf_counter()
+    photons = create(constructor, tl, num_photons, use_qm)
+    create_time = time.perf_counter() - tick
+    tick = time.perf_counter()
+    if use_qm and constructor is not LegacyPhoton:
+        for photon in photons:
+            photon.release()
+    del photons
+    delete_time = time.perf_counter() - tick
+    return size / num_photons, num_photons / create_time, num_photons / delete_time
+
+
+if __name__ == "__main__":
+    num_photons = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+
+    constructors = {"legacy": LegacyPhoton, "photon": Photon, "unchecked": Photon.unchecked}
+    for use_qm in [False, True]:
+        print(f"{num_photons} in-flight photons, " + ("quantum manager (Fock)" if use_qm else "local state (polarization)"))
+        print(f"{'':>10} {'bytes':>8} {'created/s':>10} {'deleted/s':>10}")
+        for label, constructor in constructors.items():
+            size, create_rate, delete_rate = run(constructor, num_photons, use_qm)
+            print(f"{label:>10} {size:>8.0f} {create_rate:>10.0f} {delete_rate:>10.0f}")
@@ -0,0 +1,90 @@
+"""Benchmark of BB84 key generation with individual photons and with photon trains.
+
+Two QKD nodes with polarization encoding generate `n` keys of 256 bits over a 10 km channel,
+with a light source at 80 MHz.
+    - photons: the light source emits one `Photon` and one event per photon.
+    - train: the light source emits a `PhotonTrain` (`photon_train=True`),
+      transmitted, measured and detected in batches; events are only scheduled for detections.
+The number of emitted photons per second of wall time is reported.
+
+Usage:
+    python utils/photon_train_timing.py [max_keys]
+"""
+
+import sys
+import time
+
+from sequence.components.optical_channel import QuantumChannel, ClassicalChannel
+from sequence.kernel.event import Event
+from sequence.kernel.process import Process
+from sequence.kernel.timeline import Timeline
+from sequence.protocol import StackProtocol
+from sequence.qkd.BB84 import pair_bb84_protocols
+from sequence.topology.node import QKDNode
+
+
+KEY_SIZE = 256
+
+
+class KeyCounter(StackProtocol):
+    def __init__(self, owner, num_keys: int):
+        super().__init__(owner, "")
+        self.num_keys = num_keys
+        self.counter = 0
+
+    def init(self):
+        pass
+
+    def push(self):
+        self.lower_protocols[0].push(KEY_SIZE, self.num_keys)
+
+    def pop(self, info):
+        self.counter += 1
+
+    def received_message(self, src, msg):
+        pass
+
+
+def run(num_keys: int, photon_train: bool) -> tuple[float, int, int]:
+    tl = Timeline(1e14)
+    templates = {"LightSource": {"photon_train": photon_train}}
+    alice = QKDNode("alice", tl, stack_size=1, component_templates=templates)
+    bob = QKDNode("bob", tl, stack_size=1, component_templates=templates)
+    alice.set_seed(0)
+    bob.set_seed(1)
+    pair_bb84_protocols(alice.protocol_stack[0], bob.protocol_stack[0])
+    for sender, receiver in [(alice, bob), (bob, alice)]:
+        qc = QuantumChannel(f"qc.{sender.name}", tl, distance=10e3, polarization_fidelity=0.99, attenuation=0.0002)
+        qc.set_ends(sender, receiver.name)
+        cc = ClassicalChannel(f"cc.{sender.name}", tl, distance=10e3)
+        cc.set_ends(sender, receiver.name)
+
+    counters = []
+    for node in [alice, bob]:
+        counter = KeyCounter(node, num_keys)
+        node.protocol_stack[0].upper_protocols.append(counter)
+        counter.lower_protocols.append(node.protocol_stack[0])
+        counters.append(counter)
+    tl.schedule(Event(0, Process(counters[0], "push", [])))
+
+    tl.init()
+    tick = time.perf_counter()
+    tl.run()
+    elapsed = time.perf_counter() - tick
+    assert counters[0].counter == num_keys
+    return elapsed, alice.components["alice.lightsource"].photon_counter, tl.run_counter
+
+
+if __name__ == "__main__":
+    max_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+
+    print(f"photons emitted per second of wall time to generate n keys of {KEY_SIZE} bits with BB84")
+    print(f"{'n':>5} {'photons':>10} {'events':>9} {'train':>10} {'events':>9}")
+    num_keys = 5
+    while num_keys <= max_keys:
+        row = []
+        for photon_train in [False, True]:
+            elapsed, photons, events = run(num_keys, photon_train)
+            row.append(f"{photons / elapsed:>10.0f} {events:>9}")
+        print(f"{num_keys:>5} " + " ".join(row))
+        num_keys *= 2
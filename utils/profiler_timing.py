@@ -0,0 +1,66 @@
+"""Benchmark of the overhead of the event profiler and progress reports of `Timeline`.
+
+The 2-node entanglement generation scenario and the trivial event handlers of `timeline_fast_timing` are run
+    - default: the default execution loop, without instrumentation.
+    - progress: with a progress callback (the wall clock is read every `Timeline.PROGRESS_CHECK_EVENTS` events).
+    - profiler: with the event profiler enabled.
+The best of `NUM_TRIALS` runs is reported, then the most expensive activations of the 2-node scenario.
+
+Usage:
+    python utils/profiler_timing.py [stop_time] [memo_size]
+"""
+
+import sys
+import time
+
+from timeline_fast_timing import NUM_TRIALS, Ticker, build
+from sequence.kernel.event import Event
+from sequence.kernel.process import Process
+from sequence.kernel.timeline import Timeline
+
+
+MODES = ["default", "progress", "profiler"]
+
+
+def instrument(tl: Timeline, mode: str) -> None:
+    if mode == "progress":
+        tl.progress_callback = lambda stats: None
+    elif mode == "profiler":
+        tl.enable_profiler()
+
+
+def run_trivial(mode: str, num_events: int = 200000, num_tickers: int = 100) -> tuple[float, int]:
+    tl = Timeline(stop_time=num_events // num_tickers * 1000)
+    for i in range(num_tickers):
+        ticker = Ticker(f"ticker_{i}", tl)
+        tl.schedule(Event(0, Process(ticker, "tick", [1000])))
+    instrument(tl, mode)
+    tick = time.perf_counter()
+    tl.run()
+    return time.perf_counter() - tick, tl.run_counter
+
+
+def run(mode: str, stop_time: int, memo_size: int) -> tuple[float, int, Timeline]:
+    tl = build(stop_time, memo_size)
+    instrument(tl, mode)
+    tick = time.perf_counter()
+    tl.run()
+    return time.perf_counter() - tick, tl.run_counter, tl
+
+
+if __name__ == "__main__":
+    stop_time = int(float(sys.argv[1])) if len(sys.argv) > 1 else int(5e12)
+    memo_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print(f"2-node entanglement generation, {memo_size} memories, stop time {stop_time:.0e} ps")
+    for mode in MODES:
+        elapsed, executed, tl = min((run(mode, stop_time, memo_size) for _ in range(NUM_TRIALS)), key=lambda r: r[0])
+        print(f"    {mode:>8}: {executed} events in {elapsed:.3f} s, {executed / elapsed:,.0f} events/s")
+
+    print("trivial event handlers")
+    for mode in MODES:
+        elapsed, executed = min(run_trivial(mode) for _ in range(NUM_TRIALS))
+        print(f"    {mode:>8}: {executed} events in {elapsed:.3f} s, {executed / elapsed:,.0f} events/s")
+
+    print("most expensive activations of the 2-node scenario")
+    print(tl.profiler.to_dataframe().head(10).to_string(index=False))
@@ -1,50 +1,69 @@
-import time
-import multiprocessing
-import numpy as np
-
-from psequence.quantum_manager_server import generate_arg_parser, start_server
-from sequence.kernel.quantum_manager_client import QuantumManagerClient
-from sequence.components.circuit import Circuit
+"""Benchmark of the local quantum manager against the quantum manager client and server.
 
+For 1, 2 and 3 qubit states, the latency of `run_circuit` is measured
+    - on a local `QuantumManagerKet`, with and without measurement,
+    - on a `QuantumManagerClient` for states moved to a `QuantumManagerServer`, with and without measurement.
+Circuits without measurement are batched by the client; circuits with measurement wait for the reply of the server.
 
-def client_function(ip, port):
-    client = QuantumManagerClient("KET", ip, port)
+The break-even partition size is the number of local `run_circuit` calls a partition must execute
+per measured call on a shared state, so that the time spent on the server equals the time spent locally.
 
-    # send request for new state
-    key = client.new()
+Usage:
+    python utils/qmanager_timing.py [num_trials]
+"""
 
-    # send request to get state
-    _ = client.get(key)
-
-    # run Hadamard gate
-    circ = Circuit(1)
-    circ.h(0)
-    client.run_circuit(circ, [key])
+import sys
+import time
 
-    # get state again to verify
-    _ = client.get(key)
+from sequence.components.circuit import Circuit
+from sequence.constants import KET_STATE_FORMALISM
+from sequence.kernel.quantum_manager import QuantumManagerKet
+from sequence.kernel.quantum_manager_client import QuantumManagerClient
+from sequence.kernel.quantum_manager_server import QuantumManagerServer
 
 
-NUM_TRIALS = 10
-NUM_CLIENTS = 10
+def circuits(num_qubits: int) -> tuple[Circuit, Circuit]:
+    unitary = Circuit(num_qubits)
+    unitary.h(0)
+    for i in range(1, num_qubits):
+        unitary.cx(0, i)
+    measure = Circuit(num_qubits)
+    measure.h(0)
+    measure.measure(0)
+    return unitary, measure
 
-parser = generate_arg_parser()
-args = parser.parse_args()
 
-p = multiprocessing.Process(target=start_server, args=(args.ip, args.port))
-p.start()
+def time_circuit(qm, circuit: Circuit, num_qubits: int, num_trials: int, remote: bool) -> float:
+    keys = [qm.new() for _ in range(num_qubits)]
+    if remote:
+        qm.move_manage_to_server(keys[0])
+        for key in keys[1:]:
+            qm.run_circuit(Circuit(2), [keys[0], key])
+    circuit.get_unitary_matrix()
+    meas_samp = 0.25 if len(circuit.measured_qubits) > 0 else None
 
-times = []
-for _ in range(NUM_TRIALS):
-    start = time.time()
-    pool = multiprocessing.Pool(NUM_CLIENTS, client_function, [args.ip, args.port])
-    pool.close()
-    pool.join()
-    end = time.time()
-    print("\ttime:", end - start)
-    times.append(end - start)
+    tick = time.perf_counter()
+    for _ in range(num_trials):
+        qm.run_circuit(circuit, keys, meas_samp)
+    qm.flush()
+    return (time.perf_counter() - tick) / num_trials
 
-p.kill()
 
-print("average time:", np.mean(times))
+if __name__ == "__main__":
+    num_trials = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
 
+    with QuantumManagerServer(KET_STATE_FORMALISM) as server:
+        client = QuantumManagerClient.create(server.address, 0, formalism=KET_STATE_FORMALISM)
+        local = QuantumManagerKet()
+        print(f"run_circuit latency (us), {num_trials} trials")
+        print(f"{'qubits':>6} {'local':>10} {'local meas':>10} {'batched':>10} {'measured':>10} {'break-even':>11}")
+        for num_qubits in [1, 2, 3]:
+            unitary, measure = circuits(num_qubits)
+            local_time = time_circuit(local, unitary, num_qubits, num_trials, False)
+            local_measured_time = time_circuit(local, measure, num_qubits, num_trials, False)
+            batched_time = time_circuit(client, unitary, num_qubits, num_trials, True)
+            measured_time = time_circuit(client, measure, num_qubits, num_trials, True)
+            break_even = measured_time / local_measured_time
+            print(f"{num_qubits:>6} {local_time * 1e6:>10.1f} {local_measured_time * 1e6:>10.1f} {batched_time * 1e6:>10.1f} "
+                  f"{measured_time * 1e6:>10.1f} {break_even:>11.0f}")
+        client.close()
@@ -0,0 +1,56 @@
+"""Benchmark of random number draws of hot paths.
+
+A component of a node draws `n` random numbers, one per call (as per photon in channels, detectors and BSMs).
+    - generator: `get_generator()` of the component (walking up to the node) and a call of the generator.
+    - stream: `get_stream()` of the component and a buffered draw from the `RandomStream` of the node.
+The number of draws per second is reported for uniform, exponential and Poisson numbers.
+
+Usage:
+    python utils/random_stream_timing.py [num_draws]
+"""
+
+import sys
+import time
+
+from sequence.components.detector import Detector
+from sequence.kernel.timeline import Timeline
+from sequence.topology.node import Node
+
+
+def draws(component: Detector, kind: str, buffered: bool, num_draws: int) -> float:
+    tick = time.perf_counter()
+    if buffered:
+        if kind == "uniform":
+            for _ in range(num_draws):
+                component.get_stream().uniform()
+        elif kind == "exponential":
+            for _ in range(num_draws):
+                component.get_stream().exponential(2.0)
+        else:
+            for _ in range(num_draws):
+                component.get_stream().poisson(0.1)
+    else:
+        if kind == "uniform":
+            for _ in range(num_draws):
+                component.get_generator().random()
+        elif kind == "exponential":
+            for _ in range(num_draws):
+                component.get_generator().exponential(2.0)
+        else:
+            for _ in range(num_draws):
+                component.get_generator().poisson(0.1)
+    return num_draws / (time.perf_counter() - tick)
+
+
+if __name__ == "__main__":
+    num_draws = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+
+    tl = Timeline(seed=0)
+    node = Node("node", tl)
+    detector = Detector("detector", tl)
+    detector.owner = node
+
+    print(f"draws per second ({num_draws} draws)")
+    print(f"{'':>12} {'generator':>10} {'stream':>10}")
+    for kind in ["uniform", "exponential", "poisson"]:
+        print(f"{kind:>12} {draws(detector, kind, False, num_draws):>10.0f} {draws(detector, kind, True, num_draws):>10.0f}")
@@ -0,0 +1,155 @@
+"""Benchmark of the reservation calendar against the previous per-memory reservation lists.
+
+A node with `NUM_MEMORIES` memories receives a stream of reservation requests, one per time step,
+for 1 to 4 memories over a random interval starting up to 50 steps ahead.
+Each request is scheduled as in `ResourceReservationProtocol`:
+it is added to the first free memories, the reserved memories are looked up twice (`create_rules` and `load_rules`),
+and 10% of the accepted requests are rejected later by another node (their memories are released).
+    - lists: the previous implementation, where cards keep every reservation,
+      memories are tried (and rolled back) one card at a time,
+      and lookups and releases scan all cards.
+    - calendar: `ReservationCalendar`, as used by `ResourceReservationProtocol.schedule`,
+      with expired reservations removed before each request.
+The list implementation is only timed up to `MAX_LIST_RESERVATIONS` requests.
+
+Usage:
+    python utils/reservation_calendar_timing.py [max_reservations]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from sequence.topology.node import QuantumRouter  # noqa: F401 (import order of the network management modules)
+from sequence.network_management.reservation import Reservation, ReservationCalendar
+
+
+NUM_MEMORIES = 50
+MAX_LIST_RESERVATIONS = 10 ** 4
+STEP = 10 ** 9
+REJECT_PROB = 0.1
+
+
+class ListTimeCard:
+    """Previous implementation of `MemoryTimeCard`."""
+
+    def __init__(self, memory_index: int):
+        self.memory_index = memory_index
+        self.reservations = []
+
+    def add(self, reservation: Reservation) -> bool:
+        start, end = 0, len(self.reservations) - 1
+        while start <= end:
+            mid = (start + end) // 2
+            if self.reservations[mid].start_time > reservation.end_time:
+                end = mid - 1
+            elif self.reservations[mid].end_time < reservation.start_time:
+                start = mid + 1
+            else:
+                return False
+        self.reservations.insert(start, reservation)
+        return True
+
+    def remove(self, reservation: Reservation) -> bool:
+        try:
+            self.reservations.pop(self.reservations.index(reservation))
+            return True
+        except ValueError:
+            return False
+
+
+class ListNode:
+    def __init__(self):
+        self.timecards = [ListTimeCard(i) for i in range(NUM_MEMORIES)]
+
+    def schedule(self, reservation: Reservation, now: int) -> bool:
+        counter = reservation.memory_size
+        timecards = []
+        for timecard in self.timecards:
+            if timecard.add(reservation):
+                counter -= 1
+                timecards.append(timecard)
+            if counter == 0:
+                return True
+        for timecard in timecards:
+            timecard.remove(reservation)
+        return False
+
+    def memory_indices(self, reservation: Reservation) -> list[int]:
+        return [card.memory_index for card in self.timecards if reservation in card.reservations]
+
+    def release(self, reservation: Reservation) -> None:
+        for card in self.timecards:
+            card.remove(reservation)
+
+
+class CalendarNode:
+    def __init__(self):
+        self.calendar = ReservationCalendar(NUM_MEMORIES)
+
+    def schedule(self, reservation: Reservation, now: int) -> bool:
+        self.calendar.expire(now)
+        memory_indices = self.calendar.find_free(reservation.start_time, reservation.end_time,
+                                                 reservation.memory_size)
+        if len(memory_indices) < reservation.memory_size:
+            return False
+        return self.calendar.add(reservation, memory_indices)
+
+    def memory_indices(self, reservation: Reservation) -> list[int]:
+        return self.calendar.get_memory_indices(reservation)
+
+    def release(self, reservation: Reservation) -> None:
+        self.calendar.remove(reservation)
+
+
+def requests(num_reservations: int, seed: int = 0) -> list[tuple[int, Reservation, bool]]:
+    rng = np.random.default_rng(seed)
+    leads = rng.integers(1, 50, num_reservations) * STEP
+    durations = rng.integers(1, 30, num_reservations) * STEP
+    sizes = rng.integers(1, 5, num_reservations)
+    rejected = rng.random(num_reservations) < REJECT_PROB
+    workload = []
+    for i in range(num_reservations):
+        now = i * STEP
+        start = now + int(leads[i])
+        reservation = Reservation("n0", f"n{i % 7 + 1}", start, start + int(durations[i]), int(sizes[i]), 0.9,
+                                  identity=i)
+        workload.append((now, reservation, bool(rejected[i])))
+    return workload
+
+
+def run(node, workload) -> tuple[float, int]:
+    accepted = 0
+    tick = time.perf_counter()
+    for now, reservation, rejected in workload:
+        if node.schedule(reservation, now):
+            accepted += 1
+            node.memory_indices(reservation)
+            node.memory_indices(reservation)
+            if rejected:
+                node.release(reservation)
+    return time.perf_counter() - tick, accepted
+
+
+if __name__ == "__main__":
+    max_reservations = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+
+    print(f"time (s) to schedule n reservation requests on a node with {NUM_MEMORIES} memories")
+    print(f"{'n':>8} {'lists':>9} {'calendar':>9} {'accepted':>9} {'kept':>6}")
+    num_reservations = 10 ** 3
+    while num_reservations <= max_reservations:
+        workload = requests(num_reservations)
+        row = []
+        if num_reservations <= MAX_LIST_RESERVATIONS:
+            list_time, list_accepted = run(ListNode(), workload)
+            row.append(f"{list_time:>9.3f}")
+        else:
+            list_accepted = None
+            row.append(f"{'-':>9}")
+        node = CalendarNode()
+        calendar_time, accepted = run(node, workload)
+        assert list_accepted in (None, accepted)
+        row.append(f"{calendar_time:>9.3f}")
+        print(f"{num_reservations:>8} " + " ".join(row) + f" {accepted:>9} {len(node.calendar):>6}")
+        num_reservations *= 10
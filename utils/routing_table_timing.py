@@ -0,0 +1,87 @@
+"""Benchmark of the routing table computation of `RouterNetTopo`.
+
+Routers are placed on a square grid (with random link lengths), and the next hops between all pairs are computed.
+    - per pair: the previous implementation, running `networkx.dijkstra_path` for every (source, destination) pair.
+    - table: `RoutingTable`, computing one shortest-path tree per router with `scipy.sparse.csgraph.dijkstra`.
+    - add/remove: average time for `RoutingTable` to update the next hops when a channel is added or removed.
+The per-pair implementation is only timed up to `MAX_PAIR_NODES` routers.
+
+Usage:
+    python utils/routing_table_timing.py [max_nodes]
+"""
+
+import sys
+import time
+
+import numpy as np
+from networkx import Graph, dijkstra_path
+
+from sequence.network_management.routing import RoutingTable
+
+
+MAX_PAIR_NODES = 100
+NUM_UPDATES = 20
+
+
+def grid(size: int, seed: int = 0) -> tuple[list[str], list[tuple[str, str, float]]]:
+    rng = np.random.default_rng(seed)
+    names = [f"router_{i}_{j}" for i in range(size) for j in range(size)]
+    channels = []
+    for i in range(size):
+        for j in range(size):
+            if i + 1 < size:
+                channels.append((f"router_{i}_{j}", f"router_{i + 1}_{j}", 1000 * rng.uniform(1, 2)))
+            if j + 1 < size:
+                channels.append((f"router_{i}_{j}", f"router_{i}_{j + 1}", 1000 * rng.uniform(1, 2)))
+    return names, channels
+
+
+def pair_forwarding(names, channels) -> dict:
+    graph = Graph()
+    graph.add_nodes_from(names)
+    graph.add_weighted_edges_from(channels)
+    table = {}
+    for src in names:
+        for dst in names:
+            if src == dst:
+                continue
+            if dst > src:
+                path = dijkstra_path(graph, src, dst)
+            else:
+                path = dijkstra_path(graph, dst, src)[::-1]
+            table[src, dst] = path[1]
+    return table
+
+
+def update_time(table: RoutingTable, channels, seed: int = 0) -> float:
+    rng = np.random.default_rng(seed)
+    chosen = rng.choice(len(channels), NUM_UPDATES, replace=False)
+    tick = time.perf_counter()
+    for i in chosen:
+        node1, node2, cost = channels[i]
+        table.remove_channel(node1, node2)
+        table.add_channel(node1, node2, cost)
+    return (time.perf_counter() - tick) / (2 * NUM_UPDATES)
+
+
+if __name__ == "__main__":
+    max_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 2500
+
+    print("time (s) to compute the next hops between all routers of a grid")
+    print(f"{'n':>6} {'per pair':>9} {'table':>9} {'add/remove':>11}")
+    size = 5
+    while size * size <= max_nodes:
+        names, channels = grid(size)
+        row = []
+        if len(names) <= MAX_PAIR_NODES:
+            tick = time.perf_counter()
+            pair_forwarding(names, channels)
+            row.append(f"{time.perf_counter() - tick:>9.3f}")
+        else:
+            row.append(f"{'-':>9}")
+        tick = time.perf_counter()
+        table = RoutingTable(names, channels)
+        row.append(f"{time.perf_counter() - tick:>9.3f}")
+        row.append(f"{update_time(table, channels):>11.4f}")
+        print(f"{len(names):>6} " + " ".join(row))
+        size *= 2
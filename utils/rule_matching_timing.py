@@ -0,0 +1,86 @@
+"""Benchmark of indexed rule matching in the resource manager.
+
+A router holds `m` memories shared by `m / 10` reservations, each with the entanglement swapping rules
+of an intermediate node (`es_rule_conditionA` and `es_rule_conditionB2`).
+All memories are entangled with the left node of their reservation, so that no swapping rule applies,
+and `ResourceManager.update()` is called on each memory in turn.
+    - scan: the previous implementation, where every rule is evaluated on the memory,
+      and `es_rule_conditionA` scans every memory for a partner.
+    - fallback: rules without match keys (every rule is evaluated), with the indexed partner lookup.
+    - indexed: rules with match keys (`RuleMatch`), as created by the reservation protocol.
+
+Usage:
+    python utils/rule_matching_timing.py [num_updates]
+"""
+
+import sys
+import time
+
+from sequence.kernel.timeline import Timeline
+from sequence.topology.node import QuantumRouter
+from sequence.network_management.reservation import es_rule_actionA, es_rule_actionB, es_rule_conditionA, \
+    es_rule_conditionB2, SWAPPING_STATES
+from sequence.resource_management.rule_manager import Rule, RuleMatch
+
+
+MEMORIES_PER_RESERVATION = 10
+FIDELITY = 0.9
+
+
+def scan_conditionA(memory_info, memory_manager, args):
+    """Previous `es_rule_conditionA`, scanning all memories for a partner."""
+
+    memory_indices, left, right, fidelity = args["memory_indices"], args["left"], args["right"], args["fidelity"]
+    if (memory_info.state in ["ENTANGLED", "PURIFIED"] and memory_info.index in memory_indices
+            and memory_info.remote_node in [left, right] and memory_info.fidelity >= fidelity):
+        other = right if memory_info.remote_node == left else left
+        for memory_info2 in memory_manager:
+            if (memory_info2.state in ["ENTANGLED", "PURIFIED"] and memory_info2.index in memory_indices
+                    and memory_info2.remote_node == other and memory_info2.fidelity >= fidelity):
+                return [memory_info, memory_info2]
+    return []
+
+
+def build_router(num_memories: int, variant: str) -> QuantumRouter:
+    tl = Timeline()
+    router = QuantumRouter("router", tl, memo_size=num_memories)
+    resource_manager = router.resource_manager
+    for start in range(0, num_memories, MEMORIES_PER_RESERVATION):
+        memory_indices = list(range(start, start + MEMORIES_PER_RESERVATION))
+        left, right = f"left{start}", f"right{start}"
+        condition_args = {"memory_indices": memory_indices, "left": left, "right": right, "fidelity": FIDELITY}
+        action_args = {"es_succ_prob": 1, "es_degradation": 1}
+        condition_a = scan_conditionA if variant == "scan" else es_rule_conditionA
+        match_a = match_b = None
+        if variant == "indexed":
+            match_a = RuleMatch(SWAPPING_STATES, memory_indices, [left, right])
+            match_b = RuleMatch(SWAPPING_STATES, memory_indices)
+        resource_manager.load(Rule(10, es_rule_actionA, condition_a, action_args, condition_args, match_a))
+        resource_manager.load(Rule(10, es_rule_actionB, es_rule_conditionB2, {}, condition_args, match_b))
+
+        for index in memory_indices:
+            memory = router.get_components_by_type("MemoryArray")[0][index]
+            memory.fidelity = FIDELITY
+            memory.entangled_memory = {"node_id": left, "memo_id": f"{left}[{index}]"}
+            resource_manager.memory_manager.update(memory, "ENTANGLED")
+    return router
+
+
+def time_updates(router: QuantumRouter, num_updates: int) -> float:
+    memories = router.get_components_by_type("MemoryArray")[0].memories
+    tick = time.perf_counter()
+    for i in range(num_updates):
+        router.resource_manager.update(None, memories[i % len(memories)], "ENTANGLED")
+    return (time.perf_counter() - tick) / num_updates
+
+
+if __name__ == "__main__":
+    num_updates = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    print(f"time per ResourceManager.update (us), {num_updates} updates")
+    print(f"{'memories':>8} {'rules':>6} {'scan':>10} {'fallback':>10} {'indexed':>10}")
+    for num_memories in [20, 50, 100, 200, 400]:
+        row = [time_updates(build_router(num_memories, variant), num_updates)
+               for variant in ["scan", "fallback", "indexed"]]
+        num_rules = 2 * num_memories // MEMORIES_PER_RESERVATION
+        print(f"{num_memories:>8} {num_rules:>6} " + " ".join(f"{t * 1e6:>10.1f}" for t in row))
@@ -0,0 +1,59 @@
+"""Benchmark of the stabilizer quantum manager against the ket vector quantum manager.
+
+A linear cluster state of `n` qubits is prepared with H and CZ gates,
+and its inner qubits are measured in the X basis one at a time, leaving a Bell pair between the end qubits
+(as in a repeater chain or a QLAN star).
+The ket vector manager is only timed up to `MAX_KET_QUBITS` qubits (its states have `2^n` amplitudes).
+
+Usage:
+    python utils/stabilizer_timing.py [max_qubits]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from sequence.components.circuit import Circuit
+from sequence.kernel.quantum_manager import QuantumManagerKet, QuantumManagerStabilizer
+
+
+MAX_KET_QUBITS = 14
+
+
+def cluster_chain(qm_class, num_qubits: int) -> tuple[float, float]:
+    qm = qm_class()
+    keys = [qm.new() for _ in range(num_qubits)]
+    rng = np.random.default_rng(num_qubits)
+    h = Circuit(1)
+    h.h(0)
+    cz = Circuit(2)
+    cz.cz(0, 1)
+    meas_x = Circuit(1)
+    meas_x.h(0)
+    meas_x.measure(0)
+
+    tick = time.perf_counter()
+    for key in keys:
+        qm.run_circuit(h, [key])
+    for key1, key2 in zip(keys, keys[1:]):
+        qm.run_circuit(cz, [key1, key2])
+    prepared = time.perf_counter()
+    for key in keys[1:-1]:
+        qm.run_circuit(meas_x, [key], rng.random())
+    measured = time.perf_counter()
+    assert sorted(qm.get(keys[0]).keys) == [keys[0], keys[-1]]
+    return prepared - tick, measured - prepared
+
+
+if __name__ == "__main__":
+    max_qubits = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    print("time (ms) to prepare a linear cluster state of n qubits, and to measure its inner qubits")
+    print(f"{'n':>6} {'ket prep':>10} {'ket meas':>10} {'stab prep':>10} {'stab meas':>10}")
+    num_qubits = 4
+    while num_qubits <= max_qubits:
+        row = list(cluster_chain(QuantumManagerKet, num_qubits)) if num_qubits <= MAX_KET_QUBITS else [None, None]
+        row += list(cluster_chain(QuantumManagerStabilizer, num_qubits))
+        print(f"{num_qubits:>6} " + " ".join(f"{t * 1e3:>10.1f}" if t is not None else f"{'-':>10}" for t in row))
+        num_qubits = num_qubits + 2 if num_qubits < MAX_KET_QUBITS else num_qubits * 2
@@ -0,0 +1,92 @@
+"""Benchmark of the time bin arithmetic of `QuantumChannel` and `Detector`.
+
+A channel schedules `n` photons in bursts (as a light source does), and the reserved time bins are popped at transmission.
+    - mpfr: the previous implementation, converting with 80-bit `gmpy2.mpfr` numbers
+      and checking for reserved bins by scanning the `send_bins` heap.
+    - exact: `utils.exact_time`, converting with integer arithmetic and checking for reserved bins in a set.
+The rate of detection time conversions (`Detector.record_detection`) is then reported for both implementations.
+The mpfr implementation is only timed up to `MAX_MPFR_PHOTONS` photons.
+
+Usage:
+    python utils/timebin_timing.py [max_photons]
+"""
+
+import heapq as hq
+import sys
+import time
+
+from sequence.utils.exact_time import time_to_timebin, timebin_to_time, round_to_resolution, period_ceil, \
+    _mpfr_time_to_timebin, _mpfr_timebin_to_time, _mpfr_round_to_resolution, _mpfr_period_ceil
+
+
+MAX_MPFR_PHOTONS = 10 ** 5
+FREQUENCY = 8e7
+BURST = 100
+TIME_RESOLUTION = 150
+COUNT_RATE = 25e6
+
+
+def run_mpfr(num_photons: int) -> float:
+    send_bins = []
+    tick = time.perf_counter()
+    now = 0
+    for _ in range(0, num_photons, BURST):
+        for _ in range(BURST):
+            time_bin = _mpfr_time_to_timebin(now, FREQUENCY)
+            while time_bin in send_bins:
+                time_bin += 1
+            hq.heappush(send_bins, time_bin)
+            _mpfr_timebin_to_time(time_bin, FREQUENCY)
+        for _ in range(BURST):
+            time_bin = hq.heappop(send_bins)
+            now = _mpfr_timebin_to_time(time_bin, FREQUENCY)
+    return time.perf_counter() - tick
+
+
+def run_exact(num_photons: int) -> float:
+    send_bins, send_bin_set = [], set()
+    tick = time.perf_counter()
+    now = 0
+    for _ in range(0, num_photons, BURST):
+        for _ in range(BURST):
+            time_bin = time_to_timebin(now, FREQUENCY)
+            while time_bin in send_bin_set:
+                time_bin += 1
+            hq.heappush(send_bins, time_bin)
+            send_bin_set.add(time_bin)
+            timebin_to_time(time_bin, FREQUENCY)
+        for _ in range(BURST):
+            time_bin = hq.heappop(send_bins)
+            send_bin_set.discard(time_bin)
+            now = timebin_to_time(time_bin, FREQUENCY)
+    return time.perf_counter() - tick
+
+
+def run_detections(num_detections: int, round_func, period_func) -> float:
+    tick = time.perf_counter()
+    for now in range(0, num_detections * 12347, 12347):
+        round_func(now, TIME_RESOLUTION) * TIME_RESOLUTION
+        period_func(COUNT_RATE)
+    return time.perf_counter() - tick
+
+
+if __name__ == "__main__":
+    max_photons = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+
+    print(f"photons per second scheduled and transmitted by a channel at {FREQUENCY:.0e} Hz (bursts of {BURST})")
+    print(f"{'n':>8} {'mpfr':>10} {'exact':>10}")
+    num_photons = 10 ** 4
+    while num_photons <= max_photons:
+        row = []
+        if num_photons <= MAX_MPFR_PHOTONS:
+            row.append(f"{num_photons / run_mpfr(num_photons):>10.0f}")
+        else:
+            row.append(f"{'-':>10}")
+        row.append(f"{num_photons / run_exact(num_photons):>10.0f}")
+        print(f"{num_photons:>8} " + " ".join(row))
+        num_photons *= 10
+
+    num_detections = 10 ** 5
+    mpfr_rate = num_detections / run_detections(num_detections, _mpfr_round_to_resolution, _mpfr_period_ceil)
+    exact_rate = num_detections / run_detections(num_detections, round_to_resolution, period_ceil)
+    print(f"detections per second: mpfr {mpfr_rate:.0f}, exact {exact_rate:.0f}")
@@ -0,0 +1,103 @@
+"""Microbenchmark of `Timeline.run(fast=True)` on a 2-node entanglement generation scenario.
+
+Two quantum routers connected through a middle BSM node continuously generate entanglement
+for the duration of one request of `RequestApp`.
+The same scenario is run with the default execution loop and with the fast execution loop.
+A second scenario with trivial event handlers measures the overhead of the execution loop alone.
+
+The best of `NUM_TRIALS` runs is reported.
+
+Usage:
+    python utils/timeline_fast_timing.py [stop_time] [memo_size]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from sequence.app.request_app import RequestApp
+from sequence.kernel.entity import Entity
+from sequence.kernel.event import Event
+from sequence.kernel.process import Process
+from sequence.kernel.timeline import Timeline
+from sequence.topology.router_net_topo import RouterNetTopo
+
+
+NUM_TRIALS = 5
+
+class Ticker(Entity):
+    def init(self):
+        pass
+
+    def tick(self, period):
+        process = Process(self, "tick", [period])
+        self.timeline.schedule(Event(self.timeline.now() + period, process))
+
+
+def run_trivial(fast: bool, num_events: int = 200000, num_tickers: int = 100) -> tuple[float, int]:
+    tl = Timeline(stop_time=num_events // num_tickers * 1000)
+    for i in range(num_tickers):
+        ticker = Ticker(f"ticker_{i}", tl)
+        tl.schedule(Event(0, Process(ticker, "tick", [1000])))
+    tick = time.perf_counter()
+    tl.run(fast=fast)
+    return time.perf_counter() - tick, tl.run_counter
+
+
+def two_node_config(stop_time: int, memo_size: int) -> dict:
+    return {
+        "stop_time": stop_time,
+        "nodes": [
+            {"name": "alice", "type": RouterNetTopo.QUANTUM_ROUTER, "seed": 0, "memo_size": memo_size},
+            {"name": "bob", "type": RouterNetTopo.QUANTUM_ROUTER, "seed": 1, "memo_size": memo_size}
+        ],
+        "qconnections": [
+            {"node1": "alice", "node2": "bob", "attenuation": 0.0002, "distance": 2000,
+             "type": RouterNetTopo.MEET_IN_THE_MID}
+        ],
+        "cconnections": [
+            {"node1": "alice", "node2": "bob", "delay": 1e9}
+        ]
+    }
+
+
+def build(stop_time: int, memo_size: int) -> "Timeline":
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as fh:
+        json.dump(two_node_config(stop_time, memo_size), fh)
+    try:
+        topo = RouterNetTopo(fh.name)
+    finally:
+        os.remove(fh.name)
+
+    tl = topo.get_timeline()
+    alice = tl.get_entity_by_name("alice")
+    app = RequestApp(alice)
+    app.start("bob", 1e12, stop_time, memo_size, 0.5)
+    tl.init()
+    return tl
+
+
+def run(fast: bool, stop_time: int, memo_size: int) -> tuple[float, int]:
+    tl = build(stop_time, memo_size)
+    tick = time.perf_counter()
+    tl.run(fast=fast)
+    return time.perf_counter() - tick, tl.run_counter
+
+
+if __name__ == "__main__":
+    stop_time = int(float(sys.argv[1])) if len(sys.argv) > 1 else int(5e12)
+    memo_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print(f"2-node entanglement generation, {memo_size} memories, stop time {stop_time:.0e} ps")
+    for fast in [False, True]:
+        elapsed, executed = min(run(fast, stop_time, memo_size) for _ in range(NUM_TRIALS))
+        name = "fast" if fast else "default"
+        print(f"    {name:>8}: {executed} events in {elapsed:.3f} s, {executed / elapsed:,.0f} events/s")
+
+    print("trivial event handlers")
+    for fast in [False, True]:
+        elapsed, executed = min(run_trivial(fast) for _ in range(NUM_TRIALS))
+        name = "fast" if fast else "default"
+        print(f"    {name:>8}: {executed} events in {elapsed:.3f} s, {executed / elapsed:,.0f} events/s")
@@ -0,0 +1,117 @@
+"""Benchmark of loading `RouterNetTopo` configurations.
+
+A configuration of `n` routers on a square grid is generated, with a quantum connection and a classical connection
+between neighboring routers, and written as JSON and as newline-delimited JSON.
+    - scan: the previous expansion of quantum connections, scanning all classical channels and connections
+      for every quantum connection (O(Q x C)).
+    - indexed: `Topology._add_qconnections`, which indexes classical delays by node pair first.
+The time of each stage of `RouterNetTopo` loading (`Topology.load_times`) is then reported for the NDJSON file.
+The scan expansion is only timed up to `MAX_SCAN_NODES` routers.
+
+Usage:
+    python utils/topology_load_timing.py [max_nodes]
+"""
+
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from sequence.constants import SPEED_OF_LIGHT
+from sequence.topology.router_net_topo import RouterNetTopo
+from sequence.topology.topology import Topology
+
+
+MAX_SCAN_NODES = 400
+
+
+def grid_config(size: int) -> dict:
+    nodes, qconnections, cconnections = [], [], []
+    for i in range(size):
+        for j in range(size):
+            nodes.append({"name": f"router_{i}_{j}", "type": "QuantumRouter", "seed": i * size + j, "memo_size": 2})
+            for di, dj in [(1, 0), (0, 1)]:
+                if i + di < size and j + dj < size:
+                    pair = {"node1": f"router_{i}_{j}", "node2": f"router_{i + di}_{j + dj}"}
+                    qconnections.append({**pair, "attenuation": 0.0002, "distance": 2000,
+                                         "type": "meet_in_the_middle"})
+                    cconnections.append({**pair, "delay": 1e9})
+    return {"is_parallel": False, "stop_time": 1e12, "nodes": nodes,
+            "qconnections": qconnections, "cconnections": cconnections}
+
+
+def scan_qconnections(config: dict) -> None:
+    """Previous expansion of quantum connections."""
+
+    for q_connect in config.get(Topology.ALL_Q_CONNECT, []):
+        node1, node2 = q_connect[Topology.CONNECT_NODE_1], q_connect[Topology.CONNECT_NODE_2]
+        distance = q_connect[Topology.DISTANCE] // 2
+        cc_delay = []
+        for cc in config.get(Topology.ALL_C_CHANNEL, []):
+            if (cc[Topology.SRC], cc[Topology.DST]) in [(node1, node2), (node2, node1)]:
+                cc_delay.append(cc.get(Topology.DELAY, cc.get(Topology.DISTANCE, 1000) / SPEED_OF_LIGHT))
+        for cc in config.get(Topology.ALL_C_CONNECT, []):
+            if (cc[Topology.CONNECT_NODE_1], cc[Topology.CONNECT_NODE_2]) in [(node1, node2), (node2, node1)]:
+                cc_delay.append(cc.get(Topology.DELAY, cc.get(Topology.DISTANCE, 1000) / SPEED_OF_LIGHT))
+        cc_delay = np.mean(cc_delay) // 2
+        bsm_name = f"BSM.{node1}.{node2}.auto"
+        config[Topology.ALL_NODE].append({Topology.NAME: bsm_name, Topology.TYPE: "BSMNode",
+                                          Topology.SEED: q_connect.get(Topology.SEED, 0)})
+        for src in [node1, node2]:
+            config.setdefault(Topology.ALL_Q_CHANNEL, []).append(
+                {Topology.NAME: f"QC.{src}.{bsm_name}", Topology.SRC: src, Topology.DST: bsm_name,
+                 Topology.DISTANCE: distance, Topology.ATTENUATION: q_connect[Topology.ATTENUATION]})
+            for cc_src, cc_dst in [(src, bsm_name), (bsm_name, src)]:
+                config.setdefault(Topology.ALL_C_CHANNEL, []).append(
+                    {Topology.NAME: f"CC.{cc_src}.{cc_dst}", Topology.SRC: cc_src, Topology.DST: cc_dst,
+                     Topology.DISTANCE: distance, Topology.DELAY: cc_delay})
+
+
+def write_ndjson(config: dict, filename: str) -> None:
+    with open(filename, "w") as fh:
+        fh.write(json.dumps({k: v for k, v in config.items() if k not in Topology.LIST_FIELDS}) + "\n")
+        for key in Topology.LIST_FIELDS:
+            for item in config.get(key, []):
+                fh.write(json.dumps({key: item}) + "\n")
+
+
+if __name__ == "__main__":
+    max_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1600
+
+    topo = RouterNetTopo.__new__(RouterNetTopo)
+    stages = None
+    rows = []
+    size = 5
+    with tempfile.TemporaryDirectory() as tmp:
+        while size * size <= max_nodes:
+            config = grid_config(size)
+            row = [size * size]
+            if size * size <= MAX_SCAN_NODES:
+                scan_config = copy.deepcopy(config)
+                tick = time.perf_counter()
+                scan_qconnections(scan_config)
+                row.append(time.perf_counter() - tick)
+            else:
+                row.append(None)
+            indexed_config = copy.deepcopy(config)
+            tick = time.perf_counter()
+            Topology._add_qconnections(topo, indexed_config)
+            row.append(time.perf_counter() - tick)
+
+            filename = os.path.join(tmp, f"grid_{size}.jsonl")
+            write_ndjson(config, filename)
+            loaded = RouterNetTopo(filename)
+            stages = list(loaded.load_times)
+            row += [loaded.load_times[stage] for stage in stages]
+            rows.append(row)
+            size *= 2
+
+    print("time (s) to expand quantum connections and of each stage of loading a grid of n routers (NDJSON)")
+    print(f"{'n':>6} {'scan':>8} {'indexed':>8} " + " ".join(f"{stage[:12]:>12}" for stage in stages))
+    for n, *times in rows:
+        print(f"{n:>6} " + " ".join(f"{t:>8.4f}" if t is not None else f"{'-':>8}" for t in times[:2]) + " "
+              + " ".join(f"{t:>12.4f}" for t in times[2:]))
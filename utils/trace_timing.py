@@ -0,0 +1,110 @@
+"""Benchmark of message logging and tracing.
+
+A node sends `n` messages to another node through a classical channel.
+    - legacy: the previous logging calls, formatting messages even when their module is not tracked.
+    - untracked: the modules are not tracked (messages are not formatted).
+    - log: the modules are tracked and messages are written to a text log file.
+    - trace: the modules are tracked and events are recorded to a binary trace file (without text log).
+The number of messages per second of wall time and the output size per message are reported.
+
+Usage:
+    python utils/trace_timing.py [num_messages]
+"""
+
+from enum import Enum, auto
+from math import inf
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from sequence.components.optical_channel import ClassicalChannel
+from sequence.kernel.event import Event
+from sequence.kernel.process import Process
+from sequence.kernel.timeline import Timeline
+from sequence.message import Message
+from sequence.topology.node import Node
+from sequence.utils import log, trace
+
+
+MODULES = ["node", "optical_channel"]
+
+
+class MsgType(Enum):
+    TEST = auto()
+
+
+class LegacyNode(Node):
+    def send_message(self, dst, msg, priority=inf):
+        log.logger.info(f"{self.name} send message {msg} to {dst}")
+        if priority == inf:
+            priority = self.timeline.schedule_counter
+        self.cchannels[dst].transmit(msg, self, priority)
+
+    def receive_message(self, src, msg):
+        log.logger.info(f"{self.name} receive message {msg} from {src}")
+
+
+class LegacyChannel(ClassicalChannel):
+    def transmit(self, message, source, priority):
+        log.logger.info(f"{self.sender.name} send message {message} to {self.receiver} by Channel {self.name}")
+        process = Process(self.receiver, "receive_message", [source.name, message])
+        self.timeline.schedule(Event(round(self.timeline.now() + int(self.delay)), process, priority))
+
+
+class Sender:
+    def __init__(self, node: Node, num_messages: int):
+        self.node = node
+        self.num_messages = num_messages
+
+    def send(self):
+        self.node.send_message("receiver", Message(MsgType.TEST, "receiver"))
+        self.num_messages -= 1
+        if self.num_messages > 0:
+            self.node.timeline.schedule(Event(self.node.timeline.now() + 1000, Process(self, "send", [])))
+
+
+def run(mode: str, num_messages: int, path: str) -> tuple[float, int]:
+    tl = Timeline()
+    node_class, channel_class = (LegacyNode, LegacyChannel) if mode == "legacy" else (Node, ClassicalChannel)
+    sender = node_class("sender", tl)
+    receiver = node_class("receiver", tl)
+    cc = channel_class("cc", tl, 1e3, delay=1e6)
+    cc.set_ends(sender, receiver.name)
+
+    log._log_modules.clear()
+    if mode == "log":
+        log.set_logger("trace_timing", tl, path)
+        log.set_logger_level("INFO")
+    else:
+        log.logger = logging.getLogger("trace_timing_null")
+        log.logger.setLevel(logging.WARNING)
+    if mode in ["log", "trace"]:
+        for module in MODULES:
+            log.track_module(module)
+    if mode == "trace":
+        trace.start_trace(tl, path)
+
+    tl.init()
+    Sender(sender, num_messages).send()
+    tick = time.perf_counter()
+    tl.run()
+    elapsed = time.perf_counter() - tick
+    trace.stop_trace()
+    for handler in log.logger.handlers:
+        handler.close()
+    log._log_modules.clear()
+    return elapsed, os.path.getsize(path) if os.path.exists(path) else 0
+
+
+if __name__ == "__main__":
+    num_messages = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+
+    print(f"{num_messages} messages")
+    print(f"{'':>10} {'messages/s':>10} {'bytes/msg':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ["legacy", "untracked", "log", "trace"]:
+            path = os.path.join(directory, f"{mode}.out")
+            elapsed, size = run(mode, num_messages, path)
+            print(f"{mode:>10} {num_messages / elapsed:>10.0f} {size / num_messages:>10.1f}")